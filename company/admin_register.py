@@ -4,7 +4,10 @@ Učitan je iz CompanyConfig.ready() metode da bi se osiguralo da se modeli
 registruju odmah nakon što se aplikacija inicijalizira.
 """
 
+from django import forms
 from django.contrib import admin
+from django.contrib.admin.widgets import RelatedFieldWidgetWrapper
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 import nested_admin
 from .forms import CycleAuditForm
@@ -16,6 +19,8 @@ from .standard_models import StandardDefinition, StandardIAFScopeReference, Comp
 from .auditor_models import Auditor, AuditorStandard, AuditorStandardIAFEACCode, AuditorIAFEACCode
 from .calendar_models import CalendarEvent, Appointment
 from .cycle_models import CertificationCycle, CycleAudit, CycleStandard, AuditorReservation
+from .job_models import BackgroundJob
+from . import jobs
 
 # Inline klase za model Company
 class KontaktOsobaInline(admin.TabularInline):
@@ -111,19 +116,33 @@ class CertificationCycleAdmin(admin.ModelAdmin):
     actions = ['create_default_audits_action']
     
     def create_default_audits_action(self, request, queryset):
-        count = 0
-        for cycle in queryset:
-            cycle.create_default_audits()
-            count += 1
-        self.message_user(request, f"Kreirani podrazumevani auditi za {count} ciklus(a) sertifikacije.")
+        # Kreiranje audita sa danima i rezervacijama je sporo - izvršava se u pozadini (run_worker)
+        cycle_ids = list(queryset.values_list('id', flat=True))
+        job = jobs.enqueue('cycle.create_default_audits', created_by=request.user, cycle_ids=cycle_ids)
+        self.message_user(request, f"Kreiranje podrazumevanih audita za {len(cycle_ids)} ciklus(a) je pokrenuto u pozadini (posao #{job.pk}).")
     create_default_audits_action.short_description = "Kreiraj podrazumevane audite za izabrane cikluse"
 
+class CycleAuditAdminForm(CycleAuditForm):
+    """Admin ne učitava lazy_select.js - auditori se biraju iz običnih listi"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        for name, widget_class in (('lead_auditor', forms.Select), ('audit_team', forms.SelectMultiple)):
+            field = self.fields[name]
+            widget = widget_class()
+            widget.choices = field.choices
+            # lead_auditor je u adminu umotan u RelatedFieldWidgetWrapper (dugme za dodavanje)
+            if isinstance(field.widget, RelatedFieldWidgetWrapper):
+                field.widget.widget = widget
+            else:
+                field.widget = widget
+
 class CycleAuditAdmin(admin.ModelAdmin):
     list_display = ['certification_cycle', 'audit_type', 'audit_status', 'planned_date', 'actual_date', 'lead_auditor']
     list_filter = ['audit_type', 'audit_status', 'planned_date']
     search_fields = ['certification_cycle__company__name', 'lead_auditor__ime_prezime']
     date_hierarchy = 'planned_date'
-    form = CycleAuditForm
+    form = CycleAuditAdminForm
     
     fieldsets = [
         ('Osnovne informacije', {
@@ -220,6 +239,34 @@ class AuditorStandardAdmin(nested_admin.NestedModelAdmin):
     search_fields = ['auditor__ime_prezime', 'standard__name']
     inlines = [AuditorStandardIAFEACCodeInline]
 
+# Admin klasa za pozadinske poslove (lokalni red, vidi company/jobs.py)
+class BackgroundJobAdmin(admin.ModelAdmin):
+    list_display = ['id', 'task', 'status', 'progress', 'progress_message', 'attempts', 'created_by', 'created_at', 'finished_at']
+    list_filter = ['status', 'task']
+    search_fields = ['task', 'error', 'progress_message']
+    date_hierarchy = 'created_at'
+    readonly_fields = ['task', 'kwargs', 'status', 'progress', 'progress_message', 'result', 'error', 'attempts',
+                       'worker_id', 'created_by', 'created_at', 'started_at', 'finished_at', 'updated_at']
+    fields = readonly_fields + ['max_attempts', 'run_after']
+    actions = ['requeue_jobs', 'cancel_jobs']
+
+    def has_add_permission(self, request):
+        return False
+
+    def requeue_jobs(self, request, queryset):
+        count = queryset.exclude(status=BackgroundJob.STATUS_RUNNING).update(
+            status=BackgroundJob.STATUS_QUEUED, attempts=0, error='', run_after=timezone.now()
+        )
+        self.message_user(request, f"Vraćeno u red {count} posla(ova).")
+    requeue_jobs.short_description = "Ponovo pokreni izabrane poslove"
+
+    def cancel_jobs(self, request, queryset):
+        count = queryset.filter(status=BackgroundJob.STATUS_QUEUED).update(
+            status=BackgroundJob.STATUS_CANCELLED, finished_at=timezone.now()
+        )
+        self.message_user(request, f"Otkazano {count} posla(ova) na čekanju.")
+    cancel_jobs.short_description = "Otkaži izabrane poslove na čekanju"
+
 # Eksplicitna registracija svih modela
 admin.site.register(Company, CompanyAdmin)
 admin.site.register(KontaktOsoba, KontaktOsobaAdmin)
@@ -239,5 +286,6 @@ admin.site.register(CertificationCycle, CertificationCycleAdmin)
 admin.site.register(CycleStandard)
 admin.site.register(CycleAudit, CycleAuditAdmin)
 admin.site.register(AuditorReservation, AuditorReservationAdmin)
+admin.site.register(BackgroundJob, BackgroundJobAdmin)
 
 print("Admin registracije su uspešno učitane!")
@@ -0,0 +1,186 @@
+"""
+Analitika opterećenja auditora po mesecima.
+
+Za svaki mesec i svakog auditora računa:
+- booked_days: broj različitih zauzetih dana (audit ili Srbija Tim, dan se broji jednom)
+- utilisation: booked_days / broj radnih dana u mesecu (%)
+- audit_days, lead_days, team_days: dani audita i podela na vodećeg/člana tima
+- audits, companies: broj različitih audita i kompanija
+- srbija_tim_days, srbija_tim_visits: opterećenje Srbija Tim posetama
+- travel_weeks: nedelje (ponedeljak) u kojima je auditor radio za više kompanija
+- rank: mesto po broju dana audita u mesecu (window funkcija RANK)
+
+Rezultat za jedan mesec se kešira (ANALYTICS_CACHE_SECONDS). Promena
+rezervacija, audita ili Srbija Tim poseta menja "generaciju" keša (vidi
+company/signals.py), pa se sledeći zahtev računa iznova. Generacija je u
+deljenom kešu (CACHES u settings.py), pa je vide svi workeri.
+"""
+import calendar
+import time
+from collections import defaultdict
+from datetime import date, timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, F, Q, Window
+from django.db.models.functions import Rank
+
+from isoqar_app import metrics
+
+from .auditor_models import Auditor
+from .conflict_service import KIND_SRBIJA_TIM, load_bookings
+from .cycle_models import AuditorReservation
+from .srbija_tim_models import SrbijaTim
+
+GENERATION_KEY = 'analytics:generation'
+
+# Nedelja je "putna" ako je auditor u njoj radio za bar ovoliko različitih kompanija
+TRAVEL_WEEK_MIN_COMPANIES = 2
+
+# Najveći broj meseci u jednom zahtevu
+MAX_MONTHS = 24
+
+
+def month_bounds(year, month):
+    last_day = calendar.monthrange(year, month)[1]
+    return date(year, month, 1), date(year, month, last_day)
+
+
+def working_days(date_from, date_to):
+    """Broj radnih dana (pon-pet) u periodu"""
+    days = (date_to - date_from).days + 1
+    return sum(1 for i in range(days) if (date_from + timedelta(days=i)).weekday() < 5)
+
+
+def iter_months(start, end):
+    """(godina, mesec) od start do end uključivo; start/end su (godina, mesec)"""
+    year, month = start
+    while (year, month) <= end:
+        yield year, month
+        month += 1
+        if month > 12:
+            year, month = year + 1, 1
+
+
+def parse_month(value):
+    """'YYYY-MM' -> (godina, mesec) ili None"""
+    try:
+        year, month = (int(part) for part in value.split('-'))
+    except (AttributeError, ValueError):
+        return None
+    if not 1 <= month <= 12 or not 1900 <= year <= 2999:
+        return None
+    return year, month
+
+
+def bump_generation():
+    """Poništava sve keširane mesece (poziva se iz signala)"""
+    try:
+        cache.incr(GENERATION_KEY)
+    except ValueError:
+        cache.set(GENERATION_KEY, time.time_ns(), None)
+
+
+def generation():
+    generation = cache.get(GENERATION_KEY)
+    if generation is None:
+        # Nova vrednost (a ne 1) ako je ključ izbačen iz keša, da se ne pogode stari rezultati
+        cache.add(GENERATION_KEY, time.time_ns(), None)
+        generation = cache.get(GENERATION_KEY)
+    return generation
+
+
+def _reservation_stats(date_from, date_to):
+    """Agregati rezervacija po auditoru sa rangom po broju dana (jedan upit)"""
+    rows = (
+        AuditorReservation.objects
+        .filter(date__gte=date_from, date__lte=date_to)
+        .values('auditor_id')
+        .annotate(
+            audit_days=Count('id'),
+            lead_days=Count('id', filter=Q(role='lead')),
+            team_days=Count('id', filter=~Q(role='lead')),
+            audits=Count('audit_id', distinct=True),
+            companies=Count('audit__certification_cycle__company_id', distinct=True),
+        )
+        .annotate(rank=Window(expression=Rank(), order_by=F('audit_days').desc()))
+        .order_by()
+    )
+    return {row['auditor_id']: row for row in rows}
+
+
+def _visit_counts(date_from, date_to):
+    """Broj Srbija Tim poseta po auditoru koje počinju u periodu (jedan upit)"""
+    rows = (
+        SrbijaTim.auditors.through.objects
+        .filter(srbijatim__visit_date__gte=date_from, srbijatim__visit_date__lte=date_to)
+        .values('auditor_id')
+        .annotate(visits=Count('srbijatim_id', distinct=True))
+        .order_by()
+    )
+    return {row['auditor_id']: row['visits'] for row in rows}
+
+
+def compute_month(year, month):
+    """Opterećenje svih auditora za jedan mesec (bez keša)"""
+    date_from, date_to = month_bounds(year, month)
+    capacity = working_days(date_from, date_to)
+
+    auditors = list(Auditor.objects.order_by('ime_prezime').values('id', 'ime_prezime', 'kategorija'))
+    reservations = _reservation_stats(date_from, date_to)
+    visits = _visit_counts(date_from, date_to)
+
+    booked = defaultdict(set)
+    srbija_tim_days = defaultdict(set)
+    week_companies = defaultdict(lambda: defaultdict(set))
+    for booking in load_bookings([a['id'] for a in auditors], date_from, date_to):
+        booked[booking.auditor_id].add(booking.date)
+        if booking.kind == KIND_SRBIJA_TIM:
+            srbija_tim_days[booking.auditor_id].add(booking.date)
+        week_start = booking.date - timedelta(days=booking.date.weekday())
+        week_companies[booking.auditor_id][week_start].add(booking.company)
+
+    rows = []
+    for auditor in auditors:
+        auditor_id = auditor['id']
+        stats = reservations.get(auditor_id, {})
+        booked_days = len(booked[auditor_id])
+        rows.append({
+            'id': auditor_id,
+            'name': auditor['ime_prezime'],
+            'category': auditor['kategorija'],
+            'booked_days': booked_days,
+            'utilisation': round(booked_days * 100 / capacity, 1) if capacity else 0.0,
+            'audit_days': stats.get('audit_days', 0),
+            'lead_days': stats.get('lead_days', 0),
+            'team_days': stats.get('team_days', 0),
+            'audits': stats.get('audits', 0),
+            'companies': stats.get('companies', 0),
+            'rank': stats.get('rank'),
+            'srbija_tim_days': len(srbija_tim_days[auditor_id]),
+            'srbija_tim_visits': visits.get(auditor_id, 0),
+            'travel_weeks': sorted(
+                week.isoformat() for week, companies in week_companies[auditor_id].items()
+                if len(companies) >= TRAVEL_WEEK_MIN_COMPANIES
+            ),
+        })
+
+    total_booked = sum(r['booked_days'] for r in rows)
+    return {
+        'month': f"{year}-{month:02d}",
+        'working_days': capacity,
+        'total_booked_days': total_booked,
+        'average_utilisation': round(total_booked * 100 / (capacity * len(rows)), 1) if capacity and rows else 0.0,
+        'auditors': rows,
+    }
+
+
+def month_utilisation(year, month):
+    """Opterećenje za mesec iz keša (ili izračunato i upisano u keš)"""
+    key = f"analytics:utilisation:{year}-{month:02d}:{generation()}"
+    data = cache.get(key)
+    metrics.record_cache('analytics_utilisation', hit=data is not None)
+    if data is None:
+        data = compute_month(year, month)
+        cache.set(key, data, getattr(settings, 'ANALYTICS_CACHE_SECONDS', 3600))
+    return data
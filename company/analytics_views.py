@@ -0,0 +1,82 @@
+from django.contrib.auth.decorators import login_required
+from django.contrib.auth.mixins import LoginRequiredMixin
+from django.http import JsonResponse
+from django.utils import timezone
+from django.views.decorators.http import require_GET
+from django.views.generic import TemplateView
+
+from . import analytics, forecast
+
+
+class AuditorUtilisationView(LoginRequiredMixin, TemplateView):
+    """Grafikoni opterećenja auditora; podaci se učitavaju iz auditor_utilisation_json"""
+    template_name = 'analytics/auditor_utilisation.html'
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        today = timezone.now().date()
+        # Podrazumevano poslednjih 6 meseci
+        start_year, start_month = today.year, today.month - 5
+        if start_month < 1:
+            start_year, start_month = start_year - 1, start_month + 12
+        context['title'] = 'Opterećenje auditora'
+        context['month_from'] = f"{start_year}-{start_month:02d}"
+        context['month_to'] = f"{today.year}-{today.month:02d}"
+        return context
+
+
+@login_required
+@require_GET
+def auditor_utilisation_json(request):
+    """
+    Opterećenje auditora po mesecima: ?month=YYYY-MM ili ?from=YYYY-MM&to=YYYY-MM
+    (najviše analytics.MAX_MONTHS meseci). Svaki mesec se kešira posebno.
+    """
+    if request.GET.get('month'):
+        start = end = analytics.parse_month(request.GET['month'])
+    else:
+        start = analytics.parse_month(request.GET.get('from'))
+        end = analytics.parse_month(request.GET.get('to'))
+
+    if not start or not end:
+        return JsonResponse({'success': False, 'error': 'Mesec mora biti u formatu YYYY-MM (month ili from/to).'}, status=400)
+    if end < start:
+        return JsonResponse({'success': False, 'error': 'Parametar to ne može biti pre from.'}, status=400)
+
+    months = list(analytics.iter_months(start, end))
+    if len(months) > analytics.MAX_MONTHS:
+        return JsonResponse({'success': False, 'error': f'Najviše {analytics.MAX_MONTHS} meseci po zahtevu.'}, status=400)
+
+    return JsonResponse({
+        'success': True,
+        'months': [analytics.month_utilisation(year, month) for year, month in months],
+    })
+
+
+class DemandForecastView(LoginRequiredMixin, TemplateView):
+    """Prognoza potražnje za auditima naspram kapaciteta; podaci iz demand_forecast_json"""
+    template_name = 'analytics/demand_forecast.html'
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['title'] = 'Prognoza potražnje za auditima'
+        context['forecast_months'] = forecast.FORECAST_MONTHS
+        return context
+
+
+@login_required
+@require_GET
+def demand_forecast_json(request):
+    """
+    Projekcija nadzora i resertifikacija za narednih FORECAST_MONTHS meseci,
+    ukupno i po standardu, sa kapacitetom kvalifikovanih auditora.
+    Opcioni ?from=YYYY-MM pomera početak prognoze.
+    """
+    start = None
+    if request.GET.get('from'):
+        month = analytics.parse_month(request.GET['from'])
+        if not month:
+            return JsonResponse({'success': False, 'error': 'Mesec mora biti u formatu YYYY-MM.'}, status=400)
+        start = analytics.month_bounds(*month)[0]
+
+    return JsonResponse({'success': True, **forecast.forecast(start)})
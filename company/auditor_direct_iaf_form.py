@@ -1,11 +1,11 @@
 from django import forms
 from .auditor_models import AuditorIAFEACCode
-from .iaf_models import IAFEACCode
+from .reference_data import ReferenceChoiceField, iaf_codes
 
 class DirectIAFEACCodeForm(forms.Form):
     """Forma za direktno dodeljivanje IAF/EAC koda tehničkom ekspertu"""
-    iaf_eac_code = forms.ModelChoiceField(
-        queryset=IAFEACCode.objects.all().order_by('iaf_code'),
+    iaf_eac_code = ReferenceChoiceField(
+        iaf_codes,
         label='IAF/EAC kod',
         widget=forms.Select(attrs={'class': 'form-control'})
     )
@@ -1,7 +1,6 @@
 from django import forms
 from .auditor_models import Auditor, AuditorStandard, AuditorStandardIAFEACCode, AuditorIAFEACCode
-from .standard_models import StandardDefinition
-from .iaf_models import IAFEACCode
+from .reference_data import active_standards, iaf_codes, reference_field
 
 
 class AuditorForm(forms.ModelForm):
@@ -32,8 +31,8 @@ class AuditorStandardForm(forms.ModelForm):
     
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        # Filtriranje samo aktivnih standarda
-        self.fields['standard'].queryset = StandardDefinition.objects.filter(active=True).order_by('code')
+        # Samo aktivni standardi (iz registra referentnih podataka)
+        self.fields['standard'] = reference_field(self.fields['standard'], active_standards)
 
 
 class AuditorStandardIAFEACForm(forms.ModelForm):
@@ -50,7 +49,7 @@ class AuditorStandardIAFEACForm(forms.ModelForm):
     
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.fields['iaf_eac_code'].queryset = IAFEACCode.objects.all().order_by('iaf_code')
+        self.fields['iaf_eac_code'] = reference_field(self.fields['iaf_eac_code'], iaf_codes)
 
 
 class AuditorIAFEACForm(forms.ModelForm):
@@ -67,4 +66,4 @@ class AuditorIAFEACForm(forms.ModelForm):
     
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.fields['iaf_eac_code'].queryset = IAFEACCode.objects.all().order_by('iaf_code')
+        self.fields['iaf_eac_code'] = reference_field(self.fields['iaf_eac_code'], iaf_codes)
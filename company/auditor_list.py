@@ -0,0 +1,79 @@
+"""
+Podaci za listu auditora bez N+1 upita.
+
+Kodovi standarda i IAF/EAC kodovi svakog auditora se spajaju u bazi
+(GROUP_CONCAT na SQLite, STRING_AGG na PostgreSQL) kao podupiti u istom
+upitu kojim se čitaju auditori, pa lista ima jedan upit bez obzira na broj
+veza. Podaci za padajuće filtere (standardi, IAF/EAC kodovi) dolaze iz
+registra referentnih podataka (company/reference_data.py).
+"""
+from django.db.models import Aggregate, CharField, OuterRef, Subquery
+
+from . import reference_data
+from .auditor_models import AuditorIAFEACCode, AuditorStandard, AuditorStandardIAFEACCode
+
+SEPARATOR = '|'
+
+
+class GroupConcat(Aggregate):
+    """Vrednosti grupe spojene separatorom (GROUP_CONCAT / STRING_AGG)"""
+    function = 'GROUP_CONCAT'
+    template = "%(function)s(%(expressions)s, '" + SEPARATOR + "')"
+    output_field = CharField()
+
+    def as_postgresql(self, compiler, connection, **extra_context):
+        return super().as_sql(compiler, connection, function='STRING_AGG', **extra_context)
+
+
+def _codes(model, lookup, field):
+    rows = (
+        model.objects
+        .filter(**{lookup: OuterRef('pk')})
+        .order_by()
+        .values(lookup)
+        .annotate(codes=GroupConcat(field))
+        .values('codes')
+    )
+    return Subquery(rows[:1], output_field=CharField())
+
+
+def with_code_lists(queryset):
+    """Dodaje spojene kodove standarda i IAF/EAC kodove (iz standarda i direktne za TE)"""
+    return queryset.annotate(
+        standard_codes_joined=_codes(AuditorStandard, 'auditor', 'standard__code'),
+        standard_iaf_codes_joined=_codes(AuditorStandardIAFEACCode, 'auditor_standard__auditor', 'iaf_eac_code__iaf_code'),
+        direct_iaf_codes_joined=_codes(AuditorIAFEACCode, 'auditor', 'iaf_eac_code__iaf_code'),
+    )
+
+
+def _split(value):
+    return set(value.split(SEPARATOR)) if value else set()
+
+
+def attach_code_lists(auditors):
+    """Postavlja standard_codes i all_iaf_codes (sortirane liste) na auditore iz with_code_lists"""
+    for auditor in auditors:
+        auditor.standard_codes = sorted(_split(auditor.standard_codes_joined))
+        auditor.all_iaf_codes = sorted(
+            _split(auditor.standard_iaf_codes_joined) | _split(auditor.direct_iaf_codes_joined)
+        )
+    return auditors
+
+
+def search_index(auditors):
+    """Kompaktan indeks za pretragu na klijentu: [[id, tekst malim slovima], ...]"""
+    return [
+        [auditor.pk, ' '.join([
+            auditor.ime_prezime, auditor.email, auditor.telefon, str(auditor.get_kategorija_display()),
+            *auditor.standard_codes, *auditor.all_iaf_codes,
+        ]).lower()]
+        for auditor in auditors
+    ]
+
+
+def filter_choices():
+    """Standardi i IAF/EAC kodovi za padajuće filtere (iz registra, bez upita)"""
+    return {
+        'standards': reference_data.standards(),
+        'iaf_codes': reference_data.iaf_codes(),
+    }
@@ -118,8 +118,8 @@ class Auditor(models.Model):
         Dodeljuje auditoru sve dostupne standarde ako je covers_all_standards=True
         """
         if self.covers_all_standards and self.kategorija != self.CATEGORY_TECHNICAL_EXPERT:
-            from .standard_models import StandardDefinition
-            all_standards = StandardDefinition.objects.filter(active=True)
+            from . import reference_data
+            all_standards = reference_data.standards(active=True)
             
             for standard in all_standards:
                 AuditorStandard.objects.get_or_create(
@@ -137,11 +137,14 @@ class Auditor(models.Model):
             is_primary_first: Da li prvi kod treba biti označen kao primarni
         """
         if self.kategorija == self.CATEGORY_TECHNICAL_EXPERT:
+            from . import reference_data
             from .iaf_models import IAFEACCode
             
             for i, code in enumerate(iaf_codes_list):
                 try:
-                    iaf_code = IAFEACCode.objects.get(iaf_code=code)
+                    iaf_code = reference_data.iaf_code_by_code(code)
+                    if iaf_code is None:
+                        raise IAFEACCode.DoesNotExist(code)
                     AuditorIAFEACCode.objects.get_or_create(
                         auditor=self,
                         iaf_eac_code=iaf_code,
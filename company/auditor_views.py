@@ -1,4 +1,4 @@
-from django.views.generic import ListView, DetailView, CreateView, UpdateView, DeleteView
+from django.views.generic import ListView, DetailView, CreateView, UpdateView, DeleteView, TemplateView
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.urls import reverse_lazy, reverse
 from django.shortcuts import get_object_or_404, redirect, render
@@ -7,15 +7,22 @@ from django.http import JsonResponse
 from django.views.decorators.http import require_GET
 from django.contrib.auth.decorators import login_required
 from django.core.exceptions import ValidationError
+from django.db.models import Count
+from django.utils import timezone
+from datetime import timedelta
 import logging
 
 from .auditor_models import Auditor, AuditorStandard, AuditorStandardIAFEACCode
 from .standard_models import StandardDefinition, CompanyStandard
 from .iaf_models import IAFEACCode
 from .auditor_forms import AuditorForm, AuditorStandardForm, AuditorStandardIAFEACForm
-from .cycle_models import CycleAudit
+from .cycle_models import CycleAudit, CycleStandard
 from .company_models import Company
-from .audit_utils import is_auditor_qualified_for_company, is_auditor_qualified_for_audit, get_qualified_auditors_for_company, get_qualified_auditors_for_audit
+from .audit_utils import is_auditor_qualified_for_company, is_auditor_qualified_for_audit
+from .list_filters import filter_auditors, parse_date
+from . import reference_data
+from .auditor_list import attach_code_lists, filter_choices, search_index, with_code_lists
+from .availability import MAX_RANGE_DAYS, availability_matrix
 
 # Konfigurisanje logera
 logger = logging.getLogger(__name__)
@@ -24,31 +31,14 @@ class AuditorListView(LoginRequiredMixin, ListView):
     model = Auditor
     template_name = 'auditor/auditor_list.html'
     context_object_name = 'auditors'
-    paginate_by = None  # Onemogući paginaciju za live search
+    paginate_by = None  # Live search i paginacija na klijentu (DataTables)
     
     def get_queryset(self):
-        queryset = Auditor.objects.all().prefetch_related(
-            'auditor_standardi__standard',
-            'auditor_standardi__iaf_eac_links__iaf_eac_code',
-            'direct_iaf_links__iaf_eac_code'  # Za tehničke eksperte - ispravan related_name
-        )
-        
-        # Filtriranje po kategoriji ako je zahtevano
-        category = self.request.GET.get('category')
-        if category:
-            queryset = queryset.filter(kategorija=category)
+        # Kodovi standarda i IAF/EAC kodovi se spajaju u bazi (company/auditor_list.py)
+        queryset = with_code_lists(Auditor.objects.all())
         
-        # Filtriranje po standardu ako je zahtevano
-        standard_id = self.request.GET.get('standard')
-        if standard_id:
-            queryset = queryset.filter(auditor_standardi__standard_id=standard_id).distinct()
-        
-        # Filtriranje po IAF/EAC kodu ako je zahtevano
-        iaf_code = self.request.GET.get('iaf_code')
-        if iaf_code:
-            queryset = queryset.filter(
-                auditor_standardi__iaf_eac_links__iaf_eac_code__iaf_code=iaf_code
-            ).distinct()
+        # Filtriranje po kategoriji, standardu i IAF/EAC kodu ako je zahtevano
+        queryset = filter_auditors(queryset, self.request.GET)
         
         return queryset
     
@@ -56,31 +46,16 @@ class AuditorListView(LoginRequiredMixin, ListView):
         context = super().get_context_data(**kwargs)
         context['title'] = 'Lista auditora'
         context['category_choices'] = Auditor.AUDITOR_CATEGORY_CHOICES
-        context['standards'] = StandardDefinition.objects.all()
-        context['iaf_codes'] = IAFEACCode.objects.all()
+        context.update(filter_choices())
         
         # Trenutno izabrani filteri
         context['selected_category'] = self.request.GET.get('category', '')
         context['selected_standard'] = self.request.GET.get('standard', '')
         context['selected_iaf_code'] = self.request.GET.get('iaf_code', '')
         
-        # Dodaj sve IAF/EAC kodove za svakog auditora
-        for auditor in context['auditors']:
-            iaf_codes_set = set()
-            
-            # 1. Prikupi IAF/EAC kodove iz standarda
-            for auditor_standard in auditor.auditor_standardi.all():
-                for iaf_link in auditor_standard.iaf_eac_links.all():
-                    iaf_codes_set.add(iaf_link.iaf_eac_code.iaf_code)
-            
-            # 2. Prikupi direktno dodeljene IAF/EAC kodove (za tehničke eksperte)
-            # Ispravan related_name je 'direct_iaf_links'
-            if hasattr(auditor, 'direct_iaf_links'):
-                for direct_link in auditor.direct_iaf_links.all():
-                    iaf_codes_set.add(direct_link.iaf_eac_code.iaf_code)
-            
-            # Sortiraj i dodaj kao listu
-            auditor.all_iaf_codes = sorted(list(iaf_codes_set))
+        auditors = attach_code_lists(list(context['auditors']))
+        context['auditors'] = auditors
+        context['search_index'] = search_index(auditors)
         
         return context
 
@@ -296,7 +271,7 @@ def auditor_standard_update(request, auditor_id, pk):
     
     # Za GET prikaži detalje standarda koje želimo ažurirati
     # Dobavi sve aktivne standarde za dropdown
-    all_standards = StandardDefinition.objects.filter(active=True).order_by('code')
+    all_standards = reference_data.standards(active=True)
     
     context = {
         'title': f'Izmena standarda {standard.standard.code} za auditora: {auditor.ime_prezime}',
@@ -517,9 +492,26 @@ def check_auditor_qualification_for_audit(auditor_id, audit_id):
         return {'is_qualified': False, 'missing_standards': [], 'message': str(e)}
 
 
+async def _qualified_auditors(standard_ids):
+    """Auditori kvalifikovani za SVE navedene standarde (bez standarda - svi auditori), jedan upit"""
+    auditors = Auditor.objects.all()
+    if standard_ids:
+        auditors = (
+            auditors.filter(auditor_standardi__standard_id__in=standard_ids)
+            .annotate(matched=Count('auditor_standardi__standard_id', distinct=True))
+            .filter(matched=len(standard_ids))
+        )
+    return [{
+        'id': a.id,
+        'name': a.ime_prezime,
+        'email': a.email,
+        'category': a.get_kategorija_display()
+    } async for a in auditors]
+
+
 @login_required
-def get_qualified_auditors(request):
-    """API endpoint za dohvatanje kvalifikovanih auditora za kompaniju ili audit"""
+async def get_qualified_auditors(request):
+    """API endpoint za dohvatanje kvalifikovanih auditora za kompaniju ili audit (async ORM)"""
     company_id = request.GET.get('company_id')
     audit_id = request.GET.get('audit_id')
     
@@ -527,56 +519,19 @@ def get_qualified_auditors(request):
         return JsonResponse({'success': False, 'message': 'Morate proslediti company_id ili audit_id'}, status=400)
     
     try:
-        # Ako je prosleđen audit_id, dohvatamo kvalifikovane auditore za taj audit
+        # Ako je prosleđen audit_id, auditori moraju imati sve standarde ciklusa tog audita
         if audit_id:
-            qualified_auditors_list = get_qualified_auditors_for_audit(audit_id)
-            
-            # Formatiramo rezultat za JSON odgovor
-            qualified_auditors = []
-            for auditor in qualified_auditors_list:
-                qualified_auditors.append({
-                    'id': auditor.id,
-                    'name': auditor.ime_prezime,
-                    'email': auditor.email,
-                    'category': auditor.get_kategorija_display()
-                })
+            cycle_id = await CycleAudit.objects.filter(id=audit_id).values_list('certification_cycle_id', flat=True).afirst()
+            if cycle_id is None:
+                return JsonResponse({'success': True, 'data': []})
+            standards = CycleStandard.objects.filter(certification_cycle_id=cycle_id)
         
-        # Ako je prosleđen company_id, dohvatamo kvalifikovane auditore za tu kompaniju
-        elif company_id:
-            # get_qualified_auditors_for_company vraća rečnik gde su ključevi ID-jevi standarda
-            # a vrednosti su liste auditora, pa moramo da transformišemo rezultat
-            qualified_auditors_dict = get_qualified_auditors_for_company(company_id)
-            
-            # Ako nema standarda, svi auditori su kvalifikovani
-            if not qualified_auditors_dict:
-                auditors = Auditor.objects.all()
-                qualified_auditors = [{
-                    'id': a.id, 
-                    'name': a.ime_prezime,
-                    'email': a.email,
-                    'category': a.get_kategorija_display()
-                } for a in auditors]
-                return JsonResponse({'success': True, 'data': qualified_auditors})
-            
-            # Pronalazimo auditore koji su kvalifikovani za SVE standarde
-            all_auditors = set()
-            for standard_id, auditors in qualified_auditors_dict.items():
-                # Za prvi standard, dodajemo sve auditore
-                if len(all_auditors) == 0:
-                    all_auditors = set(auditors)
-                # Za ostale standarde, zadržavamo samo one koji su u preseku
-                else:
-                    all_auditors = all_auditors.intersection(set(auditors))
-            
-            # Formatiramo rezultat za JSON odgovor
-            qualified_auditors = [{
-                'id': a.id, 
-                'name': a.ime_prezime,
-                'email': a.email,
-                'category': a.get_kategorija_display()
-            } for a in all_auditors]
+        # Ako je prosleđen company_id, auditori moraju imati sve standarde kompanije
+        else:
+            standards = CompanyStandard.objects.filter(company_id=company_id)
         
-        return JsonResponse({'success': True, 'data': qualified_auditors})
+        standard_ids = {sid async for sid in standards.values_list('standard_definition_id', flat=True)}
+        return JsonResponse({'success': True, 'data': await _qualified_auditors(standard_ids)})
     except Exception as e:
         logger.exception("Greška u get_qualified_auditors: %s", e)
         return JsonResponse({'success': False, 'message': 'Desila se greška na serveru. Pokušajte ponovo.'}, status=400)
@@ -650,3 +605,39 @@ def get_auditor_details(request, pk):
         return JsonResponse({'success': True, 'data': data})
     except Exception as e:
         return JsonResponse({'success': False, 'message': str(e)}, status=400)
+
+
+class AuditorAvailabilityView(LoginRequiredMixin, TemplateView):
+    """Matrica dostupnosti auditora (auditor × dan); podaci se učitavaju iz auditor_availability_json"""
+    template_name = 'auditor/auditor_availability.html'
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        today = timezone.now().date()
+        context['title'] = 'Dostupnost auditora'
+        context['date_from'] = parse_date(self.request.GET.get('date_from')) or today
+        context['date_to'] = parse_date(self.request.GET.get('date_to')) or today + timedelta(days=59)
+        context['categories'] = Auditor.AUDITOR_CATEGORY_CHOICES
+        context['standards'] = reference_data.standards(active=True)
+        return context
+
+
+@login_required
+@require_GET
+def auditor_availability_json(request):
+    """
+    Matrica dostupnosti auditora za period ?date_from=YYYY-MM-DD&date_to=YYYY-MM-DD
+    (isti filteri kao lista auditora: search, category, standard, iaf_code).
+    """
+    date_from = parse_date(request.GET.get('date_from'))
+    date_to = parse_date(request.GET.get('date_to'))
+    if not date_from or not date_to:
+        return JsonResponse({'success': False, 'error': 'Parametri date_from i date_to su obavezni (YYYY-MM-DD).'}, status=400)
+    if date_to < date_from:
+        return JsonResponse({'success': False, 'error': 'date_to ne može biti pre date_from.'}, status=400)
+    if (date_to - date_from).days + 1 > MAX_RANGE_DAYS:
+        return JsonResponse({'success': False, 'error': f'Period može biti najviše {MAX_RANGE_DAYS} dana.'}, status=400)
+
+    auditors = filter_auditors(Auditor.objects.order_by('ime_prezime'), request.GET)
+    data = availability_matrix(auditors, date_from, date_to)
+    return JsonResponse({'success': True, **data})
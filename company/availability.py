@@ -0,0 +1,80 @@
+"""
+Matrica dostupnosti auditora (auditor × dan) za proizvoljan period.
+
+Zauzetosti se čitaju preko BookingIndex-a (jedan UNION upit nad rezervacijama,
+Srbija Tim posetama i danima poseta), auditori drugim upitom - ukupno dva upita
+bez obzira na broj auditora i dana.
+
+Kodiranje po auditoru je run-length: navode se samo zauzeti nizovi uzastopnih
+dana sa istim stanjem i istim auditom/posetom, slobodni dani se podrazumevaju:
+
+    [pomeraj_od_date_from, broj_dana, stanje, id]
+
+stanje: 'A' audit (id = CycleAudit), 'S' Srbija Tim (id = SrbijaTim),
+        'X' više zauzetosti istog dana (id = None)
+"""
+from datetime import timedelta
+
+from .conflict_service import BookingIndex
+
+STATE_AUDIT = 'A'
+STATE_SRBIJA_TIM = 'S'
+STATE_MULTIPLE = 'X'
+
+# Najduži dozvoljeni period (u danima) za jedan zahtev
+MAX_RANGE_DAYS = 366
+
+
+def _day_state(bookings):
+    if len(bookings) > 1:
+        # Isti audit ili ista poseta kroz više izvora nije dvostruka zauzetost
+        refs = {(b.kind, b.audit_id if not b.is_srbija_tim else b.visit_id) for b in bookings}
+        if len(refs) > 1:
+            return STATE_MULTIPLE, None
+    booking = bookings[0]
+    if booking.is_srbija_tim:
+        return STATE_SRBIJA_TIM, booking.visit_id
+    return STATE_AUDIT, booking.audit_id
+
+
+def encode_runs(index, auditor_id, date_from, days):
+    """Run-length niz zauzetosti jednog auditora"""
+    runs = []
+    bookings = index.bookings_between(auditor_id, date_from, date_from + timedelta(days=days - 1))
+    for booking_date in sorted({b.date for b in bookings}):
+        offset = (booking_date - date_from).days
+        state, ref = _day_state(index.bookings_on(auditor_id, booking_date))
+        last = runs[-1] if runs else None
+        if last and last[0] + last[1] == offset and last[2] == state and last[3] == ref:
+            last[1] += 1
+        else:
+            runs.append([offset, 1, state, ref])
+    return runs
+
+
+def availability_matrix(auditors, date_from, date_to):
+    """
+    Matrica dostupnosti za dati queryset auditora i period [date_from, date_to].
+    Vraća dict spreman za JSON odgovor.
+    """
+    days = (date_to - date_from).days + 1
+    auditors = list(auditors.values('id', 'ime_prezime', 'kategorija'))
+    index = BookingIndex.load([a['id'] for a in auditors], date_from, date_to)
+
+    rows = []
+    for auditor in auditors:
+        runs = encode_runs(index, auditor['id'], date_from, days)
+        rows.append({
+            'id': auditor['id'],
+            'name': auditor['ime_prezime'],
+            'category': auditor['kategorija'],
+            'busy_days': sum(run[1] for run in runs),
+            'runs': runs,
+        })
+
+    return {
+        'date_from': date_from.isoformat(),
+        'date_to': date_to.isoformat(),
+        'days': days,
+        'auditors': rows,
+    }
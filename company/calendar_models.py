@@ -170,3 +170,44 @@ class Appointment(models.Model):
                 'location': self.location or 'Online' if self.is_online else 'N/A',
             }
         }
+
+
+class CalendarChange(models.Model):
+    """
+    Dnevnik promena kalendara za žive izmene (SSE, vidi company/live_updates.py).
+    Jedan red = jedan objekat čiji su događaji promenjeni; klijent po id-u reda
+    zna dokle je stigao i dohvata samo događaje promenjenih objekata.
+    """
+    FEED_CALENDAR = 'calendar'
+    FEED_SRBIJA_TIM = 'srbija_tim'
+
+    FEED_CHOICES = [
+        (FEED_CALENDAR, _('Kalendar audita')),
+        (FEED_SRBIJA_TIM, _('Srbija Tim kalendar')),
+    ]
+
+    KIND_AUDIT = 'audit'
+    KIND_APPOINTMENT = 'appointment'
+    KIND_VISIT = 'visit'
+
+    KIND_CHOICES = [
+        (KIND_AUDIT, _('Audit')),
+        (KIND_APPOINTMENT, _('Termin')),
+        (KIND_VISIT, _('Srbija Tim poseta')),
+    ]
+
+    feed = models.CharField(_("Kalendar"), max_length=20, choices=FEED_CHOICES)
+    kind = models.CharField(_("Vrsta objekta"), max_length=20, choices=KIND_CHOICES)
+    object_id = models.PositiveIntegerField(_("ID objekta"))
+    created_at = models.DateTimeField(_("Vreme promene"), default=timezone.now, db_index=True)
+
+    class Meta:
+        verbose_name = _("Promena kalendara")
+        verbose_name_plural = _("Promene kalendara")
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['feed', 'id'], name='calendar_change_feed_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.feed}:{self.kind}:{self.object_id}"
@@ -97,6 +97,20 @@ class Company(models.Model):
     # Notes
     notes = models.TextField(_("Napomene"), blank=True, null=True)
     
+    # Pregled (company/company_summary.py) - održavaju ga signali, ne menja se kroz forme
+    next_audit_date = models.DateField(_("Sledeći audit"), null=True, blank=True, editable=False, db_index=True)
+    next_audit_type = models.CharField(_("Tip sledećeg audita"), max_length=20, blank=True, default='', editable=False)
+    active_cycle = models.ForeignKey(
+        'company.CertificationCycle',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        editable=False,
+        related_name='+',
+        verbose_name=_("Aktivni ciklus")
+    )
+    nearest_expiry = models.DateField(_("Najbliži istek sertifikata"), null=True, blank=True, editable=False, db_index=True)
+
     # System fields
     is_active = models.BooleanField(_("Aktivna"), default=True)
     created_at = models.DateTimeField(_("Kreirano"), default=timezone.now)
@@ -116,6 +130,11 @@ class Company(models.Model):
             return ""
         return f"{self.street} {self.street_number}, {self.city}"
 
+    @property
+    def next_audit_type_display(self):
+        from .cycle_models import CycleAudit
+        return dict(CycleAudit.AUDIT_TYPE_CHOICES).get(self.next_audit_type, '')
+
     # Returns Bootstrap color class based on certificate status
     def get_status_color(self):
         status_colors = {
@@ -0,0 +1,79 @@
+"""
+Denormalizovani pregled kompanije: sledeći audit, aktivni ciklus i najbliži
+istek sertifikata.
+
+Liste i filteri čitaju ova polja direktno iz tabele kompanija (indeksirane
+kolone), umesto da za svaku kompaniju spajaju cikluse, audite i standarde:
+
+- next_audit_date / next_audit_type: najraniji planirani ili zakazani audit
+  aktivnog ciklusa (i zakasneli - audit koji nije održan ostaje "sledeći");
+  auditi završenih/otkazanih ciklusa se ne računaju
+- active_cycle: najnoviji aktivni ciklus sertifikacije
+- nearest_expiry: najraniji datum isteka standarda kompanije
+
+Vrednosti ne zavise od današnjeg datuma, pa se ne moraju osvežavati svakog
+dana. Signali (company/signals.py) ih preračunavaju jednim UPDATE-om sa
+podupitima kada se promeni audit, ciklus ili standard, u istoj transakciji
+kao i izmena. refresh_company_summaries komanda preračunava sve kompanije.
+"""
+from django.db.models import Min, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from .company_models import Company
+from .cycle_models import CertificationCycle, CycleAudit
+from .standard_models import CompanyStandard
+
+# Statusi audita koji još nisu održani
+OPEN_AUDIT_STATUSES = ('planned', 'scheduled')
+
+
+def summary_values():
+    """Izrazi za UPDATE svih polja pregleda (OuterRef('pk') je kompanija)"""
+    next_audit = (
+        CycleAudit.objects
+        .filter(
+            certification_cycle__company=OuterRef('pk'),
+            certification_cycle__status='active',
+            audit_status__in=OPEN_AUDIT_STATUSES,
+        )
+        .order_by('planned_date', 'pk')
+    )
+    active_cycle = (
+        CertificationCycle.objects
+        .filter(company=OuterRef('pk'), status='active')
+        .order_by('-planirani_datum', '-pk')
+    )
+    nearest_expiry = (
+        CompanyStandard.objects
+        .filter(company=OuterRef('pk'), expiry_date__isnull=False)
+        .order_by()
+        .values('company')
+        .annotate(nearest=Min('expiry_date'))
+        .values('nearest')
+    )
+    return {
+        'next_audit_date': Subquery(next_audit.values('planned_date')[:1]),
+        'next_audit_type': Coalesce(Subquery(next_audit.values('audit_type')[:1]), Value('')),
+        'active_cycle': Subquery(active_cycle.values('pk')[:1]),
+        'nearest_expiry': Subquery(nearest_expiry[:1]),
+    }
+
+
+def refresh(company_ids=None):
+    """Preračunava pregled zadatih kompanija (ili svih) jednim upitom; vraća broj kompanija"""
+    queryset = Company.objects.all()
+    if company_ids is not None:
+        company_ids = {company_id for company_id in company_ids if company_id}
+        if not company_ids:
+            return 0
+        queryset = queryset.filter(pk__in=company_ids)
+    return queryset.update(**summary_values())
+
+
+def refresh_for_cycles(cycle_ids):
+    """Pregled kompanija kojima pripadaju ciklusi (izmena audita)"""
+    cycle_ids = {cycle_id for cycle_id in cycle_ids if cycle_id}
+    if not cycle_ids:
+        return 0
+    companies = CertificationCycle.objects.filter(pk__in=cycle_ids).values('company_id')
+    return Company.objects.filter(pk__in=companies).update(**summary_values())
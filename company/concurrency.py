@@ -0,0 +1,57 @@
+"""
+Optimistička kontrola konkurentnosti za izmene rasporeda (drag & drop).
+
+Modeli koji nasleđuju VersionedModel imaju kolonu "version" koja se povećava
+pri svakom save(). Kalendar šalje verziju koju je prikazao; ako se ona ne
+poklapa sa verzijom u bazi, neko je u međuvremenu izmenio isti događaj i
+izmena se odbija (409 sa svežim stanjem) umesto da tiho pregazi tuđu promenu.
+
+Sama verzija ne sprečava da dva planera istovremeno pomere RAZLIČITE događaje
+na isti dan istog auditora. Zato se provera konflikata i upis rade u jednoj
+transakciji u kojoj su redovi dodeljenih auditora zaključani (lock_auditors),
+pa druga takva izmena čeka da prva završi i vidi njene rezervacije.
+"""
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+
+class VersionedModel(models.Model):
+    version = models.PositiveIntegerField(_('Verzija'), default=1, editable=False)
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, **kwargs):
+        if self.pk and not kwargs.get('force_insert'):
+            self.version = (self.version or 0) + 1
+            if kwargs.get('update_fields') is not None:
+                # auto_now polja (updated_at) Django upisuje samo ako su u update_fields,
+                # a od njih zavise pečati keširanih fragmenata detalja (detail_cache.py)
+                auto_now = {f.name for f in self._meta.concrete_fields if getattr(f, 'auto_now', False)}
+                kwargs['update_fields'] = {*kwargs['update_fields'], 'version', *auto_now}
+        super().save(*args, **kwargs)
+
+
+def is_stale(instance, expected_version):
+    """
+    Da li je klijent video stariju verziju od one u bazi. Klijent koji ne šalje
+    verziju (npr. stari JavaScript u kešu browser-a) se ne proverava.
+    """
+    if expected_version in (None, ''):
+        return False
+    try:
+        return int(expected_version) != instance.version
+    except (TypeError, ValueError):
+        return True
+
+
+def lock_auditors(auditor_ids):
+    """
+    SELECT ... FOR UPDATE nad auditorima do kraja tekuće transakcije.
+    Redosled po id-u je isti u svim zahtevima, pa nema deadlock-a.
+    """
+    from .auditor_models import Auditor
+
+    ids = sorted({auditor_id for auditor_id in auditor_ids if auditor_id})
+    if ids:
+        list(Auditor.objects.select_for_update().filter(id__in=ids).order_by('id').values_list('id', flat=True))
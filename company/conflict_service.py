@@ -0,0 +1,263 @@
+"""
+Jedinstvena provera konflikata u rasporedu auditora.
+
+Auditor je zauzet na datum ako ima:
+- rezervaciju za audit (AuditorReservation), ili
+- Srbija Tim posetu (SrbijaTim.visit_date ili neki od SrbijaTimDay dana).
+
+BookingIndex učitava sve zauzetosti za skup auditora i opseg datuma jednim
+UNION upitom i drži ih kao sortiranu listu datuma po auditoru, pa su provere
+"da li je auditor X slobodan na dan D" i "šta ima u periodu" binarna pretraga
+bez novih upita. Indeks se pravi jednom po zahtevu i koristi za sve provere
+(forma, drag & drop, validacija, Srbija Tim).
+"""
+from bisect import bisect_left, bisect_right, insort
+from collections import defaultdict
+from datetime import timedelta
+
+from django.db.models import CharField, F, IntegerField, Value
+
+from .cycle_models import AuditorReservation, CycleAudit, zaokruzi_na_veci_broj
+from .srbija_tim_models import SrbijaTim, SrbijaTimDay
+
+KIND_AUDIT = 'audit'
+KIND_SRBIJA_TIM = 'srbija_tim'
+
+AUDIT_TYPE_LABELS = dict(CycleAudit.AUDIT_TYPE_CHOICES)
+
+
+class Booking:
+    """Jedna zauzetost auditora na jedan dan"""
+    __slots__ = ('auditor_id', 'date', 'kind', 'audit_id', 'audit_day_id', 'visit_id', 'reservation_id',
+                 'company', 'audit_type')
+
+    def __init__(self, auditor_id, date, kind, audit_id=None, audit_day_id=None, visit_id=None,
+                 reservation_id=None, company=None, audit_type=None):
+        self.auditor_id = auditor_id
+        self.date = date
+        self.kind = kind
+        self.audit_id = audit_id
+        self.audit_day_id = audit_day_id
+        self.visit_id = visit_id
+        self.reservation_id = reservation_id
+        self.company = company or ('Srbija Tim' if kind == KIND_SRBIJA_TIM else 'druga kompanija')
+        self.audit_type = audit_type
+
+    @property
+    def is_srbija_tim(self):
+        return self.kind == KIND_SRBIJA_TIM
+
+    @property
+    def audit_type_display(self):
+        return str(AUDIT_TYPE_LABELS.get(self.audit_type, self.audit_type or ''))
+
+    def describe(self):
+        """Kratak opis za poruke o grešci, npr. '2025-08-15 (audit: Firma - Prvi nadzor)'"""
+        if self.is_srbija_tim:
+            return f"{self.date.isoformat()} (Srbija Tim: {self.company})"
+        return f"{self.date.isoformat()} (audit: {self.company} - {self.audit_type_display})"
+
+    def as_dict(self):
+        return {
+            'type': self.kind,
+            'date': self.date.isoformat(),
+            'company': self.company,
+            'audit_id': self.audit_id,
+            'audit_day_id': self.audit_day_id,
+            'visit_id': self.visit_id,
+            'reservation_id': self.reservation_id,
+        }
+
+    def __repr__(self):
+        return f"<Booking auditor={self.auditor_id} {self.describe()}>"
+
+
+def _booking_columns(**columns):
+    """Isti redosled anotacija u svim delovima UNION upita"""
+    names = ['b_auditor', 'b_date', 'b_kind', 'b_audit', 'b_audit_day', 'b_visit', 'b_reservation',
+             'b_company', 'b_audit_type']
+    return names, {name: columns[name] for name in names}
+
+
+_NULL_INT = Value(None, output_field=IntegerField())
+_NULL_STR = Value(None, output_field=CharField())
+
+
+def load_bookings(auditor_ids, date_from, date_to, exclude_audit_id=None, exclude_visit_id=None):
+    names, reservation_cols = _booking_columns(
+        b_auditor=F('auditor_id'),
+        b_date=F('date'),
+        b_kind=Value(KIND_AUDIT, output_field=CharField()),
+        b_audit=F('audit_id'),
+        b_audit_day=F('audit_day_id'),
+        b_visit=_NULL_INT,
+        b_reservation=F('id'),
+        b_company=F('audit__certification_cycle__company__name'),
+        b_audit_type=F('audit__audit_type'),
+    )
+    reservations = AuditorReservation.objects.filter(
+        auditor_id__in=auditor_ids, date__gte=date_from, date__lte=date_to
+    )
+    if exclude_audit_id:
+        reservations = reservations.exclude(audit_id=exclude_audit_id)
+
+    _, visit_cols = _booking_columns(
+        b_auditor=F('auditor_id'),
+        b_date=F('srbijatim__visit_date'),
+        b_kind=Value(KIND_SRBIJA_TIM, output_field=CharField()),
+        b_audit=_NULL_INT,
+        b_audit_day=_NULL_INT,
+        b_visit=F('srbijatim_id'),
+        b_reservation=_NULL_INT,
+        b_company=F('srbijatim__company__name'),
+        b_audit_type=_NULL_STR,
+    )
+    visits = SrbijaTim.auditors.through.objects.filter(
+        auditor_id__in=auditor_ids,
+        srbijatim__visit_date__gte=date_from,
+        srbijatim__visit_date__lte=date_to,
+    )
+
+    _, day_cols = _booking_columns(
+        b_auditor=F('visit__auditors__id'),
+        b_date=F('date'),
+        b_kind=Value(KIND_SRBIJA_TIM, output_field=CharField()),
+        b_audit=_NULL_INT,
+        b_audit_day=_NULL_INT,
+        b_visit=F('visit_id'),
+        b_reservation=_NULL_INT,
+        b_company=F('visit__company__name'),
+        b_audit_type=_NULL_STR,
+    )
+    visit_days = SrbijaTimDay.objects.filter(
+        visit__auditors__id__in=auditor_ids, date__gte=date_from, date__lte=date_to
+    )
+
+    if exclude_visit_id:
+        visits = visits.exclude(srbijatim_id=exclude_visit_id)
+        visit_days = visit_days.exclude(visit_id=exclude_visit_id)
+
+    query = (
+        reservations.order_by().annotate(**reservation_cols).values_list(*names)
+        .union(
+            visits.order_by().annotate(**visit_cols).values_list(*names),
+            visit_days.order_by().annotate(**day_cols).values_list(*names),
+        )
+    )
+
+    seen = set()
+    for row in query:
+        booking = Booking(*row)
+        # Prvi dan posete postoji i kao visit_date i kao SrbijaTimDay - broji se jednom
+        key = (booking.auditor_id, booking.date, booking.kind, booking.audit_id, booking.visit_id)
+        if key in seen:
+            continue
+        seen.add(key)
+        yield booking
+
+
+class BookingIndex:
+    """Indeks zauzetosti: za svakog auditora sortirana lista datuma sa pripadajućim zauzetostima"""
+
+    def __init__(self, bookings=()):
+        by_auditor = defaultdict(lambda: defaultdict(list))
+        for booking in bookings:
+            by_auditor[booking.auditor_id][booking.date].append(booking)
+
+        self._dates = {}
+        self._bookings = {}
+        for auditor_id, by_date in by_auditor.items():
+            self._dates[auditor_id] = sorted(by_date)
+            self._bookings[auditor_id] = dict(by_date)
+
+    @classmethod
+    def load(cls, auditor_ids, date_from, date_to, exclude_audit_id=None, exclude_visit_id=None):
+        auditor_ids = [a for a in set(auditor_ids) if a]
+        if not auditor_ids or not date_from or not date_to:
+            return cls()
+        return cls(load_bookings(auditor_ids, date_from, date_to, exclude_audit_id, exclude_visit_id))
+
+    @classmethod
+    def for_dates(cls, auditor_ids, dates, exclude_audit_id=None, exclude_visit_id=None):
+        dates = list(dates)
+        if not dates:
+            return cls()
+        return cls.load(auditor_ids, min(dates), max(dates), exclude_audit_id, exclude_visit_id)
+
+    def auditor_ids(self):
+        return list(self._dates)
+
+    def add(self, booking):
+        """Dodaje zauzetost u indeks (npr. predlog rasporeda koji još nije snimljen)"""
+        by_date = self._bookings.setdefault(booking.auditor_id, {})
+        if booking.date not in by_date:
+            insort(self._dates.setdefault(booking.auditor_id, []), booking.date)
+            by_date[booking.date] = []
+        by_date[booking.date].append(booking)
+
+    def bookings_on(self, auditor_id, day):
+        return list(self._bookings.get(auditor_id, {}).get(day, ()))
+
+    def bookings_between(self, auditor_id, date_from, date_to):
+        """Sve zauzetosti auditora u opsegu [date_from, date_to], sortirano po datumu"""
+        dates = self._dates.get(auditor_id)
+        if not dates:
+            return []
+        by_date = self._bookings[auditor_id]
+        start = bisect_left(dates, date_from)
+        end = bisect_right(dates, date_to)
+        return [b for d in dates[start:end] for b in by_date[d]]
+
+    def is_free(self, auditor_id, day):
+        return day not in self._bookings.get(auditor_id, {})
+
+    def conflicts(self, auditor_ids, dates):
+        """{auditor_id: [Booking, ...]} za sve auditore koji su zauzeti na neki od datuma"""
+        dates = sorted(set(dates))
+        result = {}
+        for auditor_id in auditor_ids:
+            found = [b for d in dates for b in self.bookings_on(auditor_id, d)]
+            if found:
+                result[auditor_id] = found
+        return result
+
+
+def find_conflicts(auditor_ids, dates, exclude_audit_id=None, exclude_visit_id=None):
+    """
+    Koji od auditora su zauzeti na neki od datuma i čime.
+    Vraća {auditor_id: [Booking, ...]}; prazan dict znači da nema konflikata.
+    """
+    dates = list(dates)
+    index = BookingIndex.for_dates(auditor_ids, dates, exclude_audit_id, exclude_visit_id)
+    return index.conflicts(auditor_ids, dates)
+
+
+def describe_conflicts(conflicts_by_auditor, auditors):
+    """Poruke po auditoru: 'Ime Prezime je već zauzet: 2025-08-15 (audit: ...), ...'"""
+    names = {a.id: a.ime_prezime for a in auditors}
+    return [
+        f"{names.get(auditor_id, auditor_id)} je već zauzet: " + ', '.join(b.describe() for b in bookings)
+        for auditor_id, bookings in conflicts_by_auditor.items()
+    ]
+
+
+def audit_days_count(cycle, audit_type):
+    """Broj dana audita prema tipu i podešavanjima ciklusa (kao u CycleAudit.create_audit_days)"""
+    if audit_type == 'initial' and cycle.inicijalni_broj_dana:
+        return zaokruzi_na_veci_broj(cycle.inicijalni_broj_dana)
+    if audit_type in ('surveillance_1', 'surveillance_2') and cycle.broj_dana_nadzora:
+        return zaokruzi_na_veci_broj(cycle.broj_dana_nadzora)
+    if audit_type == 'recertification' and cycle.broj_dana_resertifikacije:
+        return zaokruzi_na_veci_broj(cycle.broj_dana_resertifikacije)
+    return 1
+
+
+def audit_dates(cycle, audit_type, base_date):
+    """Datumi audita - računaju se unazad od osnovnog datuma (stvarni ili planirani)"""
+    return [base_date - timedelta(days=i) for i in range(audit_days_count(cycle, audit_type))]
+
+
+def visit_dates(visit_date, broj_dana_posete=None):
+    """Datumi Srbija Tim posete - unapred od datuma posete (kao u SrbijaTim.create_visit_days)"""
+    days = int(broj_dana_posete) if broj_dana_posete and broj_dana_posete >= 1 else 1
+    return [visit_date + timedelta(days=i) for i in range(days)]
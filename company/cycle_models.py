@@ -22,6 +22,7 @@ def zaokruzi_na_veci_broj(vrednost):
 from .company_models import Company
 from .standard_models import StandardDefinition, CompanyStandard
 from .auditor_models import Auditor
+from .concurrency import VersionedModel
 
 
 class CertificationCycle(models.Model):
@@ -143,7 +144,7 @@ class CertificationCycle(models.Model):
         if integrated_count >= 2:
             if not self.is_integrated_system:
                 self.is_integrated_system = True
-                self.save(update_fields=['is_integrated_system'])
+                self.save(update_fields=['is_integrated_system', 'updated_at'])
             return True
         return False
     
@@ -227,7 +228,7 @@ class CertificationCycle(models.Model):
         self.notes = f"{self.notes or ''}\nCiklus završen nakon resertifikacije {new_start_date.strftime('%Y-%m-%d')}."
         
         # Sačuvamo promene u trenutnom ciklusu
-        self.save(update_fields=['status', 'notes'])
+        self.save(update_fields=['status', 'notes', 'updated_at'])
         logger.info(f"Ciklus {self.id} označen kao završen")
         
         # Ako već postoji ciklus sa istim početnim datumom za istu kompaniju, koristimo njega (idempotentnost)
@@ -403,7 +404,7 @@ class CycleStandard(models.Model):
         self.certification_cycle.detect_integrated_system()
 
 
-class AuditDay(models.Model):
+class AuditDay(VersionedModel):
     """Model za praćenje pojedinačnih dana audita."""
     audit = models.ForeignKey(
         'CycleAudit',  # Koristimo string jer je CycleAudit definisan kasnije
@@ -472,7 +473,7 @@ class AuditorReservation(models.Model):
         return f"{self.auditor} - {self.date.strftime('%Y-%m-%d')} ({self.audit})"
 
 
-class CycleAudit(models.Model):
+class CycleAudit(VersionedModel):
     """Model za praćenje pojedinačnih audita u okviru ciklusa sertifikacije."""
     AUDIT_TYPE_CHOICES = [
         ('initial', _('Inicijalni')),
@@ -699,7 +700,7 @@ class CycleAudit(models.Model):
                 if prev_cycle_actual != self.actual_date:
                     cycle.datum_sprovodjenja_inicijalne = self.actual_date
                     # Snimamo ciklus da bismo aktivirali ensure_first_surveillance_scheduled preko save()
-                    cycle.save(update_fields=['datum_sprovodjenja_inicijalne'])
+                    cycle.save(update_fields=['datum_sprovodjenja_inicijalne', 'updated_at'])
                 else:
                     # Ako je već postavljen isti datum, ipak osiguramo zakazivanje
                     cycle.ensure_first_surveillance_scheduled()
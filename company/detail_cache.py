@@ -0,0 +1,94 @@
+"""
+Keširanje fragmenata stranica detalja kompanije i ciklusa sertifikacije.
+
+Svaka sekcija stranice (kontakti, standardi, ciklusi, auditi...) se renderuje
+unutar {% cache %} taga čiji ključ sadrži "pečat" sekcije: najnoviji updated_at
+njenih redova (i redova na koje upućuju, npr. definicije standarda ili
+auditora) i broj redova. Pečati se računaju kao podupiti u istom upitu kojim
+view čita kompaniju/ciklus, pa strana sa keširanim sekcijama ne izvršava
+nijedan dodatni upit za njih.
+
+Izmena, dodavanje ili brisanje reda menja pečat, pa se sekcija renderuje
+iznova. Ključ zavisi samo od stanja baze, tako da je tačan u svim worker
+procesima i bez deljenog keša. Izmene koje ne menjaju updated_at (tim
+auditora, m2m) dodiruju updated_at audita iz signala (company/signals.py).
+
+    queryset = with_stamps(Company.objects.all(), COMPANY_SECTIONS)
+    company = queryset.get(pk=pk)
+    stamps(company, COMPANY_SECTIONS)  # {'contacts': '2025-06-01 10:00:00.123|3', ...}
+"""
+from django.db.models import CharField, Count, Max, OuterRef, Subquery, Value
+from django.db.models.functions import Cast, Coalesce, Concat
+
+from .calendar_models import Appointment
+from .company_models import KontaktOsoba, OstalaLokacija
+from .cycle_models import CertificationCycle, CycleAudit, CycleStandard
+from .iaf_models import CompanyIAFEACCode
+from .standard_models import CompanyStandard
+
+
+class Stamp:
+    """Pečat redova modela vezanih za spoljni objekat preko `lookup`"""
+
+    def __init__(self, model, lookup, *timestamps):
+        self.model = model
+        self.lookup = lookup
+        self.timestamps = timestamps
+
+    def expression(self):
+        parts = [Cast(Max(field), CharField()) for field in self.timestamps]
+        parts.append(Cast(Count('pk'), CharField()))
+        joined = parts[:1]
+        for part in parts[1:]:
+            joined += [Value('|'), part]
+        rows = (
+            self.model.objects
+            .filter(**{self.lookup: OuterRef('pk')})
+            .order_by()
+            .values(self.lookup)
+            .annotate(stamp=Concat(*joined, output_field=CharField()))
+            .values('stamp')
+        )
+        return Coalesce(Subquery(rows[:1]), Value(''), output_field=CharField())
+
+
+COMPANY_SECTIONS = {
+    'contacts': [Stamp(KontaktOsoba, 'company', 'updated_at')],
+    'standards': [Stamp(CompanyStandard, 'company', 'updated_at', 'standard_definition__updated_at')],
+    'iaf_eac_codes': [Stamp(CompanyIAFEACCode, 'company', 'updated_at', 'iaf_eac_code__updated_at')],
+    'locations': [Stamp(OstalaLokacija, 'company', 'updated_at')],
+    'cycles': [
+        Stamp(CertificationCycle, 'company', 'updated_at'),
+        Stamp(CycleStandard, 'certification_cycle__company', 'updated_at', 'standard_definition__updated_at'),
+        Stamp(CycleAudit, 'certification_cycle__company', 'updated_at'),
+    ],
+    'appointments': [Stamp(Appointment, 'company', 'updated_at')],
+}
+
+CYCLE_SECTIONS = {
+    'standards': [Stamp(CycleStandard, 'certification_cycle', 'updated_at', 'standard_definition__updated_at')],
+    'audits': [
+        Stamp(CycleAudit, 'certification_cycle', 'updated_at', 'lead_auditor__updated_at', 'audit_team__updated_at'),
+    ],
+}
+
+
+def _annotation(section, index):
+    return f'stamp_{section}_{index}'
+
+
+def with_stamps(queryset, sections):
+    """Dodaje pečate svih sekcija kao anotacije (podupiti u istom upitu)"""
+    return queryset.annotate(**{
+        _annotation(section, index): part.expression()
+        for section, parts in sections.items()
+        for index, part in enumerate(parts)
+    })
+
+
+def stamps(obj, sections):
+    """Pečat po sekciji za objekat pročitan preko with_stamps"""
+    return {
+        section: '/'.join(getattr(obj, _annotation(section, index)) for index in range(len(parts)))
+        for section, parts in sections.items()
+    }
@@ -0,0 +1,249 @@
+"""
+Izvoz lista (kompanije, ciklusi, auditi, dani audita, auditori, Srbija Tim) u CSV i XLSX.
+
+Redovi se čitaju sa queryset.iterator(chunk_size=...) i odmah upisuju u odgovor,
+tako da potrošnja memorije ne raste sa brojem redova:
+- CSV se šalje kroz StreamingHttpResponse red po red;
+- XLSX se piše openpyxl write-only workbook-om u privremeni fajl koji se
+  zatim šalje u delovima kroz FileResponse.
+
+Filteri su isti kao na list view-ovima (vidi list_filters.py).
+"""
+import csv
+import logging
+import tempfile
+from datetime import date
+
+from django.contrib.auth.decorators import login_required
+from django.http import FileResponse, Http404, StreamingHttpResponse
+from django.views.decorators.http import require_GET
+
+from .auditor_models import Auditor
+from .company_models import Company
+from .cycle_models import AuditDay, CertificationCycle, CycleAudit
+from .list_filters import (filter_audit_days, filter_auditors, filter_companies, filter_cycle_audits, filter_cycles,
+                           filter_srbija_tim, sort_companies)
+from .srbija_tim_models import SrbijaTim
+
+logger = logging.getLogger(__name__)
+
+# Broj redova koji se odjednom čitaju iz baze
+EXPORT_CHUNK_SIZE = 2000
+
+XLSX_CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
+
+class Echo:
+    """Pseudo-bafer za csv.writer - umesto upisivanja samo vraća vrednost"""
+
+    def write(self, value):
+        return value
+
+
+def _choice_labels(choices):
+    return {key: str(label) for key, label in choices}
+
+
+def _companies(params):
+    headers = ['ID', 'Naziv', 'PIB', 'MB', 'Ulica', 'Broj', 'Grad', 'Poštanski broj', 'Telefon', 'Email',
+               'Status sertifikata', 'Broj sertifikata', 'Aktivna']
+    statuses = _choice_labels(Company.CERTIFICATE_STATUS_CHOICES)
+    queryset = sort_companies(filter_companies(Company.objects.all(), params), params).values_list(
+        'id', 'name', 'pib', 'mb', 'street', 'street_number', 'city', 'postal_code', 'phone', 'email',
+        'certificate_status', 'certificate_number', 'is_active'
+    )
+
+    def rows():
+        for row in queryset.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+            row = list(row)
+            row[10] = statuses.get(row[10], row[10])
+            row[12] = 'Da' if row[12] else 'Ne'
+            yield row
+
+    return headers, rows()
+
+
+def _cycles(params):
+    headers = ['ID', 'Kompanija', 'Planirani datum', 'Datum sprovođenja inicijalne', 'Status', 'Integrisani sistem',
+               'Broj dana inicijalne', 'Broj dana nadzora', 'Broj dana resertifikacije']
+    statuses = _choice_labels(CertificationCycle.CYCLE_STATUS_CHOICES)
+    queryset = filter_cycles(CertificationCycle.objects.all(), params).order_by('company__name', 'planirani_datum').values_list(
+        'id', 'company__name', 'planirani_datum', 'datum_sprovodjenja_inicijalne', 'status', 'is_integrated_system',
+        'inicijalni_broj_dana', 'broj_dana_nadzora', 'broj_dana_resertifikacije'
+    )
+
+    def rows():
+        for row in queryset.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+            row = list(row)
+            row[4] = statuses.get(row[4], row[4])
+            row[5] = 'Da' if row[5] else 'Ne'
+            yield row
+
+    return headers, rows()
+
+
+def _audits(params):
+    headers = ['ID', 'Kompanija', 'Ciklus', 'Tip audita', 'Status', 'Planirani datum', 'Stvarni datum',
+               'Vodeći auditor', 'Tim', 'Broj izveštaja', 'Poslat izveštaj']
+    types = _choice_labels(CycleAudit.AUDIT_TYPE_CHOICES)
+    statuses = _choice_labels(CycleAudit.AUDIT_STATUS_CHOICES)
+    queryset = (
+        filter_cycle_audits(CycleAudit.objects.all(), params)
+        .select_related('certification_cycle__company', 'lead_auditor')
+        .prefetch_related('audit_team')
+        .order_by('planned_date', 'id')
+    )
+
+    def rows():
+        for audit in queryset.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+            yield [
+                audit.id,
+                audit.certification_cycle.company.name,
+                audit.certification_cycle_id,
+                types.get(audit.audit_type, audit.audit_type),
+                statuses.get(audit.audit_status, audit.audit_status),
+                audit.planned_date,
+                audit.actual_date,
+                audit.lead_auditor.ime_prezime if audit.lead_auditor else '',
+                ', '.join(a.ime_prezime for a in audit.audit_team.all()),
+                audit.report_number or '',
+                'Da' if audit.poslat_izvestaj else 'Ne',
+            ]
+
+    return headers, rows()
+
+
+def _audit_days(params):
+    headers = ['ID', 'Datum', 'Kompanija', 'Audit', 'Tip audita', 'Status audita', 'Planirano', 'Stvarno', 'Napomene']
+    types = _choice_labels(CycleAudit.AUDIT_TYPE_CHOICES)
+    statuses = _choice_labels(CycleAudit.AUDIT_STATUS_CHOICES)
+    queryset = filter_audit_days(AuditDay.objects.all(), params).order_by('date', 'id').values_list(
+        'id', 'date', 'audit__certification_cycle__company__name', 'audit_id', 'audit__audit_type',
+        'audit__audit_status', 'is_planned', 'is_actual', 'notes'
+    )
+
+    def rows():
+        for row in queryset.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+            row = list(row)
+            row[4] = types.get(row[4], row[4])
+            row[5] = statuses.get(row[5], row[5])
+            row[6] = 'Da' if row[6] else 'Ne'
+            row[7] = 'Da' if row[7] else 'Ne'
+            row[8] = row[8] or ''
+            yield row
+
+    return headers, rows()
+
+
+def _auditors(params):
+    headers = ['ID', 'Ime i prezime', 'Email', 'Telefon', 'Kategorija', 'Standardi']
+    categories = _choice_labels(Auditor.AUDITOR_CATEGORY_CHOICES)
+    queryset = (
+        filter_auditors(Auditor.objects.all(), params)
+        .prefetch_related('auditor_standardi__standard')
+        .order_by('ime_prezime')
+    )
+
+    def rows():
+        for auditor in queryset.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+            yield [
+                auditor.id,
+                auditor.ime_prezime,
+                auditor.email,
+                auditor.telefon,
+                categories.get(auditor.kategorija, auditor.kategorija),
+                ', '.join(s.standard.code for s in auditor.auditor_standardi.all()),
+            ]
+
+    return headers, rows()
+
+
+def _srbija_tim(params):
+    headers = ['ID', 'Kompanija', 'Broj sertifikata', 'Standardi', 'Auditori', 'Datum posete', 'Vreme',
+               'Broj dana', 'Status', 'Izveštaj poslat', 'Datum isteka sertifikata']
+    statuses = _choice_labels(SrbijaTim.VisitStatus.choices)
+    queryset = (
+        filter_srbija_tim(SrbijaTim.objects.all(), params)
+        .select_related('company')
+        .prefetch_related('standards', 'auditors')
+        .order_by('visit_date', 'visit_time', 'id')
+    )
+
+    def rows():
+        for visit in queryset.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+            yield [
+                visit.id,
+                visit.company.name,
+                visit.certificate_number,
+                ', '.join(s.code for s in visit.standards.all()),
+                ', '.join(a.ime_prezime for a in visit.auditors.all()),
+                visit.visit_date,
+                visit.visit_time,
+                visit.broj_dana_posete,
+                statuses.get(visit.status, visit.status),
+                'Da' if visit.report_sent else 'Ne',
+                visit.certificate_expiry_date,
+            ]
+
+    return headers, rows()
+
+
+EXPORT_DATASETS = {
+    'companies': _companies,
+    'cycles': _cycles,
+    'audits': _audits,
+    'audit-days': _audit_days,
+    'auditors': _auditors,
+    'srbija-tim': _srbija_tim,
+}
+
+
+def _csv_response(filename, headers, rows):
+    writer = csv.writer(Echo())
+
+    def stream():
+        # BOM da bi Excel ispravno prepoznao UTF-8 (č, ć, š, ž, đ)
+        yield '\ufeff'
+        yield writer.writerow(headers)
+        for row in rows:
+            yield writer.writerow(row)
+
+    response = StreamingHttpResponse(stream(), content_type='text/csv; charset=utf-8')
+    response['Content-Disposition'] = f'attachment; filename="{filename}.csv"'
+    return response
+
+
+def _xlsx_response(filename, headers, rows):
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet(title=filename[:31])
+    sheet.append(headers)
+    for row in rows:
+        sheet.append(row)
+
+    # Write-only workbook se ne drži u memoriji; fajl se briše kada se odgovor zatvori
+    tmp = tempfile.TemporaryFile(suffix='.xlsx')
+    workbook.save(tmp)
+    tmp.seek(0)
+    return FileResponse(tmp, as_attachment=True, filename=f'{filename}.xlsx', content_type=XLSX_CONTENT_TYPE)
+
+
+@login_required
+@require_GET
+def export_list(request, dataset, fmt):
+    """
+    Izvoz liste u CSV ili XLSX formatu, sa istim GET filterima kao lista:
+    /export/<dataset>/<csv|xlsx>/?search=...&expiry_from=...&audit_to=...
+    """
+    builder = EXPORT_DATASETS.get(dataset)
+    if builder is None or fmt not in ('csv', 'xlsx'):
+        raise Http404('Nepoznat izvoz')
+
+    headers, rows = builder(request.GET)
+    filename = f'{dataset}-{date.today().isoformat()}'
+    logger.info(f"Izvoz {dataset} ({fmt}) pokrenuo korisnik {request.user}")
+
+    if fmt == 'xlsx':
+        return _xlsx_response(filename, headers, rows)
+    return _csv_response(filename, headers, rows)
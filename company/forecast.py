@@ -0,0 +1,228 @@
+"""
+Prognoza potražnje za auditima i poređenje sa kapacitetom auditora.
+
+Za sve aktivne cikluse projektuje nadzore i resertifikacije mesec po mesec
+za narednih FORECAST_MONTHS meseci, po istim formulama kao CycleAudit.save,
+ensure_first_surveillance_scheduled i extend_with_new_audits:
+
+    sledeći audit = prethodni audit (stvarni, inače planirani datum) + 365 - broj dana sledećeg audita
+
+gde je broj dana broj_dana_nadzora (prvi/drugi nadzor) ili broj_dana_resertifikacije
+(resertifikacija) zaokružen naviše; posle resertifikacije lanac se nastavlja
+prvim nadzorom novog ciklusa. Otvoreni (nezavršeni) auditi koji već postoje
+ulaze u potražnju sa svojim datumom.
+
+Računa se vektorski (numpy) nad svim ciklusima odjednom - petlja ide samo po
+koracima lanca (najviše PROJECTION_STEPS), ne po ciklusima.
+
+Kapacitet po standardu = broj auditora sa tim standardom × radni dani u mesecu
+× FORECAST_CAPACITY_SHARE (deo radnog vremena koji realno ide na audite).
+"""
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count
+from django.utils import timezone
+
+from isoqar_app import metrics
+
+from . import analytics
+from .auditor_models import Auditor, AuditorStandard
+from .cycle_models import CertificationCycle, CycleAudit, CycleStandard
+
+FORECAST_MONTHS = 36
+
+# Koliko koraka lanca se projektuje od poslednjeg poznatog audita (3 godine + rezerva)
+PROJECTION_STEPS = 5
+
+STAGE_INITIAL = 0
+STAGE_SURVEILLANCE_1 = 1
+STAGE_SURVEILLANCE_2 = 2
+STAGE_RECERTIFICATION = 3
+
+STAGES = {
+    'initial': STAGE_INITIAL,
+    'surveillance_1': STAGE_SURVEILLANCE_1,
+    'surveillance_2': STAGE_SURVEILLANCE_2,
+    'recertification': STAGE_RECERTIFICATION,
+}
+FORECAST_TYPES = ['surveillance_1', 'surveillance_2', 'recertification']
+
+CLOSED_STATUSES = ('completed', 'cancelled')
+
+
+def _ceil_days(values):
+    """Broj dana zaokružen naviše (kao zaokruzi_na_veci_broj); None -> 0"""
+    return np.ceil(np.array([float(v) if v else 0.0 for v in values], dtype=float)).astype(int)
+
+
+def _month_index(dates, start_month):
+    """Redni broj meseca (0 = start_month) za niz datetime64[D]"""
+    return (dates.astype('datetime64[M]') - start_month).astype(int)
+
+
+def _load_cycles():
+    cycles = list(
+        CertificationCycle.objects.filter(status='active')
+        .values_list('id', 'planirani_datum', 'datum_sprovodjenja_inicijalne', 'broj_dana_nadzora', 'broj_dana_resertifikacije')
+    )
+    audits = list(
+        CycleAudit.objects.filter(certification_cycle__status='active', audit_type__in=list(STAGES))
+        .values_list('certification_cycle_id', 'audit_type', 'planned_date', 'actual_date', 'audit_status')
+    )
+    standards = list(
+        CycleStandard.objects.filter(certification_cycle__status='active')
+        .values_list('certification_cycle_id', 'standard_definition_id', 'standard_definition__code')
+    )
+    return cycles, audits, standards
+
+
+def _capacity_by_standard():
+    """Broj kvalifikovanih auditora po standardu i ukupan broj auditora (tehnički eksperti ne vode audite)"""
+    rows = (
+        AuditorStandard.objects.exclude(auditor__kategorija=Auditor.CATEGORY_TECHNICAL_EXPERT)
+        .values('standard_id', 'standard__code')
+        .annotate(auditors=Count('auditor_id', distinct=True))
+        .order_by()
+    )
+    total = Auditor.objects.exclude(kategorija=Auditor.CATEGORY_TECHNICAL_EXPERT).count()
+    return {row['standard_id']: (row['standard__code'], row['auditors']) for row in rows}, total
+
+
+def compute_forecast(start=None, months=FORECAST_MONTHS):
+    """Prognoza od meseca datuma start (podrazumevano danas) za narednih months meseci"""
+    start = start or timezone.now().date()
+    start_month = np.datetime64(start, 'M')
+    month_starts = start_month + np.arange(months + 1)
+    horizon_end = month_starts[-1].astype('datetime64[D]')  # prvi dan posle horizonta
+
+    cycles, audits, cycle_standards = _load_cycles()
+    capacity, total_auditors = _capacity_by_standard()
+
+    n = len(cycles)
+    today = np.datetime64(start, 'D')
+    cycle_pos = {row[0]: i for i, row in enumerate(cycles)}
+    nadzor_days = _ceil_days([row[3] for row in cycles])
+    resert_days = _ceil_days([row[4] for row in cycles])
+
+    # Sidro lanca: audit najvišeg stepena u ciklusu; bez audita - inicijalna provera ciklusa
+    anchor_stage = np.full(n, STAGE_INITIAL)
+    anchor_date = np.array([row[2] or row[1] for row in cycles], dtype='datetime64[D]')
+
+    event_cycle, event_stage, event_date = [], [], []
+    if audits:
+        a_cycle = np.array([cycle_pos[row[0]] for row in audits])
+        a_stage = np.array([STAGES[row[1]] for row in audits])
+        a_date = np.array([row[3] or row[2] for row in audits], dtype='datetime64[D]')
+        a_open = np.array([row[4] not in CLOSED_STATUSES for row in audits])
+
+        # Poslednji red po ciklusu posle sortiranja po (ciklus, stepen, datum) je sidro
+        order = np.lexsort((a_date, a_stage, a_cycle))
+        last = order[np.r_[a_cycle[order][1:] != a_cycle[order][:-1], True]]
+        anchor_stage[a_cycle[last]] = a_stage[last]
+        anchor_date[a_cycle[last]] = a_date[last]
+
+        # Postojeći otvoreni nadzori/resertifikacije su poznata potražnja
+        known = a_open & (a_stage != STAGE_INITIAL)
+        event_cycle.append(a_cycle[known])
+        event_stage.append(a_stage[known])
+        event_date.append(a_date[known])
+
+    # Projekcija lanca za sve cikluse odjednom. Audit koji je po formuli već
+    # trebalo da bude održan smatra se zaostalim: pada na danas i lanac se nastavlja od njega.
+    stage, current = anchor_stage.copy(), anchor_date.copy()
+    cycle_idx = np.arange(n)
+    for _ in range(PROJECTION_STEPS):
+        stage = stage % 3 + 1
+        offset = np.where(stage == STAGE_RECERTIFICATION, resert_days, nadzor_days)
+        current = current + (365 - offset).astype('timedelta64[D]')
+        current = np.maximum(current, today)
+        event_cycle.append(cycle_idx)
+        event_stage.append(stage)
+        event_date.append(current)
+
+    e_cycle = np.concatenate(event_cycle).astype(int)
+    e_stage = np.concatenate(event_stage).astype(int)
+    e_date = np.concatenate(event_date).astype('datetime64[D]')
+    e_days = np.maximum(np.where(e_stage == STAGE_RECERTIFICATION, resert_days[e_cycle], nadzor_days[e_cycle]), 1)
+
+    # Zaostali auditi (datum prošao, a nisu završeni) računaju se u tekući mesec
+    overdue = e_date <= today
+    e_date = np.maximum(e_date, today)
+
+    in_horizon = e_date < horizon_end
+    e_month = _month_index(e_date[in_horizon], start_month)
+    h_cycle, h_stage, h_days = e_cycle[in_horizon], e_stage[in_horizon], e_days[in_horizon]
+
+    working_days = np.busday_count(month_starts[:-1].astype('datetime64[D]'), month_starts[1:].astype('datetime64[D]'))
+    share = getattr(settings, 'FORECAST_CAPACITY_SHARE', 0.5)
+
+    demand_days = np.bincount(e_month, weights=h_days, minlength=months)
+    total_capacity = working_days * total_auditors * share
+
+    by_type = {
+        audit_type: np.bincount(e_month[h_stage == STAGES[audit_type]], minlength=months).tolist()
+        for audit_type in FORECAST_TYPES
+    }
+
+    # Potražnja po standardu: matrica ciklus × standard, pomnožena mesečnom potražnjom ciklusa
+    standard_ids = sorted({row[1] for row in cycle_standards} | set(capacity))
+    standard_pos = {sid: i for i, sid in enumerate(standard_ids)}
+    codes = {row[1]: row[2] for row in cycle_standards}
+    codes.update({sid: code for sid, (code, _) in capacity.items()})
+    incidence = np.zeros((n, len(standard_ids)))
+    for cycle_id, standard_id, _ in cycle_standards:
+        incidence[cycle_pos[cycle_id], standard_pos[standard_id]] = 1.0
+
+    cycle_month = np.zeros((n, months))
+    np.add.at(cycle_month, (h_cycle, e_month), h_days)
+    standard_demand = incidence.T @ cycle_month
+
+    standards = []
+    for sid in standard_ids:
+        qualified = capacity.get(sid, (None, 0))[1]
+        demand = standard_demand[standard_pos[sid]]
+        cap = working_days * qualified * share
+        with np.errstate(divide='ignore', invalid='ignore'):
+            utilisation = np.where(cap > 0, np.round(demand * 100 / np.where(cap > 0, cap, 1), 1), np.where(demand > 0, np.inf, 0))
+        standards.append({
+            'id': sid,
+            'code': codes.get(sid, ''),
+            'qualified_auditors': qualified,
+            'demand_days': demand.round(1).tolist(),
+            'capacity_days': cap.round(1).tolist(),
+            'utilisation': [None if np.isinf(u) else float(u) for u in utilisation],
+            'shortfall_months': [str(month_starts[i]) for i in np.nonzero(demand > cap)[0]],
+        })
+
+    return {
+        'start': str(start_month),
+        'months': [str(m) for m in month_starts[:-1]],
+        'cycles': n,
+        'capacity_share': share,
+        'total': {
+            'audits': np.bincount(e_month, minlength=months).tolist(),
+            'auditor_days': demand_days.round(1).tolist(),
+            'capacity_days': total_capacity.round(1).tolist(),
+            'working_days': working_days.tolist(),
+            'qualified_auditors': total_auditors,
+            'by_type': by_type,
+        },
+        'overdue': {
+            'audits': int(overdue.sum()),
+            'auditor_days': int(e_days[overdue].sum()),
+        },
+        'standards': standards,
+    }
+
+
+def forecast(start=None):
+    """Prognoza iz keša; poništava se zajedno sa analitikom (promena ciklusa, audita, standarda)"""
+    start = start or timezone.now().date()
+    key = f"analytics:forecast:{start.isoformat()}:{analytics.generation()}"
+    data = cache.get(key)
+    metrics.record_cache('forecast', hit=data is not None)
+    if data is None:
+        data = compute_forecast(start)
+        cache.set(key, data, getattr(settings, 'ANALYTICS_CACHE_SECONDS', 3600))
+    return data
@@ -8,6 +8,9 @@ from .standard_models import StandardDefinition, CompanyStandard
 from .auditor_models import Auditor
 from .srbija_tim_models import SrbijaTim
 from .audit_utils import is_auditor_qualified_for_company, is_auditor_qualified_for_audit
+from .conflict_service import audit_dates, describe_conflicts, find_conflicts, visit_dates
+from .select_options import LazySelect, LazySelectMultiple
+from .reference_data import ReferenceMultipleChoiceField, reference_field, standards as reference_standards
 from datetime import datetime, timedelta, date
 import json
 
@@ -109,6 +112,9 @@ class CompanyForm(forms.ModelForm):
             'oblast_registracije', 'notes'
         ]
         widgets = {
+            # Oko 500 industrija - opcije se učitavaju pretragom (select_options.py)
+            'industry': LazySelect('industries', attrs={'class': 'form-control'}),
+            
             # Numerička polja
             'number_of_employees': forms.NumberInput(attrs={'class': 'form-control'}),
             
@@ -172,8 +178,8 @@ class CertificationCycleForm(forms.ModelForm):
         required=True
     )
 
-    standards = forms.ModelMultipleChoiceField(
-        queryset=StandardDefinition.objects.none(),  # Empty queryset initially, will be set in __init__
+    standards = ReferenceMultipleChoiceField(
+        [],  # Opcije se postavljaju u __init__ (iz registra referentnih podataka)
         required=True,
         label=_('Standardi'),
         widget=forms.SelectMultiple(attrs={'class': 'form-control select2'})
@@ -287,16 +293,16 @@ class CertificationCycleForm(forms.ModelForm):
                 )
                 available_ids |= current_ids
 
-            self.fields['standards'].queryset = (
-                StandardDefinition.objects.filter(id__in=available_ids).order_by('code')
-            )
+            self.fields['standards'].objects = [
+                standard for standard in reference_standards() if standard.pk in available_ids
+            ]
         else:
             # Ako nemamo company_id, prikaži makar trenutno dodeljene standarde (za slučaj izmene)
             if instance and instance.pk:
-                current_ids = CycleStandard.objects.filter(certification_cycle=instance).values_list('standard_definition_id', flat=True)
-                self.fields['standards'].queryset = StandardDefinition.objects.filter(id__in=current_ids).order_by('code')
-            else:
-                self.fields['standards'].queryset = StandardDefinition.objects.none()
+                current_ids = set(CycleStandard.objects.filter(certification_cycle=instance).values_list('standard_definition_id', flat=True))
+                self.fields['standards'].objects = [
+                    standard for standard in reference_standards() if standard.pk in current_ids
+                ]
     
     def clean(self):
         cleaned_data = super().clean()
@@ -391,7 +397,7 @@ class CycleAuditForm(forms.ModelForm):
         queryset=Auditor.objects.all(),
         required=False,
         label=_('Tim auditora'),
-        widget=forms.SelectMultiple(attrs={'class': 'form-control select2'})
+        widget=LazySelectMultiple('auditors', attrs={'class': 'form-control', 'data-placeholder': 'Izaberite auditore'})
     )
     
     class Meta:
@@ -408,7 +414,7 @@ class CycleAuditForm(forms.ModelForm):
             'audit_status': forms.Select(attrs={'class': 'form-control'}),
             'planned_date': forms.DateInput(attrs={'class': 'form-control', 'type': 'date'}),
             'actual_date': forms.DateInput(attrs={'class': 'form-control', 'type': 'date'}),
-            'lead_auditor': forms.Select(attrs={'class': 'form-control', 'id': 'id_lead_auditor'}),
+            'lead_auditor': LazySelect('auditors', attrs={'class': 'form-control', 'id': 'id_lead_auditor', 'data-placeholder': 'Izaberite auditora'}),
             'report_number': forms.TextInput(attrs={'class': 'form-control'}),
             'findings': forms.Textarea(attrs={'class': 'form-control', 'rows': 3}),
             'recommendations': forms.Textarea(attrs={'class': 'form-control', 'rows': 3}),
@@ -421,8 +427,8 @@ class CycleAuditForm(forms.ModelForm):
         
         super().__init__(*args, **kwargs)
         
-        # Uvek prikaži sve auditore u padajućoj listi za lead_auditor
-        # (kvalifikacija se proverava u clean())
+        # Svi auditori su dozvoljeni za lead_auditor (kvalifikacija se proverava u clean());
+        # widget renderuje samo izabranog, ostale učitava pretragom (select_options.py)
         self.fields['lead_auditor'].queryset = Auditor.objects.all().order_by('ime_prezime')
         
         # Ako je instanca već kreirana, popunjavamo polje audit_team sa postojećim auditorima
@@ -488,18 +494,8 @@ class CycleAuditForm(forms.ModelForm):
 
         # Ako nemamo ciklus ili osnovni datum, ne možemo proveriti konflikt
         if cycle and base_date:
-            # Odredi broj dana audita na osnovu ciklusa i tipa
-            if audit_type == 'initial' and cycle.inicijalni_broj_dana:
-                days_count = zaokruzi_na_veci_broj(cycle.inicijalni_broj_dana)
-            elif audit_type in ('surveillance_1', 'surveillance_2') and cycle.broj_dana_nadzora:
-                days_count = zaokruzi_na_veci_broj(cycle.broj_dana_nadzora)
-            elif audit_type == 'recertification' and cycle.broj_dana_resertifikacije:
-                days_count = zaokruzi_na_veci_broj(cycle.broj_dana_resertifikacije)
-            else:
-                days_count = 1
-
             # Generiši datume audita (unazad od osnovnog datuma)
-            dates = [base_date - timedelta(days=i) for i in range(days_count)]
+            dates = audit_dates(cycle, audit_type, base_date)
 
             # Sakupi sve odabrane auditore (lead + tim)
             team_selected = cleaned_data.get('audit_team') or []
@@ -508,23 +504,16 @@ class CycleAuditForm(forms.ModelForm):
                 auditors.add(lead_auditor.id)
 
             if auditors and dates:
-                qs = AuditorReservation.objects.filter(auditor_id__in=auditors, date__in=dates)
-                if getattr(self.instance, 'pk', None):
-                    qs = qs.exclude(audit_id=self.instance.pk)
-
-                conflicts_by_auditor = {}
-                for res in qs.select_related('auditor', 'audit', 'audit__certification_cycle__company'):
-                    conflicts_by_auditor.setdefault(res.auditor_id, []).append(res)
+                # Rezervacije drugih audita i Srbija Tim posete, jednim upitom
+                conflicts_by_auditor = find_conflicts(
+                    auditors, dates, exclude_audit_id=getattr(self.instance, 'pk', None)
+                )
 
                 if conflicts_by_auditor:
                     # Poruke za lead i tim posebno
                     # Lead auditor
                     if lead_auditor and lead_auditor.id in conflicts_by_auditor:
-                        msgs = []
-                        for res in conflicts_by_auditor[lead_auditor.id]:
-                            company = getattr(res.audit.certification_cycle.company, 'name', '')
-                            audit_type_disp = dict(res.audit.AUDIT_TYPE_CHOICES).get(res.audit.audit_type, res.audit.audit_type)
-                            msgs.append(f"{res.date.isoformat()} (audit: {company} - {audit_type_disp})")
+                        msgs = [booking.describe() for booking in conflicts_by_auditor[lead_auditor.id]]
                         self.add_error(
                             'lead_auditor',
                             _(
@@ -535,17 +524,13 @@ class CycleAuditForm(forms.ModelForm):
 
                     # Tim auditora
                     team_conflicts_msgs = []
-                    for auditor_id, res_list in conflicts_by_auditor.items():
+                    for auditor_id, bookings in conflicts_by_auditor.items():
                         if lead_auditor and auditor_id == lead_auditor.id:
                             continue
                         # Ovo su članovi tima sa konfliktom
                         auditor_obj = next((a for a in (team_selected or []) if a.id == auditor_id), None)
                         if auditor_obj:
-                            parts = []
-                            for res in res_list:
-                                company = getattr(res.audit.certification_cycle.company, 'name', '')
-                                audit_type_disp = dict(res.audit.AUDIT_TYPE_CHOICES).get(res.audit.audit_type, res.audit.audit_type)
-                                parts.append(f"{res.date.isoformat()} (audit: {company} - {audit_type_disp})")
+                            parts = [booking.describe() for booking in bookings]
                             team_conflicts_msgs.append(f"{auditor_obj} -> " + ', '.join(parts))
 
                     if team_conflicts_msgs:
@@ -734,8 +719,8 @@ class SrbijaTimForm(forms.ModelForm):
         # Postavi queryset za auditore
         self.fields['auditors'].queryset = Auditor.objects.all().order_by('ime_prezime')
         
-        # Postavi queryset za standarde
-        self.fields['standards'].queryset = StandardDefinition.objects.all().order_by('code')
+        # Standardi iz registra referentnih podataka
+        self.fields['standards'] = reference_field(self.fields['standards'], reference_standards)
         
         # Postavi queryset za kompanije
         self.fields['company'].queryset = Company.objects.all().order_by('name')
@@ -758,27 +743,15 @@ class SrbijaTimForm(forms.ModelForm):
                     'Datum posete ne može biti nakon datuma isticanja sertifikata.'
                 )
         
-        # Validacija konflikta auditora
+        # Validacija konflikta auditora - druge Srbija Tim posete i rezervacije za audite
         if visit_date and auditors:
-            conflicts = []
-            for auditor in auditors:
-                # Pronađi sve posete ovog auditora na isti datum
-                conflicting_visits = SrbijaTim.objects.filter(
-                    auditors=auditor,
-                    visit_date=visit_date
-                )
-                
-                # Ako je izmena postojeće posete, isključi je iz provere
-                if self.instance and self.instance.pk:
-                    conflicting_visits = conflicting_visits.exclude(pk=self.instance.pk)
-                
-                if conflicting_visits.exists():
-                    company_names = [v.company.name for v in conflicting_visits]
-                    conflicts.append(
-                        f"{auditor.ime_prezime} već ima zakazan sastanak tog dana sa: {', '.join(company_names)}"
-                    )
-            
-            if conflicts:
+            conflicts_by_auditor = find_conflicts(
+                [a.id for a in auditors],
+                visit_dates(visit_date, cleaned_data.get('broj_dana_posete')),
+                exclude_visit_id=self.instance.pk if self.instance else None,
+            )
+            if conflicts_by_auditor:
+                conflicts = describe_conflicts(conflicts_by_auditor, auditors)
                 raise forms.ValidationError({
                     'auditors': 'Konflikt u rasporedu auditora! ' + ' | '.join(conflicts)
                 })
@@ -0,0 +1,210 @@
+"""
+Provere spremnosti aplikacije za /health/ready/.
+
+Svaka provera je funkcija registrovana dekoratorom @check('naziv') koja vraća
+dict sa ključem "status" ("ready", "warning" ili "not_ready") i dodatnim
+podacima. Koje provere se izvršavaju određuje READINESS_CHECKS u settings-u
+(podrazumevano sve registrovane); umesto naziva može se navesti i putanja do
+funkcije ("myapp.checks.check_smtp"). "warning" ne obara spremnost.
+
+Rezultat se kešira READINESS_CACHE_SECONDS sekundi po procesu, tako da česte
+probe load balancer-a ne opterećuju bazu. Provere se izvršavaju van lock-a i
+samo jedna proba ih pokreće u isto vreme; ostale za to vreme dobijaju poslednji
+(zastareli) rezultat, pa zaglavljena provera ne blokira sve probe.
+"""
+import logging
+import os
+import shutil
+import threading
+import time
+from datetime import datetime
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+STATUS_READY = 'ready'
+STATUS_WARNING = 'warning'
+STATUS_NOT_READY = 'not_ready'
+
+CHECKS = {}
+
+_cache_lock = threading.Lock()
+_cached_result = None
+_cached_at = 0.0
+_refreshing = False
+
+
+def check(name):
+    """Dekorator za registraciju provere spremnosti"""
+    def decorator(func):
+        CHECKS[name] = func
+        return func
+    return decorator
+
+
+def _elapsed_ms(start):
+    return round((time.perf_counter() - start) * 1000, 2)
+
+
+@check('database')
+def check_database():
+    """Vreme jednog round-trip-a do baze"""
+    start = time.perf_counter()
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1")
+        cursor.fetchone()
+    latency_ms = _elapsed_ms(start)
+    threshold = getattr(settings, 'READINESS_DB_LATENCY_WARNING_MS', 200)
+    return {
+        'status': STATUS_WARNING if latency_ms > threshold else STATUS_READY,
+        'latency_ms': latency_ms,
+    }
+
+
+@check('migrations')
+def check_migrations():
+    """Neprimenjene migracije - aplikacija ne sme da prima saobraćaj pre migrate"""
+    executor = MigrationExecutor(connection)
+    plan = executor.migration_plan(executor.loader.graph.leaf_nodes())
+    unapplied = [f"{migration.app_label}.{migration.name}" for migration, backwards in plan if not backwards]
+    result = {
+        'status': STATUS_NOT_READY if unapplied else STATUS_READY,
+        'migrations_applied': len(executor.loader.applied_migrations),
+        'unapplied': len(unapplied),
+    }
+    if unapplied:
+        result['pending'] = unapplied[:10]
+    return result
+
+
+@check('cache')
+def check_cache():
+    """Upis i čitanje iz podrazumevanog keša"""
+    key = f"readiness-check-{os.getpid()}"
+    start = time.perf_counter()
+    cache.set(key, 'ok', 10)
+    value = cache.get(key)
+    cache.delete(key)
+    return {
+        'status': STATUS_READY if value == 'ok' else STATUS_NOT_READY,
+        'latency_ms': _elapsed_ms(start),
+        'backend': settings.CACHES['default']['BACKEND'].rsplit('.', 1)[-1],
+    }
+
+
+def _log_directories():
+    """Direktorijumi u koje pišu FileHandler-i iz LOGGING podešavanja"""
+    directories = set()
+    for handler in getattr(settings, 'LOGGING', {}).get('handlers', {}).values():
+        filename = handler.get('filename')
+        if filename:
+            directories.add(os.path.dirname(os.path.abspath(filename)))
+    return sorted(directories) or [os.path.abspath(os.getcwd())]
+
+
+@check('log_disk')
+def check_log_disk():
+    """Slobodan prostor na disku na koji se pišu log fajlovi (debug.log)"""
+    min_free_mb = getattr(settings, 'READINESS_MIN_FREE_DISK_MB', 100)
+    disks = []
+    status = STATUS_READY
+    for directory in _log_directories():
+        usage = shutil.disk_usage(directory)
+        free_mb = usage.free // (1024 * 1024)
+        if free_mb < min_free_mb:
+            status = STATUS_NOT_READY
+        disks.append({'path': directory, 'free_mb': free_mb, 'used_percent': round(usage.used * 100 / usage.total, 1)})
+    return {'status': status, 'min_free_mb': min_free_mb, 'disks': disks}
+
+
+@check('job_queue')
+def check_job_queue():
+    """Dubina reda pozadinskih poslova i starost najstarijeg dospelog posla"""
+    from django.db.models import Count, Min, Q
+
+    from .job_models import BackgroundJob
+
+    now = timezone.now()
+    stats = BackgroundJob.objects.aggregate(
+        queued=Count('id', filter=Q(status=BackgroundJob.STATUS_QUEUED, run_after__lte=now)),
+        running=Count('id', filter=Q(status=BackgroundJob.STATUS_RUNNING)),
+        oldest=Min('run_after', filter=Q(status=BackgroundJob.STATUS_QUEUED, run_after__lte=now)),
+    )
+    oldest_age = int((now - stats['oldest']).total_seconds()) if stats['oldest'] else 0
+    max_age = getattr(settings, 'READINESS_MAX_QUEUE_AGE_SECONDS', 600)
+    return {
+        # Zaglavljen red ne sprečava web da služi zahteve - samo upozorenje
+        'status': STATUS_WARNING if oldest_age > max_age else STATUS_READY,
+        'queued': stats['queued'],
+        'running': stats['running'],
+        'oldest_queued_seconds': oldest_age,
+    }
+
+
+def run_checks():
+    """Izvrši sve podešene provere; izuzetak u proveri znači not_ready za tu proveru"""
+    names = getattr(settings, 'READINESS_CHECKS', None) or list(CHECKS)
+    results = {}
+    for name in names:
+        func = CHECKS.get(name)
+        if func is None and '.' in name:
+            try:
+                func = import_string(name)
+            except ImportError:
+                func = None
+        if func is None:
+            results[name] = {'status': STATUS_NOT_READY, 'error': 'Nepoznata provera'}
+            continue
+        start = time.perf_counter()
+        try:
+            results[name] = func()
+        except Exception as e:
+            logger.warning(f"Provera spremnosti '{name}' neuspešna: {e}")
+            results[name] = {'status': STATUS_NOT_READY, 'error': str(e)}
+        results[name]['duration_ms'] = _elapsed_ms(start)
+
+    return {
+        'ready': all(r['status'] != STATUS_NOT_READY for r in results.values()),
+        'checked_at': datetime.now().isoformat(timespec='seconds'),
+        'checks': results,
+    }
+
+
+def get_readiness(fresh=False):
+    """Rezultat provera, iz keša ako je mlađi od READINESS_CACHE_SECONDS"""
+    global _cached_result, _cached_at, _refreshing
+
+    ttl = getattr(settings, 'READINESS_CACHE_SECONDS', 5)
+    with _cache_lock:
+        cached = _cached_result
+        if not fresh and cached is not None and time.monotonic() - _cached_at < ttl:
+            return {**cached, 'cached': True}
+        if _refreshing and cached is not None:
+            # Druga proba već izvršava provere
+            return {**cached, 'cached': True, 'stale': True}
+        owner = not _refreshing
+        _refreshing = True
+
+    try:
+        result = run_checks()
+    finally:
+        if owner:
+            with _cache_lock:
+                _refreshing = False
+
+    with _cache_lock:
+        _cached_result = result
+        _cached_at = time.monotonic()
+    return {**result, 'cached': False}
+
+
+def clear_cache():
+    global _cached_result
+    with _cache_lock:
+        _cached_result = None
@@ -1,11 +1,16 @@
 """
 Health check views for monitoring and deployment verification
 """
-from django.http import JsonResponse
+from django.http import HttpResponse, JsonResponse
 from django.db import connection
 from django.conf import settings
+from django.utils.crypto import constant_time_compare
 import sys
 
+from isoqar_app import metrics
+
+from . import health_checks
+
 
 def health_check(request):
     """
@@ -35,31 +40,30 @@ def health_check(request):
     return JsonResponse(health_status, status=200)
 
 
+def _has_monitoring_access(request):
+    """Staff korisnik ili "Authorization: Bearer <METRICS_TOKEN>" (ako je token postavljen)"""
+    if request.user.is_authenticated and request.user.is_staff:
+        return True
+    token = getattr(settings, 'METRICS_TOKEN', '')
+    return bool(token) and constant_time_compare(request.META.get('HTTP_AUTHORIZATION', ''), f'Bearer {token}')
+
+
 def readiness_check(request):
     """
-    Readiness check - verifies if the application is ready to serve traffic
+    Readiness check - verifies if the application is ready to serve traffic.
+    Runs the pluggable checks from company/health_checks.py (database latency,
+    unapplied migrations, cache, log disk space, job queue depth); results are
+    cached for READINESS_CACHE_SECONDS so frequent probes don't load the DB.
+    Anonymous probes get only pass/fail; staff users (or the METRICS_TOKEN
+    bearer) get per-check details and can bypass the cache with ?fresh=1.
     """
-    ready_status = {
-        "ready": True,
-        "checks": {}
-    }
-    
-    # Database check
-    try:
-        with connection.cursor() as cursor:
-            cursor.execute("SELECT COUNT(*) FROM django_migrations")
-            migration_count = cursor.fetchone()[0]
-            ready_status["checks"]["database"] = {
-                "status": "ready",
-                "migrations_applied": migration_count
-            }
-    except Exception as e:
-        ready_status["ready"] = False
-        ready_status["checks"]["database"] = {
-            "status": "not_ready",
-            "error": str(e)
-        }
-    
+    detailed = _has_monitoring_access(request)
+    fresh = request.GET.get('fresh') == '1' and detailed
+    ready_status = health_checks.get_readiness(fresh=fresh)
+    if not detailed:
+        # Bez naziva migracija, putanja i poruka grešaka za neautentifikovane probe
+        ready_status = {'ready': ready_status['ready']}
+
     status_code = 200 if ready_status["ready"] else 503
     return JsonResponse(ready_status, status=status_code)
 
@@ -69,3 +73,15 @@ def liveness_check(request):
     Liveness check - simple check that the application is alive
     """
     return JsonResponse({"alive": True}, status=200)
+
+
+def metrics_view(request):
+    """
+    Prometheus metrike (zbir za sve gunicorn workere i run_worker procese).
+    Ako je postavljen METRICS_TOKEN, zahteva "Authorization: Bearer <token>";
+    staff korisnici uvek imaju pristup.
+    """
+    if not _has_monitoring_access(request):
+        return HttpResponse('Forbidden\n', status=403, content_type='text/plain')
+
+    return HttpResponse(metrics.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -1,6 +1,7 @@
 from django.views.generic import ListView
 from django.contrib.auth.mixins import LoginRequiredMixin
-from .iaf_models import IAFEACCode, IAFScopeReference
+from . import reference_data
+from .iaf_models import IAFEACCode
 
 
 class IAFEACCodeListView(LoginRequiredMixin, ListView):
@@ -12,12 +13,12 @@ class IAFEACCodeListView(LoginRequiredMixin, ListView):
     context_object_name = 'iaf_codes'
     
     def get_queryset(self):
-        """Vrati sve IAF/EAC kodove sa related IAF Scope Reference"""
-        return IAFEACCode.objects.select_related('iaf_scope_reference').order_by('iaf_code')
+        """Svi IAF/EAC kodovi sa IAF Scope Reference (iz registra referentnih podataka, bez upita)"""
+        return reference_data.iaf_codes()
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['title'] = 'IAF/EAC Kodovi'
-        context['total_codes'] = self.get_queryset().count()
-        context['total_scopes'] = IAFScopeReference.objects.count()
+        context['total_codes'] = len(self.object_list)
+        context['total_scopes'] = len(reference_data.scope_references())
         return context
@@ -0,0 +1,86 @@
+"""
+Admin stranica za uvoz podataka iz Excel/CSV fajlova.
+
+Otpremljeni fajlovi se čuvaju u IMPORT_UPLOAD_ROOT, a komanda za uvoz (import_*)
+se upisuje u red poslova (jobs.IMPORT_TASK) i izvršava u run_worker procesu.
+Stranica prikazuje poslednje uvoze sa statusom, napretkom i izlazom komande.
+"""
+import os
+import uuid
+
+from django import forms
+from django.conf import settings
+from django.contrib import admin, messages
+from django.contrib.admin.views.decorators import staff_member_required
+from django.shortcuts import redirect, render
+from django.utils.text import get_valid_filename
+
+from . import jobs
+from .job_models import BackgroundJob
+
+ALLOWED_EXTENSIONS = ('.xlsx', '.xls', '.csv')
+
+
+class DataImportForm(forms.Form):
+    command = forms.ChoiceField(label='Uvoz', choices=[(name, name) for name in sorted(jobs.IMPORT_COMMANDS)])
+    first_file = forms.FileField(label='Fajl')
+    second_file = forms.FileField(label='Drugi fajl (naredne provere)', required=False)
+    dry_run = forms.BooleanField(label='Probni rad (bez izmena u bazi)', required=False, initial=True)
+
+    def clean(self):
+        cleaned_data = super().clean()
+        command = cleaned_data.get('command')
+        if not command:
+            return cleaned_data
+        file_count, _ = jobs.IMPORT_COMMANDS[command]
+        if file_count == 2 and not cleaned_data.get('second_file'):
+            self.add_error('second_file', 'Ovaj uvoz zahteva i fajl sa nadzornim proverama.')
+        for name in ('first_file', 'second_file')[:file_count]:
+            upload = cleaned_data.get(name)
+            if upload and not upload.name.lower().endswith(ALLOWED_EXTENSIONS):
+                self.add_error(name, 'Dozvoljeni su samo .xlsx, .xls i .csv fajlovi.')
+        return cleaned_data
+
+    def enqueue(self, user):
+        """Snima fajlove u zaseban direktorijum i upisuje uvoz u red"""
+        command = self.cleaned_data['command']
+        file_count, accepts_dry_run = jobs.IMPORT_COMMANDS[command]
+        upload_dir = os.path.join(settings.IMPORT_UPLOAD_ROOT, uuid.uuid4().hex)
+        os.makedirs(upload_dir)
+
+        paths = []
+        for name in ('first_file', 'second_file')[:file_count]:
+            upload = self.cleaned_data[name]
+            path = os.path.join(upload_dir, f'{len(paths)}_{get_valid_filename(os.path.basename(upload.name))}')
+            with open(path, 'wb') as f:
+                for chunk in upload.chunks():
+                    f.write(chunk)
+            paths.append(path)
+
+        options = {'dry_run': True} if accepts_dry_run and self.cleaned_data['dry_run'] else {}
+        # Uvoz se ne ponavlja automatski - delimično upisani podaci bi se uvezli dvaput
+        return jobs.enqueue(
+            jobs.IMPORT_TASK, created_by=user, max_attempts=1,
+            command=command, args=paths, options=options, upload_dir=upload_dir,
+        )
+
+
+@staff_member_required
+def data_import(request):
+    form = DataImportForm(request.POST or None, request.FILES or None)
+    if request.method == 'POST' and form.is_valid():
+        job = form.enqueue(request.user)
+        messages.success(request, f"Uvoz je pokrenut u pozadini (posao #{job.pk}).")
+        return redirect('data_import')
+
+    recent = list(
+        BackgroundJob.objects.filter(task=jobs.IMPORT_TASK).select_related('created_by').order_by('-created_at')[:20]
+    )
+    context = {
+        **admin.site.each_context(request),
+        'title': 'Uvoz podataka',
+        'form': form,
+        'jobs': recent,
+        'has_active': any(not job.is_finished for job in recent),
+    }
+    return render(request, 'admin/data_import.html', context)
@@ -0,0 +1,66 @@
+from django.conf import settings
+from django.db import models
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+
+class BackgroundJob(models.Model):
+    """
+    Posao u lokalnom redu (tabela u bazi, bez Redis-a/Celery-ja).
+    Izvršava ga `python manage.py run_worker`, vidi company/jobs.py.
+    """
+    STATUS_QUEUED = 'queued'
+    STATUS_RUNNING = 'running'
+    STATUS_SUCCEEDED = 'succeeded'
+    STATUS_FAILED = 'failed'
+    STATUS_CANCELLED = 'cancelled'
+
+    STATUS_CHOICES = [
+        (STATUS_QUEUED, _('Na čekanju')),
+        (STATUS_RUNNING, _('U toku')),
+        (STATUS_SUCCEEDED, _('Uspešno')),
+        (STATUS_FAILED, _('Neuspešno')),
+        (STATUS_CANCELLED, _('Otkazano')),
+    ]
+
+    task = models.CharField(_('Zadatak'), max_length=100)
+    kwargs = models.JSONField(_('Parametri'), default=dict, blank=True)
+    status = models.CharField(_('Status'), max_length=20, choices=STATUS_CHOICES, default=STATUS_QUEUED)
+
+    progress = models.PositiveSmallIntegerField(_('Napredak (%)'), default=0)
+    progress_message = models.CharField(_('Poruka o napretku'), max_length=255, blank=True, default='')
+    result = models.JSONField(_('Rezultat'), null=True, blank=True)
+    error = models.TextField(_('Greška'), blank=True, default='')
+
+    attempts = models.PositiveSmallIntegerField(_('Broj pokušaja'), default=0)
+    max_attempts = models.PositiveSmallIntegerField(_('Maksimalan broj pokušaja'), default=3)
+    run_after = models.DateTimeField(_('Pokreni posle'), default=timezone.now)
+
+    worker_id = models.CharField(_('Worker'), max_length=100, blank=True, default='')
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='background_jobs',
+        verbose_name=_('Pokrenuo')
+    )
+    created_at = models.DateTimeField(_('Kreirano'), default=timezone.now)
+    started_at = models.DateTimeField(_('Započeto'), null=True, blank=True)
+    finished_at = models.DateTimeField(_('Završeno'), null=True, blank=True)
+    updated_at = models.DateTimeField(_('Ažurirano'), auto_now=True)
+
+    class Meta:
+        verbose_name = _('Pozadinski posao')
+        verbose_name_plural = _('Pozadinski poslovi')
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'run_after'], name='job_status_run_after_idx'),
+        ]
+
+    def __str__(self):
+        return f"#{self.pk} {self.task} ({self.get_status_display()})"
+
+    @property
+    def is_finished(self):
+        return self.status in (self.STATUS_SUCCEEDED, self.STATUS_FAILED, self.STATUS_CANCELLED)
@@ -0,0 +1,273 @@
+"""
+Lokalni red poslova nad tabelom BackgroundJob.
+
+Spore operacije se iz request-a samo upisuju u red (enqueue), a izvršava ih
+zaseban proces `python manage.py run_worker`. Nije potreban Redis ni Celery -
+koordinacija između više worker procesa radi se uslovnim UPDATE-om nad
+statusom posla, tako da jedan posao uvek preuzima tačno jedan worker.
+
+Registracija zadatka:
+
+    @task('cycle.create_default_audits')
+    def create_default_audits(job, cycle_id):
+        job.set_progress(50, 'Kreiranje audita...')
+        ...
+        return {'created': 3}   # upisuje se u BackgroundJob.result
+"""
+import logging
+import os
+import shutil
+import socket
+import time
+import traceback
+from datetime import timedelta
+from io import StringIO
+
+from django.conf import settings
+from django.core.management import call_command
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from isoqar_app import metrics
+
+from .job_models import BackgroundJob
+
+logger = logging.getLogger(__name__)
+
+# Posao koji je "running" duže od ovoga smatra se napuštenim (worker je pao)
+STALE_JOB_TIMEOUT = timedelta(minutes=30)
+
+# Osnova za eksponencijalno odlaganje ponovnog pokušaja (30s, 60s, 120s, ...)
+RETRY_BASE_DELAY = timedelta(seconds=30)
+
+TASKS = {}
+
+
+class UnknownTask(Exception):
+    pass
+
+
+def task(name):
+    """Dekorator za registraciju funkcije kao zadatka u redu"""
+    def decorator(func):
+        TASKS[name] = func
+        return func
+    return decorator
+
+
+def enqueue(task_name, created_by=None, max_attempts=3, run_after=None, **kwargs):
+    """Upiši posao u red i odmah vrati BackgroundJob (bez čekanja na izvršenje)"""
+    if task_name not in TASKS:
+        raise UnknownTask(f"Nepoznat zadatak: {task_name}")
+    if created_by is not None and not created_by.is_authenticated:
+        created_by = None
+    return BackgroundJob.objects.create(
+        task=task_name,
+        kwargs=kwargs,
+        max_attempts=max_attempts,
+        run_after=run_after or timezone.now(),
+        created_by=created_by,
+    )
+
+
+def default_worker_id():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class JobContext:
+    """Objekat koji zadatak dobija kao prvi argument - za prijavu napretka"""
+
+    def __init__(self, job):
+        self.job = job
+
+    def set_progress(self, percent, message=''):
+        percent = max(0, min(100, int(percent)))
+        BackgroundJob.objects.filter(pk=self.job.pk).update(
+            progress=percent, progress_message=message[:255], updated_at=timezone.now()
+        )
+        self.job.progress = percent
+        self.job.progress_message = message[:255]
+
+
+def requeue_stale_jobs():
+    """
+    Vrati u red poslove čiji je worker nestao usred izvršavanja. Posao koji je
+    već iskoristio sve pokušaje (npr. ruši worker proces) se označava kao neuspešan.
+    """
+    now = timezone.now()
+    stale = BackgroundJob.objects.filter(status=BackgroundJob.STATUS_RUNNING, started_at__lt=now - STALE_JOB_TIMEOUT)
+    failed = stale.filter(attempts__gte=F('max_attempts')).update(
+        status=BackgroundJob.STATUS_FAILED,
+        error='Worker je prestao sa radom tokom izvršavanja posla',
+        finished_at=now,
+        updated_at=now,
+    )
+    if failed:
+        logger.error(f"Označeno kao neuspešno {failed} napuštenih poslova bez preostalih pokušaja")
+    count = stale.update(status=BackgroundJob.STATUS_QUEUED, worker_id='', run_after=now, updated_at=now)
+    if count:
+        logger.warning(f"Vraćeno u red {count} napuštenih poslova")
+    return count
+
+
+def claim_next_job(worker_id):
+    """
+    Preuzmi sledeći posao iz reda. Uslovni UPDATE (status='queued') garantuje
+    da isti posao ne preuzmu dva worker-a ni na bazama bez SELECT ... FOR UPDATE.
+    Pokušaj se broji već pri preuzimanju, da bi se računao i kada posao sruši worker.
+    """
+    now = timezone.now()
+    candidates = (
+        BackgroundJob.objects.filter(status=BackgroundJob.STATUS_QUEUED, run_after__lte=now)
+        .order_by('run_after', 'id')
+        .values_list('id', flat=True)[:10]
+    )
+    for job_id in candidates:
+        claimed = BackgroundJob.objects.filter(pk=job_id, status=BackgroundJob.STATUS_QUEUED).update(
+            status=BackgroundJob.STATUS_RUNNING,
+            attempts=F('attempts') + 1,
+            worker_id=worker_id,
+            started_at=now,
+            updated_at=now,
+        )
+        if claimed:
+            return BackgroundJob.objects.get(pk=job_id)
+    return None
+
+
+def run_job(job):
+    """Izvrši preuzeti posao i upiši rezultat, grešku ili novi pokušaj"""
+    func = TASKS.get(job.task)
+    start = time.perf_counter()
+
+    try:
+        if func is None:
+            raise UnknownTask(f"Nepoznat zadatak: {job.task}")
+        result = func(JobContext(job), **job.kwargs)
+    except Exception as e:
+        job.error = ''.join(traceback.format_exception(type(e), e, e.__traceback__))[-5000:]
+        if job.attempts < job.max_attempts and not isinstance(e, UnknownTask):
+            job.status = BackgroundJob.STATUS_QUEUED
+            job.run_after = timezone.now() + RETRY_BASE_DELAY * (2 ** (job.attempts - 1))
+            logger.warning(f"Posao #{job.pk} ({job.task}) neuspešan, pokušaj {job.attempts}/{job.max_attempts}: {e}")
+        else:
+            job.status = BackgroundJob.STATUS_FAILED
+            job.finished_at = timezone.now()
+            logger.error(f"Posao #{job.pk} ({job.task}) trajno neuspešan: {e}")
+        job.save(update_fields=['attempts', 'status', 'error', 'run_after', 'finished_at', 'updated_at'])
+        _record_metrics(job, start)
+        return job
+
+    job.status = BackgroundJob.STATUS_SUCCEEDED
+    job.progress = 100
+    job.result = result
+    job.error = ''
+    job.finished_at = timezone.now()
+    job.save(update_fields=['attempts', 'status', 'progress', 'result', 'error', 'finished_at', 'updated_at'])
+    logger.info(f"Posao #{job.pk} ({job.task}) završen")
+    _record_metrics(job, start)
+    return job
+
+
+def _record_metrics(job, start):
+    # Status 'queued' ovde znači neuspeh koji će biti ponovo pokušan
+    status = 'retry' if job.status == BackgroundJob.STATUS_QUEUED else job.status
+    metrics.inc('isoqar_jobs_total', task=job.task, status=status)
+    metrics.observe('isoqar_job_duration_seconds', time.perf_counter() - start, task=job.task)
+
+
+def run_pending(worker_id=None, max_jobs=None):
+    """Izvrši sve dospele poslove (ili najviše max_jobs) i vrati broj izvršenih"""
+    worker_id = worker_id or default_worker_id()
+    processed = 0
+    while max_jobs is None or processed < max_jobs:
+        job = claim_next_job(worker_id)
+        if job is None:
+            break
+        run_job(job)
+        processed += 1
+    return processed
+
+
+# ---------------------------------------------------------------------------
+# Zadaci
+# ---------------------------------------------------------------------------
+
+# Komande za uvoz koje je dozvoljeno pokrenuti kroz red (stranica admin/data-import/):
+# komanda -> (broj ulaznih fajlova, da li prima --dry-run)
+IMPORT_COMMANDS = {
+    'import_auditor_assignments': (1, True),
+    'import_auditor_data': (1, True),
+    'import_company_data': (2, True),
+    'import_duplicate_audits': (2, True),
+    'import_duplicate_companies': (2, True),
+    'import_iaf_codes': (1, True),
+    'validate_import_files': (2, False),
+}
+
+IMPORT_TASK = 'management.import'
+
+
+@task('cycle.create_default_audits')
+def create_default_audits_task(job, cycle_ids, is_first_cycle=False):
+    """Kreiranje podrazumevanih audita (sa danima i rezervacijama) za cikluse"""
+    from .cycle_models import CertificationCycle
+
+    cycles = list(CertificationCycle.objects.filter(pk__in=cycle_ids))
+    for index, cycle in enumerate(cycles, start=1):
+        with transaction.atomic():
+            cycle.create_default_audits(is_first_cycle=is_first_cycle)
+        job.set_progress(index * 100 // len(cycles), f"Ciklus {index}/{len(cycles)}")
+    return {'cycles': len(cycles)}
+
+
+class _ProgressOutput(StringIO):
+    """stdout komande: poslednja ispisana linija je poruka o napretku posla (najviše jednom u sekundi)"""
+
+    def __init__(self, job):
+        super().__init__()
+        self.job = job
+        self.reported_at = 0
+
+    def write(self, text):
+        lines = text.strip().splitlines()
+        if lines and time.monotonic() - self.reported_at >= 1:
+            self.reported_at = time.monotonic()
+            self.job.set_progress(self.job.job.progress, lines[-1])
+        return super().write(text)
+
+
+@task(IMPORT_TASK)
+def import_command_task(job, command, args=None, options=None, upload_dir=None):
+    """Pokretanje komande za uvoz podataka (import_*) u pozadini; otpremljeni fajlovi se brišu na kraju"""
+    try:
+        if command not in IMPORT_COMMANDS:
+            raise ValueError(f"Komanda nije dozvoljena: {command}")
+        output = _ProgressOutput(job)
+        job.set_progress(0, f"Pokrenuto: {command}")
+        call_command(command, *(args or []), stdout=output, stderr=output, **(options or {}))
+        return {'output': output.getvalue()[-10000:]}
+    finally:
+        root = os.path.realpath(settings.IMPORT_UPLOAD_ROOT)
+        if upload_dir and os.path.realpath(upload_dir).startswith(root + os.sep):
+            shutil.rmtree(upload_dir, ignore_errors=True)
+
+
+@task('report.render')
+def render_report_task(job, report, scope, hash=None):
+    """Generisanje PDF izveštaja (vidi reports.py); HTML se gradi iz trenutnog stanja baze"""
+    from . import reports
+    from .company_models import Company
+
+    if report == reports.REPORT_AUDIT_PROGRAM:
+        html = reports.build_audit_program_html(Company.objects.get(pk=scope))
+    elif report == reports.REPORT_CERTIFICATE_EXPIRY:
+        html = reports.build_certificate_expiry_html(int(scope))
+    else:
+        raise ValueError(f"Nepoznat izveštaj: {report}")
+
+    path = reports.report_path(report, scope, html)
+    if not os.path.exists(path):
+        reports.render_to_file(report, scope, html, path)
+    return {'path': path}
@@ -0,0 +1,238 @@
+"""
+Zajednički filteri za liste (kompanije, ciklusi, auditi, auditori, Srbija Tim).
+
+Iste funkcije koriste i list view-ovi i export, tako da izvezeni fajl uvek
+sadrži tačno ono što korisnik vidi na ekranu sa istim GET parametrima.
+"""
+from datetime import datetime
+
+from django.db.models import Exists, F, OuterRef, Q
+
+from .cycle_models import CycleAudit
+
+# Mapiranje starih statusa (iz filtera na listi audita) na statuse CycleAudit modela
+AUDIT_STATUS_MAPPING = {
+    'active': 'planned',
+    'pending': 'scheduled',
+    'completed': 'completed',
+    'cancelled': 'cancelled',
+    'postponed': 'postponed',
+}
+
+# Sortiranje liste kompanija (?sort=...) - kolone pregleda imaju indeks, pa baza
+# vraća redosled bez sortiranja cele tabele; kompanije bez datuma idu na kraj
+COMPANY_SORTS = {
+    'name': ('name',),
+    'next_audit': (F('next_audit_date').asc(nulls_last=True), 'name'),
+    'expiry': (F('nearest_expiry').asc(nulls_last=True), 'name'),
+}
+
+
+def parse_date(value):
+    """Parsira datum u formatu YYYY-MM-DD, vraća None za prazan ili neispravan unos"""
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value, '%Y-%m-%d').date()
+    except (TypeError, ValueError):
+        return None
+
+
+def filter_companies(queryset, params):
+    """
+    Filteri sa liste kompanija: search, expiry_from/to, audit_from/to,
+    next_audit_from/to i nearest_expiry_from/to (kolone pregleda kompanije).
+    """
+    search_query = params.get('search', '')
+    if search_query:
+        queryset = queryset.filter(
+            Q(name__icontains=search_query) |
+            Q(pib__icontains=search_query) |
+            Q(mb__icontains=search_query) |
+            Q(iaf_eac_codes__iaf_eac_code__iaf_code__icontains=search_query)
+        ).distinct()
+
+    # Date range filter za istek sertifikata (koristi Certificate model)
+    expiry_from = parse_date(params.get('expiry_from'))
+    if expiry_from:
+        queryset = queryset.filter(certificates__expiry_date__gte=expiry_from).distinct()
+
+    expiry_to = parse_date(params.get('expiry_to'))
+    if expiry_to:
+        queryset = queryset.filter(certificates__expiry_date__lte=expiry_to).distinct()
+
+    # Planirani datum bilo kog audita u aktivnom ciklusu (ne samo sledećeg nadzora);
+    # Exists umesto JOIN-a preko ciklusa i audita, pa nema duplikata ni distinct()
+    audit_from = parse_date(params.get('audit_from'))
+    audit_to = parse_date(params.get('audit_to'))
+    if audit_from or audit_to:
+        audits = CycleAudit.objects.filter(
+            certification_cycle__company=OuterRef('pk'), certification_cycle__status='active',
+        )
+        if audit_from:
+            audits = audits.filter(planned_date__gte=audit_from)
+        if audit_to:
+            audits = audits.filter(planned_date__lte=audit_to)
+        queryset = queryset.filter(Exists(audits))
+
+    # Sledeći nadzor i najbliži istek standarda - čitaju kolone pregleda
+    # (company_summary.py) direktno sa kompanije, bez JOIN-a
+    next_audit_from = parse_date(params.get('next_audit_from'))
+    if next_audit_from:
+        queryset = queryset.filter(next_audit_date__gte=next_audit_from)
+
+    next_audit_to = parse_date(params.get('next_audit_to'))
+    if next_audit_to:
+        queryset = queryset.filter(next_audit_date__lte=next_audit_to)
+
+    nearest_expiry_from = parse_date(params.get('nearest_expiry_from'))
+    if nearest_expiry_from:
+        queryset = queryset.filter(nearest_expiry__gte=nearest_expiry_from)
+
+    nearest_expiry_to = parse_date(params.get('nearest_expiry_to'))
+    if nearest_expiry_to:
+        queryset = queryset.filter(nearest_expiry__lte=nearest_expiry_to)
+
+    return queryset
+
+
+def sort_companies(queryset, params):
+    """Redosled liste kompanija prema ?sort= (name, next_audit, expiry); podrazumevano po nazivu"""
+    return queryset.order_by(*COMPANY_SORTS.get(params.get('sort'), COMPANY_SORTS['name']))
+
+
+def filter_cycles(queryset, params):
+    """Filteri za cikluse sertifikacije: company, search, status, audit_from/to"""
+    company_id = params.get('company')
+    if company_id:
+        queryset = queryset.filter(company_id=company_id)
+
+    search_query = params.get('search', '')
+    if search_query:
+        queryset = queryset.filter(
+            Q(company__name__icontains=search_query) |
+            Q(notes__icontains=search_query)
+        )
+
+    status = params.get('status', '')
+    if status:
+        queryset = queryset.filter(status=status)
+
+    audit_from = parse_date(params.get('audit_from'))
+    audit_to = parse_date(params.get('audit_to'))
+    if audit_from or audit_to:
+        audit_filters = Q()
+        if audit_from:
+            audit_filters &= Q(audits__planned_date__gte=audit_from)
+        if audit_to:
+            audit_filters &= Q(audits__planned_date__lte=audit_to)
+        queryset = queryset.filter(audit_filters).distinct()
+
+    return queryset
+
+
+def filter_cycle_audits(queryset, params):
+    """
+    Filteri sa liste audita: company, search, status, date_from/to.
+    audit_from/audit_to se prihvataju kao sinonimi za date_from/date_to.
+    """
+    company_id = params.get('company')
+    if company_id:
+        queryset = queryset.filter(certification_cycle__company_id=company_id)
+
+    search_query = params.get('search', '')
+    if search_query:
+        queryset = queryset.filter(certification_cycle__company__name__icontains=search_query)
+
+    status = params.get('status')
+    if status:
+        queryset = queryset.filter(audit_status=AUDIT_STATUS_MAPPING.get(status, status))
+
+    date_from = parse_date(params.get('date_from') or params.get('audit_from'))
+    if date_from:
+        queryset = queryset.filter(planned_date__gte=date_from)
+
+    date_to = parse_date(params.get('date_to') or params.get('audit_to'))
+    if date_to:
+        queryset = queryset.filter(planned_date__lte=date_to)
+
+    return queryset
+
+
+def filter_audit_days(queryset, params):
+    """Filteri za dane audita - isti parametri kao lista audita, ali nad datumom dana"""
+    company_id = params.get('company')
+    if company_id:
+        queryset = queryset.filter(audit__certification_cycle__company_id=company_id)
+
+    search_query = params.get('search', '')
+    if search_query:
+        queryset = queryset.filter(audit__certification_cycle__company__name__icontains=search_query)
+
+    status = params.get('status')
+    if status:
+        queryset = queryset.filter(audit__audit_status=AUDIT_STATUS_MAPPING.get(status, status))
+
+    date_from = parse_date(params.get('date_from') or params.get('audit_from'))
+    if date_from:
+        queryset = queryset.filter(date__gte=date_from)
+
+    date_to = parse_date(params.get('date_to') or params.get('audit_to'))
+    if date_to:
+        queryset = queryset.filter(date__lte=date_to)
+
+    return queryset
+
+
+def filter_auditors(queryset, params):
+    """Filteri sa liste auditora: search, category, standard, iaf_code"""
+    search_query = params.get('search', '')
+    if search_query:
+        queryset = queryset.filter(
+            Q(ime_prezime__icontains=search_query) |
+            Q(email__icontains=search_query)
+        )
+
+    category = params.get('category')
+    if category:
+        queryset = queryset.filter(kategorija=category)
+
+    standard_id = params.get('standard')
+    if standard_id:
+        queryset = queryset.filter(auditor_standardi__standard_id=standard_id).distinct()
+
+    iaf_code = params.get('iaf_code')
+    if iaf_code:
+        queryset = queryset.filter(
+            auditor_standardi__iaf_eac_links__iaf_eac_code__iaf_code=iaf_code
+        ).distinct()
+
+    return queryset
+
+
+def filter_srbija_tim(queryset, params):
+    """Filteri za Srbija Tim posete: search, status, auditor, date_from/to"""
+    search_query = params.get('search', '')
+    if search_query:
+        queryset = queryset.filter(
+            Q(company__name__icontains=search_query) |
+            Q(certificate_number__icontains=search_query)
+        )
+
+    status = params.get('status')
+    if status:
+        queryset = queryset.filter(status=status)
+
+    auditor_id = params.get('auditor')
+    if auditor_id:
+        queryset = queryset.filter(auditors__id=auditor_id).distinct()
+
+    date_from = parse_date(params.get('date_from'))
+    if date_from:
+        queryset = queryset.filter(visit_date__gte=date_from)
+
+    date_to = parse_date(params.get('date_to'))
+    if date_to:
+        queryset = queryset.filter(visit_date__lte=date_to)
+
+    return queryset
@@ -0,0 +1,208 @@
+"""
+Žive izmene kalendara: Server-Sent Events (SSE) pod ASGI, kratki ?since= upiti pod WSGI.
+
+Signali (company/signals.py) posle commit-a upisuju u CalendarChange koji
+objekat je promenjen (audit, termin, Srbija Tim poseta). Pod ASGI profilom
+(LIVE_UPDATES_MODE='stream') otvoren kalendar drži jednu SSE vezu; stream
+povremeno čita nove redove i šalje delte:
+
+    id: 1234
+    event: change
+    data: {"audits": [12, 15], "appointments": [], "visits": []}
+
+Kalendar tada uklanja događaje tih objekata i dohvata samo njih iz feed-a
+(?audit=12,15), umesto da ponovo učitava ceo kalendar. Ako je klijent
+zaostao više nego što dnevnik pamti (ili je promena previše odjednom),
+šalje se "reset" i kalendar radi jedno puno osvežavanje.
+
+Pod WSGI (podrazumevano, LIVE_UPDATES_MODE='poll') SSE veza bi za sve vreme
+trajanja držala nit gunicorn workera i konekciju iz pool-a, pa se tok ne
+servira; kalendar na svakih LIVE_UPDATES_CLIENT_POLL_SECONDS šalje jedan
+kratak zahtev sa ?since=<poslednji id> i dobija istu deltu kao JSON (poll).
+
+Tabela je zajednička za sve gunicorn workere, pa izmena u jednom procesu
+stiže do kalendara otvorenih preko bilo kog drugog.
+
+Id-jevi se dodeljuju pri INSERT-u, a redovi postaju vidljivi tek posle commit-a,
+pa red sa manjim id-jem može da se pojavi posle reda sa većim. Klijent pamti samo
+poslednji id (?since=), pa bi takav red zauvek preskočio. Zato se čitaju samo
+redovi stariji od LIVE_UPDATES_COMMIT_GRACE_SECONDS: svaki upis je kratak
+autocommit INSERT (posle commit-a izmene), koji se završi u tom roku.
+"""
+import asyncio
+import json
+import time
+from datetime import timedelta
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.db import transaction
+from django.db.models import Max, Min
+from django.utils import timezone
+
+from isoqar_app import metrics
+
+from .calendar_models import CalendarChange
+
+# Posle koliko milisekundi se EventSource ponovo povezuje
+RETRY_MS = 1000
+
+# Najviše redova u jednoj delti; preko toga klijent dobija reset
+MAX_BATCH = 500
+
+# Na svaki PRUNE_EVERY-ti upis brišu se promene starije od LIVE_UPDATES_RETENTION_SECONDS
+PRUNE_EVERY = 200
+
+KIND_FIELDS = {
+    CalendarChange.KIND_AUDIT: 'audits',
+    CalendarChange.KIND_APPOINTMENT: 'appointments',
+    CalendarChange.KIND_VISIT: 'visits',
+}
+
+
+def record(feed, kind, object_id):
+    """Beleži promenu posle commit-a; izmena koja se poništi (rollback) se ne šalje"""
+    if object_id:
+        transaction.on_commit(lambda: _insert(feed, kind, object_id))
+
+
+def _insert(feed, kind, object_id):
+    change = CalendarChange.objects.create(feed=feed, kind=kind, object_id=object_id)
+    if change.id % PRUNE_EVERY == 0:
+        prune()
+
+
+def record_many(feed, kind, object_ids):
+    """Kao record, ali jednim INSERT-om - za masovno kreiranje (bulk_create ne šalje signale)"""
+    object_ids = [object_id for object_id in object_ids if object_id]
+    if object_ids:
+        transaction.on_commit(lambda: _insert_many(feed, kind, object_ids))
+
+
+def _insert_many(feed, kind, object_ids):
+    changes = CalendarChange.objects.bulk_create(
+        [CalendarChange(feed=feed, kind=kind, object_id=object_id) for object_id in object_ids]
+    )
+    if any(change.id and change.id % PRUNE_EVERY == 0 for change in changes):
+        prune()
+
+
+def prune():
+    retention = getattr(settings, 'LIVE_UPDATES_RETENTION_SECONDS', 3600)
+    CalendarChange.objects.filter(created_at__lt=timezone.now() - timedelta(seconds=retention)).delete()
+
+
+def _settled():
+    """Redovi stariji od roka za commit - svi upisi sa manjim id-jem su tada već vidljivi"""
+    grace = getattr(settings, 'LIVE_UPDATES_COMMIT_GRACE_SECONDS', 2)
+    return CalendarChange.objects.filter(created_at__lt=timezone.now() - timedelta(seconds=grace))
+
+
+def latest_id(feed):
+    return _settled().filter(feed=feed).aggregate(last=Max('id'))['last'] or 0
+
+
+def _missed_pruned(last_id):
+    """Da li su obrisane promene koje klijent (last_id) još nije video; id-jevi su zajednički za sve kalendare"""
+    oldest = _settled().aggregate(first=Min('id'))['first']
+    return oldest is not None and oldest > last_id + 1
+
+
+def changes_since(feed, last_id, limit=MAX_BATCH):
+    return list(
+        _settled().filter(feed=feed, id__gt=last_id)
+        .order_by('id')
+        .values_list('id', 'kind', 'object_id')[:limit]
+    )
+
+
+def build_delta(rows):
+    """Redovi dnevnika -> {"audits": [...], "appointments": [...], "visits": [...]} bez duplikata"""
+    delta = {field: set() for field in KIND_FIELDS.values()}
+    for _, kind, object_id in rows:
+        delta[KIND_FIELDS[kind]].add(object_id)
+    return {field: sorted(ids) for field, ids in delta.items()}
+
+
+def parse_ids(value):
+    """'12,15' -> [12, 15]; neispravni delovi se preskaču (parametri ?audit=, ?visit= u feed-ovima)"""
+    return [int(part) for part in (value or '').split(',') if part.strip().isdigit()]
+
+
+def streaming_enabled(request):
+    """SSE tok samo u ASGI profilu; pod WSGI kalendar koristi poll (vidi poll())"""
+    return getattr(settings, 'LIVE_UPDATES_MODE', 'poll') == 'stream' and isinstance(request, ASGIRequest)
+
+
+def client_config(request, feed):
+    """Podešavanja živih izmena za stranicu kalendara (live_calendar.js)"""
+    return {
+        'mode': 'stream' if streaming_enabled(request) else 'poll',
+        'since': latest_id(feed),
+        'poll_ms': int(getattr(settings, 'LIVE_UPDATES_CLIENT_POLL_SECONDS', 15) * 1000),
+    }
+
+
+def _next(feed, last_id):
+    """Jedna provera novih promena -> (događaj ili None, last_id, podaci)"""
+    rows = changes_since(feed, last_id, MAX_BATCH + 1)
+    if len(rows) > MAX_BATCH:
+        return 'reset', latest_id(feed), {}
+    if rows:
+        metrics.inc('isoqar_calendar_live_changes_total', len(rows), feed=feed)
+        return 'change', rows[-1][0], build_delta(rows)
+    return None, last_id, {}
+
+
+def poll(feed, last_id):
+    """Odgovor ?since= upita: {"last_id": ..., "event": "change"|"reset"|null, "data": {...}}"""
+    if last_id is None:
+        return {'last_id': latest_id(feed), 'event': None, 'data': {}}
+    if _missed_pruned(last_id):
+        return {'last_id': latest_id(feed), 'event': 'reset', 'data': {}}
+    event, last_id, data = _next(feed, last_id)
+    return {'last_id': last_id, 'event': event, 'data': data}
+
+
+def _event(name, event_id, data):
+    return f"id: {event_id}\nevent: {name}\ndata: {json.dumps(data)}\n\n"
+
+
+def _timing(duration, poll):
+    duration = getattr(settings, 'LIVE_UPDATES_STREAM_SECONDS', 30) if duration is None else duration
+    poll = getattr(settings, 'LIVE_UPDATES_POLL_SECONDS', 2) if poll is None else poll
+    return time.monotonic() + duration, poll
+
+
+def _open(feed, last_id):
+    """Početak toka -> (tekst, last_id). Bez last_id se kreće od poslednje promene (kalendar je upravo učitan)."""
+    chunk = f"retry: {RETRY_MS}\n\n"
+    if last_id is None:
+        last_id = latest_id(feed)
+    elif _missed_pruned(last_id):
+        last_id = latest_id(feed)
+        chunk += _event('reset', last_id, {})
+    return chunk, last_id
+
+
+def _poll(feed, last_id):
+    """Jedna provera novih promena -> (SSE tekst, last_id)"""
+    event, last_id, data = _next(feed, last_id)
+    if event:
+        return _event(event, last_id, data), last_id
+    # Komentar održava vezu kroz proxy-je i otkriva zatvorene klijente
+    return ": keepalive\n\n", last_id
+
+
+async def astream(feed, last_id=None, duration=None, poll=None):
+    """SSE tok za jedan kalendar pod ASGI - između provera ne zauzima nit ni konekciju"""
+    deadline, poll = _timing(duration, poll)
+    chunk, last_id = await sync_to_async(_open)(feed, last_id)
+    yield chunk
+    while True:
+        chunk, last_id = await sync_to_async(_poll)(feed, last_id)
+        yield chunk
+        if time.monotonic() >= deadline:
+            break
+        await asyncio.sleep(poll)
@@ -0,0 +1,52 @@
+from django.contrib.auth.decorators import login_required
+from django.http import JsonResponse, StreamingHttpResponse
+from django.views.decorators.http import require_GET
+
+from . import live_updates
+from .calendar_models import CalendarChange
+
+FEEDS = {feed for feed, _ in CalendarChange.FEED_CHOICES}
+
+
+def _parse_request(request, last_id):
+    """(feed, last_id) ili JsonResponse sa greškom"""
+    feed = request.GET.get('feed', CalendarChange.FEED_CALENDAR)
+    if feed not in FEEDS:
+        return JsonResponse({'success': False, 'error': 'Nepoznat kalendar.'}, status=400)
+    try:
+        return feed, int(last_id) if last_id not in (None, '') else None
+    except ValueError:
+        return JsonResponse({'success': False, 'error': 'Neispravan Last-Event-ID.'}, status=400)
+
+
+@login_required
+@require_GET
+def calendar_changes_stream(request):
+    """SSE tok promena za ?feed=calendar|srbija_tim; nastavlja od Last-Event-ID ili ?since= (samo ASGI profil)"""
+    if not live_updates.streaming_enabled(request):
+        # Pod WSGI bi veza držala nit workera - klijent koristi calendar_changes (poll)
+        return JsonResponse({'success': False, 'error': 'Tok izmena nije dostupan, koristite ?since= upit.'}, status=404)
+
+    parsed = _parse_request(request, request.headers.get('Last-Event-ID') or request.GET.get('since'))
+    if isinstance(parsed, JsonResponse):
+        return parsed
+    feed, last_id = parsed
+
+    response = StreamingHttpResponse(live_updates.astream(feed, last_id), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    # Nginx ne sme da baferuje SSE odgovor
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
+@login_required
+@require_GET
+def calendar_changes(request):
+    """Promene od ?since= za ?feed=calendar|srbija_tim kao JSON (jedan kratak upit, radi i pod WSGI)"""
+    parsed = _parse_request(request, request.GET.get('since'))
+    if isinstance(parsed, JsonResponse):
+        return parsed
+    feed, last_id = parsed
+    response = JsonResponse(live_updates.poll(feed, last_id))
+    response['Cache-Control'] = 'no-cache'
+    return response
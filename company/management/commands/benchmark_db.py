@@ -0,0 +1,56 @@
+import statistics
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.core.signals import request_finished, request_started
+
+from company.models import Company
+
+
+class Command(BaseCommand):
+    help = (
+        'Meri trošak konekcije ka bazi kroz životni ciklus zahteva (request_started/request_finished) '
+        'sa trenutnim podešavanjima (DB_POOL, DB_CONN_MAX_AGE). Pokreće se više puta sa različitim '
+        'env varijablama protiv iste baze - vidi DEPLOYMENT.md.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=500, help='Broj simuliranih zahteva (podrazumevano 500)')
+        parser.add_argument('--queries', type=int, default=3, help='Broj upita po zahtevu (podrazumevano 3)')
+
+    def handle(self, *args, **options):
+        db = settings.DATABASES['default']
+        if options['requests'] < 1:
+            raise CommandError('--requests mora biti pozitivan broj')
+
+        pool = db.get('OPTIONS', {}).get('pool')
+        mode = 'pool' if pool else f"CONN_MAX_AGE={db.get('CONN_MAX_AGE', 0)}"
+        self.stdout.write(f"{db['ENGINE'].rsplit('.', 1)[-1]} {db.get('HOST') or db['NAME']}, {mode}")
+
+        # Zagrevanje: prva konekcija (i otvaranje pool-a) se ne računa
+        self._request(options['queries'])
+
+        durations = []
+        for _ in range(options['requests']):
+            start = time.perf_counter()
+            self._request(options['queries'])
+            durations.append(time.perf_counter() - start)
+
+        durations.sort()
+        p95 = durations[min(len(durations) - 1, int(len(durations) * 0.95))]
+        self.stdout.write(
+            f"{len(durations)} zahteva x {options['queries']} upita: "
+            f"p50 {statistics.median(durations) * 1000:.2f} ms, p95 {p95 * 1000:.2f} ms, "
+            f"ukupno {sum(durations):.2f} s"
+        )
+
+    def _request(self, queries):
+        """Isto što Django radi oko jednog zahteva: close_old_connections na početku i na kraju"""
+        request_started.send(sender=self.__class__)
+        try:
+            for _ in range(queries):
+                Company.objects.order_by('id').values_list('id', flat=True).first()
+        finally:
+            # CONN_MAX_AGE=0 zatvara konekciju, trajna ostaje otvorena, uz pool se vraća u pool
+            request_finished.send(sender=self.__class__)
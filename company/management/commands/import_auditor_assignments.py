@@ -3,6 +3,7 @@ from django.db import transaction
 from company.auditor_models import Auditor, AuditorStandard, AuditorStandardIAFEACCode
 from company.standard_models import StandardDefinition
 from company.iaf_models import IAFEACCode
+from company import reference_data
 import pandas as pd
 
 
@@ -41,23 +42,13 @@ class Command(BaseCommand):
         Normalizuje EAC kod - dodaje vodeću nulu ako je potrebno.
         Primer: '6a' -> '06a', '7b' -> '07b', '28a' -> '28a'
         """
-        if not eac_code:
-            return eac_code
-        
-        # Izdvoji numerički deo i slovna oznaka
-        import re
-        match = re.match(r'^(\d+)([a-z]*)$', eac_code.lower())
-        if match:
-            number = match.group(1)
-            letter = match.group(2)
-            
-            # Ako je broj jednocifren, dodaj vodeću nulu
-            if len(number) == 1:
-                return f'0{number}{letter}'
-            else:
-                return f'{number}{letter}'
-        
-        # Ako ne odgovara patternu, vrati originalni kod
+        return reference_data.normalize_iaf_code(eac_code)
+
+    def get_eac_code(self, normalized_code):
+        """EAC kod iz registra referentnih podataka (bez upita po kodu)"""
+        eac_code = reference_data.iaf_code_by_code(normalized_code)
+        if eac_code is None:
+            raise IAFEACCode.DoesNotExist(normalized_code)
         return eac_code
 
     def add_arguments(self, parser):
@@ -195,10 +186,9 @@ class Command(BaseCommand):
         Prvo pokušava da pronađe po kodu, zatim kreira ako ne postoji.
         """
         # Pokušaj da pronađeš postojeći standard po kodu
-        try:
-            return StandardDefinition.objects.get(code=standard_code)
-        except StandardDefinition.DoesNotExist:
-            pass
+        standard = reference_data.standard_by_code(standard_code)
+        if standard:
+            return standard
         
         # Ako ne postoji, kreiraj novi standard
         full_name = self.STANDARD_MAPPING.get(standard_code, f'ISO {standard_code}')
@@ -292,7 +282,7 @@ class Command(BaseCommand):
                     # Normalizuj EAC kod (dodaj vodeću nulu ako je potrebno)
                     normalized_code = self.normalize_eac_code(eac_code_str)
                     try:
-                        eac_code = IAFEACCode.objects.get(iaf_code=normalized_code)
+                        eac_code = self.get_eac_code(normalized_code)
                         from company.auditor_models import AuditorIAFEACCode
                         AuditorIAFEACCode.objects.get_or_create(
                             auditor=auditor,
@@ -311,7 +301,7 @@ class Command(BaseCommand):
                 
                 if 'SVI' in standards or 'ALL' in standards:
                     # Dodeli sve standarde
-                    all_standards = StandardDefinition.objects.filter(active=True)
+                    all_standards = reference_data.standards(active=True)
                     for standard in all_standards:
                         auditor_standard, created = AuditorStandard.objects.get_or_create(
                             auditor=auditor,
@@ -327,7 +317,7 @@ class Command(BaseCommand):
                             # Normalizuj EAC kod (dodaj vodeću nulu ako je potrebno)
                             normalized_code = self.normalize_eac_code(eac_code_str)
                             try:
-                                eac_code = IAFEACCode.objects.get(iaf_code=normalized_code)
+                                eac_code = self.get_eac_code(normalized_code)
                                 AuditorStandardIAFEACCode.objects.get_or_create(
                                     auditor_standard=auditor_standard,
                                     iaf_eac_code=eac_code,
@@ -339,7 +329,7 @@ class Command(BaseCommand):
                                     self.style.WARNING(f'    EAC kod "{eac_code_str}" (normalizovan: "{normalized_code}") ne postoji u bazi')
                                 )
                     
-                    self.stdout.write(f'    Dodeljeno: SVI standardi ({all_standards.count()})')
+                    self.stdout.write(f'    Dodeljeno: SVI standardi ({len(all_standards)})')
                 else:
                     # Dodeli specifične standarde
                     for standard_code in standards:
@@ -364,7 +354,7 @@ class Command(BaseCommand):
                                 # Normalizuj EAC kod (dodaj vodeću nulu ako je potrebno)
                                 normalized_code = self.normalize_eac_code(eac_code_str)
                                 try:
-                                    eac_code = IAFEACCode.objects.get(iaf_code=normalized_code)
+                                    eac_code = self.get_eac_code(normalized_code)
                                     AuditorStandardIAFEACCode.objects.get_or_create(
                                         auditor_standard=auditor_standard,
                                         iaf_eac_code=eac_code,
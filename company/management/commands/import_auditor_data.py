@@ -2,6 +2,7 @@ from django.core.management.base import BaseCommand
 from django.db import transaction
 from company.auditor_models import Auditor, AuditorIAFEACCode
 from company.iaf_models import IAFEACCode
+from company import reference_data
 import csv
 
 
@@ -118,7 +119,9 @@ class Command(BaseCommand):
             
             for i, eac_code in enumerate(eac_list):
                 try:
-                    iaf_eac_obj = IAFEACCode.objects.get(iaf_code=eac_code)
+                    iaf_eac_obj = reference_data.iaf_code_by_code(eac_code)
+                    if iaf_eac_obj is None:
+                        raise IAFEACCode.DoesNotExist(eac_code)
                     
                     auditor_iaf, created = AuditorIAFEACCode.objects.get_or_create(
                         auditor=auditor,
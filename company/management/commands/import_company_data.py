@@ -8,6 +8,7 @@ from company.models import (
     Company, CertificationCycle, CycleAudit, CycleStandard,
     StandardDefinition, IAFEACCode, CompanyIAFEACCode, Certificate
 )
+from company import reference_data
 from datetime import datetime
 import openpyxl
 import os
@@ -398,39 +399,11 @@ class Command(BaseCommand):
             
             # Ako je standard_id broj, pokušaj da nađeš po ID-u
             if std_code.isdigit() and len(std_code) < 4:
-                try:
-                    standard_def = StandardDefinition.objects.get(id=int(std_code))
-                except StandardDefinition.DoesNotExist:
-                    pass
+                standard_def = reference_data.standard(std_code)
             
-            # Ako nije pronađen, pokušaj po kodu
+            # Ako nije pronađen, pokušaj po kodu: tačno, 'ISO <kod>', 'ISO<kod>', pa sadržan u kodu
             if not standard_def:
-                try:
-                    # Prvo pokušaj tačno poklapanje
-                    standard_def = StandardDefinition.objects.filter(
-                        code__iexact=std_code
-                    ).first()
-                    
-                    # Pokušaj sa 'ISO ' prefiksom (startswith)
-                    if not standard_def:
-                        standard_def = StandardDefinition.objects.filter(
-                            code__istartswith=f'ISO {std_code}'
-                        ).first()
-                    
-                    # Pokušaj bez razmaka (startswith)
-                    if not standard_def:
-                        standard_def = StandardDefinition.objects.filter(
-                            code__istartswith=f'ISO{std_code}'
-                        ).first()
-                    
-                    # Pokušaj contains kao poslednju opciju
-                    if not standard_def:
-                        standard_def = StandardDefinition.objects.filter(
-                            code__icontains=std_code
-                        ).first()
-                        
-                except StandardDefinition.DoesNotExist:
-                    pass
+                standard_def = reference_data.resolve_standard(std_code)
             
             if standard_def:
                 # Kreiraj vezu između kompanije i standarda
@@ -445,7 +418,7 @@ class Command(BaseCommand):
                 # Ako već postoji, ažuriraj issue_date ako je prosleđen
                 if not created and issue_date and not company_standard.issue_date:
                     company_standard.issue_date = issue_date
-                    company_standard.save(update_fields=['issue_date'])
+                    company_standard.save(update_fields=['issue_date', 'updated_at'])
             else:
                 self.stdout.write(self.style.WARNING(f'      ⚠ Standard "{original_code}" → "{std_code}" nije pronađen'))
                 
@@ -459,15 +432,11 @@ class Command(BaseCommand):
             iaf_code = None
             
             if isinstance(iaf_kod_id, int) or (isinstance(iaf_kod_id, str) and iaf_kod_id.isdigit()):
-                try:
-                    iaf_code = IAFEACCode.objects.get(id=int(iaf_kod_id))
-                except IAFEACCode.DoesNotExist:
-                    pass
+                iaf_code = reference_data.iaf_code(iaf_kod_id)
             
             if not iaf_code and iaf_kod_id:
-                try:
-                    iaf_code = IAFEACCode.objects.get(code__icontains=str(iaf_kod_id))
-                except IAFEACCode.DoesNotExist:
+                iaf_code = reference_data.resolve_iaf_code(str(iaf_kod_id))
+                if not iaf_code:
                     self.stdout.write(self.style.WARNING(f'    IAF kod {iaf_kod_id} nije pronađen'))
                     return
             
@@ -564,7 +533,7 @@ class Command(BaseCommand):
                 # Detektuj da li je integrisani sistem
                 if len(standards_list) > 1:
                     cycle.is_integrated_system = True
-                    cycle.save(update_fields=['is_integrated_system'])
+                    cycle.save(update_fields=['is_integrated_system', 'updated_at'])
             else:
                 self.stdout.write(f'    ⚠️  Ciklus već postoji za {company.name}, datum: {init_reg_date}')
                 
@@ -616,30 +585,9 @@ class Command(BaseCommand):
             if std_code in standard_mapping:
                 std_code = standard_mapping[std_code]
             
-            # Pronađi StandardDefinition
+            # Pronađi StandardDefinition (tačno, 'ISO <kod>', 'ISO<kod>', pa sadržan u kodu)
             try:
-                # Prvo pokušaj tačno poklapanje
-                standard_def = StandardDefinition.objects.filter(
-                    code__iexact=std_code
-                ).first()
-                
-                # Pokušaj sa 'ISO ' prefiksom
-                if not standard_def:
-                    standard_def = StandardDefinition.objects.filter(
-                        code__istartswith=f'ISO {std_code}'
-                    ).first()
-                
-                # Pokušaj bez razmaka
-                if not standard_def:
-                    standard_def = StandardDefinition.objects.filter(
-                        code__istartswith=f'ISO{std_code}'
-                    ).first()
-                
-                # Pokušaj contains (npr. '9001' u 'ISO 9001:2015')
-                if not standard_def:
-                    standard_def = StandardDefinition.objects.filter(
-                        code__icontains=std_code
-                    ).first()
+                standard_def = reference_data.resolve_standard(std_code)
                 
                 if standard_def:
                     # Dodaj standard u cycle
@@ -756,7 +704,7 @@ class Command(BaseCommand):
                 # Ako već postoji, ažuriraj status
                 if not created and cycle.status != cycle_status:
                     cycle.status = cycle_status
-                    cycle.save(update_fields=['status'])
+                    cycle.save(update_fields=['status', 'updated_at'])
                 
                 # Dodaj standarde u ciklus - SAMO standarde specifične za ovaj company_id
                 # (ne sve standarde kompanije, jer kompanija može imati više sertifikata)
@@ -771,7 +719,7 @@ class Command(BaseCommand):
                         # Detektuj da li je integrisani sistem
                         if len(standards_list) > 1:
                             cycle.is_integrated_system = True
-                            cycle.save(update_fields=['is_integrated_system'])
+                            cycle.save(update_fields=['is_integrated_system', 'updated_at'])
                 
                 # Kreiraj prvi nadzorni audit
                 # VAŽNO: Onemogućavamo automatsko kreiranje drugog nadzora tokom importa
@@ -22,6 +22,7 @@ from company.models import (
     Company, CertificationCycle, CycleAudit, StandardDefinition,
     CompanyStandard, CycleStandard, CompanyIAFEACCode
 )
+from company import reference_data
 from datetime import datetime, date
 import openpyxl
 from collections import defaultdict
@@ -319,9 +320,7 @@ class Command(BaseCommand):
                 std_code = standard_mapping[std_code]
             
             # Pronađi standard definiciju
-            standard_def = StandardDefinition.objects.filter(
-                code__icontains=std_code
-            ).first()
+            standard_def = reference_data.resolve_standard(std_code)
             
             if not standard_def:
                 self.log(f'    ⚠️ Standard {std_code} nije pronađen u bazi')
@@ -0,0 +1,151 @@
+import statistics
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import defaultdict
+
+from django.conf import settings
+from django.contrib.auth import BACKEND_SESSION_KEY, HASH_SESSION_KEY, SESSION_KEY, get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.urls import reverse
+
+from company.models import Company
+
+
+class Command(BaseCommand):
+    help = (
+        'Opterećuje kalendarske JSON endpoint-e paralelnim klijentima i meri latenciju. '
+        'Pokreće se protiv servera u WSGI i u ASGI profilu (vidi DEPLOYMENT.md) radi poređenja.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', default='http://127.0.0.1:8000', help='Adresa servera (podrazumevano http://127.0.0.1:8000)')
+        parser.add_argument('--user', required=True, help='Korisnik u čije ime se šalju zahtevi (sesija se kreira u bazi)')
+        parser.add_argument('--concurrency', type=int, default=10, help='Broj paralelnih klijenata (podrazumevano 10)')
+        parser.add_argument('--duration', type=float, default=20.0, help='Trajanje testa u sekundama (podrazumevano 20)')
+        parser.add_argument(
+            '--open-calendars', type=int, default=0,
+            help='Broj otvorenih kalendara (SSE veza) koje se drže za vreme testa, kao planeri koji ceo dan imaju otvoren kalendar'
+        )
+        parser.add_argument('--timeout', type=float, default=30.0, help='Timeout jednog zahteva u sekundama')
+
+    def handle(self, *args, **options):
+        base = options['url'].rstrip('/')
+        cookie = f"{settings.SESSION_COOKIE_NAME}={self._session_key(options['user'])}"
+        endpoints = self._endpoints()
+        deadline = time.monotonic() + options['duration']
+        stop = threading.Event()
+
+        latencies = defaultdict(list)
+        errors = defaultdict(int)
+        lock = threading.Lock()
+
+        def client(offset):
+            i = offset
+            while time.monotonic() < deadline:
+                name, path = endpoints[i % len(endpoints)]
+                i += 1
+                request = urllib.request.Request(base + path, headers={'Cookie': cookie, 'Accept': 'application/json'})
+                start = time.perf_counter()
+                try:
+                    with urllib.request.urlopen(request, timeout=options['timeout']) as response:
+                        response.read()
+                        ok = response.status == 200 and not response.geturl().startswith(base + settings.LOGIN_URL)
+                except (urllib.error.URLError, OSError):
+                    ok = False
+                elapsed = time.perf_counter() - start
+                with lock:
+                    if ok:
+                        latencies[name].append(elapsed)
+                    else:
+                        errors[name] += 1
+
+        def open_calendar():
+            # Drži SSE vezu (i ponovo se povezuje) dok test traje; pod WSGI tok nije
+            # dostupan (404) pa otvoren kalendar periodično poziva poll endpoint
+            stream = reverse('company:calendar_changes_stream') + '?feed=calendar'
+            poll = reverse('company:calendar_changes') + '?feed=calendar&since=0'
+            poll_seconds = settings.LIVE_UPDATES_CLIENT_POLL_SECONDS
+            while not stop.is_set():
+                request = urllib.request.Request(base + stream, headers={'Cookie': cookie, 'Accept': 'text/event-stream'})
+                try:
+                    with urllib.request.urlopen(request, timeout=options['timeout'] + 60) as response:
+                        while not stop.is_set() and response.readline():
+                            pass
+                except urllib.error.HTTPError as exc:
+                    if exc.code != 404:
+                        time.sleep(1)
+                        continue
+                    while not stop.is_set():
+                        request = urllib.request.Request(base + poll, headers={'Cookie': cookie, 'Accept': 'application/json'})
+                        try:
+                            with urllib.request.urlopen(request, timeout=options['timeout']) as response:
+                                response.read()
+                        except (urllib.error.URLError, OSError):
+                            pass
+                        stop.wait(poll_seconds)
+                except (urllib.error.URLError, OSError):
+                    time.sleep(1)
+
+        holders = [threading.Thread(target=open_calendar, daemon=True) for _ in range(options['open_calendars'])]
+        for thread in holders:
+            thread.start()
+        if holders:
+            time.sleep(2)  # da se SSE veze (ili poll petlje) uspostave pre merenja
+
+        started = time.monotonic()
+        deadline = started + options['duration']
+        clients = [threading.Thread(target=client, args=(n,)) for n in range(options['concurrency'])]
+        for thread in clients:
+            thread.start()
+        for thread in clients:
+            thread.join()
+        wall = time.monotonic() - started
+        stop.set()
+
+        self._report(endpoints, latencies, errors, wall, options)
+
+    def _session_key(self, username):
+        """Sesija za korisnika direktno u bazi (isti SESSION_ENGINE kao server)"""
+        from importlib import import_module
+
+        try:
+            user = get_user_model().objects.get(username=username)
+        except get_user_model().DoesNotExist:
+            raise CommandError(f'Korisnik "{username}" ne postoji')
+
+        session = import_module(settings.SESSION_ENGINE).SessionStore()
+        session[SESSION_KEY] = str(user.pk)
+        session[BACKEND_SESSION_KEY] = 'django.contrib.auth.backends.ModelBackend'
+        session[HASH_SESSION_KEY] = user.get_session_auth_hash()
+        session.create()
+        return session.session_key
+
+    def _endpoints(self):
+        company_id = Company.objects.order_by('id').values_list('id', flat=True).first()
+        endpoints = [
+            ('appointment_calendar_json', reverse('company:appointment_calendar_json')),
+            ('srbija_tim_calendar_json', reverse('company:srbija_tim_calendar_json')),
+            ('get_companies', reverse('company:get_companies') + '?term=a'),
+        ]
+        if company_id:
+            endpoints.append(('get_qualified_auditors', reverse('company:qualified_auditors_api') + f'?company_id={company_id}'))
+        return endpoints
+
+    def _report(self, endpoints, latencies, errors, wall, options):
+        total = sum(len(values) for values in latencies.values())
+        self.stdout.write(
+            f"{options['concurrency']} klijenata, {options['open_calendars']} otvorenih kalendara, {wall:.1f} s"
+        )
+        self.stdout.write(f"{'endpoint':32} {'zahteva':>8} {'greške':>7} {'p50 ms':>8} {'p95 ms':>8} {'max ms':>8}")
+        for name, _ in endpoints:
+            values = sorted(latencies[name])
+            if values:
+                p50 = statistics.median(values) * 1000
+                p95 = values[min(len(values) - 1, int(len(values) * 0.95))] * 1000
+                worst = values[-1] * 1000
+                self.stdout.write(f"{name:32} {len(values):8} {errors[name]:7} {p50:8.1f} {p95:8.1f} {worst:8.1f}")
+            else:
+                self.stdout.write(f"{name:32} {0:8} {errors[name]:7} {'-':>8} {'-':>8} {'-':>8}")
+        self.stdout.write(self.style.SUCCESS(f"Ukupno {total} uspešnih zahteva, {total / wall:.1f} zahteva/s"))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from company import company_summary
+
+
+class Command(BaseCommand):
+    help = 'Preračunava pregled kompanija (sledeći audit, aktivni ciklus, najbliži istek)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('company_ids', nargs='*', type=int, help='ID-jevi kompanija (podrazumevano sve)')
+
+    def handle(self, *args, **options):
+        count = company_summary.refresh(options['company_ids'] or None)
+        self.stdout.write(self.style.SUCCESS(f'Osvežen pregled za {count} kompanija'))
@@ -0,0 +1,74 @@
+import signal
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from company import jobs
+from isoqar_app import metrics
+
+
+class Command(BaseCommand):
+    help = 'Pokreće worker koji izvršava poslove iz lokalnog reda (BackgroundJob)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Izvrši sve dospele poslove i izađi'
+        )
+        parser.add_argument(
+            '--sleep',
+            type=float,
+            default=2.0,
+            help='Pauza u sekundama kada je red prazan (podrazumevano 2)'
+        )
+        parser.add_argument(
+            '--max-jobs',
+            type=int,
+            default=None,
+            help='Izađi nakon ovoliko izvršenih poslova (korisno za periodični restart)'
+        )
+        parser.add_argument(
+            '--worker-id',
+            type=str,
+            default=None,
+            help='Identifikator worker-a (podrazumevano host:pid)'
+        )
+
+    def handle(self, *args, **options):
+        worker_id = options['worker_id'] or jobs.default_worker_id()
+        max_jobs = options['max_jobs']
+        self._stop = False
+
+        def request_stop(signum, frame):
+            self.stdout.write(self.style.WARNING('Zaustavljanje nakon tekućeg posla...'))
+            self._stop = True
+
+        signal.signal(signal.SIGTERM, request_stop)
+        signal.signal(signal.SIGINT, request_stop)
+
+        jobs.requeue_stale_jobs()
+        self.stdout.write(self.style.SUCCESS(f'Worker {worker_id} pokrenut'))
+
+        processed = 0
+        while not self._stop:
+            close_old_connections()
+            job = jobs.claim_next_job(worker_id)
+
+            if job is None:
+                if options['once']:
+                    break
+                time.sleep(options['sleep'])
+                continue
+
+            self.stdout.write(f'Posao #{job.pk} ({job.task})...')
+            job = jobs.run_job(job)
+            self.stdout.write(f'  -> {job.get_status_display()}')
+            metrics.store.flush()
+
+            processed += 1
+            if max_jobs is not None and processed >= max_jobs:
+                break
+
+        self.stdout.write(self.style.SUCCESS(f'Worker {worker_id} završio, izvršeno poslova: {processed}'))
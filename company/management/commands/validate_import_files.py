@@ -2,7 +2,7 @@
 Django management command za validaciju Excel fajlova pre importa
 """
 from django.core.management.base import BaseCommand
-from company.models import StandardDefinition, IAFEACCode
+from company import reference_data
 import openpyxl
 import os
 from datetime import datetime
@@ -251,9 +251,9 @@ class Command(BaseCommand):
         """Proveri da li standard postoji u bazi"""
         try:
             if isinstance(standard_id, int) or (isinstance(standard_id, str) and standard_id.isdigit()):
-                return StandardDefinition.objects.filter(id=int(standard_id)).exists()
+                return reference_data.standard(standard_id) is not None
             else:
-                return StandardDefinition.objects.filter(code__icontains=str(standard_id)).exists()
+                return reference_data.resolve_standard(standard_id) is not None
         except:
             return False
 
@@ -261,9 +261,9 @@ class Command(BaseCommand):
         """Proveri da li IAF kod postoji u bazi"""
         try:
             if isinstance(iaf_kod_id, int) or (isinstance(iaf_kod_id, str) and iaf_kod_id.isdigit()):
-                return IAFEACCode.objects.filter(id=int(iaf_kod_id)).exists()
+                return reference_data.iaf_code(iaf_kod_id) is not None
             else:
-                return IAFEACCode.objects.filter(code__icontains=str(iaf_kod_id)).exists()
+                return reference_data.resolve_iaf_code(iaf_kod_id) is not None
         except:
             return False
 
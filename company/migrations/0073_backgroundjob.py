@@ -0,0 +1,45 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:15
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('company', '0072_add_certificate_status_to_companystandard'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BackgroundJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('task', models.CharField(max_length=100, verbose_name='Zadatak')),
+                ('kwargs', models.JSONField(blank=True, default=dict, verbose_name='Parametri')),
+                ('status', models.CharField(choices=[('queued', 'Na čekanju'), ('running', 'U toku'), ('succeeded', 'Uspešno'), ('failed', 'Neuspešno'), ('cancelled', 'Otkazano')], default='queued', max_length=20, verbose_name='Status')),
+                ('progress', models.PositiveSmallIntegerField(default=0, verbose_name='Napredak (%)')),
+                ('progress_message', models.CharField(blank=True, default='', max_length=255, verbose_name='Poruka o napretku')),
+                ('result', models.JSONField(blank=True, null=True, verbose_name='Rezultat')),
+                ('error', models.TextField(blank=True, default='', verbose_name='Greška')),
+                ('attempts', models.PositiveSmallIntegerField(default=0, verbose_name='Broj pokušaja')),
+                ('max_attempts', models.PositiveSmallIntegerField(default=3, verbose_name='Maksimalan broj pokušaja')),
+                ('run_after', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Pokreni posle')),
+                ('worker_id', models.CharField(blank=True, default='', max_length=100, verbose_name='Worker')),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Kreirano')),
+                ('started_at', models.DateTimeField(blank=True, null=True, verbose_name='Započeto')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='Završeno')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Ažurirano')),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='background_jobs', to=settings.AUTH_USER_MODEL, verbose_name='Pokrenuo')),
+            ],
+            options={
+                'verbose_name': 'Pozadinski posao',
+                'verbose_name_plural': 'Pozadinski poslovi',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['status', 'run_after'], name='job_status_run_after_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('company', '0073_backgroundjob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='auditday',
+            name='version',
+            field=models.PositiveIntegerField(default=1, editable=False, verbose_name='Verzija'),
+        ),
+        migrations.AddField(
+            model_name='cycleaudit',
+            name='version',
+            field=models.PositiveIntegerField(default=1, editable=False, verbose_name='Verzija'),
+        ),
+        migrations.AddField(
+            model_name='srbijatim',
+            name='version',
+            field=models.PositiveIntegerField(default=1, editable=False, verbose_name='Verzija'),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:46
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('company', '0074_schedule_versions'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CalendarChange',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('feed', models.CharField(choices=[('calendar', 'Kalendar audita'), ('srbija_tim', 'Srbija Tim kalendar')], max_length=20, verbose_name='Kalendar')),
+                ('kind', models.CharField(choices=[('audit', 'Audit'), ('appointment', 'Termin'), ('visit', 'Srbija Tim poseta')], max_length=20, verbose_name='Vrsta objekta')),
+                ('object_id', models.PositiveIntegerField(verbose_name='ID objekta')),
+                ('created_at', models.DateTimeField(db_index=True, default=django.utils.timezone.now, verbose_name='Vreme promene')),
+            ],
+            options={
+                'verbose_name': 'Promena kalendara',
+                'verbose_name_plural': 'Promene kalendara',
+                'ordering': ['id'],
+                'indexes': [models.Index(fields=['feed', 'id'], name='calendar_change_feed_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:59
+
+from django.db import migrations, models
+
+
+def fill_displays(apps, schema_editor):
+    SrbijaTim = apps.get_model('company', 'SrbijaTim')
+    visits = list(SrbijaTim.objects.prefetch_related('standards', 'auditors'))
+    for visit in visits:
+        visit.standards_display = ", ".join(std.code for std in visit.standards.all())[:500]
+        visit.auditors_display = ", ".join(auditor.ime_prezime for auditor in visit.auditors.all())[:500]
+    SrbijaTim.objects.bulk_update(visits, ['standards_display', 'auditors_display'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('company', '0075_calendar_changes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='srbijatim',
+            name='auditors_display',
+            field=models.CharField(blank=True, default='', editable=False, max_length=500, verbose_name='Auditori (prikaz)'),
+        ),
+        migrations.AddField(
+            model_name='srbijatim',
+            name='standards_display',
+            field=models.CharField(blank=True, default='', editable=False, max_length=500, verbose_name='Standardi (prikaz)'),
+        ),
+        migrations.RunPython(fill_displays, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,72 @@
+# Generated by Django 5.2.18 on 2026-10-19 15:43
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Min, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def fill_summary(apps, schema_editor):
+    Company = apps.get_model('company', 'Company')
+    CertificationCycle = apps.get_model('company', 'CertificationCycle')
+    CycleAudit = apps.get_model('company', 'CycleAudit')
+    CompanyStandard = apps.get_model('company', 'CompanyStandard')
+    next_audit = (
+        CycleAudit.objects
+        .filter(
+            certification_cycle__company=OuterRef('pk'),
+            certification_cycle__status='active',
+            audit_status__in=('planned', 'scheduled'),
+        )
+        .order_by('planned_date', 'pk')
+    )
+    active_cycle = (
+        CertificationCycle.objects
+        .filter(company=OuterRef('pk'), status='active')
+        .order_by('-planirani_datum', '-pk')
+    )
+    nearest_expiry = (
+        CompanyStandard.objects
+        .filter(company=OuterRef('pk'), expiry_date__isnull=False)
+        .order_by()
+        .values('company')
+        .annotate(nearest=Min('expiry_date'))
+        .values('nearest')
+    )
+    Company.objects.update(
+        next_audit_date=Subquery(next_audit.values('planned_date')[:1]),
+        next_audit_type=Coalesce(Subquery(next_audit.values('audit_type')[:1]), Value('')),
+        active_cycle=Subquery(active_cycle.values('pk')[:1]),
+        nearest_expiry=Subquery(nearest_expiry[:1]),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('company', '0076_srbija_tim_displays'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='company',
+            name='active_cycle',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='company.certificationcycle', verbose_name='Aktivni ciklus'),
+        ),
+        migrations.AddField(
+            model_name='company',
+            name='nearest_expiry',
+            field=models.DateField(blank=True, db_index=True, editable=False, null=True, verbose_name='Najbliži istek sertifikata'),
+        ),
+        migrations.AddField(
+            model_name='company',
+            name='next_audit_date',
+            field=models.DateField(blank=True, db_index=True, editable=False, null=True, verbose_name='Sledeći audit'),
+        ),
+        migrations.AddField(
+            model_name='company',
+            name='next_audit_type',
+            field=models.CharField(blank=True, default='', editable=False, max_length=20, verbose_name='Tip sledećeg audita'),
+        ),
+        migrations.RunPython(fill_summary, migrations.RunPython.noop),
+    ]
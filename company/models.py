@@ -33,6 +33,7 @@ from .auditor_models import (
 from .calendar_models import (
     CalendarEvent,
     Appointment,
+    CalendarChange,
 )
 
 # Import certification cycle models
@@ -52,3 +53,8 @@ from .srbija_tim_models import (
 from .certificate_models import (
     Certificate,
 )
+
+# Import background job models
+from .job_models import (
+    BackgroundJob,
+)
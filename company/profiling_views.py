@@ -0,0 +1,32 @@
+"""
+Admin stranica sa profilima SQL upita poslednjih zahteva (vidi isoqar_app/sql_profiler.py)
+"""
+from django.contrib import admin, messages
+from django.contrib.admin.views.decorators import staff_member_required
+from django.conf import settings
+from django.shortcuts import redirect, render
+
+from isoqar_app.sql_profiler import RECENT_PROFILES
+
+
+@staff_member_required
+def sql_profile(request):
+    if request.method == 'POST' and request.POST.get('action') == 'clear':
+        RECENT_PROFILES.clear()
+        messages.success(request, 'Profili su obrisani.')
+        return redirect('sql_profile')
+
+    profiles = RECENT_PROFILES.items()
+    sort = request.GET.get('sort')
+    if sort in ('count', 'db_ms', 'duplicate_count'):
+        profiles.sort(key=lambda p: p[sort], reverse=True)
+
+    context = {
+        **admin.site.each_context(request),
+        'title': 'SQL profil zahteva',
+        'profiles': profiles,
+        'sort': sort,
+        'profiling_enabled': getattr(settings, 'SQL_PROFILING', False),
+        'buffer_size': getattr(settings, 'SQL_PROFILING_BUFFER_SIZE', 200),
+    }
+    return render(request, 'admin/sql_profile.html', context)
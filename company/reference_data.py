@@ -0,0 +1,315 @@
+"""
+Registar referentnih podataka: definicije standarda, IAF/EAC kodovi i IAF
+Scope Reference.
+
+Ovi podaci se retko menjaju, a koriste se na skoro svakoj strani i formi
+(padajući filteri, forme ciklusa, standarda i Srbija Tim poseta, import
+komande). Svaki proces ih drži u memoriji (snapshot) zajedno sa verzijom
+pročitanom iz keša; dok se verzija ne promeni, pretraga po id-u/kodu i
+liste za forme ne izvršavaju nijedan upit:
+
+    reference_data.standards(active=True)      # lista po kodu
+    reference_data.standard(pk)                # ili None
+    reference_data.resolve_standard('9001')    # 'ISO 9001:2015'
+    reference_data.resolve_iaf_code('6a')      # '06a'
+
+Izmena (signali u company/signals.py) odmah poništava snapshot u tekućem
+procesu, a posle commit-a povećava verziju u deljenom kešu (CACHES u
+settings.py: Redis ili tabela u bazi). Proces verziju proverava najviše jednom
+u REFERENCE_DATA_VERSION_CHECK_SECONDS (uz DatabaseCache je svaka provera upit),
+pa ostali procesi vide izmenu najkasnije posle tog roka. REFERENCE_DATA_MAX_AGE je samo gornja granica ako verzija
+ispadne iz keša (LRU) ili keš nije deljen (LocMem u lokalnom razvoju).
+
+Snapshot dele sve niti procesa. Pojedinačni objekti (standard(), iaf_code(),
+resolve_*, *_by_code i vrednosti ReferenceChoiceField-a) se vraćaju kao kopije,
+pa ih pozivalac sme menjati i dodeljivati FK poljima. Liste (standards(),
+iaf_codes(), scope_references()) sadrže deljene instance i služe samo za
+čitanje (opcije formi, prikaz); objekat koji se menja treba uzeti preko pk.
+Isto važi za povezane objekte kopije (iaf_code().iaf_scope_reference).
+
+ReferenceChoiceField / ReferenceMultipleChoiceField su polja formi sa
+opcijama iz registra (renderovanje i validacija bez upita).
+"""
+import copy
+import re
+import threading
+import time
+
+from django import forms
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db import models, transaction
+from django.forms.models import ModelChoiceIterator
+
+from isoqar_app import metrics
+
+from .iaf_models import IAFEACCode, IAFScopeReference
+from .standard_models import StandardDefinition
+
+VERSION_KEY = 'reference_data:version'
+
+_snapshot = None
+_lock = threading.Lock()
+
+
+def _new_version():
+    # Nova vrednost (a ne 1) kada verzije nema u kešu: posle brisanja keša svi procesi se osvežavaju
+    return time.time_ns()
+
+
+def version():
+    value = cache.get(VERSION_KEY)
+    if value is None:
+        cache.add(VERSION_KEY, _new_version(), None)
+        value = cache.get(VERSION_KEY)
+    return value
+
+
+def bump_version():
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.set(VERSION_KEY, _new_version(), None)
+
+
+def invalidate():
+    """Poništava registar: odmah u ovom procesu, u ostalim posle commit-a"""
+    global _snapshot
+    _snapshot = None
+    transaction.on_commit(bump_version)
+
+
+class _Snapshot:
+    def __init__(self, version):
+        self.version = version
+        self.loaded_at = self.checked_at = time.monotonic()
+
+        self.standards = list(StandardDefinition.objects.order_by('code'))
+        self.iaf_codes = list(IAFEACCode.objects.select_related('iaf_scope_reference').order_by('iaf_code'))
+        self.scope_references = list(IAFScopeReference.objects.order_by('reference'))
+
+        self.standards_by_id = {standard.pk: standard for standard in self.standards}
+        self.iaf_codes_by_id = {code.pk: code for code in self.iaf_codes}
+        self.scope_references_by_id = {scope.pk: scope for scope in self.scope_references}
+        # Kod nije jedinstven kod IAF/EAC kodova - važi prvi po redosledu (kao .first())
+        self.standards_by_code = {}
+        for standard in self.standards:
+            self.standards_by_code.setdefault(standard.code.casefold(), standard)
+        self.iaf_codes_by_code = {}
+        for code in self.iaf_codes:
+            self.iaf_codes_by_code.setdefault(code.iaf_code.casefold(), code)
+        self.scope_references_by_reference = {scope.reference.casefold(): scope for scope in self.scope_references}
+
+    def is_fresh(self):
+        return time.monotonic() - self.loaded_at < getattr(settings, 'REFERENCE_DATA_MAX_AGE', 300)
+
+    def is_current(self, version):
+        return self.version == version and self.is_fresh()
+
+    def was_checked_recently(self):
+        return time.monotonic() - self.checked_at < getattr(settings, 'REFERENCE_DATA_VERSION_CHECK_SECONDS', 5)
+
+
+def _current():
+    global _snapshot
+    snapshot = _snapshot
+    # Između provera verzije se ne čita ni keš
+    if snapshot is not None and snapshot.was_checked_recently() and snapshot.is_fresh():
+        metrics.record_cache('reference_data', hit=True)
+        return snapshot
+
+    current_version = version()
+    hit = snapshot is not None and snapshot.is_current(current_version)
+    metrics.record_cache('reference_data', hit=hit)
+    if hit:
+        snapshot.checked_at = time.monotonic()
+    else:
+        with _lock:
+            snapshot = _snapshot
+            if snapshot is None or not snapshot.is_current(current_version):
+                snapshot = _snapshot = _Snapshot(current_version)
+    return snapshot
+
+
+def _own(obj):
+    """Kopija deljene instance iz snapshot-a (ili None)"""
+    return copy.copy(obj) if obj is not None else None
+
+
+def _to_int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+# Definicije standarda
+
+def standards(active=None):
+    """Standardi po kodu; active=True samo aktivni"""
+    items = _current().standards
+    if active is None:
+        return list(items)
+    return [standard for standard in items if standard.active == active]
+
+
+def active_standards():
+    return standards(active=True)
+
+
+def standard(pk):
+    return _own(_current().standards_by_id.get(_to_int(pk)))
+
+
+def standard_by_code(code):
+    return _own(_current().standards_by_code.get(str(code).strip().casefold()))
+
+
+def resolve_standard(value):
+    """
+    Standard iz koda kakav dolazi iz import fajlova: tačan kod, pa 'ISO <kod>...',
+    'ISO<kod>...' i na kraju kod sadržan u kodu standarda ('9001' -> 'ISO 9001:2015').
+    """
+    value = str(value or '').strip().casefold()
+    if not value:
+        return None
+    snapshot = _current()
+    found = snapshot.standards_by_code.get(value)
+    if found:
+        return _own(found)
+    for matches in (
+        lambda code: code.startswith(f'iso {value}'),
+        lambda code: code.startswith(f'iso{value}'),
+        lambda code: value in code,
+    ):
+        for item in snapshot.standards:
+            if matches(item.code.casefold()):
+                return _own(item)
+    return None
+
+
+# IAF/EAC kodovi
+
+def normalize_iaf_code(code):
+    """Dodaje vodeću nulu jednocifrenom kodu: '6a' -> '06a', '28a' -> '28a'"""
+    if not code:
+        return code
+    match = re.match(r'^(\d+)([a-z]*)$', str(code).strip().lower())
+    if not match:
+        return code
+    number, letter = match.groups()
+    return f'{number.zfill(2)}{letter}'
+
+
+def iaf_codes():
+    """IAF/EAC kodovi po kodu (sa učitanim iaf_scope_reference)"""
+    return list(_current().iaf_codes)
+
+
+def iaf_code(pk):
+    return _own(_current().iaf_codes_by_id.get(_to_int(pk)))
+
+
+def iaf_code_by_code(code):
+    return _own(_current().iaf_codes_by_code.get(str(code).strip().casefold()))
+
+
+def resolve_iaf_code(value):
+    """IAF/EAC kod po tačnom ili normalizovanom kodu ('6a' -> '06a')"""
+    if value in (None, ''):
+        return None
+    return iaf_code_by_code(value) or iaf_code_by_code(normalize_iaf_code(str(value)))
+
+
+# IAF Scope Reference
+
+def scope_references():
+    return list(_current().scope_references)
+
+
+def scope_reference(pk):
+    return _own(_current().scope_references_by_id.get(_to_int(pk)))
+
+
+def scope_reference_by_reference(reference):
+    return _own(_current().scope_references_by_reference.get(str(reference).strip().casefold()))
+
+
+# Polja formi
+
+class ReferenceChoiceIterator(ModelChoiceIterator):
+    """Opcije iz liste objekata polja umesto iz queryset-a"""
+
+    def __iter__(self):
+        if self.field.empty_label is not None:
+            yield ('', self.field.empty_label)
+        for obj in self.field.get_objects():
+            yield self.choice(obj)
+
+    def __len__(self):
+        return len(self.field.get_objects()) + (self.field.empty_label is not None)
+
+    def __bool__(self):
+        return self.field.empty_label is not None or bool(self.field.get_objects())
+
+
+class ReferenceChoicesMixin:
+    iterator = ReferenceChoiceIterator
+
+    def __init__(self, objects, **kwargs):
+        # objects: lista ili funkcija registra (npr. active_standards) koja se poziva pri renderovanju
+        self.objects = objects
+        super().__init__(queryset=None, **kwargs)
+
+    def get_objects(self):
+        return self.objects() if callable(self.objects) else self.objects
+
+    def _lookup(self, value):
+        if isinstance(value, models.Model):
+            value = value.pk
+        for obj in self.get_objects():
+            if str(obj.pk) == str(value):
+                # cleaned_data ide u model (FK, save) - ne sme biti deljena instanca registra
+                return copy.copy(obj)
+        raise ValidationError(self.error_messages['invalid_choice'], code='invalid_choice', params={'value': value})
+
+
+class ReferenceChoiceField(ReferenceChoicesMixin, forms.ModelChoiceField):
+    def to_python(self, value):
+        if value in self.empty_values:
+            return None
+        return self._lookup(value)
+
+
+class ReferenceMultipleChoiceField(ReferenceChoicesMixin, forms.ModelMultipleChoiceField):
+    def clean(self, value):
+        value = self.prepare_value(value)
+        if self.required and not value:
+            raise ValidationError(self.error_messages['required'], code='required')
+        if not value:
+            return []
+        if not isinstance(value, (list, tuple)):
+            raise ValidationError(self.error_messages['invalid_list'], code='invalid_list')
+        objects = self._check_values(value)
+        self.run_validators(value)
+        return objects
+
+    def _check_values(self, value):
+        return [self._lookup(pk) for pk in dict.fromkeys(str(pk) for pk in value)]
+
+
+def reference_field(field, objects):
+    """Zamenjuje ModelChoiceField/ModelMultipleChoiceField forme poljem sa opcijama iz registra"""
+    kwargs = {
+        'required': field.required,
+        'widget': field.widget,
+        'label': field.label,
+        'initial': field.initial,
+        'help_text': field.help_text,
+        'error_messages': field.error_messages,
+        'disabled': field.disabled,
+    }
+    if isinstance(field, forms.ModelMultipleChoiceField):
+        return ReferenceMultipleChoiceField(objects, **kwargs)
+    return ReferenceChoiceField(objects, empty_label=field.empty_label, **kwargs)
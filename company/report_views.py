@@ -0,0 +1,80 @@
+"""
+View-ovi za PDF izveštaje. Renderovanje se radi u redu poslova (vidi reports.py);
+dok PDF nije spreman vraća se 202 (JSON za AJAX, stranica sa auto-osvežavanjem za browser).
+"""
+import logging
+
+from django.contrib.auth.decorators import login_required
+from django.http import FileResponse, JsonResponse
+from django.shortcuts import get_object_or_404, render
+from django.views.decorators.http import require_GET
+
+from . import reports
+from .company_models import Company
+
+logger = logging.getLogger(__name__)
+
+# Koliko sekundi klijent čeka pre ponovnog pokušaja
+REPORT_RETRY_AFTER = 3
+
+
+def _report_response(request, name, scope, html, filename, title):
+    try:
+        status, result = reports.request_report(name, scope, html)
+    except reports.ReportUnavailable as e:
+        logger.error(f"PDF izveštaj {name} nije dostupan: {e}")
+        return JsonResponse({'success': False, 'error': 'Generisanje PDF izveštaja nije dostupno na serveru.'}, status=503)
+
+    if status == reports.STATUS_READY:
+        try:
+            return FileResponse(open(result, 'rb'), filename=filename, content_type='application/pdf')
+        except FileNotFoundError:
+            # Signal je obrisao fajl između provere i otvaranja - renderuje se ponovo
+            reports.schedule_render(name, scope, html)
+            status = reports.STATUS_PENDING
+
+    if status == reports.STATUS_ERROR:
+        return JsonResponse({'success': False, 'error': f'Greška pri generisanju izveštaja: {result}'}, status=500)
+
+    if request.headers.get('x-requested-with') == 'XMLHttpRequest' or request.GET.get('format') == 'json':
+        response = JsonResponse({
+            'success': True,
+            'status': reports.STATUS_PENDING,
+            'message': 'Izveštaj se generiše, pokušajte ponovo za nekoliko sekundi.',
+        }, status=202)
+    else:
+        response = render(request, 'reports/report_pending.html', {
+            'title': title,
+            'retry_after': REPORT_RETRY_AFTER,
+        }, status=202)
+    response['Retry-After'] = str(REPORT_RETRY_AFTER)
+    return response
+
+
+@login_required
+@require_GET
+def company_audit_program_pdf(request, pk):
+    """Program audita kompanije u PDF formatu"""
+    company = get_object_or_404(Company, pk=pk)
+    html = reports.build_audit_program_html(company)
+    return _report_response(
+        request, reports.REPORT_AUDIT_PROGRAM, company.pk, html,
+        filename=f'program-audita-{company.pk}.pdf',
+        title=f'Program audita - {company.name}',
+    )
+
+
+@login_required
+@require_GET
+def certificate_expiry_pdf(request):
+    """Pregled sertifikata koji ističu u narednih ?days= dana (podrazumevano 90)"""
+    try:
+        days = max(1, min(int(request.GET.get('days', 90)), 730))
+    except ValueError:
+        days = 90
+    html = reports.build_certificate_expiry_html(days)
+    return _report_response(
+        request, reports.REPORT_CERTIFICATE_EXPIRY, days, html,
+        filename=f'istek-sertifikata-{days}-dana.pdf',
+        title=f'Istek sertifikata - narednih {days} dana',
+    )
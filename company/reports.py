@@ -0,0 +1,185 @@
+"""
+PDF izveštaji (program audita kompanije, istek sertifikata).
+
+HTML se renderuje u request thread-u (brzo, samo template), a WeasyPrint
+konverzija u PDF (sporo, nekoliko sekundi) ide u red poslova kao zadatak
+'report.render' (company/jobs.py) koji izvršava `run_worker` proces, tako da
+gunicorn worker odmah vraća odgovor i ne deli CPU sa renderovanjem.
+
+Gotovi PDF-ovi se čuvaju na disku pod imenom <izveštaj>-<scope>-<hash>.pdf,
+gde je hash SHA-256 renderovanog HTML-a. Isti sadržaj se nikad ne renderuje
+dva puta, a fajl je vidljiv svim worker procesima. Promena ciklusa, audita
+ili standarda menja HTML (pa i hash), a signali dodatno brišu zastarele fajlove.
+"""
+import glob
+import hashlib
+import logging
+import importlib.util
+import os
+import threading
+from datetime import date, timedelta
+
+from django.conf import settings
+from django.template.loader import render_to_string
+
+from isoqar_app import metrics
+
+from . import jobs
+from .job_models import BackgroundJob
+
+logger = logging.getLogger(__name__)
+
+REPORT_AUDIT_PROGRAM = 'audit-program'
+REPORT_CERTIFICATE_EXPIRY = 'certificate-expiry'
+
+STATUS_READY = 'ready'
+STATUS_PENDING = 'pending'
+STATUS_ERROR = 'error'
+
+RENDER_TASK = 'report.render'
+
+
+class ReportUnavailable(Exception):
+    """PDF renderer (WeasyPrint) nije instaliran u ovom okruženju"""
+
+
+def report_dir():
+    path = getattr(settings, 'REPORTS_ROOT', os.path.join(settings.MEDIA_ROOT, 'reports'))
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def content_hash(html):
+    return hashlib.sha256(html.encode('utf-8')).hexdigest()[:24]
+
+
+def report_path(name, scope, html):
+    return os.path.join(report_dir(), f'{name}-{scope}-{content_hash(html)}.pdf')
+
+
+def renderer_available():
+    return importlib.util.find_spec('weasyprint') is not None
+
+
+def html_to_pdf(html):
+    """Konverzija HTML -> PDF bajtovi (WeasyPrint)"""
+    try:
+        from weasyprint import HTML
+    except ImportError as e:
+        raise ReportUnavailable('WeasyPrint nije instaliran') from e
+    return HTML(string=html, base_url=str(settings.BASE_DIR)).write_pdf()
+
+
+def render_to_file(name, scope, html, path):
+    pdf = html_to_pdf(html)
+
+    # Atomski upis: drugi worker nikad ne vidi polu-upisan fajl
+    tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(pdf)
+    os.replace(tmp_path, path)
+
+    # Stare verzije istog izveštaja više nisu potrebne
+    for stale in glob.glob(os.path.join(report_dir(), f'{name}-{scope}-*.pdf')):
+        if stale != path:
+            _remove(stale)
+
+    logger.info(f"PDF izveštaj {name} ({scope}) generisan: {os.path.basename(path)}")
+    return path
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def request_report(name, scope, html):
+    """
+    Vraća (status, putanja ili poruka greške).
+
+    Ako PDF za ovaj sadržaj već postoji vraća STATUS_READY, inače upisuje
+    posao u red (samo jednom po sadržaju) i vraća STATUS_PENDING.
+    """
+    path = report_path(name, scope, html)
+    if os.path.exists(path):
+        metrics.record_cache('report_pdf', hit=True)
+        return STATUS_READY, path
+    if not renderer_available():
+        raise ReportUnavailable('WeasyPrint nije instaliran')
+
+    digest = content_hash(html)
+    job = (
+        BackgroundJob.objects
+        .filter(task=RENDER_TASK, kwargs__report=name, kwargs__scope=scope, kwargs__hash=digest)
+        .order_by('-created_at', '-pk')
+        .first()
+    )
+    if job is not None and not job.is_finished:
+        return STATUS_PENDING, None
+    if job is not None and job.status == BackgroundJob.STATUS_FAILED:
+        # Poslednji red traceback-a je poruka izuzetka
+        error = (job.error.strip().splitlines() or [''])[-1]
+        logger.error(f"Greška pri generisanju PDF izveštaja {name} ({scope}): {error}")
+        return STATUS_ERROR, error
+
+    # Nema posla, ili je fajl u međuvremenu invalidiran - renderuje se ponovo
+    schedule_render(name, scope, html)
+    return STATUS_PENDING, None
+
+
+def schedule_render(name, scope, html):
+    metrics.record_cache('report_pdf', hit=False)
+    return jobs.enqueue(RENDER_TASK, max_attempts=2, report=name, scope=scope, hash=content_hash(html))
+
+
+def invalidate(name, scope='*'):
+    """Obriši keširane PDF-ove za izveštaj (i opciono za konkretan scope)"""
+    for path in glob.glob(os.path.join(report_dir(), f'{name}-{scope}-*.pdf')):
+        _remove(path)
+
+
+def invalidate_company(company_id):
+    invalidate(REPORT_AUDIT_PROGRAM, company_id)
+
+
+def build_audit_program_html(company):
+    """HTML programa audita za kompaniju - svi aktivni ciklusi sa auditima"""
+    from .cycle_models import CertificationCycle
+
+    cycles = (
+        CertificationCycle.objects.filter(company=company, status='active')
+        .prefetch_related(
+            'cycle_standards__standard_definition',
+            'audits__lead_auditor',
+            'audits__audit_team',
+            'audits__audit_days',
+        )
+        .order_by('planirani_datum')
+    )
+    return render_to_string('reports/audit_program.html', {
+        'company': company,
+        'cycles': cycles,
+        'standards': company.company_standards.select_related('standard_definition').order_by('expiry_date'),
+        'report_date': date.today(),
+    })
+
+
+def build_certificate_expiry_html(days):
+    """HTML pregleda sertifikata koji ističu u narednih `days` dana"""
+    from .standard_models import CompanyStandard
+
+    today = date.today()
+    until = today + timedelta(days=days)
+    standards = (
+        CompanyStandard.objects.filter(expiry_date__gte=today, expiry_date__lte=until)
+        .select_related('company', 'standard_definition')
+        .order_by('expiry_date', 'company__name')
+    )
+    return render_to_string('reports/certificate_expiry.html', {
+        'standards': standards,
+        'days': days,
+        'date_until': until,
+        'report_date': today,
+    })
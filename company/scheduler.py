@@ -0,0 +1,390 @@
+"""
+Automatski predlog vodećeg auditora i tima za skup planiranih audita.
+
+Pohlepni (greedy) algoritam koji radi lokalno, bez spoljnog solvera:
+
+1. Učitaju se neraspoređeni auditi u periodu (status planiran/odložen, bez
+   vodećeg auditora), njihovi dani, standardi ciklusa i IAF/EAC kodovi
+   kompanije, kao i kvalifikacije svih auditora - sve u nekoliko upita.
+2. Auditi se obrađuju od najograničenijeg (najmanje kvalifikovanih vodećih
+   auditora) ka najmanje ograničenom, pa po datumu.
+3. Vodeći auditor mora imati sve standarde ciklusa (isto pravilo kao
+   audit_utils.is_auditor_qualified_for_audit) i biti slobodan sve dane
+   audita (rezervacije i Srbija Tim posete, vidi conflict_service). Među
+   kandidatima bira se onaj sa najmanje zauzetih dana u periodu.
+4. IAF/EAC kodove kompanije koje vodeći auditor ne pokriva pokrivaju članovi
+   tima, birani po tome koliko preostalih kodova pokrivaju, pa po opterećenju.
+   Član tima mora imati sve standarde ciklusa, osim tehničkog eksperta koji
+   učestvuje samo zbog IAF/EAC kodova.
+5. Svaki predlog se odmah upisuje u indeks zauzetosti, tako da isti auditor
+   ne može biti predložen za dva audita istog dana.
+
+Predlog se ne snima sam - primenjuje se tek kroz apply_assignments posle
+pregleda, uz ponovnu proveru konflikata i kvalifikacija.
+"""
+import logging
+from collections import defaultdict
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Q
+
+from .audit_utils import is_auditor_qualified_for_audit
+from .auditor_models import Auditor, AuditorIAFEACCode, AuditorStandard, AuditorStandardIAFEACCode
+from .concurrency import lock_auditors
+from .conflict_service import KIND_AUDIT, Booking, BookingIndex, audit_dates, find_conflicts
+from .cycle_models import AuditDay, CycleAudit, CycleStandard
+from .iaf_models import CompanyIAFEACCode
+
+logger = logging.getLogger(__name__)
+
+# Statusi audita koje raspoređivač uzima u obzir
+SCHEDULABLE_STATUSES = ('planned', 'postponed')
+
+# Kategorije auditora koji mogu biti vodeći
+LEAD_CATEGORIES = (Auditor.CATEGORY_LEAD_AUDITOR,)
+
+# Najveći period jednog raspoređivanja (dana)
+MAX_RANGE_DAYS = 92
+
+STATUS_ASSIGNED = 'assigned'
+STATUS_PARTIAL = 'partial'
+STATUS_UNASSIGNED = 'unassigned'
+
+
+class Qualifications:
+    """Standardi i IAF/EAC kodovi svih auditora, učitani jednom"""
+
+    def __init__(self, auditors):
+        self.auditors = {a.id: a for a in auditors}
+        self.standards = defaultdict(set)
+        self.codes = defaultdict(set)
+        for auditor_id, standard_id in AuditorStandard.objects.values_list('auditor_id', 'standard_id'):
+            self.standards[auditor_id].add(standard_id)
+        for auditor_id, code_id in AuditorStandardIAFEACCode.objects.values_list(
+            'auditor_standard__auditor_id', 'iaf_eac_code_id'
+        ):
+            self.codes[auditor_id].add(code_id)
+        # Tehnički eksperti imaju direktno dodeljene kodove
+        for auditor_id, code_id in AuditorIAFEACCode.objects.values_list('auditor_id', 'iaf_eac_code_id'):
+            self.codes[auditor_id].add(code_id)
+
+    def lead_candidates(self, standard_ids):
+        return [
+            auditor_id for auditor_id, auditor in self.auditors.items()
+            if auditor.kategorija in LEAD_CATEGORIES and standard_ids <= self.standards[auditor_id]
+        ]
+
+    def can_join_team(self, auditor_id, standard_ids):
+        """Isto pravilo kao _validate_team pri primeni predloga"""
+        if self.auditors[auditor_id].kategorija == Auditor.CATEGORY_TECHNICAL_EXPERT:
+            return True
+        return standard_ids <= self.standards[auditor_id]
+
+
+class Proposal:
+    """Predlog za jedan audit"""
+
+    def __init__(self, audit, dates, standard_ids, code_ids):
+        self.audit = audit
+        self.dates = dates
+        self.standard_ids = standard_ids
+        self.code_ids = code_ids
+        self.lead_id = None
+        self.team_ids = []
+        self.missing_codes = set()
+        self.reasons = []
+
+    @property
+    def status(self):
+        if not self.lead_id:
+            return STATUS_UNASSIGNED
+        return STATUS_PARTIAL if self.missing_codes else STATUS_ASSIGNED
+
+    def as_dict(self, auditors, code_labels):
+        cycle = self.audit.certification_cycle
+        return {
+            'audit_id': self.audit.id,
+            'company': cycle.company.name,
+            'company_id': cycle.company_id,
+            'audit_type': self.audit.audit_type,
+            'audit_type_display': self.audit.get_audit_type_display(),
+            'dates': [d.isoformat() for d in self.dates],
+            'status': self.status,
+            'lead': _auditor_dict(auditors.get(self.lead_id)),
+            'team': [_auditor_dict(auditors[a]) for a in self.team_ids],
+            'missing_codes': sorted(code_labels.get(c, str(c)) for c in self.missing_codes),
+            'reasons': self.reasons,
+        }
+
+
+def _auditor_dict(auditor):
+    if auditor is None:
+        return None
+    return {'id': auditor.id, 'name': auditor.ime_prezime, 'category': auditor.kategorija}
+
+
+def _load_audits(date_from, date_to, audit_ids=None):
+    audits = (
+        CycleAudit.objects
+        .filter(audit_status__in=SCHEDULABLE_STATUSES, lead_auditor__isnull=True)
+        .filter(Q(actual_date__range=(date_from, date_to)) | Q(actual_date__isnull=True, planned_date__range=(date_from, date_to)))
+        .select_related('certification_cycle__company')
+        .order_by('planned_date', 'id')
+    )
+    if audit_ids:
+        audits = audits.filter(id__in=audit_ids)
+    return list(audits)
+
+
+def _audit_days(audits):
+    """Datumi audita iz AuditDay (kao u kalendaru), inače izračunati iz ciklusa"""
+    days = defaultdict(list)
+    for audit_id, day, is_actual in AuditDay.objects.filter(audit__in=audits).values_list('audit_id', 'date', 'is_actual'):
+        days[audit_id].append((is_actual, day))
+
+    result = {}
+    for audit in audits:
+        rows = days.get(audit.id)
+        if rows:
+            # Ako postoje stvarni dani, planirani se ne računaju (kao u create_audit_days)
+            has_actual = any(is_actual for is_actual, _ in rows)
+            result[audit.id] = sorted(d for is_actual, d in rows if is_actual or not has_actual)
+        else:
+            base_date = audit.actual_date or audit.planned_date
+            result[audit.id] = sorted(audit_dates(audit.certification_cycle, audit.audit_type, base_date))
+    return result
+
+
+def _requirements(audits):
+    """Standardi ciklusa i IAF/EAC kodovi kompanije po auditu"""
+    cycle_ids = {a.certification_cycle_id for a in audits}
+    company_ids = {a.certification_cycle.company_id for a in audits}
+
+    standards = defaultdict(set)
+    for cycle_id, standard_id in CycleStandard.objects.filter(certification_cycle_id__in=cycle_ids).values_list(
+        'certification_cycle_id', 'standard_definition_id'
+    ):
+        standards[cycle_id].add(standard_id)
+
+    codes = defaultdict(set)
+    code_labels = {}
+    for company_id, code_id, label in CompanyIAFEACCode.objects.filter(company_id__in=company_ids).values_list(
+        'company_id', 'iaf_eac_code_id', 'iaf_eac_code__iaf_code'
+    ):
+        codes[company_id].add(code_id)
+        code_labels[code_id] = label
+    return standards, codes, code_labels
+
+
+class Scheduler:
+    """Pohlepni raspoređivač za audite u periodu [date_from, date_to]"""
+
+    def __init__(self, date_from, date_to, audit_ids=None):
+        self.date_from = date_from
+        self.date_to = date_to
+        self.audits = _load_audits(date_from, date_to, audit_ids)
+        self.auditors = {a.id: a for a in Auditor.objects.order_by('ime_prezime')}
+        self.qualifications = Qualifications(self.auditors.values())
+        self.load = defaultdict(int)
+        self.proposals = []
+
+    def _booked_days(self, index, auditor_id):
+        return len({b.date for b in index.bookings_between(auditor_id, self.date_from, self.date_to)})
+
+    def _is_free(self, index, auditor_id, dates):
+        return all(index.is_free(auditor_id, d) for d in dates)
+
+    def _book(self, index, proposal, auditor_id):
+        for day in proposal.dates:
+            index.add(Booking(auditor_id, day, KIND_AUDIT, audit_id=proposal.audit.id,
+                              company=proposal.audit.certification_cycle.company.name,
+                              audit_type=proposal.audit.audit_type))
+        self.load[auditor_id] += len(proposal.dates)
+
+    def _pick_lead(self, index, proposal, candidates):
+        free = [a for a in candidates if self._is_free(index, a, proposal.dates)]
+        if not candidates:
+            proposal.reasons.append('Nema vodećeg auditora kvalifikovanog za sve standarde ciklusa.')
+            return None
+        if not free:
+            proposal.reasons.append('Svi kvalifikovani vodeći auditori su zauzeti u danima audita.')
+            return None
+        # Prednost ima onaj ko pokriva više IAF/EAC kodova, pa manje opterećen
+        codes = self.qualifications.codes
+        return min(free, key=lambda a: (-len(proposal.code_ids & codes[a]), self.load[a], self.auditors[a].ime_prezime))
+
+    def _pick_team(self, index, proposal):
+        codes = self.qualifications.codes
+        missing = proposal.code_ids - codes[proposal.lead_id]
+        while missing:
+            candidates = [
+                a for a in self.auditors
+                if a != proposal.lead_id and a not in proposal.team_ids
+                and missing & codes[a] and self.qualifications.can_join_team(a, proposal.standard_ids)
+                and self._is_free(index, a, proposal.dates)
+            ]
+            if not candidates:
+                proposal.reasons.append('Nijedan slobodan auditor ne pokriva preostale IAF/EAC kodove.')
+                break
+            member = min(candidates, key=lambda a: (-len(missing & codes[a]), self.load[a], self.auditors[a].ime_prezime))
+            proposal.team_ids.append(member)
+            missing -= codes[member]
+        proposal.missing_codes = missing
+
+    def run(self):
+        if not self.audits:
+            return self
+        days = _audit_days(self.audits)
+        standards, codes, self.code_labels = _requirements(self.audits)
+
+        all_dates = [d for dates in days.values() for d in dates]
+        index = BookingIndex.load(list(self.auditors), min(all_dates), max(all_dates))
+        for auditor_id in self.auditors:
+            self.load[auditor_id] = self._booked_days(index, auditor_id)
+
+        work = []
+        for audit in self.audits:
+            proposal = Proposal(
+                audit, days[audit.id],
+                standards[audit.certification_cycle_id],
+                codes[audit.certification_cycle.company_id],
+            )
+            candidates = self.qualifications.lead_candidates(proposal.standard_ids)
+            work.append((len(candidates), proposal.dates[0] if proposal.dates else audit.planned_date, proposal, candidates))
+            self.proposals.append(proposal)
+
+        for _, _, proposal, candidates in sorted(work, key=lambda item: (item[0], item[1], item[2].audit.id)):
+            proposal.lead_id = self._pick_lead(index, proposal, candidates)
+            if proposal.lead_id is None:
+                continue
+            self._book(index, proposal, proposal.lead_id)
+            self._pick_team(index, proposal)
+            for member in proposal.team_ids:
+                self._book(index, proposal, member)
+        return self
+
+    def as_dict(self):
+        code_labels = getattr(self, 'code_labels', {})
+        proposals = [p.as_dict(self.auditors, code_labels) for p in self.proposals]
+        return {
+            'date_from': self.date_from.isoformat(),
+            'date_to': self.date_to.isoformat(),
+            'proposals': proposals,
+            'summary': {
+                status: sum(1 for p in proposals if p['status'] == status)
+                for status in (STATUS_ASSIGNED, STATUS_PARTIAL, STATUS_UNASSIGNED)
+            },
+            'load': [
+                {**_auditor_dict(auditor), 'days': self.load[auditor.id]}
+                for auditor in self.auditors.values() if self.load[auditor.id]
+            ],
+        }
+
+
+def propose(date_from, date_to, audit_ids=None):
+    """Predlog rasporeda za neraspoređene audite u periodu (ništa se ne snima)"""
+    return Scheduler(date_from, date_to, audit_ids).run().as_dict()
+
+
+def apply_assignments(assignments):
+    """
+    Snima odobrene predloge: [{'audit_id': 1, 'lead_auditor_id': 2, 'team_ids': [3]}, ...]
+    Svaki audit se ponovo proverava (da li je i dalje bez vodećeg auditora, kvalifikacija,
+    konflikti) jer se stanje moglo promeniti od predloga. Vraća (primenjeni, odbijeni).
+    """
+    applied, rejected = [], []
+    for item in assignments:
+        audit_id = item.get('audit_id')
+        try:
+            audit_id = _parse_id(audit_id)
+            lead_id = _parse_id(item.get('lead_auditor_id'))
+            team = item.get('team_ids') or []
+            if not isinstance(team, list):
+                raise TypeError(team)
+            team_ids = list(dict.fromkeys(_parse_id(t) for t in team))
+        except (TypeError, ValueError):
+            rejected.append({'audit_id': audit_id, 'error': 'Neispravan ID audita ili auditora.'})
+            continue
+        team_ids = [t for t in team_ids if t and t != lead_id]
+        try:
+            with transaction.atomic():
+                audit = CycleAudit.objects.select_for_update().select_related('certification_cycle').get(pk=audit_id)
+                lock_auditors([lead_id, *team_ids])
+                error = _validate_assignment(audit, lead_id, team_ids)
+                if error:
+                    rejected.append({'audit_id': audit_id, 'error': error})
+                    continue
+                audit.lead_auditor_id = lead_id
+                audit.save(update_fields=['lead_auditor', 'updated_at'])
+                audit.audit_team.set(team_ids)
+                audit.sync_auditor_reservations()
+            applied.append(audit_id)
+        except CycleAudit.DoesNotExist:
+            rejected.append({'audit_id': audit_id, 'error': 'Audit ne postoji.'})
+    if applied:
+        logger.info(f"Raspoređivač: primenjeno {len(applied)} predloga, odbijeno {len(rejected)}")
+    return applied, rejected
+
+
+def _validate_team(audit, members):
+    """Član tima ima sve standarde ciklusa; tehnički ekspert pokriva bar jedan IAF/EAC kod kompanije"""
+    company_codes = None
+    for member in members:
+        if member.kategorija == Auditor.CATEGORY_TECHNICAL_EXPERT:
+            if company_codes is None:
+                company_codes = set(CompanyIAFEACCode.objects.filter(
+                    company_id=audit.certification_cycle.company_id,
+                ).values_list('iaf_eac_code_id', flat=True))
+            codes = set(AuditorIAFEACCode.objects.filter(auditor=member).values_list('iaf_eac_code_id', flat=True))
+            if not codes & company_codes:
+                return f'Tehnički ekspert {member.ime_prezime} ne pokriva nijedan IAF/EAC kod kompanije.'
+            continue
+        is_qualified, missing = is_auditor_qualified_for_audit(member.id, audit.id)
+        if not is_qualified:
+            return f'Član tima {member.ime_prezime} nije kvalifikovan za standarde: ' + ', '.join(s.code for s in missing)
+    return None
+
+
+def _parse_id(value):
+    if value in (None, ''):
+        return None
+    if isinstance(value, bool):
+        raise ValueError(value)
+    return int(value)
+
+
+def _validate_assignment(audit, lead_id, team_ids):
+    if audit.lead_auditor_id:
+        return 'Audit u međuvremenu već ima vodećeg auditora.'
+    if audit.audit_status not in SCHEDULABLE_STATUSES:
+        return 'Audit više nije u statusu koji se raspoređuje.'
+    if not lead_id:
+        return 'Vodeći auditor nije izabran.'
+
+    auditors = Auditor.objects.in_bulk([lead_id, *team_ids])
+    unknown = [str(a) for a in [lead_id, *team_ids] if a not in auditors]
+    if unknown:
+        return 'Nepostojeći auditori: ' + ', '.join(unknown)
+
+    is_qualified, missing = is_auditor_qualified_for_audit(lead_id, audit.id)
+    if not is_qualified:
+        return 'Vodeći auditor nije kvalifikovan za standarde: ' + ', '.join(s.code for s in missing)
+
+    error = _validate_team(audit, [auditors[t] for t in team_ids])
+    if error:
+        return error
+
+    dates = _audit_days([audit])[audit.id]
+    conflicts = find_conflicts([lead_id, *team_ids], dates, exclude_audit_id=audit.id)
+    if conflicts:
+        names = dict(Auditor.objects.filter(id__in=conflicts).values_list('id', 'ime_prezime'))
+        return 'Zauzeti auditori: ' + '; '.join(
+            f"{names.get(a, a)} ({', '.join(b.describe() for b in bookings)})" for a, bookings in conflicts.items()
+        )
+    return None
+
+
+def default_range(today):
+    """Podrazumevani period: naredne 4 nedelje"""
+    return today, today + timedelta(days=27)
@@ -0,0 +1,59 @@
+import json
+import logging
+
+from django.contrib.auth.decorators import login_required
+from django.contrib.auth.mixins import LoginRequiredMixin
+from django.http import JsonResponse
+from django.utils import timezone
+from django.views.decorators.http import require_GET, require_POST
+from django.views.generic import TemplateView
+
+from . import scheduler
+from .list_filters import parse_date
+
+logger = logging.getLogger(__name__)
+
+
+class AuditSchedulerView(LoginRequiredMixin, TemplateView):
+    """Pregled predloga rasporeda i primena odabranih predloga"""
+    template_name = 'audit/audit_scheduler.html'
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        date_from, date_to = scheduler.default_range(timezone.now().date())
+        context['title'] = 'Automatsko raspoređivanje auditora'
+        context['date_from'] = date_from.isoformat()
+        context['date_to'] = date_to.isoformat()
+        return context
+
+
+@login_required
+@require_GET
+def audit_scheduler_propose(request):
+    """Predlog vodećih auditora i timova za neraspoređene audite u periodu ?from=&to="""
+    date_from = parse_date(request.GET.get('from'))
+    date_to = parse_date(request.GET.get('to'))
+    if not date_from or not date_to:
+        return JsonResponse({'success': False, 'error': 'Parametri from i to su obavezni (YYYY-MM-DD).'}, status=400)
+    if date_to < date_from:
+        return JsonResponse({'success': False, 'error': 'Datum do ne može biti pre datuma od.'}, status=400)
+    if (date_to - date_from).days + 1 > scheduler.MAX_RANGE_DAYS:
+        return JsonResponse({'success': False, 'error': f'Najviše {scheduler.MAX_RANGE_DAYS} dana po raspoređivanju.'}, status=400)
+
+    return JsonResponse({'success': True, **scheduler.propose(date_from, date_to)})
+
+
+@login_required
+@require_POST
+def audit_scheduler_apply(request):
+    """Snima odabrane predloge; telo: {"assignments": [{"audit_id", "lead_auditor_id", "team_ids"}, ...]}"""
+    try:
+        assignments = json.loads(request.body).get('assignments')
+    except (ValueError, AttributeError):
+        assignments = None
+    if not isinstance(assignments, list) or not all(isinstance(a, dict) for a in assignments):
+        return JsonResponse({'success': False, 'error': 'Neispravan zahtev.'}, status=400)
+
+    applied, rejected = scheduler.apply_assignments(assignments)
+    logger.info(f"Korisnik {request.user} primenio raspored: {len(applied)} audita, odbijeno {len(rejected)}")
+    return JsonResponse({'success': True, 'applied': applied, 'rejected': rejected})
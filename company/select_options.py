@@ -0,0 +1,153 @@
+"""
+Lenje učitavanje opcija za velike padajuće liste u formama.
+
+Forma ne renderuje sve <option> elemente (oko 500 industrija, svi auditori,
+svi IAF/EAC kodovi), već samo trenutno izabrane vrednosti. Ostale opcije
+select2 dohvata sa select_options_json, stranu po stranu i uz pretragu na
+serveru (static/js/lazy_select.js):
+
+    GET /company/api/select-options/auditors/?q=pet&page=2
+    {"results": [{"id": "12", "text": "Petar Petrović (Lead auditor)"}], "pagination": {"more": false}}
+
+Izvori su registrovani u SOURCES (IAF/EAC kodovi iz registra referentnih
+podataka, bez upita); LazySelect/LazySelectMultiple widget-i
+prikazuju izabrane vrednosti preko istog izvora, pa je labela u formi ista
+kao u padajućoj listi.
+"""
+from django import forms
+from django.db.models import Q
+from django.urls import reverse
+
+from . import reference_data
+from .auditor_models import Auditor
+from .data.industries import INDUSTRY_CHOICES
+
+# Broj opcija po strani
+PAGE_SIZE = 25
+
+
+class ChoicesSource:
+    """Opcije iz statične liste izbora (pretraga u memoriji, labele se prevode po zahtevu)"""
+
+    def __init__(self, choices):
+        self.choices = [(str(value), label) for value, label in choices if value not in ('', None)]
+
+    def page(self, term, page):
+        term = term.casefold()
+        matches = [(value, str(label)) for value, label in self.choices]
+        if term:
+            matches = [choice for choice in matches if term in choice[1].casefold()]
+        offset = (page - 1) * PAGE_SIZE
+        return matches[offset:offset + PAGE_SIZE], len(matches) > offset + PAGE_SIZE
+
+    def labels(self, values):
+        labels = dict(self.choices)
+        return [(value, str(labels[value])) for value in values if value in labels]
+
+
+class QuerySetSource:
+    """Opcije iz baze; strana se čita jednim upitom (PAGE_SIZE + 1 reda, bez COUNT-a)"""
+
+    def __init__(self, queryset, search_fields, label, only=()):
+        self.queryset = queryset
+        self.search_fields = search_fields
+        self.label = label
+        self.only = only
+
+    def _queryset(self):
+        queryset = self.queryset.all()
+        return queryset.only('pk', *self.only) if self.only else queryset
+
+    def page(self, term, page):
+        queryset = self._queryset()
+        if term:
+            condition = Q()
+            for field in self.search_fields:
+                condition |= Q(**{f'{field}__icontains': term})
+            queryset = queryset.filter(condition)
+        offset = (page - 1) * PAGE_SIZE
+        rows = list(queryset[offset:offset + PAGE_SIZE + 1])
+        return [(str(obj.pk), self.label(obj)) for obj in rows[:PAGE_SIZE]], len(rows) > PAGE_SIZE
+
+    def labels(self, values):
+        ids = [value for value in values if value.isdigit()]
+        if not ids:
+            return []
+        objects = {str(obj.pk): obj for obj in self._queryset().filter(pk__in=ids)}
+        return [(value, self.label(objects[value])) for value in ids if value in objects]
+
+
+class ReferenceSource:
+    """Opcije iz registra referentnih podataka (company/reference_data.py): pretraga u memoriji, bez upita"""
+
+    def __init__(self, objects, get, search_fields, label):
+        self.objects = objects
+        self.get = get
+        self.search_fields = search_fields
+        self.label = label
+
+    def page(self, term, page):
+        term = term.casefold()
+        matches = self.objects()
+        if term:
+            matches = [
+                obj for obj in matches
+                if any(term in (getattr(obj, field) or '').casefold() for field in self.search_fields)
+            ]
+        offset = (page - 1) * PAGE_SIZE
+        return [(str(obj.pk), self.label(obj)) for obj in matches[offset:offset + PAGE_SIZE]], len(matches) > offset + PAGE_SIZE
+
+    def labels(self, values):
+        objects = [(value, self.get(value)) for value in values if value.isdigit()]
+        return [(value, self.label(obj)) for value, obj in objects if obj is not None]
+
+
+def _auditor_label(auditor):
+    return f"{auditor.ime_prezime} ({auditor.get_kategorija_display()})"
+
+
+def _iaf_eac_label(code):
+    description = code.description or ''
+    if len(description) > 50:
+        description = description[:49] + '…'
+    return f"{code.iaf_code} - {description}" if description else code.iaf_code
+
+
+SOURCES = {
+    'industries': ChoicesSource(INDUSTRY_CHOICES),
+    'auditors': QuerySetSource(
+        Auditor.objects.order_by('ime_prezime'), ['ime_prezime'], _auditor_label, only=('ime_prezime', 'kategorija'),
+    ),
+    'iaf_eac_codes': ReferenceSource(
+        reference_data.iaf_codes, reference_data.iaf_code, ['iaf_code', 'description'], _iaf_eac_label,
+    ),
+}
+
+
+class LazySelect(forms.Select):
+    """Select koji renderuje samo izabranu vrednost; ostale opcije učitava lazy_select.js"""
+
+    def __init__(self, source, attrs=None):
+        super().__init__(attrs)
+        self.source = source
+
+    def get_context(self, name, value, attrs):
+        context = super().get_context(name, value, attrs)
+        widget_attrs = context['widget']['attrs']
+        widget_attrs['class'] = f"{widget_attrs.get('class', '')} lazy-select".strip()
+        widget_attrs['data-options-url'] = reverse('company:select_options', args=[self.source])
+        return context
+
+    def optgroups(self, name, value, attrs=None):
+        values = [str(v) for v in value if v not in ('', None)]
+        options = []
+        if not self.allow_multiple_selected:
+            # Prazna opcija je potrebna za placeholder i brisanje izbora u select2
+            options.append(self.create_option(name, '', '', not values, 0))
+        for index, (option_value, label) in enumerate(SOURCES[self.source].labels(values), start=len(options)):
+            options.append(self.create_option(name, option_value, label, True, index))
+        return [(None, options, 0)]
+
+
+class LazySelectMultiple(LazySelect, forms.SelectMultiple):
+    """Višestruki izbor sa lenjim učitavanjem opcija (npr. tim auditora)"""
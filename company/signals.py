@@ -0,0 +1,197 @@
+"""
+Signali aplikacije. Učitavaju se iz CompanyConfig.ready().
+"""
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from . import analytics, company_summary, live_updates, reference_data, reports
+from .auditor_models import Auditor, AuditorStandard
+from .calendar_models import Appointment, CalendarChange
+from .company_models import Company
+from .cycle_models import AuditDay, AuditorReservation, CertificationCycle, CycleAudit, CycleStandard
+from .srbija_tim_models import SrbijaTim, SrbijaTimDay
+from .iaf_models import IAFEACCode, IAFScopeReference
+from .standard_models import CompanyStandard, StandardDefinition
+
+
+@receiver([post_save, post_delete], sender=Company)
+def invalidate_company_reports(sender, instance, **kwargs):
+    reports.invalidate_company(instance.pk)
+
+
+@receiver([post_save, post_delete], sender=CertificationCycle)
+def invalidate_cycle_reports(sender, instance, **kwargs):
+    reports.invalidate_company(instance.company_id)
+
+
+@receiver([post_save, post_delete], sender=CycleAudit)
+@receiver([post_save, post_delete], sender=CycleStandard)
+def invalidate_cycle_child_reports(sender, instance, **kwargs):
+    company_id = CertificationCycle.objects.filter(pk=instance.certification_cycle_id).values_list('company_id', flat=True).first()
+    if company_id:
+        reports.invalidate_company(company_id)
+
+
+@receiver([post_save, post_delete], sender=CompanyStandard)
+def invalidate_standard_reports(sender, instance, **kwargs):
+    reports.invalidate_company(instance.company_id)
+    reports.invalidate(reports.REPORT_CERTIFICATE_EXPIRY)
+
+
+@receiver(post_save, sender=Company)
+def refresh_company_summary(sender, instance, **kwargs):
+    # save() upisuje vrednosti pregleda iz memorije, koje mogu biti zastarele
+    company_summary.refresh([instance.pk])
+
+
+@receiver([post_save, post_delete], sender=CertificationCycle)
+@receiver([post_save, post_delete], sender=CompanyStandard)
+def refresh_company_summary_on_change(sender, instance, **kwargs):
+    company_summary.refresh([instance.company_id])
+
+
+@receiver([post_save, post_delete], sender=CycleAudit)
+def refresh_company_summary_on_audit_change(sender, instance, **kwargs):
+    company_summary.refresh_for_cycles([instance.certification_cycle_id])
+
+
+@receiver([post_save, post_delete], sender=Auditor)
+@receiver([post_save, post_delete], sender=AuditorReservation)
+@receiver([post_save, post_delete], sender=SrbijaTim)
+@receiver([post_save, post_delete], sender=SrbijaTimDay)
+def invalidate_auditor_analytics(sender, **kwargs):
+    analytics.bump_generation()
+
+
+@receiver([post_save, post_delete], sender=StandardDefinition)
+@receiver([post_save, post_delete], sender=IAFEACCode)
+@receiver([post_save, post_delete], sender=IAFScopeReference)
+def invalidate_reference_data(sender, **kwargs):
+    reference_data.invalidate()
+
+
+@receiver(m2m_changed, sender=SrbijaTim.auditors.through)
+def invalidate_auditor_analytics_on_team_change(sender, action, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        analytics.bump_generation()
+
+
+@receiver([post_save, post_delete], sender=CertificationCycle)
+@receiver([post_save, post_delete], sender=CycleAudit)
+@receiver([post_save, post_delete], sender=CycleStandard)
+@receiver([post_save, post_delete], sender=AuditorStandard)
+def invalidate_demand_forecast(sender, **kwargs):
+    # Prognoza potražnje (company/forecast.py) koristi istu generaciju keša
+    analytics.bump_generation()
+
+
+@receiver([post_save, post_delete], sender=CycleAudit)
+def live_calendar_audit_changed(sender, instance, **kwargs):
+    live_updates.record(CalendarChange.FEED_CALENDAR, CalendarChange.KIND_AUDIT, instance.pk)
+
+
+@receiver([post_save, post_delete], sender=AuditDay)
+def live_calendar_audit_day_changed(sender, instance, **kwargs):
+    live_updates.record(CalendarChange.FEED_CALENDAR, CalendarChange.KIND_AUDIT, instance.audit_id)
+
+
+@receiver(m2m_changed, sender=CycleAudit.audit_team.through)
+def live_calendar_audit_team_changed(sender, instance, action, reverse, **kwargs):
+    # Tim menja rezultat filtera po auditoru
+    if action in ('post_add', 'post_remove', 'post_clear') and not reverse:
+        live_updates.record(CalendarChange.FEED_CALENDAR, CalendarChange.KIND_AUDIT, instance.pk)
+
+
+@receiver(m2m_changed, sender=CycleAudit.audit_team.through)
+def touch_audit_on_team_change(sender, instance, action, reverse, pk_set, **kwargs):
+    """Tim ne menja updated_at audita, a on je deo ključa keša fragmenata (company/detail_cache.py)"""
+    if not reverse:
+        if action in ('post_add', 'post_remove', 'post_clear'):
+            CycleAudit.objects.filter(pk=instance.pk).update(updated_at=timezone.now())
+        return
+    # Izmena sa strane auditora (auditor.audit_participations.add(...)): pk_set su auditi
+    if action == 'pre_clear':
+        instance._team_audit_ids = list(instance.audit_participations.values_list('pk', flat=True))
+        return
+    if action in ('post_add', 'post_remove'):
+        audit_ids = pk_set
+    elif action == 'post_clear':
+        audit_ids = getattr(instance, '_team_audit_ids', [])
+    else:
+        return
+    CycleAudit.objects.filter(pk__in=audit_ids).update(updated_at=timezone.now())
+
+
+@receiver([post_save, post_delete], sender=Appointment)
+def live_calendar_appointment_changed(sender, instance, **kwargs):
+    live_updates.record(CalendarChange.FEED_CALENDAR, CalendarChange.KIND_APPOINTMENT, instance.pk)
+
+
+@receiver([post_save, post_delete], sender=SrbijaTim)
+def live_calendar_visit_changed(sender, instance, **kwargs):
+    live_updates.record(CalendarChange.FEED_SRBIJA_TIM, CalendarChange.KIND_VISIT, instance.pk)
+
+
+@receiver([post_save, post_delete], sender=SrbijaTimDay)
+def live_calendar_visit_day_changed(sender, instance, **kwargs):
+    live_updates.record(CalendarChange.FEED_SRBIJA_TIM, CalendarChange.KIND_VISIT, instance.visit_id)
+
+
+@receiver(m2m_changed, sender=SrbijaTim.auditors.through)
+@receiver(m2m_changed, sender=SrbijaTim.standards.through)
+def live_calendar_visit_relations_changed(sender, instance, action, reverse, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear') and not reverse:
+        live_updates.record(CalendarChange.FEED_SRBIJA_TIM, CalendarChange.KIND_VISIT, instance.pk)
+
+
+@receiver(m2m_changed, sender=SrbijaTim.auditors.through)
+@receiver(m2m_changed, sender=SrbijaTim.standards.through)
+def refresh_visit_displays(sender, instance, action, reverse, pk_set, **kwargs):
+    """Denormalizovani standards_display/auditors_display posete (feed Srbija Tim kalendara)"""
+    if not reverse:
+        if action in ('post_add', 'post_remove', 'post_clear'):
+            SrbijaTim.refresh_displays([instance.pk])
+        return
+    # Izmena sa strane auditora/standarda (auditor.srbija_tim_visits.add(...)): pk_set su posete
+    if action == 'pre_clear':
+        instance._srbija_tim_visit_ids = list(instance.srbija_tim_visits.values_list('pk', flat=True))
+    elif action in ('post_add', 'post_remove'):
+        SrbijaTim.refresh_displays(pk_set)
+    elif action == 'post_clear':
+        SrbijaTim.refresh_displays(getattr(instance, '_srbija_tim_visit_ids', []))
+
+
+@receiver(pre_delete, sender=Auditor)
+@receiver(pre_delete, sender=StandardDefinition)
+def remember_visits_for_displays(sender, instance, **kwargs):
+    # Brisanje briše i veze sa posetama bez m2m_changed signala
+    instance._srbija_tim_visit_ids = list(instance.srbija_tim_visits.values_list('pk', flat=True))
+
+
+# Polje koje se prikazuje u standards_display/auditors_display posete
+VISIT_DISPLAY_FIELDS = {Auditor: 'ime_prezime', StandardDefinition: 'code'}
+
+
+@receiver(pre_save, sender=Auditor)
+@receiver(pre_save, sender=StandardDefinition)
+def remember_visit_display_name(sender, instance, raw=False, update_fields=None, **kwargs):
+    field = VISIT_DISPLAY_FIELDS[sender]
+    if raw or instance.pk is None or (update_fields is not None and field not in update_fields):
+        instance._visit_display_name = getattr(instance, field)
+        return
+    instance._visit_display_name = sender.objects.filter(pk=instance.pk).values_list(field, flat=True).first()
+
+
+@receiver([post_save, post_delete], sender=Auditor)
+@receiver([post_save, post_delete], sender=StandardDefinition)
+def refresh_visit_displays_on_rename(sender, instance, signal, created=False, **kwargs):
+    if signal is post_save:
+        # Izmena drugih polja (email, telefon, aktivnost...) ne menja prikaz posete
+        if created or getattr(instance, '_visit_display_name', None) == getattr(instance, VISIT_DISPLAY_FIELDS[sender]):
+            return
+        visit_ids = list(instance.srbija_tim_visits.values_list('pk', flat=True))
+    else:
+        visit_ids = getattr(instance, '_srbija_tim_visit_ids', [])
+    if visit_ids:
+        SrbijaTim.refresh_displays(visit_ids)
@@ -6,9 +6,10 @@ from datetime import timedelta
 from .company_models import Company
 from .auditor_models import Auditor
 from .standard_models import StandardDefinition
+from .concurrency import VersionedModel
 
 
-class SrbijaTim(models.Model):
+class SrbijaTim(VersionedModel):
     """
     Model za evidenciju stvarnih poseta auditora (Crni kalendar).
     Predstavlja stvarne posete koje mogu odstupati od planiranih audit dana.
@@ -116,6 +117,10 @@ class SrbijaTim(models.Model):
         help_text=_('Da li je izveštaj poslat')
     )
     
+    # Denormalizovani prikaz standarda i auditora za kalendar (održava se signalima, vidi refresh_displays)
+    standards_display = models.CharField(_('Standardi (prikaz)'), max_length=500, blank=True, default='', editable=False)
+    auditors_display = models.CharField(_('Auditori (prikaz)'), max_length=500, blank=True, default='', editable=False)
+    
     # Dodatne informacije
     notes = models.TextField(
         _('Napomene'),
@@ -175,6 +180,15 @@ class SrbijaTim(models.Model):
         """Vraća string sa svim auditorima"""
         return ", ".join([auditor.ime_prezime for auditor in self.auditors.all()])
     
+    @classmethod
+    def refresh_displays(cls, visit_ids):
+        """Ponovo računa standards_display/auditors_display za date posete (bez save(), verzije i signala)"""
+        visits = list(cls.objects.filter(pk__in=visit_ids).prefetch_related('standards', 'auditors'))
+        for visit in visits:
+            visit.standards_display = visit.get_standards_display()[:500]
+            visit.auditors_display = visit.get_auditors_display()[:500]
+        cls.objects.bulk_update(visits, ['standards_display', 'auditors_display'])
+    
     def is_certificate_expired(self):
         """Proverava da li je sertifikat istekao"""
         if self.certificate_expiry_date:
@@ -190,33 +204,43 @@ class SrbijaTim(models.Model):
     
     def create_visit_days(self):
         """
-        Kreira pojedinačne dane posete na osnovu broja dana posete.
-        Poziva se nakon čuvanja SrbijaTim objekta.
+        Usklađuje dane posete sa visit_date i brojem dana posete.
+        Poziva se nakon čuvanja SrbijaTim objekta (i posle pomeranja posete u kalendaru).
+        
+        Postojeći dani se pomeraju na nove datume (napomene dana ostaju), višak
+        se briše, a nedostajući dani se dodaju - najviše četiri upita bez obzira
+        na broj dana.
         """
         if not self.broj_dana_posete or self.broj_dana_posete < 1:
             return
         
-        # Zaokruži na ceo broj
+        # Zaokruži na ceo broj; dani idu unapred od datuma posete (1, 2, 3...)
         broj_dana_int = int(self.broj_dana_posete)
+        wanted = {
+            i + 1: self.visit_date + timedelta(days=i) if self.visit_date else None
+            for i in range(broj_dana_int)
+        }
         
-        # Obriši postojeće dane za ovu posetu
-        self.visit_days.all().delete()
-        
-        # Kreiraj nove dane
-        visit_days = []
-        for i in range(broj_dana_int):
-            visit_date = self.visit_date + timedelta(days=i) if self.visit_date else None
-            
-            visit_day = SrbijaTimDay(
-                visit=self,
-                date=visit_date,
-                visit_time=self.visit_time,
-                day_number=i + 1  # 1, 2, 3...
-            )
-            visit_days.append(visit_day)
+        moved, extra = [], []
+        for day in self.visit_days.all():
+            if day.day_number not in wanted:
+                extra.append(day.pk)
+                continue
+            new_date = wanted.pop(day.day_number)
+            if day.date != new_date or day.visit_time != self.visit_time:
+                day.date = new_date
+                day.visit_time = self.visit_time
+                moved.append(day)
         
-        # Bulk create za bolje performanse
-        SrbijaTimDay.objects.bulk_create(visit_days)
+        if extra:
+            SrbijaTimDay.objects.filter(pk__in=extra).delete()
+        if moved:
+            SrbijaTimDay.objects.bulk_update(moved, ['date', 'visit_time'])
+        if wanted:
+            SrbijaTimDay.objects.bulk_create([
+                SrbijaTimDay(visit=self, date=day_date, visit_time=self.visit_time, day_number=day_number)
+                for day_number, day_date in wanted.items()
+            ])
 
 
 class SrbijaTimDay(models.Model):
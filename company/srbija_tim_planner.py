@@ -0,0 +1,367 @@
+"""
+Masovno planiranje Srbija Tim poseta za sertifikate koji ističu.
+
+1. Sertifikati su standardi kompanija (CompanyStandard) sa datumom isteka u
+   periodu; standardi iste kompanije sa istim brojem sertifikata i istim
+   datumom isteka čine jedan sertifikat, tj. jednu posetu sa više standarda.
+   Sertifikati za koje već postoji poseta (ista kompanija i datum isteka) se
+   preskaču.
+2. Poželjan datum posete je LEAD_DAYS dana pre isteka. Traže se radni dani
+   od najbližeg poželjnom ka udaljenijim, najviše SEARCH_DAYS dana ranije, a
+   svi dani posete moraju biti pre isteka i posle današnjeg dana.
+3. Auditor mora imati sve standarde sertifikata (scheduler.Qualifications) i
+   biti slobodan sve dane posete (conflict_service); bira se najmanje
+   opterećen. Zauzetosti se učitavaju jednim upitom za ceo period, a svaki
+   predlog se odmah upisuje u indeks.
+
+Predlog se ne snima sam - apply_visits ponovo proverava konflikte pod
+zaključanim auditorima i kreira sve posete, dane i m2m veze u jednoj
+transakciji sa bulk_create (jedan INSERT po tabeli).
+"""
+import logging
+import uuid
+from collections import defaultdict
+from datetime import timedelta
+
+from django.db import transaction
+from django.utils import timezone
+
+from . import analytics, live_updates
+from .auditor_models import Auditor
+from .calendar_models import CalendarChange
+from .concurrency import lock_auditors
+from .conflict_service import KIND_SRBIJA_TIM, Booking, BookingIndex, visit_dates
+from .list_filters import parse_date
+from .scheduler import Qualifications
+from .srbija_tim_models import SrbijaTim, SrbijaTimDay
+from .standard_models import CompanyStandard
+
+logger = logging.getLogger(__name__)
+
+# Kategorije auditora koji obavljaju Srbija Tim posete
+VISIT_CATEGORIES = (Auditor.CATEGORY_LEAD_AUDITOR, Auditor.CATEGORY_AUDITOR)
+
+# Statusi sertifikata za koje se posete ne planiraju
+EXCLUDED_STATUSES = ('withdrawn', 'expired')
+
+# Poželjan broj dana između posete i isteka sertifikata
+LEAD_DAYS = 30
+
+# Koliko dana pre poželjnog datuma se još traži slobodan termin
+SEARCH_DAYS = 30
+
+# Najveći period isteka jednog planiranja (dana)
+MAX_RANGE_DAYS = 92
+
+# Najveći broj dana jedne posete
+MAX_VISIT_DAYS = 5
+
+STATUS_ASSIGNED = 'assigned'
+STATUS_UNASSIGNED = 'unassigned'
+
+
+class Certificate:
+    """Jedan sertifikat (jedan ili više standarda kompanije) i predlog posete za njega"""
+
+    def __init__(self, company, certificate_number, expiry_date):
+        self.company = company
+        self.certificate_number = certificate_number
+        self.expiry_date = expiry_date
+        self.company_standards = []
+        self.dates = []
+        self.auditor_id = None
+        self.reasons = []
+
+    @property
+    def standard_ids(self):
+        return {cs.standard_definition_id for cs in self.company_standards}
+
+    @property
+    def standards_display(self):
+        return ', '.join(sorted(cs.standard_definition.code for cs in self.company_standards))
+
+    @property
+    def status(self):
+        return STATUS_ASSIGNED if self.auditor_id else STATUS_UNASSIGNED
+
+    def as_dict(self, auditors):
+        auditor = auditors.get(self.auditor_id)
+        return {
+            'company_standard_ids': sorted(cs.id for cs in self.company_standards),
+            'company': self.company.name,
+            'company_id': self.company.id,
+            'certificate_number': self.certificate_number,
+            'expiry_date': self.expiry_date.isoformat(),
+            'standards': self.standards_display,
+            'dates': [d.isoformat() for d in self.dates],
+            'status': self.status,
+            'auditor': {'id': auditor.id, 'name': auditor.ime_prezime} if auditor else None,
+            'reasons': self.reasons,
+        }
+
+
+def _certificates(company_standards):
+    """Grupiše standarde kompanija po (kompanija, broj sertifikata, datum isteka)"""
+    grouped = {}
+    for cs in company_standards:
+        number = cs.certificate_number or cs.company.certificate_number or ''
+        key = (cs.company_id, number, cs.expiry_date)
+        if key not in grouped:
+            grouped[key] = Certificate(cs.company, number, cs.expiry_date)
+        grouped[key].company_standards.append(cs)
+    return list(grouped.values())
+
+
+def _planned_keys(company_ids, expiry_dates):
+    """(kompanija, datum isteka) za koje Srbija Tim poseta već postoji"""
+    return set(
+        SrbijaTim.objects
+        .filter(company_id__in=company_ids, certificate_expiry_date__in=expiry_dates)
+        .values_list('company_id', 'certificate_expiry_date')
+    )
+
+
+def _search_window(expiry_date, days, today):
+    """Prvi i poslednji mogući datum posete za sertifikat"""
+    latest = expiry_date - timedelta(days=days)
+    earliest = max(today + timedelta(days=1), expiry_date - timedelta(days=LEAD_DAYS + SEARCH_DAYS))
+    return earliest, latest
+
+
+def _candidate_dates(expiry_date, days, today):
+    """Datumi početka posete, od najbližeg poželjnom; svi dani posete su radni dani"""
+    earliest, latest = _search_window(expiry_date, days, today)
+    preferred = min(max(expiry_date - timedelta(days=LEAD_DAYS), earliest), latest)
+    candidates = []
+    day = earliest
+    while day <= latest:
+        if all(d.weekday() < 5 for d in visit_dates(day, days)):
+            candidates.append(day)
+        day += timedelta(days=1)
+    return sorted(candidates, key=lambda d: (abs((d - preferred).days), d))
+
+
+class VisitPlanner:
+    """Predlog Srbija Tim poseta za sertifikate koji ističu u [date_from, date_to]"""
+
+    def __init__(self, date_from, date_to, days=1, today=None):
+        self.date_from = date_from
+        self.date_to = date_to
+        self.days = days
+        self.today = today or timezone.now().date()
+        self.auditors = {
+            a.id: a for a in Auditor.objects.filter(kategorija__in=VISIT_CATEGORIES).order_by('ime_prezime')
+        }
+        self.qualifications = Qualifications(self.auditors.values())
+        self.load = defaultdict(int)
+        self.certificates = []
+        self.skipped = 0
+
+    def _load_certificates(self):
+        company_standards = list(
+            CompanyStandard.objects
+            .filter(expiry_date__range=(self.date_from, self.date_to))
+            .exclude(certificate_status__in=EXCLUDED_STATUSES)
+            .select_related('company', 'standard_definition')
+            .order_by('expiry_date', 'company__name', 'id')
+        )
+        certificates = _certificates(company_standards)
+        planned = _planned_keys({c.company.id for c in certificates}, {c.expiry_date for c in certificates})
+        self.certificates = [c for c in certificates if (c.company.id, c.expiry_date) not in planned]
+        self.skipped = len(certificates) - len(self.certificates)
+
+    def _pick(self, index, certificate):
+        candidates = [
+            a for a in self.auditors if certificate.standard_ids <= self.qualifications.standards[a]
+        ]
+        if not candidates:
+            certificate.reasons.append('Nema auditora kvalifikovanog za sve standarde sertifikata.')
+            return
+        dates = _candidate_dates(certificate.expiry_date, self.days, self.today)
+        if not dates:
+            certificate.reasons.append('Nema radnih dana za posetu pre isteka sertifikata.')
+            return
+        for start in dates:
+            days = visit_dates(start, self.days)
+            free = [a for a in candidates if all(index.is_free(a, d) for d in days)]
+            if free:
+                certificate.auditor_id = min(free, key=lambda a: (self.load[a], self.auditors[a].ime_prezime))
+                certificate.dates = days
+                return
+        certificate.reasons.append('Svi kvalifikovani auditori su zauzeti u mogućim terminima.')
+
+    def _book(self, index, certificate):
+        for day in certificate.dates:
+            index.add(Booking(certificate.auditor_id, day, KIND_SRBIJA_TIM, company=certificate.company.name))
+        self.load[certificate.auditor_id] += len(certificate.dates)
+
+    def run(self):
+        self._load_certificates()
+        if not self.certificates:
+            return self
+
+        windows = [_search_window(c.expiry_date, self.days, self.today) for c in self.certificates]
+        span_from = min(earliest for earliest, _ in windows)
+        span_to = max(latest for _, latest in windows) + timedelta(days=self.days)
+        index = BookingIndex.load(list(self.auditors), span_from, span_to)
+        for auditor_id in self.auditors:
+            self.load[auditor_id] = len({b.date for b in index.bookings_between(auditor_id, span_from, span_to)})
+
+        # Najpre sertifikati koji ranije ističu
+        for certificate in self.certificates:
+            self._pick(index, certificate)
+            if certificate.auditor_id:
+                self._book(index, certificate)
+        return self
+
+    def as_dict(self):
+        proposals = [c.as_dict(self.auditors) for c in self.certificates]
+        return {
+            'date_from': self.date_from.isoformat(),
+            'date_to': self.date_to.isoformat(),
+            'days': self.days,
+            'proposals': proposals,
+            'summary': {
+                **{status: sum(1 for p in proposals if p['status'] == status)
+                   for status in (STATUS_ASSIGNED, STATUS_UNASSIGNED)},
+                'already_planned': self.skipped,
+            },
+        }
+
+
+def propose(date_from, date_to, days=1):
+    """Predlog poseta za sertifikate koji ističu u periodu (ništa se ne snima)"""
+    return VisitPlanner(date_from, date_to, days).run().as_dict()
+
+
+def apply_visits(items, user=None, days=1):
+    """
+    Kreira odobrene posete: [{'company_standard_ids': [1, 2], 'visit_date': '2025-08-14', 'auditor_ids': [3]}, ...]
+    Svaka stavka se ponovo proverava (sertifikat, kvalifikacije, konflikti, već postojeća
+    poseta) pod zaključanim auditorima. Sve prihvaćene posete, njihovi dani i m2m veze
+    se upisuju u jednoj transakciji. Vraća (id-jevi kreiranih poseta, odbijeni).
+    """
+    rejected = []
+    cs_ids = {cs_id for item in items for cs_id in item.get('company_standard_ids') or []}
+    company_standards = CompanyStandard.objects.select_related('company', 'standard_definition').in_bulk(cs_ids)
+
+    work = []
+    for item in items:
+        error, certificate, dates, auditor_ids = _parse_item(item, company_standards, days)
+        if error:
+            rejected.append({'company_standard_ids': item.get('company_standard_ids'), 'error': error})
+        else:
+            work.append((item, certificate, dates, auditor_ids))
+    if not work:
+        return [], rejected
+
+    with transaction.atomic():
+        all_auditors = {a for _, _, _, auditor_ids in work for a in auditor_ids}
+        lock_auditors(all_auditors)
+        auditors = {a.id: a for a in Auditor.objects.filter(id__in=all_auditors)}
+        qualifications = Qualifications(auditors.values())
+        all_dates = [d for _, _, dates, _ in work for d in dates]
+        index = BookingIndex.load(list(all_auditors), min(all_dates), max(all_dates))
+        planned = _planned_keys({c.company.id for _, c, _, _ in work}, {c.expiry_date for _, c, _, _ in work})
+
+        accepted = []
+        for item, certificate, dates, auditor_ids in work:
+            error = _validate_item(certificate, dates, auditor_ids, auditors, qualifications, index, planned)
+            if error:
+                rejected.append({'company_standard_ids': item.get('company_standard_ids'), 'error': error})
+                continue
+            planned.add((certificate.company.id, certificate.expiry_date))
+            for auditor_id in auditor_ids:
+                for day in dates:
+                    index.add(Booking(auditor_id, day, KIND_SRBIJA_TIM, company=certificate.company.name))
+            accepted.append((certificate, dates, auditor_ids))
+
+        if not accepted:
+            return [], rejected
+
+        group_id = str(uuid.uuid4())
+        visits = SrbijaTim.objects.bulk_create([
+            SrbijaTim(
+                certificate_number=certificate.certificate_number or None,
+                company=certificate.company,
+                certificate_expiry_date=certificate.expiry_date,
+                visit_date=dates[0],
+                broj_dana_posete=len(dates),
+                group_id=group_id,
+                status=SrbijaTim.VisitStatus.SCHEDULED,
+                standards_display=certificate.standards_display[:500],
+                auditors_display=', '.join(auditors[a].ime_prezime for a in auditor_ids)[:500],
+                created_by=user,
+            )
+            for certificate, dates, auditor_ids in accepted
+        ])
+
+        AuditorLink = SrbijaTim.auditors.through
+        StandardLink = SrbijaTim.standards.through
+        AuditorLink.objects.bulk_create([
+            AuditorLink(srbijatim_id=visit.pk, auditor_id=auditor_id)
+            for visit, (_, _, auditor_ids) in zip(visits, accepted) for auditor_id in auditor_ids
+        ])
+        StandardLink.objects.bulk_create([
+            StandardLink(srbijatim_id=visit.pk, standarddefinition_id=standard_id)
+            for visit, (certificate, _, _) in zip(visits, accepted) for standard_id in sorted(certificate.standard_ids)
+        ])
+        SrbijaTimDay.objects.bulk_create([
+            SrbijaTimDay(visit_id=visit.pk, date=day, day_number=number)
+            for visit, (_, dates, _) in zip(visits, accepted) for number, day in enumerate(dates, start=1)
+        ])
+
+        # bulk_create ne šalje signale - keš analitike i žive izmene kalendara se ažuriraju ovde
+        created = [visit.pk for visit in visits]
+        analytics.bump_generation()
+        live_updates.record_many(CalendarChange.FEED_SRBIJA_TIM, CalendarChange.KIND_VISIT, created)
+
+    logger.info(f"Planer Srbija Tim: kreirano {len(created)} poseta, odbijeno {len(rejected)}")
+    return created, rejected
+
+
+def _parse_item(item, company_standards, days):
+    """Stavka zahteva -> (greška, sertifikat, datumi, auditori)"""
+    cs_ids = item.get('company_standard_ids') or []
+    rows = [company_standards.get(cs_id) for cs_id in cs_ids]
+    if not rows or None in rows:
+        return 'Standard kompanije ne postoji.', None, None, None
+    certificates = _certificates(rows)
+    if len(certificates) != 1:
+        return 'Standardi ne pripadaju istom sertifikatu.', None, None, None
+    certificate = certificates[0]
+    if not certificate.expiry_date:
+        return 'Sertifikat nema datum isteka.', None, None, None
+
+    visit_date = parse_date(item.get('visit_date'))
+    if not visit_date:
+        return 'Datum posete nije ispravan.', None, None, None
+    auditor_ids = list(dict.fromkeys(a for a in item.get('auditor_ids') or [] if isinstance(a, int)))
+    if not auditor_ids:
+        return 'Auditor nije izabran.', None, None, None
+    return None, certificate, visit_dates(visit_date, days), auditor_ids
+
+
+def _validate_item(certificate, dates, auditor_ids, auditors, qualifications, index, planned):
+    if (certificate.company.id, certificate.expiry_date) in planned:
+        return 'Poseta za ovaj sertifikat već postoji.'
+    if dates[-1] >= certificate.expiry_date:
+        return 'Poseta mora biti pre isteka sertifikata.'
+    missing = [a for a in auditor_ids if a not in auditors]
+    if missing:
+        return 'Auditor ne postoji.'
+    unqualified = [a for a in auditor_ids if not certificate.standard_ids <= qualifications.standards[a]]
+    if unqualified:
+        return 'Auditor nije kvalifikovan za sve standarde: ' + ', '.join(auditors[a].ime_prezime for a in unqualified)
+    conflicts = index.conflicts(auditor_ids, dates)
+    if conflicts:
+        return 'Zauzeti auditori: ' + '; '.join(
+            f"{auditors[a].ime_prezime} ({', '.join(b.describe() for b in bookings)})" for a, bookings in conflicts.items()
+        )
+    return None
+
+
+def default_range(today):
+    """Podrazumevani period isteka: od za mesec dana, naredna 4 nedelje"""
+    date_from = today + timedelta(days=LEAD_DAYS)
+    return date_from, date_from + timedelta(days=27)
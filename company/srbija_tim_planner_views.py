@@ -0,0 +1,73 @@
+import json
+import logging
+
+from django.contrib.auth.decorators import login_required
+from django.contrib.auth.mixins import LoginRequiredMixin
+from django.http import JsonResponse
+from django.utils import timezone
+from django.views.decorators.http import require_GET, require_POST
+from django.views.generic import TemplateView
+
+from . import srbija_tim_planner as planner
+from .list_filters import parse_date
+
+logger = logging.getLogger(__name__)
+
+
+def _visit_days(value):
+    try:
+        days = int(value or 1)
+    except (TypeError, ValueError):
+        return None
+    return days if 1 <= days <= planner.MAX_VISIT_DAYS else None
+
+
+class SrbijaTimPlannerView(LoginRequiredMixin, TemplateView):
+    """Predlog Srbija Tim poseta za sertifikate koji ističu i masovno kreiranje odabranih"""
+    template_name = 'srbija_tim/planner.html'
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        date_from, date_to = planner.default_range(timezone.now().date())
+        context['title'] = 'Planiranje Srbija Tim poseta'
+        context['date_from'] = date_from.isoformat()
+        context['date_to'] = date_to.isoformat()
+        context['max_visit_days'] = planner.MAX_VISIT_DAYS
+        return context
+
+
+@login_required
+@require_GET
+def srbija_tim_planner_propose(request):
+    """Predlog poseta za sertifikate koji ističu u periodu ?from=&to=&days="""
+    date_from = parse_date(request.GET.get('from'))
+    date_to = parse_date(request.GET.get('to'))
+    days = _visit_days(request.GET.get('days'))
+    if not date_from or not date_to:
+        return JsonResponse({'success': False, 'error': 'Parametri from i to su obavezni (YYYY-MM-DD).'}, status=400)
+    if date_to < date_from:
+        return JsonResponse({'success': False, 'error': 'Datum do ne može biti pre datuma od.'}, status=400)
+    if (date_to - date_from).days + 1 > planner.MAX_RANGE_DAYS:
+        return JsonResponse({'success': False, 'error': f'Najviše {planner.MAX_RANGE_DAYS} dana po planiranju.'}, status=400)
+    if days is None:
+        return JsonResponse({'success': False, 'error': f'Broj dana posete mora biti od 1 do {planner.MAX_VISIT_DAYS}.'}, status=400)
+
+    return JsonResponse({'success': True, **planner.propose(date_from, date_to, days)})
+
+
+@login_required
+@require_POST
+def srbija_tim_planner_apply(request):
+    """Kreira odabrane posete; telo: {"days": 1, "visits": [{"company_standard_ids", "visit_date", "auditor_ids"}, ...]}"""
+    try:
+        body = json.loads(request.body)
+        visits = body.get('visits')
+        days = _visit_days(body.get('days'))
+    except (ValueError, AttributeError):
+        visits, days = None, None
+    if not isinstance(visits, list) or not all(isinstance(v, dict) for v in visits) or days is None:
+        return JsonResponse({'success': False, 'error': 'Neispravan zahtev.'}, status=400)
+
+    created, rejected = planner.apply_visits(visits, user=request.user, days=days)
+    logger.info(f"Korisnik {request.user} kreirao {len(created)} Srbija Tim poseta, odbijeno {len(rejected)}")
+    return JsonResponse({'success': True, 'created': created, 'rejected': rejected})
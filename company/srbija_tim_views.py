@@ -1,4 +1,4 @@
-from django.views.generic import ListView, CreateView, UpdateView, DeleteView, DetailView
+from django.views.generic import ListView, CreateView, UpdateView, DeleteView, DetailView, TemplateView
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.urls import reverse_lazy
 from django.http import JsonResponse
@@ -6,22 +6,29 @@ from django.shortcuts import get_object_or_404
 from django.views.decorators.http import require_http_methods
 from django.views.decorators.csrf import csrf_exempt
 from django.contrib.auth.decorators import login_required
+from django.db import transaction
+from django.db.models import Count, F, Window
+from django.utils import timezone
+from . import live_updates
+from .calendar_models import CalendarChange
 from .srbija_tim_models import SrbijaTim
 from .forms import SrbijaTimForm
+from .concurrency import is_stale, lock_auditors
+from .conflict_service import describe_conflicts, find_conflicts, visit_dates
+from .list_filters import filter_srbija_tim, parse_date
+from isoqar_app import metrics
 import logging
 import json
-from datetime import datetime
+from datetime import datetime, timedelta
 
 logger = logging.getLogger(__name__)
 
 
-class SrbijaTimCalendarView(LoginRequiredMixin, ListView):
+class SrbijaTimCalendarView(LoginRequiredMixin, TemplateView):
     """
-    Glavna stranica sa kalendarom za Srbija Tim posete
+    Glavna stranica sa kalendarom za Srbija Tim posete (događaji dolaze iz srbija_tim_calendar_json)
     """
-    model = SrbijaTim
     template_name = 'srbija_tim/calendar.html'
-    context_object_name = 'visits'
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -41,6 +48,9 @@ class SrbijaTimCalendarView(LoginRequiredMixin, ListView):
         # Dobij view parametar iz URL-a
         initial_view = self.request.GET.get('view', 'dayGridMonth')
         context['initial_view'] = initial_view
+
+        # Poslednja promena pre učitavanja stranice (odatle kreću žive izmene) i SSE/poll režim
+        context['live'] = live_updates.client_config(self.request, CalendarChange.FEED_SRBIJA_TIM)
         
         return context
 
@@ -67,60 +77,52 @@ class SrbijaTimListView(LoginRequiredMixin, ListView):
         return context
 
 
-class SrbijaTimAuditorScheduleView(LoginRequiredMixin, ListView):
+class SrbijaTimAuditorScheduleView(LoginRequiredMixin, TemplateView):
     """
-    Lista stvarnih sastanaka sa auditorima - raspored auditora
+    Lista stvarnih sastanaka sa auditorima - raspored auditora.
+    Bez zadatog opsega prikazuje SCHEDULE_DAYS_BEFORE dana unazad i SCHEDULE_DAYS_AFTER unapred.
     """
-    model = SrbijaTim
     template_name = 'srbija_tim/auditor_schedule.html'
-    context_object_name = 'visits'
+    SCHEDULE_DAYS_BEFORE = 30
+    SCHEDULE_DAYS_AFTER = 90
     
-    def get_queryset(self):
-        queryset = SrbijaTim.objects.all().prefetch_related(
-            'standards',
-            'auditors',
-            'company'
-        ).select_related('created_by')
-        
-        # Filtriranje po datumu
-        date_from = self.request.GET.get('date_from')
-        date_to = self.request.GET.get('date_to')
-        
-        if date_from:
-            try:
-                from datetime import datetime
-                date_from_obj = datetime.strptime(date_from, '%Y-%m-%d').date()
-                queryset = queryset.filter(visit_date__gte=date_from_obj)
-            except ValueError:
-                pass
-        
-        if date_to:
-            try:
-                from datetime import datetime
-                date_to_obj = datetime.strptime(date_to, '%Y-%m-%d').date()
-                queryset = queryset.filter(visit_date__lte=date_to_obj)
-            except ValueError:
-                pass
-        
-        return queryset.order_by('-visit_date', 'visit_time')
+    def get_filter_params(self):
+        params = self.request.GET.copy()
+        if not params.get('date_from') and not params.get('date_to'):
+            today = timezone.now().date()
+            params['date_from'] = (today - timedelta(days=self.SCHEDULE_DAYS_BEFORE)).isoformat()
+            params['date_to'] = (today + timedelta(days=self.SCHEDULE_DAYS_AFTER)).isoformat()
+        return params
+    
+    def get_assignments(self, params):
+        """Jedan upit nad vezom poseta-auditor: red po auditoru i poseti, sa brojem poseta auditora u opsegu"""
+        visits = filter_srbija_tim(SrbijaTim.objects.all(), params)
+        return (
+            SrbijaTim.auditors.through.objects
+            .filter(srbijatim__in=visits.values('pk'))
+            .select_related('auditor', 'srbijatim__company')
+            .annotate(visit_count=Window(Count('id'), partition_by=[F('auditor_id')]))
+            .order_by('auditor__ime_prezime', 'auditor_id', '-srbijatim__visit_date', 'srbijatim__visit_time')
+        )
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['title'] = 'Srbija Tim - Raspored Auditora'
         
+        params = self.get_filter_params()
         # Prosleđivanje filter parametara u template
-        context['date_from'] = self.request.GET.get('date_from', '')
-        context['date_to'] = self.request.GET.get('date_to', '')
+        context['date_from'] = params.get('date_from', '')
+        context['date_to'] = params.get('date_to', '')
         
-        # Grupisanje po auditorima
-        from collections import defaultdict
-        auditor_visits = defaultdict(list)
+        # Grupisanje po auditorima (redovi su već sortirani po auditoru)
+        auditor_visits = {}
+        for row in self.get_assignments(params):
+            if row.auditor not in auditor_visits:
+                row.auditor.visit_count = row.visit_count
+                auditor_visits[row.auditor] = []
+            auditor_visits[row.auditor].append(row.srbijatim)
         
-        for visit in self.get_queryset():
-            for auditor in visit.auditors.all():
-                auditor_visits[auditor].append(visit)
-        
-        context['auditor_visits'] = dict(auditor_visits)
+        context['auditor_visits'] = auditor_visits
         
         return context
 
@@ -194,13 +196,14 @@ class SrbijaTimUpdateView(LoginRequiredMixin, UpdateView):
     template_name = 'srbija_tim/form.html'
     success_url = reverse_lazy('company:srbija_tim_calendar')
     
+    @transaction.atomic
     def form_valid(self, form):
         from django.contrib import messages
         
         # Sačuvaj glavni objekat
         response = super().form_valid(form)
         
-        # Regeneriši dane posete (automatski briše stare i kreira nove)
+        # Uskladi dane posete sa novim datumom i brojem dana (u istoj transakciji)
         self.object.create_visit_days()
         
         # Dobij broj dana za poruku
@@ -258,64 +261,92 @@ class SrbijaTimDetailView(LoginRequiredMixin, DetailView):
         return context
 
 
-def srbija_tim_calendar_json(request):
+def _visit_color(visit):
+    """Boja događaja na osnovu statusa posete i izveštaja"""
+    # Ako je izveštaj poslat (može biti samo za odrađenu posetu)
+    if visit.report_sent:
+        return '#28a745'  # Zelena - poslat izveštaj
+    # Ako izveštaj nije poslat, boja zavisi od statusa
+    status = getattr(visit, 'status', 'nije_zakazan')
+    if status == 'zakazan':
+        return '#007bff'  # Plava - zakazan
+    if status == 'nije_zakazan':
+        return '#6c757d'  # Siva - nije zakazan
+    if status == 'odradjena':
+        return '#ffc107'  # Žuta - odrađena poseta (bez izveštaja)
+    return '#dc3545'  # Crvena - default
+
+
+def _serialize_visit(visit):
+    """Zajednički deo događaja jedne posete - računa se jednom i deli između svih njenih dana"""
+    title = f'{visit.certificate_number} - {visit.company.name}'
+    return {
+        'title': title,
+        'multi_day': bool(visit.broj_dana_posete and visit.broj_dana_posete > 1),
+        'color': _visit_color(visit),
+        'extendedProps': {
+            'certificate_number': visit.certificate_number,
+            'company_name': visit.company.name,
+            'standards': visit.standards_display,
+            'auditors': visit.auditors_display,
+            'status': getattr(visit, 'status', 'nije_zakazan'),
+            'report_sent': visit.report_sent,
+            'certificate_expiry_date': visit.certificate_expiry_date.isoformat() if visit.certificate_expiry_date else None,
+            'notes': visit.notes or '',
+            'broj_dana_posete': float(visit.broj_dana_posete) if visit.broj_dana_posete else None,
+            'version': visit.version,
+        },
+    }
+
+
+async def srbija_tim_calendar_json(request):
     """
-    JSON endpoint za FullCalendar - vraća sve dane poseta kao događaje
+    JSON endpoint za FullCalendar - dani poseta u vidljivom opsegu (?start=&end=) kao događaji (async ORM).
+    Bez start/end vraća sve dane (npr. delta živih izmena za ?visit=).
     """
     from .srbija_tim_models import SrbijaTimDay
     
     # Get filter parametar za auditora
     auditor_id = request.GET.get('auditor')
     
-    # Učitaj sve dane poseta sa povezanim podacima
-    visit_days = SrbijaTimDay.objects.select_related(
-        'visit',
-        'visit__company'
-    ).prefetch_related(
-        'visit__standards',
-        'visit__auditors'
-    ).all()
+    # Standardi i auditori dolaze iz denormalizovanih polja posete, bez prefetch-a m2m veza
+    visit_days = SrbijaTimDay.objects.select_related('visit', 'visit__company')
+    
+    # FullCalendar šalje opseg prikaza (ISO datum ili datum-vreme); end je isključiv
+    range_start = parse_date((request.GET.get('start') or '')[:10])
+    range_end = parse_date((request.GET.get('end') or '')[:10])
+    if range_start:
+        visit_days = visit_days.filter(date__gte=range_start)
+    if range_end:
+        visit_days = visit_days.filter(date__lt=range_end)
     
     # Filtriraj po auditoru ako je selektovan
     if auditor_id:
         visit_days = visit_days.filter(visit__auditors__id=auditor_id).distinct()
-        logger.info(f"Srbija Tim - filtered by auditor {auditor_id}: {visit_days.count()} visit days")
+    # Delta za žive izmene (company/live_updates.py): samo dani navedenih poseta
+    if 'visit' in request.GET:
+        visit_days = visit_days.filter(visit_id__in=live_updates.parse_ids(request.GET.get('visit')))
     
+    serialized = {}
     events = []
-    for visit_day in visit_days:
+    async for visit_day in visit_days.filter(date__isnull=False):
         visit = visit_day.visit
-        # Boja na osnovu statusa i izveštaja
-        status = getattr(visit, 'status', 'nije_zakazan')
-        
-        # Ako je izveštaj poslat (može biti samo za odrađenu posetu)
-        if visit.report_sent:
-            color = '#28a745'  # Zelena - poslat izveštaj
-        # Ako izveštaj nije poslat, boja zavisi od statusa
-        elif status == 'zakazan':
-            color = '#007bff'  # Plava - zakazan
-        elif status == 'nije_zakazan':
-            color = '#6c757d'  # Siva - nije zakazan
-        elif status == 'odradjena':
-            color = '#ffc107'  # Žuta - odrađena poseta (bez izveštaja)
-        else:
-            color = '#dc3545'  # Crvena - default
+        base = serialized.get(visit.id)
+        if base is None:
+            base = serialized[visit.id] = _serialize_visit(visit)
         
         # Koristi datum iz visit_day, a vreme iz visit_day ili visit
         visit_time = visit_day.visit_time or getattr(visit, 'visit_time', None)
-        if visit_time and visit_day.date:
-            start_datetime = datetime.combine(visit_day.date, visit_time)
-            event_start = start_datetime.isoformat()
+        if visit_time:
+            event_start = datetime.combine(visit_day.date, visit_time).isoformat()
             all_day = False
-        elif visit_day.date:
+        else:
             event_start = visit_day.date.isoformat()
             all_day = True
-        else:
-            # Skip ako nema datum
-            continue
         
         # Dodaj oznaku dana u naslovu ako je višednevna poseta
-        title = f'{visit.certificate_number} - {visit.company.name}'
-        if visit.broj_dana_posete and visit.broj_dana_posete > 1:
+        title = base['title']
+        if base['multi_day']:
             title += f' (Dan {visit_day.day_number})'
         
         events.append({
@@ -323,22 +354,16 @@ def srbija_tim_calendar_json(request):
             'title': title,
             'start': event_start,
             'allDay': all_day,
-            'color': color,
+            'color': base['color'],
             'extendedProps': {
-                'certificate_number': visit.certificate_number,
-                'company_name': visit.company.name,
-                'standards': visit.get_standards_display(),
-                'auditors': visit.get_auditors_display(),
-                'status': getattr(visit, 'status', 'nije_zakazan'),
-                'report_sent': visit.report_sent,
-                'certificate_expiry_date': visit.certificate_expiry_date.isoformat() if visit.certificate_expiry_date else None,
-                'notes': visit.notes or '',
+                **base['extendedProps'],
                 'visit_time': visit_time.isoformat() if visit_time else None,
-                'broj_dana_posete': float(visit.broj_dana_posete) if visit.broj_dana_posete else None,
                 'day_number': visit_day.day_number,
             }
         })
     
+    metrics.inc('isoqar_calendar_feed_requests_total', feed='srbija_tim')
+    metrics.inc('isoqar_calendar_feed_events_total', len(events), feed='srbija_tim')
     return JsonResponse(events, safe=False)
 
 
@@ -379,19 +404,30 @@ def get_company_data(request, company_id):
         }, status=500)
 
 
+def _visit_date_payload(visit):
+    return {
+        'id': visit.pk,
+        'visit_date': visit.visit_date.isoformat() if visit.visit_date else None,
+        'visit_time': visit.visit_time.isoformat() if visit.visit_time else None,
+        'version': visit.version,
+    }
+
+
 @login_required
 @require_http_methods(["POST"])
 def srbija_tim_update_date(request, pk):
     """
     Ažurira datum i vreme posete preko AJAX-a (za drag & drop)
-    Validira da auditor ne može biti na više sastanaka istog dana
+    Validira da nijedan auditor nije zauzet ni u jednom danu pomerene posete
+    i u istoj transakciji pomera dane posete (SrbijaTimDay)
     """
     try:
-        visit = SrbijaTim.objects.get(pk=pk)
         data = json.loads(request.body)
         
         new_date_str = data.get('visit_date')
         new_time_str = data.get('visit_time')
+        # Verzija posete koju je kalendar prikazao (optimistička kontrola konkurentnosti)
+        expected_version = data.get('version')
         
         if not new_date_str:
             return JsonResponse({
@@ -399,10 +435,6 @@ def srbija_tim_update_date(request, pk):
                 'message': 'Datum je obavezan.'
             }, status=400)
         
-        # Sačuvaj stare vrednosti za logging
-        old_date = visit.visit_date
-        old_time = getattr(visit, 'visit_time', None)
-        
         # Parsiranje datuma
         from datetime import datetime
         new_date = datetime.strptime(new_date_str, '%Y-%m-%d').date()
@@ -422,48 +454,58 @@ def srbija_tim_update_date(request, pk):
                         'message': 'Neispravan format vremena.'
                     }, status=400)
         
-        # VALIDACIJA: Proveri da li neki od auditora već ima sastanak tog dana
-        auditors = visit.auditors.all()
-        conflicts = []
-        
-        for auditor in auditors:
-            # Pronađi sve posete ovog auditora na novi datum (osim trenutne)
-            conflicting_visits = SrbijaTim.objects.filter(
-                auditors=auditor,
-                visit_date=new_date
-            ).exclude(pk=visit.pk)
+        # Provera i upis u jednoj transakciji: poseta i njeni auditori su zaključani
+        # dok se ne upiše novi datum (vidi company/concurrency.py)
+        with transaction.atomic():
+            visit = SrbijaTim.objects.select_for_update().filter(pk=pk).first()
+            if visit is None:
+                return JsonResponse({
+                    'success': False,
+                    'stale': True,
+                    'message': 'Poseta više ne postoji - kalendar je zastareo.',
+                    'current': None,
+                }, status=409)
+            if is_stale(visit, expected_version):
+                return JsonResponse({
+                    'success': False,
+                    'stale': True,
+                    'message': 'Posetu je u međuvremenu izmenio drugi korisnik. Prikazano je trenutno stanje.',
+                    'current': _visit_date_payload(visit),
+                }, status=409)
+
+            # Sačuvaj stare vrednosti za logging
+            old_date = visit.visit_date
+            old_time = getattr(visit, 'visit_time', None)
+
+            # VALIDACIJA: Proveri da li je neki od auditora već zauzet (druga poseta ili audit) u danima posete
+            # Svi dani posete naspram svih drugih zauzetosti auditora - jedan upit (conflict_service.BookingIndex)
+            auditors = list(visit.auditors.all())
+            lock_auditors(a.id for a in auditors)
+            new_dates = visit_dates(new_date, visit.broj_dana_posete)
+            conflicts_by_auditor = find_conflicts(
+                [a.id for a in auditors],
+                new_dates,
+                exclude_visit_id=visit.pk,
+            )
             
-            if conflicting_visits.exists():
-                # Napravi listu kompanija sa kojima je konflikt
-                company_names = [v.company.name for v in conflicting_visits]
-                conflicts.append({
-                    'auditor': auditor.ime_prezime,
-                    'companies': company_names
-                })
-        
-        # Ako ima konflikata, vrati grešku
-        if conflicts:
-            conflict_messages = []
-            for conflict in conflicts:
-                companies = ', '.join(conflict['companies'])
-                conflict_messages.append(
-                    f"{conflict['auditor']} već ima zakazan sastanak tog dana sa: {companies}"
-                )
+            # Ako ima konflikata, vrati grešku
+            if conflicts_by_auditor:
+                return JsonResponse({
+                    'success': False,
+                    'message': 'Konflikt u rasporedu auditora!',
+                    'conflicts': describe_conflicts(conflicts_by_auditor, auditors)
+                }, status=400)
             
-            return JsonResponse({
-                'success': False,
-                'message': 'Konflikt u rasporedu auditora!',
-                'conflicts': conflict_messages
-            }, status=400)
-        
-        # Ako nema konflikata, ažuriraj
-        visit.visit_date = new_date
-        
-        # Postavi visit_time samo ako polje postoji u modelu
-        if hasattr(visit, 'visit_time'):
-            visit.visit_time = new_time
-        
-        visit.save()
+            # Ako nema konflikata, ažuriraj
+            visit.visit_date = new_date
+            
+            # Postavi visit_time samo ako polje postoji u modelu
+            if hasattr(visit, 'visit_time'):
+                visit.visit_time = new_time
+            
+            visit.save()
+            # Dani višednevne posete prate novi datum (bez toga bi kalendar i provera konflikata videli stare dane)
+            visit.create_visit_days()
         
         log_message = f'Srbija Tim poseta {visit.certificate_number} - datum promenjen sa {old_date} na {new_date}'
         if new_time:
@@ -475,7 +517,9 @@ def srbija_tim_update_date(request, pk):
         response_data = {
             'success': True,
             'message': 'Datum posete je uspešno ažuriran.',
-            'new_date': new_date.isoformat()
+            'new_date': new_date.isoformat(),
+            'dates': [d.isoformat() for d in new_dates],
+            'version': visit.version,
         }
         if new_time:
             response_data['new_time'] = new_time.isoformat()
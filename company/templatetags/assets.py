@@ -0,0 +1,46 @@
+"""
+Statički bundle-ovi definisani u assets.json (gradi ih `npm run build` u static/dist/).
+
+    {% load assets %}
+    {% bundle 'calendar.js' %}
+
+Kada je bundle izgrađen, renderuje se jedan <script>/<link> ka dist/<ime>;
+inače (razvoj bez node-a, testovi) izvorni fajlovi redom iz assets.json, pa se
+stranica ponaša isto u oba slučaja. Heširanje imena radi {% static %} preko
+STORAGES['staticfiles'], tako da bundle nema ?v= parametar.
+"""
+import json
+import os
+from functools import lru_cache
+
+from django import template
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.templatetags.static import static
+from django.utils.html import format_html_join
+
+register = template.Library()
+
+DIST_DIR = 'dist'
+
+
+@lru_cache(maxsize=None)
+def bundles():
+    with open(os.path.join(settings.BASE_DIR, 'assets.json'), encoding='utf-8') as f:
+        return json.load(f)
+
+
+@lru_cache(maxsize=None)
+def bundle_files(name):
+    """Putanje (relativno na static/) koje stranica učitava za bundle"""
+    sources = bundles()[name]
+    built = f'{DIST_DIR}/{name}'
+    return (built,) if finders.find(built) else tuple(sources)
+
+
+@register.simple_tag
+def bundle(name):
+    urls = ((static(path),) for path in bundle_files(name))
+    if name.endswith('.css'):
+        return format_html_join('\n', '<link rel="stylesheet" href="{}">', urls)
+    return format_html_join('\n', '<script src="{}"></script>', urls)
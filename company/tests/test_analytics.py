@@ -0,0 +1,86 @@
+from datetime import date
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from company import analytics
+from company.auditor_models import Auditor
+from company.cycle_models import CertificationCycle, CycleAudit
+from company.models import Company
+from company.srbija_tim_models import SrbijaTim
+
+
+class AuditorUtilisationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        User = get_user_model()
+        User.objects.create_user(username='tester', password='pass1234')
+        self.client.login(username='tester', password='pass1234')
+
+        self.auditor = Auditor.objects.create(ime_prezime='Auditor A', email='a@example.com', telefon='1')
+        self.idle = Auditor.objects.create(ime_prezime='Auditor B', email='b@example.com', telefon='2')
+
+        company_a = Company.objects.create(name='Comp A')
+        company_b = Company.objects.create(name='Comp B')
+        cycle = CertificationCycle.objects.create(
+            company=company_a, planirani_datum=date(2025, 8, 12), status='active', inicijalni_broj_dana=2,
+        )
+        # Dvodnevni audit 11-12. avgust (vodeći auditor)
+        CycleAudit.objects.create(
+            certification_cycle=cycle, audit_type='initial', audit_status='planned',
+            planned_date=date(2025, 8, 12), lead_auditor=self.auditor,
+        )
+        # Srbija Tim poseta iste nedelje za drugu kompaniju
+        visit = SrbijaTim.objects.create(
+            certificate_number='SRB-1', company=company_b, visit_date=date(2025, 8, 14), broj_dana_posete=1,
+        )
+        visit.auditors.add(self.auditor)
+        visit.create_visit_days()
+
+    def _row(self, data, auditor):
+        return next(row for row in data['auditors'] if row['id'] == auditor.id)
+
+    def test_month_breakdown(self):
+        data = analytics.compute_month(2025, 8)
+
+        self.assertEqual(data['working_days'], 21)
+        row = self._row(data, self.auditor)
+        self.assertEqual(row['booked_days'], 3)
+        self.assertEqual(row['audit_days'], 2)
+        self.assertEqual(row['lead_days'], 2)
+        self.assertEqual(row['team_days'], 0)
+        self.assertEqual(row['srbija_tim_days'], 1)
+        self.assertEqual(row['srbija_tim_visits'], 1)
+        self.assertEqual(row['rank'], 1)
+        self.assertEqual(row['utilisation'], round(3 * 100 / 21, 1))
+        self.assertEqual(row['travel_weeks'], ['2025-08-11'])
+        self.assertEqual(self._row(data, self.idle)['booked_days'], 0)
+
+    def test_month_is_cached_until_bookings_change(self):
+        analytics.month_utilisation(2025, 8)
+        with CaptureQueriesContext(connection) as ctx:
+            analytics.month_utilisation(2025, 8)
+        self.assertEqual(len(ctx.captured_queries), 0)
+
+        visit = SrbijaTim.objects.create(
+            certificate_number='SRB-2', company=Company.objects.get(name='Comp A'), visit_date=date(2025, 8, 20),
+        )
+        visit.auditors.add(self.idle)
+
+        self.assertEqual(self._row(analytics.month_utilisation(2025, 8), self.idle)['srbija_tim_visits'], 1)
+
+    def test_api_range_and_validation(self):
+        url = reverse('company:auditor_utilisation_json')
+
+        resp = self.client.get(url, {'from': '2025-07', 'to': '2025-09'})
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual([m['month'] for m in resp.json()['months']], ['2025-07', '2025-08', '2025-09'])
+
+        self.assertEqual(self.client.get(url, {'month': '2025-13'}).status_code, 400)
+        self.assertEqual(self.client.get(url, {'from': '2020-01', 'to': '2025-01'}).status_code, 400)
+
+        self.assertEqual(self.client.get(reverse('company:auditor_utilisation')).status_code, 200)
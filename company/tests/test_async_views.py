@@ -0,0 +1,84 @@
+from datetime import date
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from company.auditor_models import Auditor, AuditorStandard
+from company.cycle_models import CertificationCycle, CycleAudit, CycleStandard
+from company.models import Company
+from company.srbija_tim_models import SrbijaTim
+from company.standard_models import CompanyStandard, StandardDefinition
+
+
+class AsyncJsonViewsTests(TestCase):
+    """JSON endpoint-i ASGI profila kroz AsyncClient (async middleware + async ORM)"""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(username='tester', password='pass1234')
+        self.company = Company.objects.create(name='Comp A')
+
+        self.iso9001 = StandardDefinition.objects.create(code='9001', name='ISO 9001')
+        self.iso14001 = StandardDefinition.objects.create(code='14001', name='ISO 14001')
+        CompanyStandard.objects.create(company=self.company, standard_definition=self.iso9001)
+        CompanyStandard.objects.create(company=self.company, standard_definition=self.iso14001)
+
+        self.both = Auditor.objects.create(ime_prezime='Auditor A', email='a@example.com', telefon='1')
+        self.one = Auditor.objects.create(ime_prezime='Auditor B', email='b@example.com', telefon='2')
+        AuditorStandard.objects.create(auditor=self.both, standard=self.iso9001)
+        AuditorStandard.objects.create(auditor=self.both, standard=self.iso14001)
+        AuditorStandard.objects.create(auditor=self.one, standard=self.iso9001)
+
+        cycle = CertificationCycle.objects.create(
+            company=self.company, planirani_datum=date(2025, 8, 12), status='active', inicijalni_broj_dana=2,
+        )
+        CycleStandard.objects.create(certification_cycle=cycle, standard_definition=self.iso9001)
+        self.audit = CycleAudit.objects.create(
+            certification_cycle=cycle, audit_type='initial', audit_status='planned',
+            planned_date=date(2025, 8, 12), lead_auditor=self.both,
+        )
+        self.visit = SrbijaTim.objects.create(
+            certificate_number='SRB-1', company=self.company, visit_date=date(2025, 8, 14), broj_dana_posete=1,
+        )
+        self.visit.create_visit_days()
+
+    async def test_anonymous_request_is_redirected_by_async_middleware(self):
+        resp = await self.async_client.get(reverse('company:appointment_calendar_json'))
+        self.assertEqual(resp.status_code, 302)
+        self.assertIn('/accounts/login/', resp['Location'])
+
+    async def test_calendar_and_lookup_endpoints(self):
+        await self.async_client.aforce_login(self.user)
+
+        events = (await self.async_client.get(reverse('company:appointment_calendar_json'))).json()
+        self.assertIn(self.audit.pk, {e['extendedProps'].get('audit_id') for e in events})
+
+        events = (await self.async_client.get(reverse('company:srbija_tim_calendar_json'))).json()
+        self.assertEqual(len(events), 1)
+
+        body = (await self.async_client.get(reverse('company:audit_days_by_audit_id', args=[self.audit.pk]))).json()
+        self.assertTrue(body['success'])
+        self.assertEqual(len(body['audit']['audit_days']), 2)
+
+        companies = (await self.async_client.get(reverse('company:get_companies'), {'term': 'Comp'})).json()
+        self.assertEqual([c['id'] for c in companies], [self.company.pk])
+
+    async def test_qualified_auditors_need_every_standard(self):
+        await self.async_client.aforce_login(self.user)
+        url = reverse('company:qualified_auditors_api')
+
+        # Kompanija ima oba standarda - samo Auditor A
+        body = (await self.async_client.get(url, {'company_id': self.company.pk})).json()
+        self.assertEqual([a['id'] for a in body['data']], [self.both.pk])
+
+        # Ciklus audita ima samo 9001 - oba auditora
+        body = (await self.async_client.get(url, {'audit_id': self.audit.pk})).json()
+        self.assertEqual({a['id'] for a in body['data']}, {self.both.pk, self.one.pk})
+
+    @override_settings(LIVE_UPDATES_STREAM_SECONDS=0, LIVE_UPDATES_MODE='stream', LIVE_UPDATES_COMMIT_GRACE_SECONDS=0)
+    async def test_stream_is_async_under_asgi(self):
+        await self.async_client.aforce_login(self.user)
+        resp = await self.async_client.get(reverse('company:calendar_changes_stream'), {'feed': 'calendar'})
+        self.assertTrue(resp.is_async)
+        body = b''.join([chunk async for chunk in resp.streaming_content]).decode()
+        self.assertIn(': keepalive', body)
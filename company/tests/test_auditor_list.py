@@ -0,0 +1,73 @@
+import json
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from company.auditor_models import Auditor, AuditorIAFEACCode, AuditorStandard, AuditorStandardIAFEACCode
+from company.iaf_models import IAFEACCode
+from company.standard_models import StandardDefinition
+
+
+class AuditorListTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        User = get_user_model()
+        User.objects.create_user(username='tester', password='pass1234')
+        self.client.login(username='tester', password='pass1234')
+
+        self.iso9001 = StandardDefinition.objects.create(code='ISO9001', name='ISO 9001')
+        self.iso14001 = StandardDefinition.objects.create(code='ISO14001', name='ISO 14001')
+        self.code17 = IAFEACCode.objects.create(iaf_code='17')
+        self.code28 = IAFEACCode.objects.create(iaf_code='28')
+        self.ana = Auditor.objects.create(ime_prezime='Ana Anić', email='ana@example.com', telefon='1')
+        self.ana_9001 = AuditorStandard.objects.create(auditor=self.ana, standard=self.iso9001)
+        AuditorStandardIAFEACCode.objects.create(auditor_standard=self.ana_9001, iaf_eac_code=self.code28)
+
+    def _get(self, **params):
+        with CaptureQueriesContext(connection) as queries:
+            resp = self.client.get(reverse('company:auditor_list'), params)
+        self.assertEqual(resp.status_code, 200)
+        return resp, len(queries)
+
+    def test_code_lists_are_aggregated_in_one_query(self):
+        self._get()  # popunjava keš filtera
+        _, before = self._get()
+
+        ana_14001 = AuditorStandard.objects.create(auditor=self.ana, standard=self.iso14001)
+        AuditorStandardIAFEACCode.objects.create(auditor_standard=ana_14001, iaf_eac_code=self.code28)
+        AuditorStandardIAFEACCode.objects.create(auditor_standard=ana_14001, iaf_eac_code=self.code17)
+        expert = Auditor.objects.create(ime_prezime='Boris Borić', email='boris@example.com', telefon='2',
+                                        kategorija='technical_expert')
+        AuditorIAFEACCode.objects.create(auditor=expert, iaf_eac_code=self.code17)
+
+        resp, after = self._get()
+        self.assertEqual(after, before)
+        auditors = {auditor.pk: auditor for auditor in resp.context['auditors']}
+        self.assertEqual(auditors[self.ana.pk].standard_codes, ['ISO14001', 'ISO9001'])
+        self.assertEqual(auditors[self.ana.pk].all_iaf_codes, ['17', '28'])
+        self.assertEqual(auditors[expert.pk].standard_codes, [])
+        self.assertEqual(auditors[expert.pk].all_iaf_codes, ['17'])
+
+        payload = resp.content.decode().split('id="auditorSearchIndex" type="application/json">')[1]
+        index = dict(json.loads(payload.split('</script>')[0]))
+        self.assertEqual(index[self.ana.pk], 'ana anić ana@example.com 1 auditor iso14001 iso9001 17 28')
+
+    def test_filters_still_apply(self):
+        Auditor.objects.create(ime_prezime='Boris Borić', email='boris@example.com', telefon='2')
+        resp, _ = self._get(iaf_code='28')
+        self.assertEqual([auditor.pk for auditor in resp.context['auditors']], [self.ana.pk])
+        resp, _ = self._get(standard=self.iso14001.pk)
+        self.assertEqual(list(resp.context['auditors']), [])
+
+    def test_filter_choices_follow_definition_changes(self):
+        resp, _ = self._get()
+        self.assertEqual([s.code for s in resp.context['standards']], ['ISO14001', 'ISO9001'])
+
+        StandardDefinition.objects.create(code='ISO27001', name='ISO 27001')
+        resp, _ = self._get()
+        self.assertIn('ISO27001', [s.code for s in resp.context['standards']])
+        self.assertContains(resp, '<option value="28">28</option>', html=True)
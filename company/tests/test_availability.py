@@ -0,0 +1,65 @@
+from datetime import date
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from company.auditor_models import Auditor
+from company.availability import availability_matrix
+from company.cycle_models import CertificationCycle, CycleAudit
+from company.models import Company
+from company.srbija_tim_models import SrbijaTim
+
+
+class AuditorAvailabilityTests(TestCase):
+    def setUp(self):
+        User = get_user_model()
+        User.objects.create_user(username='tester', password='pass1234')
+        self.client.login(username='tester', password='pass1234')
+
+        self.company = Company.objects.create(name='Comp A')
+        self.busy = Auditor.objects.create(ime_prezime='Auditor A', email='a@example.com', telefon='1')
+        self.free = Auditor.objects.create(ime_prezime='Auditor B', email='b@example.com', telefon='2')
+
+        cycle = CertificationCycle.objects.create(
+            company=self.company, planirani_datum=date(2025, 8, 12), status='active', inicijalni_broj_dana=2,
+        )
+        # Dvodnevni audit: 11. i 12. avgust (dani se računaju unazad)
+        self.audit = CycleAudit.objects.create(
+            certification_cycle=cycle, audit_type='initial', audit_status='planned',
+            planned_date=date(2025, 8, 12), lead_auditor=self.busy,
+        )
+        # Srbija Tim poseta 14. avgusta
+        self.visit = SrbijaTim.objects.create(
+            certificate_number='SRB-1', company=self.company, visit_date=date(2025, 8, 14), broj_dana_posete=1,
+        )
+        self.visit.auditors.add(self.busy)
+        self.visit.create_visit_days()
+
+    def test_matrix_is_run_length_encoded_in_two_queries(self):
+        with CaptureQueriesContext(connection) as ctx:
+            data = availability_matrix(Auditor.objects.order_by('ime_prezime'), date(2025, 8, 10), date(2025, 8, 20))
+
+        self.assertEqual(len(ctx.captured_queries), 2)
+        self.assertEqual(data['days'], 11)
+        busy, free = data['auditors']
+        self.assertEqual(busy['runs'], [[1, 2, 'A', self.audit.id], [4, 1, 'S', self.visit.id]])
+        self.assertEqual(busy['busy_days'], 3)
+        self.assertEqual(free['runs'], [])
+
+    def test_api_validates_range_and_applies_filters(self):
+        url = reverse('company:auditor_availability_json')
+
+        self.assertEqual(self.client.get(url).status_code, 400)
+        self.assertEqual(self.client.get(url, {'date_from': '2025-08-20', 'date_to': '2025-08-10'}).status_code, 400)
+
+        resp = self.client.get(url, {'date_from': '2025-08-10', 'date_to': '2025-08-20', 'search': 'Auditor B'})
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual([a['id'] for a in resp.json()['auditors']], [self.free.id])
+
+    def test_availability_page_renders(self):
+        resp = self.client.get(reverse('company:auditor_availability'))
+        self.assertEqual(resp.status_code, 200)
+        self.assertContains(resp, 'availabilityGrid')
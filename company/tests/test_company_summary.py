@@ -0,0 +1,135 @@
+from datetime import date
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from company import company_summary
+from company.cycle_models import CertificationCycle, CycleAudit
+from company.models import Company
+from company.standard_models import CompanyStandard, StandardDefinition
+
+
+class CompanySummaryTests(TestCase):
+    def setUp(self):
+        self.iso9001 = StandardDefinition.objects.create(code='9001', name='ISO 9001')
+        self.iso14001 = StandardDefinition.objects.create(code='14001', name='ISO 14001')
+        self.company = Company.objects.create(name='Comp A')
+        self.cycle = CertificationCycle.objects.create(company=self.company, planirani_datum=date(2025, 1, 10))
+
+    def _audit(self, audit_type, planned, status='planned', cycle=None):
+        return CycleAudit.objects.create(
+            certification_cycle=cycle or self.cycle, audit_type=audit_type, planned_date=planned, audit_status=status,
+        )
+
+    def test_summary_follows_audit_cycle_and_standard_changes(self):
+        self.company.refresh_from_db()
+        self.assertEqual(self.company.active_cycle_id, self.cycle.pk)
+        self.assertIsNone(self.company.next_audit_date)
+
+        self._audit('initial', date(2025, 1, 10), status='completed')
+        surveillance = self._audit('surveillance_1', date(2026, 1, 10))
+        self._audit('surveillance_2', date(2027, 1, 10))
+        self.company.refresh_from_db()
+        self.assertEqual(self.company.next_audit_date, date(2026, 1, 10))
+        self.assertEqual(self.company.next_audit_type, 'surveillance_1')
+
+        surveillance.audit_status = 'completed'
+        surveillance.save()
+        self.company.refresh_from_db()
+        self.assertEqual(self.company.next_audit_type, 'surveillance_2')
+
+        CompanyStandard.objects.create(company=self.company, standard_definition=self.iso9001, expiry_date=date(2028, 1, 9))
+        second = CompanyStandard.objects.create(company=self.company, standard_definition=self.iso14001, expiry_date=date(2027, 6, 1))
+        self.company.refresh_from_db()
+        self.assertEqual(self.company.nearest_expiry, date(2027, 6, 1))
+        second.delete()
+        self.company.refresh_from_db()
+        self.assertEqual(self.company.nearest_expiry, date(2028, 1, 9))
+
+        self.cycle.status = 'completed'
+        self.cycle.save()
+        self.company.refresh_from_db()
+        self.assertIsNone(self.company.active_cycle_id)
+        # Otvoreni auditi završenog ciklusa nisu "sledeći"
+        self.assertIsNone(self.company.next_audit_date)
+
+    def test_saving_company_keeps_summary(self):
+        stale = Company.objects.get(pk=self.company.pk)
+        self._audit('surveillance_1', date(2026, 3, 1))
+        stale.name = 'Comp A d.o.o.'
+        stale.save()
+        self.company.refresh_from_db()
+        self.assertEqual(self.company.next_audit_date, date(2026, 3, 1))
+
+    def test_refresh_recomputes_in_one_query(self):
+        self._audit('surveillance_1', date(2026, 3, 1))
+        Company.objects.update(next_audit_date=None, next_audit_type='', active_cycle=None)
+        with self.assertNumQueries(1):
+            self.assertEqual(company_summary.refresh(), 1)
+        self.company.refresh_from_db()
+        self.assertEqual(self.company.next_audit_date, date(2026, 3, 1))
+        self.assertEqual(self.company.active_cycle_id, self.cycle.pk)
+
+        Company.objects.update(next_audit_date=None)
+        call_command('refresh_company_summaries', verbosity=0, stdout=StringIO())
+        self.company.refresh_from_db()
+        self.assertEqual(self.company.next_audit_date, date(2026, 3, 1))
+
+    def test_company_list_filters_by_next_audit(self):
+        other = Company.objects.create(name='Comp B')
+        other_cycle = CertificationCycle.objects.create(company=other, planirani_datum=date(2025, 1, 10))
+        self._audit('surveillance_1', date(2026, 3, 1))
+        self._audit('surveillance_1', date(2026, 9, 1), cycle=other_cycle)
+
+        User = get_user_model()
+        User.objects.create_user(username='tester', password='pass1234')
+        self.client.login(username='tester', password='pass1234')
+        resp = self.client.get(reverse('company:list'), {'audit_from': '2026-06-01'})
+        self.assertEqual([company.pk for company in resp.context['companies']], [other.pk])
+        self.assertContains(resp, '01.09.2026')
+
+        # Filter važi za bilo koji audit aktivnog ciklusa, ne samo za sledeći
+        self._audit('surveillance_2', date(2026, 12, 1), status='completed')
+        resp = self.client.get(reverse('company:list'), {'audit_from': '2026-06-01'})
+        self.assertEqual(sorted(company.pk for company in resp.context['companies']), sorted([self.company.pk, other.pk]))
+
+        # Auditi završenog ciklusa se ne vide ni u filteru ni u koloni
+        other_cycle.status = 'completed'
+        other_cycle.save()
+        resp = self.client.get(reverse('company:list'), {'audit_from': '2026-06-01', 'audit_to': '2026-10-01'})
+        self.assertEqual(list(resp.context['companies']), [])
+        other.refresh_from_db()
+        self.assertIsNone(other.next_audit_date)
+
+    def test_company_list_sorts_and_filters_by_summary_columns(self):
+        other = Company.objects.create(name='Comp B')
+        other_cycle = CertificationCycle.objects.create(company=other, planirani_datum=date(2025, 1, 10))
+        no_audit = Company.objects.create(name='Comp 0')
+        self._audit('surveillance_1', date(2026, 9, 1))
+        self._audit('surveillance_1', date(2026, 3, 1), cycle=other_cycle)
+        CompanyStandard.objects.create(company=self.company, standard_definition=self.iso9001, expiry_date=date(2027, 1, 1))
+        CompanyStandard.objects.create(company=other, standard_definition=self.iso9001, expiry_date=date(2028, 1, 1))
+
+        User = get_user_model()
+        User.objects.create_user(username='tester', password='pass1234')
+        self.client.login(username='tester', password='pass1234')
+
+        def listed(**params):
+            resp = self.client.get(reverse('company:list'), params)
+            return [company.pk for company in resp.context['companies']]
+
+        self.assertEqual(listed(), [no_audit.pk, self.company.pk, other.pk])
+        # Kompanije bez datuma su na kraju
+        self.assertEqual(listed(sort='next_audit'), [other.pk, self.company.pk, no_audit.pk])
+        self.assertEqual(listed(sort='expiry'), [self.company.pk, other.pk, no_audit.pk])
+        self.assertEqual(listed(sort='nepoznato'), [no_audit.pk, self.company.pk, other.pk])
+
+        # Kasniji audit u ciklusu ne utiče na filter po sledećem nadzoru
+        self._audit('surveillance_2', date(2026, 12, 1), cycle=other_cycle)
+        self.assertEqual(listed(next_audit_from='2026-06-01'), [self.company.pk])
+        self.assertEqual(listed(audit_from='2026-06-01'), [self.company.pk, other.pk])
+        self.assertEqual(listed(nearest_expiry_to='2027-06-01'), [self.company.pk])
+        self.assertEqual(listed(nearest_expiry_from='2027-06-01', sort='next_audit'), [other.pk])
@@ -0,0 +1,85 @@
+from datetime import date
+import json
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, Client
+from django.urls import reverse
+
+from company.auditor_models import Auditor
+from company.cycle_models import CertificationCycle, CycleAudit
+from company.models import Company
+from company.srbija_tim_models import SrbijaTim
+
+
+class OptimisticConcurrencyTests(TestCase):
+    def setUp(self):
+        User = get_user_model()
+        User.objects.create_user(username='tester', password='pass1234')
+        self.client = Client()
+        self.client.login(username='tester', password='pass1234')
+
+        self.company = Company.objects.create(name='Comp A')
+        self.auditor = Auditor.objects.create(ime_prezime='Auditor X', email='x@example.com', telefon='123')
+
+        cycle = CertificationCycle.objects.create(
+            company=self.company, planirani_datum=date(2025, 8, 14), status='active', inicijalni_broj_dana=1,
+        )
+        self.audit = CycleAudit.objects.create(
+            certification_cycle=cycle, audit_type='initial', audit_status='planned',
+            planned_date=date(2025, 8, 14), lead_auditor=self.auditor,
+        )
+
+    def _move_audit(self, new_date, version=None):
+        payload = {'eventType': 'cycle_audit', 'eventId': self.audit.id, 'newDate': new_date.isoformat()}
+        if version is not None:
+            payload['version'] = version
+        return self.client.post(reverse('company:update_event_date'), data=json.dumps(payload), content_type='application/json')
+
+    def test_save_bumps_version_also_with_update_fields(self):
+        self.audit.refresh_from_db()
+        version = self.audit.version
+
+        self.audit.notes = 'izmena'
+        self.audit.save(update_fields=['notes'])
+        self.audit.refresh_from_db()
+
+        self.assertEqual(self.audit.version, version + 1)
+
+    def test_stale_audit_move_returns_409_with_current_state(self):
+        self.audit.refresh_from_db()
+        seen = self.audit.version
+
+        # Drugi planer u međuvremenu pomera isti audit
+        self.assertEqual(self._move_audit(date(2025, 8, 18), seen).status_code, 200)
+
+        resp = self._move_audit(date(2025, 8, 20), seen)
+        self.assertEqual(resp.status_code, 409)
+        body = resp.json()
+        self.assertTrue(body['stale'])
+        self.assertEqual(body['current']['audit']['version'], seen + 1)
+        self.audit.refresh_from_db()
+        self.assertEqual(self.audit.planned_date, date(2025, 8, 18))
+
+        # Sa svežom verzijom izmena prolazi i vraća novu verziju
+        resp = self._move_audit(date(2025, 8, 20), body['current']['audit']['version'])
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.json()['audit']['version'], seen + 2)
+
+        # Klijent bez verzije se ne proverava
+        self.assertEqual(self._move_audit(date(2025, 8, 21)).status_code, 200)
+
+    def test_stale_srbija_tim_move_returns_409(self):
+        visit = SrbijaTim.objects.create(
+            certificate_number='SRB-1', company=self.company, visit_date=date(2025, 9, 1), broj_dana_posete=1,
+        )
+        url = reverse('company:srbija_tim_update_date', args=[visit.pk])
+
+        resp = self.client.post(url, data=json.dumps({'visit_date': '2025-09-02', 'version': visit.version + 5}),
+                                content_type='application/json')
+        self.assertEqual(resp.status_code, 409)
+        self.assertEqual(resp.json()['current']['version'], visit.version)
+
+        resp = self.client.post(url, data=json.dumps({'visit_date': '2025-09-02', 'version': visit.version}),
+                                content_type='application/json')
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.json()['version'], visit.version + 1)
@@ -0,0 +1,137 @@
+from datetime import date, datetime
+import json
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from company.auditor_models import Auditor
+from company.conflict_service import BookingIndex, audit_dates, find_conflicts, visit_dates
+from company.cycle_models import CertificationCycle, CycleAudit
+from company.models import Company
+from company.srbija_tim_models import SrbijaTim
+
+
+class ConflictServiceTests(TestCase):
+    def setUp(self):
+        User = get_user_model()
+        User.objects.create_user(username='tester', password='pass1234')
+        self.client.login(username='tester', password='pass1234')
+
+        self.company_a = Company.objects.create(name='Comp A')
+        self.company_b = Company.objects.create(name='Comp B')
+        self.auditor = Auditor.objects.create(ime_prezime='Auditor X', email='x@example.com', telefon='123')
+        self.other = Auditor.objects.create(ime_prezime='Auditor Y', email='y@example.com', telefon='456')
+
+        self.d1 = date(2025, 8, 14)
+        self.d2 = date(2025, 8, 15)
+
+    def _audit(self, company, planned_date, days=1):
+        cycle = CertificationCycle.objects.create(
+            company=company, planirani_datum=planned_date, status='active', inicijalni_broj_dana=days,
+        )
+        return CycleAudit.objects.create(
+            certification_cycle=cycle, audit_type='initial', audit_status='planned',
+            planned_date=planned_date, lead_auditor=self.auditor,
+        )
+
+    def _visit(self, company, visit_date, days=1):
+        visit = SrbijaTim.objects.create(
+            certificate_number=f'SRB-{company.pk}', company=company, visit_date=visit_date, broj_dana_posete=days,
+        )
+        visit.auditors.add(self.auditor)
+        visit.create_visit_days()
+        return visit
+
+    def test_audit_reservation_is_a_conflict(self):
+        audit = self._audit(self.company_a, self.d1)
+
+        conflicts = find_conflicts([self.auditor.id, self.other.id], [self.d1, self.d2])
+
+        self.assertEqual(list(conflicts), [self.auditor.id])
+        booking = conflicts[self.auditor.id][0]
+        self.assertEqual(booking.audit_id, audit.id)
+        self.assertIn('Comp A', booking.describe())
+
+        # Sopstveni audit se ne računa kao konflikt
+        self.assertEqual(find_conflicts([self.auditor.id], [self.d1], exclude_audit_id=audit.id), {})
+
+    def test_multi_day_visit_counts_each_day_once(self):
+        visit = self._visit(self.company_b, self.d1, days=2)
+
+        index = BookingIndex.load([self.auditor.id], self.d1, self.d2)
+        self.assertFalse(index.is_free(self.auditor.id, self.d1))
+        self.assertFalse(index.is_free(self.auditor.id, self.d2))
+        self.assertEqual(len(index.bookings_on(self.auditor.id, self.d1)), 1)
+        self.assertEqual([b.visit_id for b in index.bookings_between(self.auditor.id, self.d1, self.d2)],
+                         [visit.id, visit.id])
+        self.assertEqual(find_conflicts([self.auditor.id], [self.d2], exclude_visit_id=visit.id), {})
+
+    def test_date_helpers(self):
+        cycle = CertificationCycle(inicijalni_broj_dana=1.5)
+        self.assertEqual(audit_dates(cycle, 'initial', self.d2), [self.d2, self.d1])
+        self.assertEqual(visit_dates(self.d1, 2), [self.d1, self.d2])
+        self.assertEqual(visit_dates(self.d1, None), [self.d1])
+
+    def test_srbija_tim_visit_blocks_audit_drag(self):
+        audit = self._audit(self.company_a, self.d1)
+        self._visit(self.company_b, self.d2)
+
+        payload = {
+            'eventType': 'cycle_audit',
+            'eventId': audit.id,
+            'newDate': datetime.combine(self.d2, datetime.min.time()).isoformat(),
+        }
+        resp = self.client.post(reverse('company:update_event_date'), data=json.dumps(payload),
+                                content_type='application/json')
+
+        self.assertEqual(resp.status_code, 409)
+        self.assertIsNotNone(resp.json()['conflicts'][0]['conflicting_visit_id'])
+        audit.refresh_from_db()
+        self.assertEqual(audit.planned_date, self.d1)
+
+    def test_srbija_tim_drag_onto_audit_is_rejected(self):
+        self._audit(self.company_a, self.d2)
+        visit = self._visit(self.company_b, self.d1)
+
+        resp = self.client.post(reverse('company:srbija_tim_update_date', args=[visit.pk]),
+                                data=json.dumps({'visit_date': self.d2.isoformat()}),
+                                content_type='application/json')
+
+        self.assertEqual(resp.status_code, 400)
+        self.assertIn('Auditor X', resp.json()['conflicts'][0])
+        visit.refresh_from_db()
+        self.assertEqual(visit.visit_date, self.d1)
+
+    def test_srbija_tim_drag_checks_every_day_and_moves_visit_days(self):
+        visit = self._visit(self.company_b, self.d1, days=3)
+        visit.visit_days.filter(day_number=2).update(notes='Obilazak pogona')
+        # Audit pada na treći dan posete ako se poseta pomeri za dva dana
+        self._audit(self.company_a, date(2025, 8, 18))
+        url = reverse('company:srbija_tim_update_date', args=[visit.pk])
+
+        resp = self.client.post(url, data=json.dumps({'visit_date': '2025-08-16'}), content_type='application/json')
+        self.assertEqual(resp.status_code, 400)
+        self.assertIn('2025-08-18', resp.json()['conflicts'][0])
+
+        resp = self.client.post(url, data=json.dumps({'visit_date': '2025-08-20', 'visit_time': '09:00'}),
+                                content_type='application/json')
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.json()['dates'], ['2025-08-20', '2025-08-21', '2025-08-22'])
+        days = list(visit.visit_days.order_by('day_number').values_list('date', 'notes'))
+        self.assertEqual(days, [(date(2025, 8, 20), None), (date(2025, 8, 21), 'Obilazak pogona'), (date(2025, 8, 22), None)])
+
+        # Stari dani više ne zauzimaju auditora
+        self.assertEqual(find_conflicts([self.auditor.id], visit_dates(self.d1, 3)), {})
+
+    def test_visit_days_follow_day_count(self):
+        visit = self._visit(self.company_b, self.d1, days=3)
+        visit.broj_dana_posete = 2
+        visit.save()
+        visit.create_visit_days()
+        self.assertEqual(list(visit.visit_days.order_by('day_number').values_list('date', flat=True)), [self.d1, self.d2])
+
+        visit.broj_dana_posete = 4
+        visit.save()
+        visit.create_visit_days()
+        self.assertEqual(visit.visit_days.count(), 4)
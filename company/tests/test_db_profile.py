@@ -0,0 +1,46 @@
+import runpy
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import SimpleTestCase, TransactionTestCase
+
+import isoqar_app
+
+SETTINGS_PATH = Path(isoqar_app.__file__).with_name('settings.py')
+
+
+def load_settings(**env):
+    """Izvršava settings.py sa datim env varijablama, bez uticaja na aktivna podešavanja"""
+    with mock.patch.dict('os.environ', env):
+        return runpy.run_path(str(SETTINGS_PATH))
+
+
+class DatabaseProfileSettingsTests(SimpleTestCase):
+    def test_postgres_uses_pool_health_checks_and_statement_timeout(self):
+        db = load_settings(DATABASE_URL='postgres://u:p@db:5432/isoqar', GUNICORN_THREADS='6')['DATABASES']['default']
+        self.assertEqual(db['OPTIONS']['options'], '-c statement_timeout=30000')
+        self.assertEqual(db['OPTIONS']['pool']['max_size'], 6)
+        self.assertEqual(db['CONN_MAX_AGE'], 0)
+        self.assertTrue(db['CONN_HEALTH_CHECKS'])
+
+    def test_without_pool_connections_are_persistent(self):
+        db = load_settings(
+            DATABASE_URL='postgresql', DB_POOL='False', DB_CONN_MAX_AGE='120', DB_STATEMENT_TIMEOUT_MS='0',
+        )['DATABASES']['default']
+        self.assertNotIn('pool', db['OPTIONS'])
+        self.assertEqual(db['OPTIONS']['options'], '-c statement_timeout=0')
+        self.assertEqual(db['CONN_MAX_AGE'], 120)
+
+    def test_sqlite_is_left_alone(self):
+        db = load_settings(DATABASE_URL='')['DATABASES']['default']
+        self.assertNotIn('OPTIONS', db)
+
+
+class BenchmarkDbCommandTests(TransactionTestCase):
+    # Komanda zatvara konekciju posle svakog zahteva, što nije dozvoljeno unutar transakcije TestCase-a
+    def test_reports_latency(self):
+        out = StringIO()
+        call_command('benchmark_db', requests=5, stdout=out)
+        self.assertIn('5 zahteva x 3 upita', out.getvalue())
@@ -0,0 +1,101 @@
+import json
+import re
+from datetime import date
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from company.auditor_models import Auditor
+from company.cycle_models import CertificationCycle, CycleAudit, CycleStandard
+from company.models import Company, KontaktOsoba, OstalaLokacija
+from company.standard_models import CompanyStandard, StandardDefinition
+
+
+class DetailFragmentCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        User = get_user_model()
+        User.objects.create_user(username='tester', password='pass1234')
+        self.client.login(username='tester', password='pass1234')
+
+        self.iso9001 = StandardDefinition.objects.create(code='9001', name='ISO 9001')
+        self.company = Company.objects.create(name='Comp A')
+        CompanyStandard.objects.create(company=self.company, standard_definition=self.iso9001, certificate_number='C-77')
+        self.contact = KontaktOsoba.objects.create(company=self.company, ime_prezime='Petar Petrović')
+        self.location = OstalaLokacija.objects.create(company=self.company, name='Magacin Zemun')
+        self.cycle = self._cycle(date(2025, 9, 1))
+        self.ana = Auditor.objects.create(ime_prezime='Ana Anić', email='ana@example.com', telefon='1')
+        self.audit = CycleAudit.objects.create(
+            certification_cycle=self.cycle, audit_type='initial', planned_date=date(2025, 9, 15), lead_auditor=self.ana,
+        )
+
+    def _cycle(self, planned):
+        cycle = CertificationCycle.objects.create(company=self.company, planirani_datum=planned)
+        CycleStandard.objects.create(certification_cycle=cycle, standard_definition=self.iso9001)
+        return cycle
+
+    def _get(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            resp = self.client.get(url)
+        self.assertEqual(resp.status_code, 200)
+        # CSRF token se razlikuje po odgovoru
+        html = re.sub(r'value="[A-Za-z0-9]{64}"', '', resp.content.decode())
+        return html, len(queries)
+
+    def test_company_sections_are_cached_until_related_rows_change(self):
+        url = reverse('company:detail', args=[self.company.pk])
+        first, cold = self._get(url)
+        second, warm = self._get(url)
+        self.assertEqual(first, second)
+        self.assertLess(warm, cold)
+        self.assertIn('C-77', second)
+        self.assertIn('15.09.2025', second)  # poslednji planirani datum ciklusa je datum audita
+
+        self.contact.ime_prezime = 'Petar Jovanović'
+        self.contact.save()
+        self.location.delete()
+        html, _ = self._get(url)
+        self.assertIn('Petar Jovanović', html)
+        self.assertNotIn('Magacin Zemun', html)
+        self.assertIn('C-77', html)
+
+    def test_company_detail_queries_do_not_grow_with_cycles(self):
+        url = reverse('company:detail', args=[self.company.pk])
+        _, one_cycle = self._get(url)
+        for month in (10, 11, 12):
+            cycle = self._cycle(date(2025, month, 1))
+            CycleAudit.objects.create(certification_cycle=cycle, audit_type='initial', planned_date=date(2025, month, 20))
+        cache.clear()
+        html, four_cycles = self._get(url)
+        self.assertEqual(four_cycles, one_cycle)
+        self.assertIn('20.12.2025', html)
+
+    def test_cycle_audit_team_change_invalidates_fragment(self):
+        url = reverse('company:cycle_detail', args=[self.cycle.pk])
+        boris = Auditor.objects.create(ime_prezime='Boris Borić', email='boris@example.com', telefon='1')
+        self.assertNotIn('Boris Borić', self._get(url)[0])
+
+        self.audit.audit_team.add(boris)
+        self.assertIn('Boris Borić', self._get(url)[0])
+
+        boris.audit_participations.clear()
+        self.assertNotIn('Boris Borić', self._get(url)[0])
+
+    def test_calendar_move_invalidates_cycle_fragment(self):
+        url = reverse('company:cycle_detail', args=[self.cycle.pk])
+        self.assertIn('15.09.2025', self._get(url)[0])
+
+        # update_event_date čuva audit sa update_fields=['planned_date']
+        resp = self.client.post(
+            reverse('company:update_event_date'),
+            data=json.dumps({'eventType': 'cycle_audit', 'eventId': self.audit.pk, 'newDate': '2025-09-22T00:00:00'}),
+            content_type='application/json',
+        )
+        self.assertEqual(resp.status_code, 200)
+        html, _ = self._get(url)
+        self.assertIn('22.09.2025', html)
+        self.assertNotIn('15.09.2025', html)
@@ -0,0 +1,82 @@
+from datetime import date
+from io import BytesIO
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, Client
+from django.urls import reverse
+from openpyxl import load_workbook
+
+from company.models import Company
+from company.cycle_models import CertificationCycle, CycleAudit, AuditDay
+from company.auditor_models import Auditor
+
+
+class ExportListTests(TestCase):
+    def setUp(self):
+        User = get_user_model()
+        self.user = User.objects.create_user(username='tester', password='pass1234')
+        self.client = Client()
+        self.client.login(username='tester', password='pass1234')
+
+        self.company_a = Company.objects.create(name='Alfa doo', pib='123456789')
+        self.company_b = Company.objects.create(name='Beta doo')
+        self.auditor = Auditor.objects.create(ime_prezime='Auditor X', email='x@example.com', telefon='123')
+
+        cycle = CertificationCycle.objects.create(
+            company=self.company_a,
+            planirani_datum=date(2025, 3, 10),
+            status='active',
+            inicijalni_broj_dana=2,
+        )
+        self.audit = CycleAudit.objects.create(
+            certification_cycle=cycle,
+            audit_type='initial',
+            audit_status='planned',
+            planned_date=date(2025, 3, 10),
+            lead_auditor=self.auditor,
+        )
+
+    def _csv_rows(self, response):
+        content = b''.join(response.streaming_content).decode('utf-8-sig')
+        return [line for line in content.splitlines() if line]
+
+    def test_companies_csv_is_streamed_and_filtered(self):
+        url = reverse('company:export_list', args=['companies', 'csv'])
+        response = self.client.get(url, {'search': 'Alfa'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertIn('attachment', response['Content-Disposition'])
+        rows = self._csv_rows(response)
+        self.assertEqual(len(rows), 2)  # zaglavlje + Alfa
+        self.assertIn('Alfa doo', rows[1])
+
+    def test_audit_days_csv_respects_date_filter(self):
+        days = list(AuditDay.objects.filter(audit=self.audit).order_by('date').values_list('date', flat=True))
+        self.assertTrue(days)
+
+        url = reverse('company:export_list', args=['audit-days', 'csv'])
+        response = self.client.get(url, {'date_from': days[-1].isoformat()})
+        rows = self._csv_rows(response)
+        self.assertEqual(len(rows), 2)
+        self.assertIn(days[-1].isoformat(), rows[1])
+
+    def test_audits_xlsx(self):
+        url = reverse('company:export_list', args=['audits', 'xlsx'])
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, 200)
+        workbook = load_workbook(BytesIO(b''.join(response.streaming_content)), read_only=True)
+        rows = list(workbook.active.iter_rows(values_only=True))
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(rows[1][1], 'Alfa doo')
+        self.assertEqual(rows[1][7], 'Auditor X')
+
+    def test_unknown_dataset_returns_404(self):
+        url = reverse('company:export_list', args=['nepostojece', 'csv'])
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+    def test_requires_login(self):
+        self.client.logout()
+        url = reverse('company:export_list', args=['companies', 'csv'])
+        self.assertEqual(self.client.get(url).status_code, 302)
@@ -0,0 +1,86 @@
+from datetime import date
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from company import forecast
+from company.auditor_models import Auditor, AuditorStandard
+from company.cycle_models import CertificationCycle, CycleStandard
+from company.models import Company
+from company.standard_models import StandardDefinition
+
+
+class DemandForecastTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        User = get_user_model()
+        User.objects.create_user(username='tester', password='pass1234')
+        self.client.login(username='tester', password='pass1234')
+
+        self.standard = StandardDefinition.objects.create(code='9001', name='ISO 9001')
+        auditor = Auditor.objects.create(ime_prezime='Auditor A', email='a@example.com', telefon='1')
+        AuditorStandard.objects.create(auditor=auditor, standard=self.standard)
+
+        # Inicijalna provera 1.3.2024 -> prvi nadzor se automatski zakazuje za 27.2.2025
+        cycle = CertificationCycle.objects.create(
+            company=Company.objects.create(name='Comp A'), planirani_datum=date(2024, 3, 1),
+            datum_sprovodjenja_inicijalne=date(2024, 3, 1), status='active',
+            broj_dana_nadzora=Decimal('2'), broj_dana_resertifikacije=Decimal('2.5'),
+        )
+        CycleStandard.objects.create(certification_cycle=cycle, standard_definition=self.standard)
+
+        # Ciklus bez audita čiji je prvi nadzor trebalo da bude 10.1.2024 - zaostao
+        CertificationCycle.objects.create(
+            company=Company.objects.create(name='Comp B'), planirani_datum=date(2023, 1, 10), status='active',
+        )
+
+    def test_projection_follows_cycle_formulas(self):
+        data = forecast.compute_forecast(date(2025, 1, 15))
+
+        self.assertEqual(len(data['months']), forecast.FORECAST_MONTHS)
+        self.assertEqual(data['months'][0], '2025-01')
+        self.assertEqual(data['cycles'], 2)
+        types = data['total']['by_type']
+        # Comp A: S1 02/2025 (postojeći), S2 02/2026, resertifikacija 02/2027
+        self.assertEqual(types['surveillance_1'][1], 1)
+        self.assertEqual(types['surveillance_2'][13], 1)
+        self.assertEqual(types['recertification'][25], 1)
+        # Comp B: zaostali prvi nadzor pada u tekući mesec, lanac se nastavlja od njega
+        self.assertEqual(types['surveillance_1'][0], 1)
+        self.assertEqual(types['surveillance_2'][12], 1)
+        self.assertEqual(data['overdue']['audits'], 1)
+
+        standard = next(s for s in data['standards'] if s['id'] == self.standard.id)
+        self.assertEqual(standard['qualified_auditors'], 1)
+        self.assertEqual(standard['demand_days'][1], 2.0)
+        self.assertEqual(standard['demand_days'][25], 3.0)
+        # Februar 2025: 20 radnih dana × 1 auditor × 0.5
+        self.assertEqual(standard['capacity_days'][1], 10.0)
+        self.assertEqual(standard['shortfall_months'], [])
+
+    def test_forecast_is_cached_until_cycles_change(self):
+        forecast.forecast(date(2025, 1, 15))
+        with CaptureQueriesContext(connection) as ctx:
+            forecast.forecast(date(2025, 1, 15))
+        self.assertEqual(len(ctx.captured_queries), 0)
+
+        CertificationCycle.objects.create(
+            company=Company.objects.get(name='Comp B'), planirani_datum=date(2025, 6, 1), status='active',
+        )
+        self.assertEqual(forecast.forecast(date(2025, 1, 15))['cycles'], 3)
+
+    def test_api(self):
+        url = reverse('company:demand_forecast_json')
+
+        resp = self.client.get(url, {'from': '2025-01'})
+        self.assertEqual(resp.status_code, 200)
+        self.assertTrue(resp.json()['success'])
+        self.assertEqual(resp.json()['start'], '2025-01')
+
+        self.assertEqual(self.client.get(url, {'from': 'jan'}).status_code, 400)
+        self.assertEqual(self.client.get(reverse('company:demand_forecast')).status_code, 200)
@@ -0,0 +1,93 @@
+import threading
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from company import health_checks
+from company.models import BackgroundJob
+
+
+def failing_check():
+    raise RuntimeError('nije dostupno')
+
+
+class ReadinessCheckTests(TestCase):
+    def setUp(self):
+        health_checks.clear_cache()
+        self.addCleanup(health_checks.clear_cache)
+        User = get_user_model()
+        self.staff = User.objects.create_user(username='ops', password='pass1234', is_staff=True)
+
+    def test_anonymous_probe_gets_only_pass_fail(self):
+        resp = self.client.get(reverse('readiness_check'))
+
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.json(), {'ready': True})
+
+    def test_all_checks_ready_for_staff(self):
+        self.client.force_login(self.staff)
+        resp = self.client.get(reverse('readiness_check'))
+
+        self.assertEqual(resp.status_code, 200)
+        data = resp.json()
+        self.assertTrue(data['ready'])
+        self.assertEqual(set(data['checks']), {'database', 'migrations', 'cache', 'log_disk', 'job_queue'})
+        self.assertEqual(data['checks']['migrations']['unapplied'], 0)
+        self.assertIn('latency_ms', data['checks']['database'])
+
+    def test_results_are_cached_between_probes(self):
+        self.client.force_login(self.staff)
+        with mock.patch.object(health_checks, 'run_checks', wraps=health_checks.run_checks) as run_checks:
+            self.client.get(reverse('readiness_check'))
+            resp = self.client.get(reverse('readiness_check'))
+
+        self.assertEqual(run_checks.call_count, 1)
+        self.assertTrue(resp.json()['cached'])
+
+    def test_slow_check_does_not_block_other_probes(self):
+        health_checks.get_readiness()
+        started, release = threading.Event(), threading.Event()
+
+        def slow_checks():
+            started.set()
+            release.wait(5)
+            return {'ready': False, 'checks': {}}
+
+        with mock.patch.object(health_checks, 'run_checks', side_effect=slow_checks):
+            refresh = threading.Thread(target=health_checks.get_readiness, kwargs={'fresh': True})
+            refresh.start()
+            started.wait(5)
+            # Dok traje osvežavanje, ostale probe dobijaju poslednji rezultat bez čekanja
+            result = health_checks.get_readiness(fresh=True)
+            release.set()
+            refresh.join(5)
+
+        self.assertTrue(result['ready'])
+        self.assertTrue(result['stale'])
+        self.assertFalse(health_checks.get_readiness()['ready'])
+
+    @override_settings(READINESS_CHECKS=['database', 'company.tests.test_health_checks.failing_check'])
+    def test_failing_plugin_check_returns_503(self):
+        self.client.force_login(self.staff)
+        resp = self.client.get(reverse('readiness_check'))
+
+        self.assertEqual(resp.status_code, 503)
+        check = resp.json()['checks']['company.tests.test_health_checks.failing_check']
+        self.assertEqual(check['status'], health_checks.STATUS_NOT_READY)
+        self.assertIn('nije dostupno', check['error'])
+
+    @override_settings(READINESS_MAX_QUEUE_AGE_SECONDS=60)
+    def test_old_queue_is_only_a_warning(self):
+        BackgroundJob.objects.create(task='x', run_after=timezone.now() - timedelta(minutes=5))
+        self.client.force_login(self.staff)
+
+        resp = self.client.get(reverse('readiness_check'))
+
+        self.assertEqual(resp.status_code, 200)
+        queue = resp.json()['checks']['job_queue']
+        self.assertEqual(queue['status'], health_checks.STATUS_WARNING)
+        self.assertEqual(queue['queued'], 1)
@@ -0,0 +1,166 @@
+from datetime import date, timedelta
+from io import StringIO
+
+import os
+import shutil
+import tempfile
+
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from company import jobs
+from company.models import Company, BackgroundJob
+from company.cycle_models import CertificationCycle
+
+
+CALLS = []
+
+
+@jobs.task('test.record')
+def record_task(job, value):
+    job.set_progress(50, 'pola')
+    CALLS.append(value)
+    return {'value': value}
+
+
+@jobs.task('test.fail')
+def fail_task(job):
+    raise RuntimeError('namerna greška')
+
+
+class BackgroundJobQueueTests(TestCase):
+    def setUp(self):
+        CALLS.clear()
+
+    def _run_worker(self):
+        out = StringIO()
+        call_command('run_worker', '--once', stdout=out)
+        return out.getvalue()
+
+    def test_enqueue_and_run_worker(self):
+        job = jobs.enqueue('test.record', value=42)
+        self.assertEqual(job.status, BackgroundJob.STATUS_QUEUED)
+
+        self._run_worker()
+
+        job.refresh_from_db()
+        self.assertEqual(CALLS, [42])
+        self.assertEqual(job.status, BackgroundJob.STATUS_SUCCEEDED)
+        self.assertEqual(job.progress, 100)
+        self.assertEqual(job.result, {'value': 42})
+        self.assertEqual(job.attempts, 1)
+
+    def test_failed_job_is_retried_with_backoff_then_marked_failed(self):
+        job = jobs.enqueue('test.fail', max_attempts=2)
+
+        self._run_worker()
+        job.refresh_from_db()
+        self.assertEqual(job.status, BackgroundJob.STATUS_QUEUED)
+        self.assertEqual(job.attempts, 1)
+        self.assertGreater(job.run_after, timezone.now())
+        self.assertIn('namerna greška', job.error)
+
+        # Odloženi posao se ne preuzima pre isteka run_after
+        self.assertIsNone(jobs.claim_next_job('w1'))
+
+        BackgroundJob.objects.filter(pk=job.pk).update(run_after=timezone.now() - timedelta(seconds=1))
+        self._run_worker()
+        job.refresh_from_db()
+        self.assertEqual(job.status, BackgroundJob.STATUS_FAILED)
+        self.assertEqual(job.attempts, 2)
+        self.assertIsNotNone(job.finished_at)
+
+    def test_job_is_claimed_only_once(self):
+        jobs.enqueue('test.record', value=1)
+        self.assertIsNotNone(jobs.claim_next_job('w1'))
+        self.assertIsNone(jobs.claim_next_job('w2'))
+
+    def test_stale_running_job_is_requeued(self):
+        job = jobs.enqueue('test.record', value=1)
+        BackgroundJob.objects.filter(pk=job.pk).update(
+            status=BackgroundJob.STATUS_RUNNING,
+            started_at=timezone.now() - jobs.STALE_JOB_TIMEOUT - timedelta(minutes=1),
+        )
+        self.assertEqual(jobs.requeue_stale_jobs(), 1)
+        job.refresh_from_db()
+        self.assertEqual(job.status, BackgroundJob.STATUS_QUEUED)
+
+    def test_job_that_kills_the_worker_is_not_requeued_forever(self):
+        job = jobs.enqueue('test.record', value=1, max_attempts=2)
+        for attempt in (1, 2):
+            # Worker preuzme posao i "umre" pre nego što upiše rezultat
+            self.assertEqual(jobs.claim_next_job('w1').attempts, attempt)
+            BackgroundJob.objects.filter(pk=job.pk).update(
+                started_at=timezone.now() - jobs.STALE_JOB_TIMEOUT - timedelta(minutes=1),
+            )
+            jobs.requeue_stale_jobs()
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, BackgroundJob.STATUS_FAILED)
+        self.assertIsNone(jobs.claim_next_job('w1'))
+
+    def test_create_default_audits_task(self):
+        company = Company.objects.create(name='Alfa doo')
+        cycle = CertificationCycle.objects.create(
+            company=company, planirani_datum=date(2025, 3, 10), status='active', inicijalni_broj_dana=1
+        )
+        cycle.audits.all().delete()
+
+        job = jobs.enqueue('cycle.create_default_audits', cycle_ids=[cycle.pk], is_first_cycle=True)
+        self._run_worker()
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, BackgroundJob.STATUS_SUCCEEDED)
+        self.assertTrue(cycle.audits.exists())
+
+
+class DataImportViewTests(TestCase):
+    def setUp(self):
+        self.upload_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.upload_root, ignore_errors=True)
+        self.settings_override = override_settings(IMPORT_UPLOAD_ROOT=self.upload_root)
+        self.settings_override.enable()
+        self.addCleanup(self.settings_override.disable)
+        User = get_user_model()
+        self.staff = User.objects.create_user(username='admin', password='pass1234', is_staff=True)
+        User.objects.create_user(username='tester', password='pass1234')
+
+    def _post(self, **data):
+        return self.client.post(reverse('data_import'), {'command': 'import_auditor_data', 'dry_run': 'on', **data})
+
+    def test_only_staff_can_start_imports(self):
+        self.client.login(username='tester', password='pass1234')
+        upload = SimpleUploadedFile('auditori.csv', b'Auditor,Kategorija\n')
+        self.assertEqual(self._post(first_file=upload).status_code, 302)
+        self.assertFalse(BackgroundJob.objects.exists())
+
+    def test_upload_is_queued_run_by_worker_and_cleaned_up(self):
+        self.client.force_login(self.staff)
+        upload = SimpleUploadedFile('auditori.csv', b'Auditor,Kategorija\nPetar Petrovic,Nepoznata\n')
+        self.assertRedirects(self._post(first_file=upload), reverse('data_import'))
+
+        job = BackgroundJob.objects.get(task=jobs.IMPORT_TASK)
+        self.assertEqual(job.max_attempts, 1)
+        self.assertEqual(job.kwargs['options'], {'dry_run': True})
+        self.assertTrue(os.path.exists(job.kwargs['args'][0]))
+
+        jobs.run_pending()
+        job.refresh_from_db()
+        self.assertEqual(job.status, BackgroundJob.STATUS_SUCCEEDED)
+        self.assertIn('DRY RUN', job.result['output'])
+        self.assertFalse(os.path.exists(job.kwargs['upload_dir']))
+
+        resp = self.client.get(reverse('data_import'))
+        self.assertContains(resp, 'import_auditor_data')
+        self.assertContains(resp, 'DRY RUN')
+
+    def test_two_file_import_requires_both_files(self):
+        self.client.force_login(self.staff)
+        resp = self._post(command='import_company_data', first_file=SimpleUploadedFile('company-list.xlsx', b'x'))
+        self.assertEqual(resp.status_code, 200)
+        self.assertFalse(BackgroundJob.objects.exists())
+        self.assertEqual(os.listdir(self.upload_root), [])
@@ -0,0 +1,96 @@
+from datetime import date, timedelta
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, Client, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from company import live_updates
+from company.calendar_models import CalendarChange
+from company.cycle_models import CertificationCycle, CycleAudit
+from company.models import Company
+from company.srbija_tim_models import SrbijaTim
+
+
+@override_settings(LIVE_UPDATES_STREAM_SECONDS=0, LIVE_UPDATES_COMMIT_GRACE_SECONDS=0)
+class LiveCalendarUpdatesTests(TestCase):
+    def setUp(self):
+        User = get_user_model()
+        User.objects.create_user(username='tester', password='pass1234')
+        self.client = Client()
+        self.client.login(username='tester', password='pass1234')
+        self.company = Company.objects.create(name='Comp A')
+
+    def _audit(self, planned_date):
+        cycle = CertificationCycle.objects.create(
+            company=self.company, planirani_datum=planned_date, status='active', inicijalni_broj_dana=1,
+        )
+        return CycleAudit.objects.create(
+            certification_cycle=cycle, audit_type='initial', audit_status='planned', planned_date=planned_date,
+        )
+
+    def _poll(self, feed, since):
+        resp = self.client.get(reverse('company:calendar_changes'), {'feed': feed, 'since': since})
+        self.assertEqual(resp.status_code, 200)
+        return resp.json()
+
+    def test_changes_are_recorded_on_commit_and_streamed_as_delta(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            audit = self._audit(date(2025, 8, 14))
+        with self.captureOnCommitCallbacks(execute=True):
+            visit = SrbijaTim.objects.create(certificate_number='SRB-1', company=self.company, visit_date=date(2025, 9, 1))
+
+        rows = live_updates.changes_since(CalendarChange.FEED_CALENDAR, 0)
+        self.assertEqual(live_updates.build_delta(rows)['audits'], [audit.pk])
+
+        result = self._poll('calendar', '0')
+        self.assertEqual(result['event'], 'change')
+        self.assertEqual(result['last_id'], rows[-1][0])
+        self.assertEqual(result['data'], {'audits': [audit.pk], 'appointments': [], 'visits': []})
+
+        self.assertEqual(self._poll('srbija_tim', '0')['data']['visits'], [visit.pk])
+
+        # Klijent koji je sve video ne dobija ništa
+        result = self._poll('calendar', str(rows[-1][0]))
+        self.assertIsNone(result['event'])
+        self.assertEqual(result['last_id'], rows[-1][0])
+
+    def test_client_behind_pruned_log_gets_reset(self):
+        CalendarChange.objects.create(feed=CalendarChange.FEED_CALENDAR, kind=CalendarChange.KIND_AUDIT, object_id=1)
+        CalendarChange.objects.create(feed=CalendarChange.FEED_CALENDAR, kind=CalendarChange.KIND_AUDIT, object_id=2)
+        CalendarChange.objects.filter(object_id=1).delete()
+
+        self.assertEqual(self._poll('calendar', '0')['event'], 'reset')
+
+    @override_settings(LIVE_UPDATES_COMMIT_GRACE_SECONDS=2)
+    def test_change_committed_after_a_newer_id_is_not_skipped(self):
+        # Worker A dobija id 9, worker B upisuje id 10 i commit-uje prvi
+        now = timezone.now()
+        CalendarChange.objects.create(id=10, feed=CalendarChange.FEED_CALENDAR, kind=CalendarChange.KIND_AUDIT, object_id=2)
+        self.assertEqual(self._poll('calendar', '8'), {'last_id': 8, 'event': None, 'data': {}})
+
+        # A commit-uje id 9 (created_at je vreme upisa, pre commit-a)
+        CalendarChange.objects.create(id=9, feed=CalendarChange.FEED_CALENDAR, kind=CalendarChange.KIND_AUDIT, object_id=1)
+        CalendarChange.objects.update(created_at=now - timedelta(seconds=3))
+        result = self._poll('calendar', '8')
+        self.assertEqual(result['last_id'], 10)
+        self.assertEqual(result['data']['audits'], [1, 2])
+
+    @override_settings(LIVE_UPDATES_MODE='stream')
+    def test_stream_is_not_served_under_wsgi(self):
+        # SSE veza bi držala nit gunicorn workera; kalendar dobija poll režim
+        resp = self.client.get(reverse('company:calendar_changes_stream'), {'feed': 'calendar'})
+        self.assertEqual(resp.status_code, 404)
+        resp = self.client.get(reverse('company:calendar'))
+        self.assertEqual(resp.context['live']['mode'], 'poll')
+
+    def test_feed_returns_only_changed_items(self):
+        changed = self._audit(date(2025, 8, 14))
+        self._audit(date(2025, 8, 20))
+
+        events = self.client.get(reverse('company:appointment_calendar_json'), {'audit': str(changed.pk)}).json()
+        self.assertTrue(events)
+        self.assertEqual({e['extendedProps']['audit_id'] for e in events}, {changed.pk})
+
+        # Obrisan audit: prazna lista, kalendar samo uklanja njegove događaje
+        self.assertEqual(self.client.get(reverse('company:appointment_calendar_json'), {'audit': '999999'}).json(), [])
@@ -0,0 +1,78 @@
+import json
+import os
+import shutil
+import socket
+import tempfile
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from company import jobs
+from isoqar_app import metrics
+
+
+@jobs.task('test.metrics')
+def metrics_task(job):
+    return {}
+
+
+class MetricsEndpointTests(TestCase):
+    def setUp(self):
+        self.metrics_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.metrics_dir, ignore_errors=True)
+        override = override_settings(METRICS_DIR=self.metrics_dir, METRICS_TOKEN='secret')
+        override.enable()
+        self.addCleanup(override.disable)
+        metrics.store.reset()
+
+        User = get_user_model()
+        User.objects.create_user(username='tester', password='pass1234')
+        self.client.login(username='tester', password='pass1234')
+
+    def _scrape(self):
+        resp = self.client.get(reverse('metrics'), HTTP_AUTHORIZATION='Bearer secret')
+        self.assertEqual(resp.status_code, 200)
+        return resp.content.decode()
+
+    def test_requires_token_or_staff(self):
+        self.assertEqual(self.client.get(reverse('metrics')).status_code, 403)
+        self.assertEqual(self.client.get(reverse('metrics'), HTTP_AUTHORIZATION='Bearer wrong').status_code, 403)
+
+    def test_request_latency_and_db_metrics_per_url_name(self):
+        self.client.get(reverse('company:list'))
+
+        body = self._scrape()
+        self.assertIn('# TYPE isoqar_request_duration_seconds histogram', body)
+        self.assertIn('isoqar_request_duration_seconds_bucket{le="+Inf",view="company:list"} 1', body)
+        self.assertIn('isoqar_request_duration_seconds_count{view="company:list"} 1', body)
+        self.assertIn('isoqar_db_queries_total{view="company:list"}', body)
+
+    def test_job_and_calendar_feed_metrics(self):
+        jobs.enqueue('test.metrics')
+        jobs.run_pending()
+        resp = self.client.get(reverse('company:srbija_tim_calendar_json'))
+        self.assertEqual(resp.status_code, 200)
+
+        body = self._scrape()
+        self.assertIn('isoqar_jobs_total{status="succeeded",task="test.metrics"} 1', body)
+        self.assertIn('isoqar_job_duration_seconds_count{task="test.metrics"} 1', body)
+        self.assertIn('isoqar_calendar_feed_requests_total{feed="srbija_tim"} 1', body)
+        self.assertIn('isoqar_calendar_feed_events_total{feed="srbija_tim"} 0', body)
+
+    def test_values_are_summed_across_worker_files(self):
+        metrics.inc('isoqar_cache_requests_total', cache='report_pdf', result='hit')
+        metrics.store.flush()
+        sample = [['isoqar_cache_requests_total', [['cache', 'report_pdf'], ['result', 'hit']], 2]]
+
+        # Drugi worker na drugom hostu (kontejneru) i ugašen worker sa ovog hosta
+        with open(os.path.join(self.metrics_dir, 'other-host-123.json'), 'w') as f:
+            json.dump(sample, f)
+        dead_name = f'{socket.gethostname()}-999999999.json'
+        with open(os.path.join(self.metrics_dir, dead_name), 'w') as f:
+            json.dump(sample, f)
+
+        body = self._scrape()
+        self.assertIn('isoqar_cache_requests_total{cache="report_pdf",result="hit"} 5', body)
+        self.assertFalse(os.path.exists(os.path.join(self.metrics_dir, dead_name)))
+        self.assertTrue(os.path.exists(os.path.join(self.metrics_dir, metrics.ARCHIVE_FILE)))
@@ -0,0 +1,105 @@
+import time
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from company import reference_data
+from company.auditor_forms import AuditorStandardForm
+from company.iaf_models import IAFEACCode, IAFScopeReference
+from company.standard_models import StandardDefinition
+
+
+class ReferenceDataTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.iso9001 = StandardDefinition.objects.create(code='ISO 9001:2015', name='ISO 9001')
+        self.iso14001 = StandardDefinition.objects.create(code='ISO14001', name='ISO 14001')
+        self.retired = StandardDefinition.objects.create(code='OHSAS18001', name='OHSAS 18001', active=False)
+        self.scope = IAFScopeReference.objects.create(reference='IAF 6', description='Drvo')
+        self.code06a = IAFEACCode.objects.create(iaf_code='06a', iaf_scope_reference=self.scope)
+        self.code28 = IAFEACCode.objects.create(iaf_code='28')
+
+    def test_lookups_cost_no_queries_in_steady_state(self):
+        reference_data.standards()
+        with self.assertNumQueries(0):
+            self.assertEqual(reference_data.standard(str(self.iso14001.pk)), self.iso14001)
+            self.assertEqual(reference_data.standard_by_code('iso14001'), self.iso14001)
+            self.assertEqual(reference_data.resolve_standard('9001'), self.iso9001)
+            self.assertEqual(reference_data.resolve_standard('14001'), self.iso14001)
+            self.assertIsNone(reference_data.resolve_standard('22000'))
+            self.assertEqual([s.code for s in reference_data.standards(active=True)], ['ISO 9001:2015', 'ISO14001'])
+            self.assertEqual(reference_data.resolve_iaf_code('6a'), self.code06a)
+            self.assertEqual(reference_data.iaf_code(self.code28.pk), self.code28)
+            self.assertEqual(reference_data.iaf_code_by_code('06A').iaf_scope_reference, self.scope)
+            self.assertEqual(reference_data.scope_reference_by_reference('iaf 6'), self.scope)
+            self.assertIsNone(reference_data.standard('abc'))
+
+    def test_lookups_return_copies_of_shared_instances(self):
+        found = reference_data.standard(self.iso9001.pk)
+        found.name = 'Izmenjeno u jednom zahtevu'
+        with self.assertNumQueries(0):
+            self.assertEqual(reference_data.standard(self.iso9001.pk).name, 'ISO 9001')
+            self.assertEqual(reference_data.resolve_standard('9001').name, 'ISO 9001')
+            self.assertEqual(next(s for s in reference_data.standards() if s.pk == self.iso9001.pk).name, 'ISO 9001')
+
+    def test_changes_invalidate_registry(self):
+        reference_data.standards()
+        self.iso14001.name = 'ISO 14001:2015'
+        self.iso14001.save()
+        self.assertEqual(reference_data.standard(self.iso14001.pk).name, 'ISO 14001:2015')
+
+        self.code28.delete()
+        self.assertIsNone(reference_data.iaf_code_by_code('28'))
+
+    def test_version_bump_reloads_other_processes(self):
+        reference_data.standards()
+        # Izmena bez signala (drugi proces je već poništio svoj registar)
+        StandardDefinition.objects.filter(pk=self.iso9001.pk).update(name='Promenjen')
+        self.assertEqual(reference_data.standard(self.iso9001.pk).name, 'ISO 9001')
+
+        # Verzija se povećava posle commit-a izmene u drugom procesu
+        version = reference_data.version()
+        reference_data.bump_version()
+        self.assertNotEqual(reference_data.version(), version)
+        # Do sledeće provere verzije (REFERENCE_DATA_VERSION_CHECK_SECONDS) se ne čita ni keš
+        with mock.patch.object(reference_data.cache, 'get', wraps=reference_data.cache.get) as cache_get:
+            self.assertEqual(reference_data.standard(self.iso9001.pk).name, 'ISO 9001')
+            self.assertEqual(cache_get.call_count, 0)
+
+        later = time.monotonic() + 6
+        with mock.patch.object(reference_data.time, 'monotonic', return_value=later):
+            self.assertEqual(reference_data.standard(self.iso9001.pk).name, 'Promenjen')
+
+    def test_invalidation_bumps_version_after_commit(self):
+        version = reference_data.version()
+        with self.captureOnCommitCallbacks(execute=True):
+            StandardDefinition.objects.create(code='ISO27001', name='ISO 27001')
+        self.assertNotEqual(reference_data.version(), version)
+
+    def test_form_choices_and_validation_use_registry(self):
+        reference_data.standards()
+        form = AuditorStandardForm()
+        with self.assertNumQueries(0):
+            html = str(form['standard'])
+        self.assertIn('ISO14001', html)
+        self.assertNotIn('OHSAS18001', html)
+
+        form = AuditorStandardForm(data={'standard': self.retired.pk})
+        self.assertFalse(form.is_valid())
+        self.assertIn('standard', form.errors)
+        form = AuditorStandardForm(data={'standard': self.iso14001.pk})
+        self.assertEqual(form.fields['standard'].clean(str(self.iso14001.pk)), self.iso14001)
+
+    def test_iaf_code_list_view(self):
+        User = get_user_model()
+        User.objects.create_user(username='tester', password='pass1234')
+        self.client.login(username='tester', password='pass1234')
+
+        resp = self.client.get(reverse('company:iaf_code_list'))
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.context['total_codes'], 2)
+        self.assertEqual(resp.context['total_scopes'], 1)
+        self.assertContains(resp, 'IAF 6')
@@ -0,0 +1,101 @@
+import os
+import tempfile
+from datetime import date
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, Client, override_settings
+from django.urls import reverse
+
+from company import jobs, reports
+from company.models import BackgroundJob, Company
+from company.cycle_models import CertificationCycle, CycleAudit
+
+
+def fake_pdf(html):
+    return b'%PDF-1.4 ' + html.encode('utf-8')[:20]
+
+
+@mock.patch('company.reports.renderer_available', return_value=True)
+@mock.patch('company.reports.html_to_pdf', side_effect=fake_pdf)
+class AuditProgramReportTests(TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.settings_override = override_settings(REPORTS_ROOT=self.tmpdir.name)
+        self.settings_override.enable()
+
+        User = get_user_model()
+        User.objects.create_user(username='tester', password='pass1234')
+        self.client = Client()
+        self.client.login(username='tester', password='pass1234')
+
+        self.company = Company.objects.create(name='Alfa doo')
+        self.cycle = CertificationCycle.objects.create(
+            company=self.company,
+            planirani_datum=date(2025, 3, 10),
+            status='active',
+            inicijalni_broj_dana=1,
+        )
+        self.audit = CycleAudit.objects.create(
+            certification_cycle=self.cycle,
+            audit_type='initial',
+            audit_status='planned',
+            planned_date=date(2025, 3, 10),
+        )
+        self.url = reverse('company:report_audit_program', args=[self.company.pk])
+
+    def tearDown(self):
+        self.settings_override.disable()
+        self.tmpdir.cleanup()
+
+    def _pdf_files(self):
+        return sorted(f for f in os.listdir(self.tmpdir.name) if f.endswith('.pdf'))
+
+    def test_first_request_is_pending_then_pdf_is_served_from_cache(self, html_to_pdf, renderer_available):
+        response = self.client.get(self.url, {'format': 'json'})
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.json()['status'], 'pending')
+
+        jobs.run_pending()
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/pdf')
+        self.assertTrue(b''.join(response.streaming_content).startswith(b'%PDF'))
+
+        # Drugi zahtev za isti sadržaj ne renderuje ponovo
+        self.client.get(self.url).close()
+        self.assertEqual(html_to_pdf.call_count, 1)
+
+    def test_audit_change_invalidates_cached_pdf(self, html_to_pdf, renderer_available):
+        self.client.get(self.url)
+        jobs.run_pending()
+        self.assertEqual(len(self._pdf_files()), 1)
+
+        self.audit.planned_date = date(2025, 4, 1)
+        self.audit.save()
+        self.assertEqual(self._pdf_files(), [])
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 202)
+        jobs.run_pending()
+        self.assertEqual(len(self._pdf_files()), 1)
+        self.assertEqual(html_to_pdf.call_count, 2)
+
+    def test_missing_renderer_returns_503(self, html_to_pdf, renderer_available):
+        renderer_available.return_value = False
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 503)
+        self.assertFalse(response.json()['success'])
+
+    def test_pending_request_enqueues_one_job(self, html_to_pdf, renderer_available):
+        self.client.get(self.url)
+        self.client.get(self.url)
+        self.assertEqual(BackgroundJob.objects.filter(task=reports.RENDER_TASK).count(), 1)
+
+    def test_file_removed_before_open_is_rendered_again(self, html_to_pdf, renderer_available):
+        self.client.get(self.url)
+        jobs.run_pending()
+        with mock.patch('company.report_views.open', side_effect=FileNotFoundError, create=True):
+            response = self.client.get(self.url, {'format': 'json'})
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(BackgroundJob.objects.filter(task=reports.RENDER_TASK, status=BackgroundJob.STATUS_QUEUED).count(), 1)
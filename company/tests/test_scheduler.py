@@ -0,0 +1,124 @@
+import json
+from datetime import date
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from company import scheduler
+from company.auditor_models import Auditor, AuditorIAFEACCode, AuditorStandard
+from company.cycle_models import AuditorReservation, CertificationCycle, CycleAudit, CycleStandard
+from company.iaf_models import CompanyIAFEACCode, IAFEACCode
+from company.models import Company
+from company.srbija_tim_models import SrbijaTim
+from company.standard_models import StandardDefinition
+
+DAY = date(2025, 9, 10)
+
+
+class AuditSchedulerTests(TestCase):
+    def setUp(self):
+        User = get_user_model()
+        User.objects.create_user(username='tester', password='pass1234')
+        self.client.login(username='tester', password='pass1234')
+
+        self.standard = StandardDefinition.objects.create(code='9001', name='ISO 9001')
+        self.busy_lead = self._auditor('Ana Busy', Auditor.CATEGORY_LEAD_AUDITOR)
+        self.free_lead = self._auditor('Bojan Free', Auditor.CATEGORY_LEAD_AUDITOR)
+        self.expert = self._auditor('Cedomir Expert', Auditor.CATEGORY_TECHNICAL_EXPERT, standard=False)
+        self.code = IAFEACCode.objects.create(iaf_code='28')
+        AuditorIAFEACCode.objects.create(auditor=self.expert, iaf_eac_code=self.code)
+
+        # Ana je zauzeta Srbija Tim posetom na dan audita
+        visit = SrbijaTim.objects.create(
+            certificate_number='SRB-1', company=Company.objects.create(name='Other'), visit_date=DAY,
+        )
+        visit.auditors.add(self.busy_lead)
+
+        self.audit = self._audit('Comp A')
+        CompanyIAFEACCode.objects.create(company=self.audit.certification_cycle.company, iaf_eac_code=self.code)
+
+    def _auditor(self, name, category, standard=True):
+        auditor = Auditor.objects.create(ime_prezime=name, email=f'{name.split()[0].lower()}@example.com', telefon='1', kategorija=category)
+        if standard:
+            AuditorStandard.objects.create(auditor=auditor, standard=self.standard)
+        return auditor
+
+    def _audit(self, company_name):
+        cycle = CertificationCycle.objects.create(
+            company=Company.objects.create(name=company_name), planirani_datum=date(2024, 9, 10),
+            status='active', broj_dana_nadzora=Decimal('1'),
+        )
+        CycleStandard.objects.create(certification_cycle=cycle, standard_definition=self.standard)
+        return CycleAudit.objects.create(
+            certification_cycle=cycle, audit_type='surveillance_1', audit_status='planned', planned_date=DAY,
+        )
+
+    def _proposal(self, data, audit):
+        return next(p for p in data['proposals'] if p['audit_id'] == audit.id)
+
+    def test_proposal_respects_bookings_and_covers_codes(self):
+        data = scheduler.propose(date(2025, 9, 1), date(2025, 9, 30))
+
+        proposal = self._proposal(data, self.audit)
+        self.assertEqual(proposal['status'], scheduler.STATUS_ASSIGNED)
+        self.assertEqual(proposal['lead']['id'], self.free_lead.id)
+        # Vodeći nema IAF/EAC kod kompanije - pokriva ga tehnički ekspert
+        self.assertEqual([a['id'] for a in proposal['team']], [self.expert.id])
+
+    def test_same_day_audits_do_not_share_auditors(self):
+        second = self._audit('Comp B')
+
+        data = scheduler.propose(date(2025, 9, 1), date(2025, 9, 30))
+
+        statuses = {self._proposal(data, a)['status'] for a in (self.audit, second)}
+        # Samo jedan slobodan vodeći auditor za isti dan
+        self.assertIn(scheduler.STATUS_UNASSIGNED, statuses)
+        self.assertEqual(data['summary'][scheduler.STATUS_UNASSIGNED], 1)
+
+    def test_apply_saves_assignment_and_rechecks(self):
+        url = reverse('company:audit_scheduler_apply')
+        payload = {'assignments': [{'audit_id': self.audit.id, 'lead_auditor_id': self.free_lead.id, 'team_ids': [self.expert.id]}]}
+
+        resp = self.client.post(url, json.dumps(payload), content_type='application/json')
+
+        self.assertEqual(resp.json()['applied'], [self.audit.id])
+        self.audit.refresh_from_db()
+        self.assertEqual(self.audit.lead_auditor, self.free_lead)
+        self.assertEqual(list(self.audit.audit_team.all()), [self.expert])
+        self.assertTrue(AuditorReservation.objects.filter(audit=self.audit, auditor=self.free_lead, date=DAY, role='lead').exists())
+
+        # Ponovna primena se odbija jer audit već ima vodećeg auditora; zauzet auditor se takođe odbija
+        other = self._audit('Comp C')
+        payload = {'assignments': [
+            {'audit_id': self.audit.id, 'lead_auditor_id': self.free_lead.id},
+            {'audit_id': other.id, 'lead_auditor_id': self.busy_lead.id},
+        ]}
+        resp = self.client.post(url, json.dumps(payload), content_type='application/json')
+        self.assertEqual(resp.json()['applied'], [])
+        self.assertEqual(len(resp.json()['rejected']), 2)
+
+    def test_apply_rechecks_team_members(self):
+        url = reverse('company:audit_scheduler_apply')
+        unqualified = self._auditor('Dragan Bez Standarda', Auditor.CATEGORY_AUDITOR, standard=False)
+        other_expert = self._auditor('Eva Expert', Auditor.CATEGORY_TECHNICAL_EXPERT, standard=False)
+        for team_ids in ([999999], [unqualified.id], [other_expert.id], ['x']):
+            payload = {'assignments': [{'audit_id': self.audit.id, 'lead_auditor_id': self.free_lead.id, 'team_ids': team_ids}]}
+            resp = self.client.post(url, json.dumps(payload), content_type='application/json')
+            self.assertEqual(resp.status_code, 200)
+            self.assertEqual(resp.json()['applied'], [])
+            self.assertEqual(len(resp.json()['rejected']), 1)
+
+        self.audit.refresh_from_db()
+        self.assertIsNone(self.audit.lead_auditor_id)
+        self.assertFalse(self.audit.audit_team.exists())
+
+    def test_propose_api_validation(self):
+        url = reverse('company:audit_scheduler_propose')
+        self.assertEqual(self.client.get(url, {'from': '2025-09-01'}).status_code, 400)
+        self.assertEqual(self.client.get(url, {'from': '2025-01-01', 'to': '2025-12-31'}).status_code, 400)
+        resp = self.client.get(url, {'from': '2025-09-01', 'to': '2025-09-30'})
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(len(resp.json()['proposals']), 1)
+        self.assertEqual(self.client.get(reverse('company:audit_scheduler')).status_code, 200)
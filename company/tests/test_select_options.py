@@ -0,0 +1,74 @@
+from datetime import date
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from company.auditor_models import Auditor
+from company.cycle_models import CertificationCycle, CycleAudit
+from company.forms import CompanyForm, CycleAuditForm
+from company.models import Company
+from company.select_options import PAGE_SIZE
+
+
+class SelectOptionsTests(TestCase):
+    def setUp(self):
+        User = get_user_model()
+        User.objects.create_user(username='tester', password='pass1234')
+        self.client.login(username='tester', password='pass1234')
+        self.auditors = [
+            Auditor.objects.create(ime_prezime=f'Auditor {i:02d}', email=f'a{i}@example.com', telefon='1')
+            for i in range(PAGE_SIZE + 5)
+        ]
+
+    def _options(self, source, **params):
+        resp = self.client.get(reverse('company:select_options', args=[source]), params)
+        self.assertEqual(resp.status_code, 200)
+        return resp.json()
+
+    def test_pages_and_search(self):
+        first = self._options('auditors')
+        self.assertEqual(len(first['results']), PAGE_SIZE)
+        self.assertTrue(first['pagination']['more'])
+        self.assertEqual(first['results'][0], {'id': str(self.auditors[0].pk), 'text': 'Auditor 00 (Auditor)'})
+
+        second = self._options('auditors', page=2)
+        self.assertEqual((len(second['results']), second['pagination']['more']), (5, False))
+
+        found = self._options('auditors', q='tor 1')
+        self.assertEqual(len(found['results']), 10)
+
+        industries = self._options('industries', q='stočar')
+        self.assertEqual([r['id'] for r in industries['results']], ['livestock'])
+
+    def test_unknown_source_and_login_required(self):
+        self.assertEqual(self.client.get(reverse('company:select_options', args=['users'])).status_code, 404)
+        self.client.logout()
+        self.assertEqual(self.client.get(reverse('company:select_options', args=['auditors'])).status_code, 302)
+
+    def test_forms_render_only_selected_options(self):
+        cycle = CertificationCycle.objects.create(
+            company=Company.objects.create(name='Comp A', industry='livestock'), planirani_datum=date(2025, 9, 1),
+        )
+        audit = CycleAudit.objects.create(
+            certification_cycle=cycle, audit_type='initial', planned_date=date(2025, 9, 1), lead_auditor=self.auditors[3],
+        )
+        audit.audit_team.add(self.auditors[7], self.auditors[8])
+
+        html = CycleAuditForm(instance=audit).as_p()
+        for auditor in self.auditors:
+            self.assertEqual(f'>{auditor.ime_prezime} (' in html, auditor in (self.auditors[3], self.auditors[7], self.auditors[8]))
+        self.assertIn('data-options-url="/company/api/select-options/auditors/"', html)
+
+        industry = str(CompanyForm(instance=cycle.company)['industry'])
+        self.assertEqual(industry.count('<option'), 2)
+        self.assertIn('selected>Stočarstvo</option>', industry)
+
+    def test_selected_values_still_validate_against_all_auditors(self):
+        cycle = CertificationCycle.objects.create(company=Company.objects.create(name='Comp B'), planirani_datum=date(2025, 9, 1))
+        form = CycleAuditForm(data={
+            'certification_cycle': cycle.pk, 'audit_type': 'initial', 'audit_status': 'planned',
+            'planned_date': '2025-09-01', 'lead_auditor': self.auditors[-1].pk, 'audit_team': [self.auditors[-2].pk],
+        })
+        self.assertTrue(form.is_valid(), form.errors)
+        self.assertEqual(list(form.cleaned_data['audit_team']), [self.auditors[-2]])
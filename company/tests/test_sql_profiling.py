@@ -0,0 +1,94 @@
+from datetime import date
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from company.auditor_models import Auditor
+from company.cycle_models import CertificationCycle, CycleAudit
+from company.models import Company
+from isoqar_app.sql_profiler import RECENT_PROFILES, QueryBudgetMixin, fingerprint
+
+
+class SQLProfilingMiddlewareTests(TestCase):
+    def setUp(self):
+        User = get_user_model()
+        User.objects.create_user(username='staff', password='pass1234', is_staff=True)
+        self.client.login(username='staff', password='pass1234')
+        Company.objects.create(name='Comp A')
+        RECENT_PROFILES.clear()
+
+    def test_fingerprint_ignores_values(self):
+        self.assertEqual(
+            fingerprint('SELECT * FROM t WHERE id = 5 AND name = \'x\''),
+            fingerprint('SELECT  *  FROM t WHERE id = 17 AND name = \'y\''),
+        )
+        self.assertEqual(fingerprint('SELECT 1 FROM t WHERE id IN (%s, %s, %s)'), 'SELECT ? FROM t WHERE id IN (...)')
+
+    @override_settings(DEBUG=False)
+    def test_header_enables_profile_for_staff(self):
+        resp = self.client.get(reverse('company:list'))
+        self.assertNotIn('Server-Timing', resp)
+
+        resp = self.client.get(reverse('company:list'), HTTP_X_SQL_PROFILE='1')
+        self.assertIn('db;dur=', resp['Server-Timing'])
+        self.assertGreater(int(resp['X-SQL-Query-Count']), 0)
+
+        profile = RECENT_PROFILES.items()[0]
+        self.assertEqual(profile['path'], reverse('company:list'))
+        self.assertEqual(profile['count'], int(resp['X-SQL-Query-Count']))
+
+    @override_settings(DEBUG=False)
+    def test_header_is_ignored_for_non_staff(self):
+        User = get_user_model()
+        User.objects.create_user(username='plain', password='pass1234')
+        self.client.login(username='plain', password='pass1234')
+
+        resp = self.client.get(reverse('company:list'), HTTP_X_SQL_PROFILE='1')
+        self.assertNotIn('Server-Timing', resp)
+        self.assertEqual(RECENT_PROFILES.items(), [])
+
+    @override_settings(SQL_PROFILING=True)
+    def test_admin_page_lists_recent_profiles(self):
+        self.client.get(reverse('company:list'))
+
+        resp = self.client.get(reverse('sql_profile'))
+        self.assertEqual(resp.status_code, 200)
+        self.assertContains(resp, reverse('company:list'))
+
+
+class QueryBudgetTests(QueryBudgetMixin, TestCase):
+    """Gornje granice broja upita po endpoint-u (za 5 kompanija/auditora/audita)"""
+
+    def setUp(self):
+        User = get_user_model()
+        User.objects.create_user(username='tester', password='pass1234')
+        self.client.login(username='tester', password='pass1234')
+
+        for i in range(5):
+            company = Company.objects.create(name=f'Comp {i}')
+            auditor = Auditor.objects.create(ime_prezime=f'Auditor {i}', email=f'a{i}@example.com', telefon='1')
+            cycle = CertificationCycle.objects.create(
+                company=company, planirani_datum=date(2025, 8, 10 + i), status='active', inicijalni_broj_dana=1,
+            )
+            CycleAudit.objects.create(
+                certification_cycle=cycle, audit_type='initial', audit_status='planned',
+                planned_date=date(2025, 8, 10 + i), lead_auditor=auditor,
+            )
+
+    def test_company_list(self):
+        with self.assertQueryBudget(15):
+            self.client.get(reverse('company:list'))
+
+    def test_auditor_list(self):
+        with self.assertQueryBudget(6, max_duplicates=0):
+            self.client.get(reverse('company:auditor_list'))
+
+    def test_dashboard(self):
+        with self.assertQueryBudget(40):
+            self.client.get(reverse('company:dashboard'))
+
+    def test_availability_matrix(self):
+        with self.assertQueryBudget(4, max_duplicates=0):
+            self.client.get(reverse('company:auditor_availability_json'),
+                            {'date_from': '2025-08-01', 'date_to': '2025-10-29'})
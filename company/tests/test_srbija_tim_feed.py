@@ -0,0 +1,137 @@
+from datetime import date
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from company.auditor_models import Auditor
+from company.models import Company
+from company.srbija_tim_models import SrbijaTim
+from company.standard_models import StandardDefinition
+
+
+class SrbijaTimCalendarFeedTests(TestCase):
+    def setUp(self):
+        User = get_user_model()
+        User.objects.create_user(username='tester', password='pass1234')
+        self.client.login(username='tester', password='pass1234')
+
+        self.company = Company.objects.create(name='Comp A')
+        self.auditor = Auditor.objects.create(ime_prezime='Auditor A', email='a@example.com', telefon='1')
+        self.standard = StandardDefinition.objects.create(code='9001', name='ISO 9001')
+
+    def _visit(self, visit_date, days=1):
+        visit = SrbijaTim.objects.create(
+            certificate_number=f'SRB-{visit_date}', company=self.company, visit_date=visit_date, broj_dana_posete=days,
+        )
+        visit.auditors.add(self.auditor)
+        visit.standards.add(self.standard)
+        visit.create_visit_days()
+        return visit
+
+    def test_displays_follow_relations_and_renames(self):
+        visit = self._visit(date(2025, 8, 14))
+        visit.refresh_from_db()
+        self.assertEqual((visit.standards_display, visit.auditors_display), ('9001', 'Auditor A'))
+
+        other = Auditor.objects.create(ime_prezime='Auditor B', email='b@example.com', telefon='2')
+        other.srbija_tim_visits.add(visit)
+        self.auditor.ime_prezime = 'Auditor Z'
+        self.auditor.save()
+        visit.refresh_from_db()
+        self.assertEqual(sorted(visit.auditors_display.split(', ')), ['Auditor B', 'Auditor Z'])
+
+        other.delete()
+        visit.standards.clear()
+        visit.refresh_from_db()
+        self.assertEqual((visit.standards_display, visit.auditors_display), ('', 'Auditor Z'))
+
+    def test_save_without_rename_does_not_touch_visits(self):
+        visit = self._visit(date(2025, 8, 14))
+        self.auditor.telefon = '999'
+        with CaptureQueriesContext(connection) as ctx:
+            self.auditor.save()
+        self.assertFalse([q for q in ctx.captured_queries if SrbijaTim._meta.db_table in q['sql']])
+
+        self.standard.code = '9001:2015'
+        self.standard.save()
+        visit.refresh_from_db()
+        self.assertEqual(visit.standards_display, '9001:2015')
+
+    def test_feed_returns_only_visible_range(self):
+        # Trodnevna poseta prelazi granicu meseca: 30.7, 31.7, 1.8.
+        edge = self._visit(date(2025, 7, 30), days=3)
+        self._visit(date(2024, 1, 10))
+
+        events = self.client.get(
+            reverse('company:srbija_tim_calendar_json'),
+            {'start': '2025-08-01T00:00:00+02:00', 'end': '2025-09-01T00:00:00+02:00'},
+        ).json()
+        self.assertEqual([(e['id'], e['extendedProps']['day_number']) for e in events], [(edge.pk, 3)])
+        self.assertEqual(events[0]['title'], f'{edge.certificate_number} - Comp A (Dan 3)')
+        self.assertEqual(events[0]['extendedProps']['standards'], '9001')
+
+        # Bez opsega (delta živih izmena) - svi dani
+        self.assertEqual(len(self.client.get(reverse('company:srbija_tim_calendar_json')).json()), 4)
+
+    def test_query_count_does_not_grow_with_visits(self):
+        for day in (4, 11, 18):
+            self._visit(date(2025, 8, day), days=2)
+
+        url = reverse('company:srbija_tim_calendar_json')
+        params = {'start': '2025-08-01', 'end': '2025-09-01', 'auditor': str(self.auditor.pk)}
+        with CaptureQueriesContext(connection) as few:
+            self.assertEqual(len(self.client.get(url, params).json()), 6)
+
+        for day in (5, 12, 19, 26):
+            self._visit(date(2025, 8, day), days=2)
+        with CaptureQueriesContext(connection) as many:
+            self.assertEqual(len(self.client.get(url, params).json()), 14)
+        self.assertEqual(len(few), len(many))
+
+
+class SrbijaTimPagesTests(TestCase):
+    def setUp(self):
+        User = get_user_model()
+        User.objects.create_user(username='tester', password='pass1234')
+        self.client.login(username='tester', password='pass1234')
+        self.company = Company.objects.create(name='Comp A')
+        self.ana = Auditor.objects.create(ime_prezime='Ana', email='a@example.com', telefon='1')
+        self.boris = Auditor.objects.create(ime_prezime='Boris', email='b@example.com', telefon='2')
+
+    def _visit(self, visit_date, *auditors):
+        visit = SrbijaTim.objects.create(certificate_number=f'SRB-{visit_date}', company=self.company, visit_date=visit_date)
+        visit.auditors.add(*auditors)
+        return visit
+
+    def test_calendar_page_does_not_load_visits(self):
+        self._visit(date(2025, 8, 14), self.ana)
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.client.get(reverse('company:srbija_tim_calendar')).status_code, 200)
+        self.assertFalse([q for q in queries if 'FROM "company_srbijatim"' in q['sql']])
+
+    def test_schedule_groups_by_auditor_within_range(self):
+        first = self._visit(date(2025, 8, 4), self.ana, self.boris)
+        second = self._visit(date(2025, 8, 18), self.ana)
+        self._visit(date(2024, 1, 10), self.boris)
+
+        url = reverse('company:srbija_tim_auditor_schedule')
+        with CaptureQueriesContext(connection) as few:
+            resp = self.client.get(url, {'date_from': '2025-08-01', 'date_to': '2025-08-31'})
+        grouped = resp.context['auditor_visits']
+        self.assertEqual([(a.ime_prezime, a.visit_count) for a in grouped], [('Ana', 2), ('Boris', 1)])
+        self.assertEqual(grouped[self.ana], [second, first])
+
+        for day in (5, 6, 7):
+            self._visit(date(2025, 8, day), self.ana, self.boris)
+        with CaptureQueriesContext(connection) as many:
+            self.client.get(url, {'date_from': '2025-08-01', 'date_to': '2025-08-31'})
+        self.assertEqual(len(few), len(many))
+
+    def test_schedule_defaults_to_window_around_today(self):
+        self._visit(date(2000, 1, 1), self.ana)
+        resp = self.client.get(reverse('company:srbija_tim_auditor_schedule'))
+        self.assertEqual(resp.context['auditor_visits'], {})
+        self.assertTrue(resp.context['date_from'] and resp.context['date_to'])
@@ -0,0 +1,130 @@
+import json
+from datetime import date
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from company import srbija_tim_planner as planner
+from company.auditor_models import Auditor, AuditorStandard
+from company.calendar_models import CalendarChange
+from company.models import Company
+from company.srbija_tim_models import SrbijaTim, SrbijaTimDay
+from company.standard_models import CompanyStandard, StandardDefinition
+
+EXPIRY = date(2025, 9, 10)
+PREFERRED = date(2025, 8, 11)  # 30 dana pre isteka, ponedeljak
+TODAY = date(2025, 6, 1)
+
+
+class SrbijaTimPlannerTests(TestCase):
+    def setUp(self):
+        User = get_user_model()
+        self.user = User.objects.create_user(username='tester', password='pass1234')
+        self.client.login(username='tester', password='pass1234')
+
+        self.iso9001 = StandardDefinition.objects.create(code='9001', name='ISO 9001')
+        self.iso14001 = StandardDefinition.objects.create(code='14001', name='ISO 14001')
+        self.ana = self._auditor('Ana', self.iso9001, self.iso14001)
+        self.boris = self._auditor('Boris', self.iso9001, self.iso14001)
+        self.cedomir = self._auditor('Cedomir', self.iso9001)
+
+        # Ana je zauzeta na poželjan datum
+        busy = SrbijaTim.objects.create(certificate_number='OLD', company=Company.objects.create(name='Other'), visit_date=PREFERRED)
+        busy.auditors.add(self.ana)
+
+        self.company = Company.objects.create(name='Comp A', certificate_number='C-1')
+        self.cs = [
+            CompanyStandard.objects.create(company=self.company, standard_definition=s, expiry_date=EXPIRY, certificate_status='active')
+            for s in (self.iso9001, self.iso14001)
+        ]
+
+    def _auditor(self, name, *standards):
+        auditor = Auditor.objects.create(ime_prezime=name, email=f'{name.lower()}@example.com', telefon='1',
+                                         kategorija=Auditor.CATEGORY_AUDITOR)
+        for standard in standards:
+            AuditorStandard.objects.create(auditor=auditor, standard=standard)
+        return auditor
+
+    def _propose(self, days=2):
+        return planner.VisitPlanner(date(2025, 9, 1), date(2025, 9, 30), days, today=TODAY).run().as_dict()
+
+    def _apply(self, visits, days=2):
+        resp = self.client.post(reverse('company:srbija_tim_planner_apply'), json.dumps({'days': days, 'visits': visits}),
+                                content_type='application/json')
+        self.assertEqual(resp.status_code, 200)
+        return resp.json()
+
+    def test_proposal_groups_certificate_and_avoids_busy_auditor(self):
+        other = Company.objects.create(name='Comp B')
+        CompanyStandard.objects.create(company=other, standard_definition=self.iso9001, expiry_date=EXPIRY,
+                                       certificate_number='B-1', certificate_status='withdrawn')
+        planned = Company.objects.create(name='Comp C')
+        CompanyStandard.objects.create(company=planned, standard_definition=self.iso9001, expiry_date=EXPIRY)
+        SrbijaTim.objects.create(company=planned, certificate_expiry_date=EXPIRY)
+
+        data = self._propose()
+        self.assertEqual(data['summary'], {'assigned': 1, 'unassigned': 0, 'already_planned': 1})
+        proposal = data['proposals'][0]
+        self.assertEqual(proposal['company_standard_ids'], sorted(cs.id for cs in self.cs))
+        self.assertEqual((proposal['certificate_number'], proposal['standards']), ('C-1', '14001, 9001'))
+        self.assertEqual(proposal['dates'], ['2025-08-11', '2025-08-12'])
+        self.assertEqual(proposal['auditor']['id'], self.boris.id)
+
+    def test_no_free_or_qualified_auditor_is_reported(self):
+        AuditorStandard.objects.filter(auditor__in=[self.ana, self.boris]).delete()
+        proposal = self._propose()['proposals'][0]
+        self.assertEqual(proposal['status'], planner.STATUS_UNASSIGNED)
+        self.assertIn('kvalifikovanog', proposal['reasons'][0])
+
+    def test_apply_creates_visits_in_one_transaction(self):
+        companies = [Company.objects.create(name=f'Bulk {i}') for i in range(4)]
+        rows = [
+            CompanyStandard.objects.create(company=c, standard_definition=self.iso9001, expiry_date=EXPIRY)
+            for c in companies
+        ]
+        visits = [
+            {'company_standard_ids': [cs.id], 'visit_date': f'2025-08-{11 + i:02d}', 'auditor_ids': [self.cedomir.id]}
+            for i, cs in enumerate(rows[:2])
+        ]
+        with CaptureQueriesContext(connection) as few:
+            self.assertEqual(len(self._apply(visits)['rejected']), 1)  # Cedomir je 12.8. već zauzet prvom posetom
+
+        visits = [
+            {'company_standard_ids': [cs.id], 'visit_date': f'2025-08-{18 + 2 * i:02d}', 'auditor_ids': [self.cedomir.id]}
+            for i, cs in enumerate(rows[1:])
+        ]
+        with self.captureOnCommitCallbacks(execute=True), CaptureQueriesContext(connection) as many:
+            data = self._apply(visits)
+        self.assertEqual((len(data['created']), data['rejected']), (3, []))
+        self.assertLessEqual(len(many), len(few))
+        self.assertEqual(
+            sorted(CalendarChange.objects.filter(feed=CalendarChange.FEED_SRBIJA_TIM).values_list('object_id', flat=True)),
+            sorted(data['created']),
+        )
+
+        visit = SrbijaTim.objects.get(pk=data['created'][0])
+        self.assertEqual((visit.company, visit.certificate_expiry_date, visit.created_by), (companies[1], EXPIRY, self.user))
+        self.assertEqual((visit.standards_display, visit.auditors_display), ('9001', 'Cedomir'))
+        self.assertEqual(list(visit.auditors.all()), [self.cedomir])
+        self.assertEqual(
+            list(SrbijaTimDay.objects.filter(visit=visit).values_list('day_number', 'date')),
+            [(1, date(2025, 8, 18)), (2, date(2025, 8, 19))],
+        )
+        self.assertEqual(SrbijaTim.objects.filter(group_id=visit.group_id).count(), 3)
+
+    def test_apply_rechecks_qualifications_and_existing_visits(self):
+        item = {'company_standard_ids': [cs.id for cs in self.cs], 'visit_date': '2025-08-13', 'auditor_ids': [self.cedomir.id]}
+        self.assertIn('kvalifikovan', self._apply([item])['rejected'][0]['error'])
+
+        item['auditor_ids'] = [self.boris.id]
+        self.assertEqual(len(self._apply([item])['created']), 1)
+        self.assertIn('već postoji', self._apply([item])['rejected'][0]['error'])
+
+    def test_propose_validates_parameters(self):
+        url = reverse('company:srbija_tim_planner_propose')
+        self.assertEqual(self.client.get(url, {'from': '2025-09-01', 'to': '2025-09-30', 'days': '9'}).status_code, 400)
+        self.assertEqual(self.client.get(url, {'from': '2025-01-01', 'to': '2025-12-31'}).status_code, 400)
+        self.assertTrue(self.client.get(url, {'from': '2025-09-01', 'to': '2025-09-30'}).json()['success'])
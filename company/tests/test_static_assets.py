@@ -0,0 +1,80 @@
+import gzip
+import os
+import tempfile
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.template import Context, Template
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from company.templatetags import assets
+
+MANIFEST_STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {'BACKEND': 'isoqar_app.storage.CompressedManifestStaticFilesStorage'},
+}
+
+
+def _write(root, name, content):
+    path = os.path.join(root, name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(content)
+
+
+class StaticAssetsTests(TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.source = os.path.join(self.tmp.name, 'static')
+        self.root = os.path.join(self.tmp.name, 'staticfiles')
+        assets.bundle_files.cache_clear()
+        self.addCleanup(assets.bundle_files.cache_clear)
+
+    def _render(self, name):
+        assets.bundle_files.cache_clear()
+        return Template("{% load assets %}{% bundle name %}").render(Context({'name': name}))
+
+    def test_bundle_uses_built_file_or_sources_in_order(self):
+        with override_settings(STATICFILES_DIRS=[self.source]):
+            html = self._render('calendar.js')
+            sources = assets.bundles()['calendar.js']
+            self.assertEqual(html.count('<script'), len(sources))
+            positions = [html.index(f'/static/{source}"') for source in sources]
+            self.assertEqual(positions, sorted(positions))
+
+            _write(self.source, 'dist/calendar.js', 'var built = 1;')
+            self.assertEqual(self._render('calendar.js'), '<script src="/static/dist/calendar.js"></script>')
+            self.assertIn('<link rel="stylesheet" href="/static/css/calendar.css">', self._render('calendar.css'))
+
+    @override_settings(STORAGES=MANIFEST_STORAGES, DEBUG=False,
+                       STATICFILES_FINDERS=['django.contrib.staticfiles.finders.FileSystemFinder'])
+    def test_collectstatic_hashes_and_precompresses(self):
+        script = 'function calendarPage() { return "kalendar"; }\n' * 100
+        _write(self.source, 'dist/calendar.js', script)
+        _write(self.source, 'css/vendor.css', '.icon { background: url("images/missing.png"); }')
+
+        with override_settings(STATICFILES_DIRS=[self.source], STATIC_ROOT=self.root):
+            call_command('collectstatic', interactive=False, verbosity=0)
+            html = self._render('calendar.js')
+
+        hashed = html.split('"')[1][len('/static/'):]
+        self.assertRegex(hashed, r'^dist/calendar\.[0-9a-f]{12}\.js$')
+        with gzip.open(os.path.join(self.root, hashed + '.gz'), 'rt', encoding='utf-8') as f:
+            self.assertEqual(f.read(), script)
+        # Mali fajlovi se ne kompresuju, a url() ka nepostojećem fajlu ne ruši collectstatic
+        self.assertFalse(any(name.endswith('.gz') for name in os.listdir(os.path.join(self.root, 'css'))))
+
+    def test_calendar_page_loads_extracted_scripts(self):
+        User = get_user_model()
+        User.objects.create_user(username='tester', password='pass1234')
+        self.client.login(username='tester', password='pass1234')
+
+        resp = self.client.get(reverse('company:calendar'))
+        self.assertEqual(resp.status_code, 200)
+        html = resp.content.decode()
+        self.assertIn('window.calendarPageConfig = {', html)
+        self.assertIn('<script src="/static/js/pages/calendar_page.js"></script>', html)
+        self.assertIn('<script src="/static/js/jquery.min.js"></script>', html)
+        self.assertNotIn('function initializeCalendar', html)
@@ -1,10 +1,15 @@
 from django.urls import path
-from .auditor_views import AuditorListView, AuditorDetailView, AuditorDeleteView, AuditorCreateView, AuditorUpdateView, auditor_standard_create, auditor_standard_update, auditor_standard_delete, auditor_standard_iaf_eac_create, auditor_standard_iaf_eac_update, auditor_standard_iaf_eac_delete, get_auditor_details, get_qualified_auditors
+from .auditor_views import AuditorListView, AuditorDetailView, AuditorDeleteView, AuditorCreateView, AuditorUpdateView, auditor_standard_create, auditor_standard_update, auditor_standard_delete, auditor_standard_iaf_eac_create, auditor_standard_iaf_eac_update, auditor_standard_iaf_eac_delete, get_auditor_details, get_qualified_auditors, AuditorAvailabilityView, auditor_availability_json
 from .auditor_direct_iaf_views import auditor_direct_iaf_eac_create, auditor_direct_iaf_eac_update, auditor_direct_iaf_eac_delete
 from .contact_views import kontakt_osoba_create, kontakt_osoba_update, kontakt_osoba_delete
 # Certificate views removed - sertifikati su sada deo CompanyStandard modela
 from .location_views import LocationListView, LocationDetailView, LocationCreateView, LocationUpdateView, LocationDeleteView
 from .iaf_views import IAFEACCodeListView
+from .export_views import export_list
+from .report_views import company_audit_program_pdf, certificate_expiry_pdf
+from .live_views import calendar_changes, calendar_changes_stream
+from .scheduler_views import AuditSchedulerView, audit_scheduler_apply, audit_scheduler_propose
+from .analytics_views import AuditorUtilisationView, DemandForecastView, auditor_utilisation_json, demand_forecast_json
 from .views_cycles import (CertificationCycleListView, CertificationCycleDetailView, CertificationCycleCreateView, 
                          CertificationCycleUpdateView, CertificationCycleDeleteView, CycleAuditCreateView, 
                          CycleAuditUpdateView, CycleAuditDeleteView)
@@ -12,6 +17,7 @@ from .srbija_tim_views import (SrbijaTimCalendarView, SrbijaTimListView, SrbijaT
                                SrbijaTimCreateView, SrbijaTimUpdateView, SrbijaTimDeleteView, 
                                SrbijaTimDetailView, srbija_tim_calendar_json, srbija_tim_update_date,
                                get_company_data)
+from .srbija_tim_planner_views import SrbijaTimPlannerView, srbija_tim_planner_apply, srbija_tim_planner_propose
 from .views import (
     CalendarView, 
     CalendarEventsView, 
@@ -49,6 +55,7 @@ from .views_ajax import (
     delete_iaf_eac_code,
     update_iaf_eac_primary,
     list_iaf_eac_codes,
+    select_options_json,
     certification_cycle_json,
     audit_days_by_audit_id,
     update_event_date,
@@ -71,6 +78,7 @@ urlpatterns = [
     # API endpoints
     path('api/company-contacts/', get_company_contacts, name='get_company_contacts'),
     path('api/companies/', get_companies, name='get_companies'),
+    path('api/select-options/<slug:source>/', select_options_json, name='select_options'),
     
     # Standardi CRUD URLs
     path('companies/<int:company_id>/standards/add/', company_standard_create, name='standard_create'),
@@ -108,9 +116,26 @@ urlpatterns = [
     # API endpoint za ažuriranje datuma događaja nakon drag-and-drop
     path('api/events/update-date/', update_event_date, name='update_event_date'),
     
+    # Žive izmene kalendara (Server-Sent Events)
+    path('api/calendar/changes/', calendar_changes_stream, name='calendar_changes_stream'),
+    path('api/calendar/changes/poll/', calendar_changes, name='calendar_changes'),
+    
     # API endpoint za validaciju rezervacije auditora
     path('api/validate-auditor-reservation/', validate_auditor_reservation, name='validate_auditor_reservation'),
     
+    # Izvoz lista u CSV/XLSX (isti GET filteri kao na listama)
+    path('export/<str:dataset>/<str:fmt>/', export_list, name='export_list'),
+    
+    # PDF izveštaji (generišu se u pozadini)
+    path('reports/companies/<int:pk>/audit-program/', company_audit_program_pdf, name='report_audit_program'),
+    path('reports/certificate-expiry/', certificate_expiry_pdf, name='report_certificate_expiry'),
+    
+    # Analitika opterećenja auditora
+    path('analytics/auditor-utilisation/', AuditorUtilisationView.as_view(), name='auditor_utilisation'),
+    path('api/analytics/auditor-utilisation/', auditor_utilisation_json, name='auditor_utilisation_json'),
+    path('analytics/forecast/', DemandForecastView.as_view(), name='demand_forecast'),
+    path('api/analytics/forecast/', demand_forecast_json, name='demand_forecast_json'),
+    
     # Dashboard
     path('dashboard/', dashboard, name='dashboard'),
     
@@ -128,9 +153,13 @@ urlpatterns = [
     path('audits/<int:pk>/', CompanyAuditDetailView.as_view(), name='audit_detail'),
     path('old-audits/<int:pk>/update/', AuditUpdateView.as_view(), name='audit_update'),  # Promenjen URL za stare audite
     path('audits/<int:pk>/delete/', AuditDeleteView.as_view(), name='audit_delete'),
+    path('audits/scheduler/', AuditSchedulerView.as_view(), name='audit_scheduler'),
+    path('api/audits/scheduler/propose/', audit_scheduler_propose, name='audit_scheduler_propose'),
+    path('api/audits/scheduler/apply/', audit_scheduler_apply, name='audit_scheduler_apply'),
     
     # Auditor CRUD URLs
     path('auditors/', AuditorListView.as_view(), name='auditor_list'),
+    path('auditors/availability/', AuditorAvailabilityView.as_view(), name='auditor_availability'),
     path('auditors/create/', AuditorCreateView.as_view(), name='auditor_create'),
     path('auditors/<int:pk>/', AuditorDetailView.as_view(), name='auditor_detail'),
     path('auditors/<int:pk>/update/', AuditorUpdateView.as_view(), name='auditor_update'),
@@ -152,6 +181,7 @@ urlpatterns = [
     
     path('api/auditors/<int:pk>/details/', get_auditor_details, name='auditor_details_api'),
     path('api/qualified-auditors/', get_qualified_auditors, name='qualified_auditors_api'),
+    path('api/auditors/availability/', auditor_availability_json, name='auditor_availability_json'),
     
     # Kontakt osobe CRUD URLs
     path('companies/<int:company_id>/kontakt/create/', kontakt_osoba_create, name='kontakt_create'),
@@ -182,6 +212,9 @@ urlpatterns = [
     path('srbija-tim/', SrbijaTimCalendarView.as_view(), name='srbija_tim_calendar'),
     path('srbija-tim/list/', SrbijaTimListView.as_view(), name='srbija_tim_list'),
     path('srbija-tim/auditor-schedule/', SrbijaTimAuditorScheduleView.as_view(), name='srbija_tim_auditor_schedule'),
+    path('srbija-tim/planner/', SrbijaTimPlannerView.as_view(), name='srbija_tim_planner'),
+    path('srbija-tim/api/planner/propose/', srbija_tim_planner_propose, name='srbija_tim_planner_propose'),
+    path('srbija-tim/api/planner/apply/', srbija_tim_planner_apply, name='srbija_tim_planner_apply'),
     path('srbija-tim/create/', SrbijaTimCreateView.as_view(), name='srbija_tim_create'),
     path('srbija-tim/<int:pk>/', SrbijaTimDetailView.as_view(), name='srbija_tim_detail'),
     path('srbija-tim/<int:pk>/update/', SrbijaTimUpdateView.as_view(), name='srbija_tim_update'),
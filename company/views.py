@@ -9,7 +9,8 @@ from django.contrib.auth.mixins import LoginRequiredMixin
 from django.core.exceptions import ValidationError
 from django.core.paginator import Paginator
 from django.db import transaction
-from django.db.models import Count, Q, Avg
+from django.db.models import Count, Q, Avg, Max, Prefetch
+from django.db.models.functions import Coalesce
 from django.http import HttpResponseRedirect, JsonResponse
 from django.shortcuts import render, get_object_or_404, redirect
 from django.template.loader import render_to_string
@@ -20,10 +21,15 @@ from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_POST
 from django.views.generic import ListView, DetailView, CreateView, UpdateView, DeleteView, TemplateView
 
+from isoqar_app import metrics
+
+from . import live_updates, reference_data
 from .auditor_models import Auditor, AuditorStandard, AuditorStandardIAFEACCode
 from .cycle_models import CertificationCycle, CycleStandard, CycleAudit, AuditDay, AuditorReservation
+from .detail_cache import COMPANY_SECTIONS, stamps, with_stamps
 from .forms import CompanyForm, CertificationCycleForm, CycleAuditForm
-from .models import Company, Appointment, KontaktOsoba, OstalaLokacija, IAFEACCode, CompanyIAFEACCode
+from .list_filters import AUDIT_STATUS_MAPPING, COMPANY_SORTS, filter_companies, sort_companies
+from .models import Company, Appointment, CalendarChange, KontaktOsoba, OstalaLokacija, IAFEACCode, CompanyIAFEACCode
 from .standard_models import StandardDefinition, CompanyStandard
 
 logger = logging.getLogger(__name__)
@@ -34,80 +40,14 @@ class CompanyListView(ListView):
     context_object_name = 'companies'
     
     def get_queryset(self):
-        queryset = super().get_queryset()
-        search_query = self.request.GET.get('search', '')
-        
-        if search_query:
-            queryset = queryset.filter(
-                Q(name__icontains=search_query) | 
-                Q(pib__icontains=search_query) | 
-                Q(mb__icontains=search_query) |
-                Q(iaf_eac_codes__iaf_eac_code__iaf_code__icontains=search_query)
-            ).distinct()
-        
-        # Date range filter za istek sertifikata (koristi Certificate model)
-        expiry_from = self.request.GET.get('expiry_from')
-        expiry_to = self.request.GET.get('expiry_to')
-        
-        if expiry_from:
-            try:
-                from datetime import datetime
-                expiry_from_date = datetime.strptime(expiry_from, '%Y-%m-%d').date()
-                # Filtriraj kompanije koje imaju bar jedan sertifikat sa datumom isteka >= expiry_from
-                queryset = queryset.filter(
-                    certificates__expiry_date__gte=expiry_from_date
-                ).distinct()
-            except ValueError:
-                pass
-        
-        if expiry_to:
-            try:
-                from datetime import datetime
-                expiry_to_date = datetime.strptime(expiry_to, '%Y-%m-%d').date()
-                # Filtriraj kompanije koje imaju bar jedan sertifikat sa datumom isteka <= expiry_to
-                queryset = queryset.filter(
-                    certificates__expiry_date__lte=expiry_to_date
-                ).distinct()
-            except ValueError:
-                pass
-        
-        # Date range filter za planirani datum nadzora (poslednji planirani audit)
-        audit_from = self.request.GET.get('audit_from')
-        audit_to = self.request.GET.get('audit_to')
-        
-        if audit_from or audit_to:
-            from .cycle_models import CycleAudit
-            from datetime import datetime
-            
-            # Subquery za pronalaženje kompanija sa auditima u opsegu
-            audit_filters = Q(certification_cycles__audits__isnull=False)
-            
-            if audit_from:
-                try:
-                    audit_from_date = datetime.strptime(audit_from, '%Y-%m-%d').date()
-                    audit_filters &= Q(certification_cycles__audits__planned_date__gte=audit_from_date)
-                except ValueError:
-                    pass
-            
-            if audit_to:
-                try:
-                    audit_to_date = datetime.strptime(audit_to, '%Y-%m-%d').date()
-                    audit_filters &= Q(certification_cycles__audits__planned_date__lte=audit_to_date)
-                except ValueError:
-                    pass
-            
-            # Filtriraj samo aktivne cikluse
-            audit_filters &= Q(certification_cycles__status='active')
-            
-            queryset = queryset.filter(audit_filters).distinct()
+        queryset = filter_companies(super().get_queryset(), self.request.GET)
         
         # Prefetch related data for better performance
-        return queryset.prefetch_related(
+        return sort_companies(queryset.prefetch_related(
             'iaf_eac_codes__iaf_eac_code',
             'company_standards__standard_definition',
             'certificates',
-            'certification_cycles__audits'
-        ).order_by('name')
+        ), self.request.GET)
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -116,6 +56,12 @@ class CompanyListView(ListView):
         context['expiry_to'] = self.request.GET.get('expiry_to', '')
         context['audit_from'] = self.request.GET.get('audit_from', '')
         context['audit_to'] = self.request.GET.get('audit_to', '')
+        context['next_audit_from'] = self.request.GET.get('next_audit_from', '')
+        context['next_audit_to'] = self.request.GET.get('next_audit_to', '')
+        context['nearest_expiry_from'] = self.request.GET.get('nearest_expiry_from', '')
+        context['nearest_expiry_to'] = self.request.GET.get('nearest_expiry_to', '')
+        sort = self.request.GET.get('sort', '')
+        context['sort'] = sort if sort in COMPANY_SORTS else 'name'
         return context
 
 
@@ -137,34 +83,34 @@ class CompanyDetailView(LoginRequiredMixin, DetailView):
         # Ako nema edit_audit parametra, nastavljamo normalno са view-ом
         return super().get(request, *args, **kwargs)
     
+    def get_queryset(self):
+        # Pečati sekcija (ključevi keša fragmenata) se čitaju u istom upitu kao i kompanija
+        return with_stamps(Company.objects.all(), COMPANY_SECTIONS)
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         company = self.object
         
-        # Get related data
+        # Plan upita za sve sekcije strane - querysetovi su lenji, pa se za sekcije
+        # koje su u kešu fragmenata (company/detail_cache.py) ne izvršavaju
         context['contact_persons'] = company.kontakt_osobe.all().order_by('-is_primary', 'ime_prezime')
-        
-        # Get standards with their auditors
-        standards = company.company_standards.all()
-        standards_with_auditors = []
-        
-        for standard in standards:
-            # Ne prikazujemo auditore na nivou standarda kompanije
-            # Auditori se dodeljuju na nivou audita u ciklusu, ne na nivou standarda kompanije
-            standards_with_auditors.append({
-                'standard': standard,
-                'auditors': []  # Prazna lista - auditori se dodeljuju na nivou audita
-            })
-        
-        context['standards'] = standards_with_auditors
+        # Auditori se dodeljuju na nivou audita u ciklusu, ne na nivou standarda kompanije
+        context['standards'] = company.company_standards.select_related('standard_definition')
         context['locations'] = company.ostale_lokacije.all()
         context['appointments'] = company.appointments.all().order_by('-start_datetime')[:5]
-        
-        # Get IAF/EAC codes for the company
-        context['iaf_eac_codes'] = CompanyIAFEACCode.objects.filter(company=company).select_related('iaf_eac_code')
-        
-        # Get certification cycles for the company
-        context['certification_cycles'] = company.certification_cycles.all().order_by('-planirani_datum')
+        context['iaf_eac_codes'] = company.iaf_eac_codes.select_related('iaf_eac_code')
+        context['certification_cycles'] = (
+            company.certification_cycles
+            .annotate(
+                audit_count=Count('audits'),
+                # Isto što i get_last_planned_date(), bez upita po ciklusu
+                last_planned_date=Coalesce(Max('audits__planned_date'), 'planirani_datum'),
+            )
+            .prefetch_related(Prefetch('cycle_standards', queryset=CycleStandard.objects.select_related('standard_definition')))
+            .order_by('-planirani_datum')
+        )
+        context['fragment_stamps'] = stamps(company, COMPANY_SECTIONS)
+        context['fragment_cache_seconds'] = settings.FRAGMENT_CACHE_SECONDS
         
         # Get audit information if available
         try:
@@ -250,11 +196,9 @@ class CompanyCreateView(CreateView):
         context = super().get_context_data(**kwargs)
         context['title'] = 'Nova kompanija'
         context['submit_text'] = 'Sačuvaj'
-        # Dodaj sve IAF/EAC kodove za izbor
-        context['all_iaf_eac_codes'] = IAFEACCode.objects.all().order_by('iaf_code')
-        # Dodaj sve definicije standarda za izbor
-        from .standard_models import StandardDefinition
-        context['all_standard_definitions'] = StandardDefinition.objects.filter(active=True).order_by('code')
+        # IAF/EAC kodovi, auditori i industrije se učitavaju pretragom (select_options.py)
+        # Dodaj sve definicije standarda za izbor (registar referentnih podataka, bez upita)
+        context['all_standard_definitions'] = reference_data.standards(active=True)
         return context
     
     def form_valid(self, form):
@@ -275,10 +219,8 @@ class CompanyUpdateView(UpdateView):
         context = super().get_context_data(**kwargs)
         context['title'] = 'Izmena kompanije'
         context['submit_text'] = 'Sačuvaj izmene'
-        context['all_iaf_eac_codes'] = IAFEACCode.objects.all().order_by('iaf_code')
-        context['iaf_codes'] = IAFEACCode.objects.all().order_by('iaf_code')
-        context['all_standard_definitions'] = StandardDefinition.objects.filter(active=True).order_by('code')
-        context['all_auditors'] = Auditor.objects.all().order_by('ime_prezime')
+        # IAF/EAC kodovi, auditori i industrije se učitavaju pretragom (select_options.py)
+        context['all_standard_definitions'] = reference_data.standards(active=True)
         
         if self.object:
             context['kontakt_osobe'] = self.object.kontakt_osobe.all().order_by('-is_primary', 'ime_prezime')
@@ -372,14 +314,7 @@ class AuditListView(LoginRequiredMixin, ListView):
             status = self.request.GET.get('status', None)
             if status:
                 # Mapiranje starih statusa na nove
-                status_mapping = {
-                    'active': 'planned',
-                    'pending': 'scheduled',  # Ažurirano: in_progress -> scheduled
-                    'completed': 'completed',
-                    'cancelled': 'cancelled',
-                    'postponed': 'postponed'
-                }
-                mapped_status = status_mapping.get(status, status)
+                mapped_status = AUDIT_STATUS_MAPPING.get(status, status)
                 cycle_audits = cycle_audits.filter(audit_status=mapped_status)
             
             # Primenjujemo datumske filtere
@@ -622,6 +557,9 @@ class CalendarView(TemplateView):  # Privremeno uklonjen LoginRequiredMixin za t
         # Dobij view parametar iz URL-a
         initial_view = self.request.GET.get('view', 'dayGridMonth')
         context['initial_view'] = initial_view
+
+        # Poslednja promena pre učitavanja stranice (odatle kreću žive izmene) i SSE/poll režim
+        context['live'] = live_updates.client_config(self.request, CalendarChange.FEED_CALENDAR)
         return context
 
 class CalendarEventsView(LoginRequiredMixin, TemplateView):
@@ -774,29 +712,17 @@ def dashboard(request):
         visit_date__lte=seven_days_from_now
     ).order_by('visit_date').select_related('company').prefetch_related('auditors', 'standards')
     
-    # Sertifikati - Isticanje
-    # Sertifikati koji ističu u narednih 30 dana
-    expiring_30_days = CompanyStandard.objects.filter(
-        expiry_date__gte=today,
-        expiry_date__lte=today + timedelta(days=30)
-    ).select_related('company', 'standard_definition').count()
-    
-    # Sertifikati koji ističu u narednih 60 dana
-    expiring_60_days = CompanyStandard.objects.filter(
-        expiry_date__gte=today,
-        expiry_date__lte=today + timedelta(days=60)
-    ).select_related('company', 'standard_definition').count()
-    
-    # Sertifikati koji ističu u narednih 90 dana
-    expiring_90_days = CompanyStandard.objects.filter(
-        expiry_date__gte=today,
-        expiry_date__lte=today + timedelta(days=90)
-    ).select_related('company', 'standard_definition').count()
-    
-    # Već istekli sertifikati
-    expired_certificates_count = CompanyStandard.objects.filter(
-        expiry_date__lt=today
-    ).count()
+    # Sertifikati - Isticanje (30/60/90 dana i već istekli) jednim agregatnim upitom
+    expiry_buckets = CompanyStandard.objects.aggregate(
+        expiring_30_days=Count('id', filter=Q(expiry_date__gte=today, expiry_date__lte=today + timedelta(days=30))),
+        expiring_60_days=Count('id', filter=Q(expiry_date__gte=today, expiry_date__lte=today + timedelta(days=60))),
+        expiring_90_days=Count('id', filter=Q(expiry_date__gte=today, expiry_date__lte=today + timedelta(days=90))),
+        expired=Count('id', filter=Q(expiry_date__lt=today)),
+    )
+    expiring_30_days = expiry_buckets['expiring_30_days']
+    expiring_60_days = expiry_buckets['expiring_60_days']
+    expiring_90_days = expiry_buckets['expiring_90_days']
+    expired_certificates_count = expiry_buckets['expired']
     
     # Lista sertifikata koji ističu u narednih 30 dana (za tabelu)
     expiring_certificates_list = CompanyStandard.objects.filter(
@@ -809,7 +735,6 @@ def dashboard(request):
     total_auditors = Auditor.objects.count()
     
     # Najzauzetiji auditor (ovaj mesec) - broj rezervacija
-    from django.db.models import Count
     busiest_auditor = AuditorReservation.objects.filter(
         date__gte=current_month_start,
         date__lt=next_month_start
@@ -1086,8 +1011,8 @@ def audit_detail_json(request, pk):
 
 
 @login_required
-def appointment_calendar_json(request):
-    """API endpoint for getting appointment data in FullCalendar format"""
+async def appointment_calendar_json(request):
+    """API endpoint for getting appointment data in FullCalendar format (async ORM, vidi ASGI profil u DEPLOYMENT.md)"""
     # Get filter parametar za auditora
     auditor_id = request.GET.get('auditor')
     
@@ -1098,6 +1023,12 @@ def appointment_calendar_json(request):
     # jer nemaju direktnu vezu sa auditorima
     if auditor_id:
         appointments = appointments.none()
+
+    # Delta za žive izmene (company/live_updates.py): samo događaji navedenih audita/termina
+    delta = 'audit' in request.GET or 'appointment' in request.GET
+    if delta:
+        audit_ids = live_updates.parse_ids(request.GET.get('audit'))
+        appointments = appointments.filter(id__in=live_updates.parse_ids(request.GET.get('appointment')))
     
     events = []
     
@@ -1107,7 +1038,8 @@ def appointment_calendar_json(request):
     
     # Kreiraj mapu appointment_id -> related_day_id za brže lookup
     appointment_related_days = {}
-    if appointments.exists():
+    appointments = [appointment async for appointment in appointments]
+    if appointments:
         appointment_dates = {}
         for appt in appointments:
             appt_dt = appt.start_datetime
@@ -1122,11 +1054,11 @@ def appointment_calendar_json(request):
             related_days_qs = AuditDay.objects.filter(
                 date__in=[d for d, c in date_company_pairs],
                 audit__certification_cycle__company_id__in=[c for d, c in date_company_pairs]
-            ).select_related('audit')
+            ).select_related('audit__certification_cycle')
             
             # Kreiraj mapu (date, company_id) -> audit_day
             related_days_map = {}
-            for rd in related_days_qs:
+            async for rd in related_days_qs:
                 key = (rd.date, rd.audit.certification_cycle.company_id)
                 if key not in related_days_map:
                     related_days_map[key] = rd
@@ -1177,6 +1109,8 @@ def appointment_calendar_json(request):
         cycle_audits = cycle_audits.filter(
             Q(lead_auditor__id=auditor_id) | Q(audit_team__id=auditor_id)
         ).distinct()
+    if delta:
+        cycle_audits = cycle_audits.filter(id__in=audit_ids)
     
     audit_type_mapping = {
         'surveillance_1': {
@@ -1240,9 +1174,11 @@ def appointment_calendar_json(request):
         audit_days = audit_days.filter(
             Q(audit__lead_auditor__id=auditor_id) | Q(audit__audit_team__id=auditor_id)
         ).distinct()
+    if delta:
+        audit_days = audit_days.filter(audit_id__in=audit_ids)
     
     # Add audit days to events
-    for audit_day in audit_days:
+    async for audit_day in audit_days:
         audit = audit_day.audit
         company_name = audit.certification_cycle.company.name
         audit_type_info = audit_type_mapping.get(audit.audit_type, {})
@@ -1291,12 +1227,13 @@ def appointment_calendar_json(request):
                 'modelType': 'audit_day',
                 'audit_id': audit.id,
                 'audit_day_id': audit_day.id,
+                'version': audit_day.version,
                 'notes': audit_day.notes or audit.notes or 'N/A'
             }
         })
     
     # Add cycle audit dates to events (glavni audit datumi)
-    for audit in cycle_audits:
+    async for audit in cycle_audits:
         # Get company name from certification cycle
         company_name = audit.certification_cycle.company.name
         audit_type_info = audit_type_mapping.get(audit.audit_type, {})
@@ -1335,16 +1272,6 @@ def appointment_calendar_json(request):
         else:  # planned
             status_text = 'planiran'
 
-        # Izbegni dupliranje: ako postoje AuditDay zapisi za isti datum, ne prikazuj glavni audit događaj
-        try:
-            has_planned_day = bool(audit.planned_date) and audit.audit_days.filter(is_planned=True, date=audit.planned_date).exists()
-        except Exception:
-            has_planned_day = False
-        try:
-            has_actual_day = bool(audit.actual_date) and audit.audit_days.filter(is_actual=True, date=audit.actual_date).exists()
-        except Exception:
-            has_actual_day = False
-        
         # Helper: proveri da li je datum validan (nije 0001-01-01 ili sličan nevažeći datum)
         def is_valid_date(d):
             return d and d.year >= 2000
@@ -1372,6 +1299,7 @@ def appointment_calendar_json(request):
                     'auditStatus': 'planned' if not is_completed else 'completed',
                     'modelType': 'new',
                     'audit_id': audit.id,
+                    'version': audit.version,
                     'notes': audit.notes or 'N/A',
                     'poslat_izvestaj': audit.poslat_izvestaj,
                 }
@@ -1397,11 +1325,14 @@ def appointment_calendar_json(request):
                     'auditStatus': 'completed',
                     'modelType': 'new',
                     'audit_id': audit.id,
+                    'version': audit.version,
                     'notes': audit.notes or 'N/A',
                     'poslat_izvestaj': audit.poslat_izvestaj,
                 }
             })
     
+    metrics.inc('isoqar_calendar_feed_requests_total', feed='appointments')
+    metrics.inc('isoqar_calendar_feed_events_total', len(events), feed='appointments')
     return JsonResponse(events, safe=False)
 
 def appointment_detail(request, pk):
@@ -1523,11 +1454,11 @@ def get_company_contacts(request):
     contacts = KontaktOsoba.objects.filter(company_id=company_id).values('id', 'ime_prezime', 'pozicija')
     return JsonResponse({'contacts': list(contacts)})
 
-def get_companies(request):
+async def get_companies(request):
     """API endpoint for getting companies for autocomplete"""
     term = request.GET.get('term', '')
     companies = Company.objects.filter(name__icontains=term).values('id', 'name')[:10]
-    results = [{'id': company['id'], 'value': company['name'], 'label': company['name']} for company in companies]
+    results = [{'id': company['id'], 'value': company['name'], 'label': company['name']} async for company in companies]
     return JsonResponse(results, safe=False)
 
 
@@ -1621,21 +1552,17 @@ def company_standard_update(request, company_id, pk):
     # GET zahtev - prikaži formu za uređivanje
     if request.method == 'GET':
         # Dohvati sve definicije standarda za dropdown
-        all_standard_definitions = StandardDefinition.objects.all().order_by('code')
-        # Dohvati sve auditore za dropdown
-        all_auditors = Auditor.objects.all().order_by('ime_prezime')
-        # Dohvati auditore trenutno dodeljene ovom standardu
-        current_auditor_ids = list(
-            AuditorStandard.objects.filter(standard_id=company_standard.standard_definition_id)
-            .values_list('auditor_id', flat=True)
-        )
+        all_standard_definitions = reference_data.standards()
+        # Auditori trenutno dodeljeni ovom standardu; ostali se učitavaju pretragom (select_options.py)
+        selected_auditors = Auditor.objects.filter(
+            auditor_standardi__standard_id=company_standard.standard_definition_id
+        ).order_by('ime_prezime').distinct()
         
         context = {
             'company': company,
             'standard': company_standard,
             'all_standard_definitions': all_standard_definitions,
-            'all_auditors': all_auditors,
-            'current_auditor_ids': current_auditor_ids,
+            'selected_auditors': selected_auditors,
             'certificate_status_choices': CompanyStandard.CERTIFICATE_STATUS_CHOICES,
         }
         return render(request, 'company/standard-update-form.html', context)
@@ -1,16 +1,22 @@
-from django.http import JsonResponse
+from django.http import Http404, JsonResponse
 from django.views.decorators.http import require_POST, require_GET
-from django.shortcuts import get_object_or_404
+from django.shortcuts import aget_object_or_404, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.utils import timezone
+from django.db import transaction
+from django.db.models import Prefetch
 import logging
 import json
 from datetime import datetime, time, date
+from . import reference_data
 from .standard_models import CompanyStandard
 from .models import Company, Appointment
 from .iaf_models import IAFEACCode, CompanyIAFEACCode
-from .cycle_models import CertificationCycle, CycleAudit, AuditDay, AuditorReservation, zaokruzi_na_veci_broj
+from .cycle_models import AuditorReservation, CertificationCycle, CycleAudit, AuditDay
 from .auditor_models import Auditor
+from .concurrency import is_stale, lock_auditors
+from .conflict_service import BookingIndex, audit_dates, find_conflicts
+from .select_options import SOURCES as SELECT_OPTION_SOURCES
 
 @require_POST
 @login_required
@@ -86,7 +92,9 @@ def add_iaf_eac_code(request, company_id):
             }, status=400)
         
         # Dohvati IAF/EAC kod
-        iaf_eac_code = get_object_or_404(IAFEACCode, id=iaf_eac_code_id)
+        iaf_eac_code = reference_data.iaf_code(iaf_eac_code_id)
+        if iaf_eac_code is None:
+            raise Http404('IAF/EAC kod ne postoji')
         logger.info(f"IAF/EAC kod pronađen: {iaf_eac_code}")
         
         # Proveri da li veza već postoji
@@ -253,6 +261,28 @@ def list_iaf_eac_codes(request, company_id):
         }, status=500)
 
 
+@require_GET
+@login_required
+def select_options_json(request, source):
+    """
+    Strana opcija za select2 sa lenjim učitavanjem (vidi company/select_options.py).
+    GET ?q=pretraga&page=1 -> {"results": [{"id", "text"}], "pagination": {"more": bool}}
+    """
+    options = SELECT_OPTION_SOURCES.get(source)
+    if options is None:
+        return JsonResponse({'success': False, 'error': 'Nepoznat izvor opcija.'}, status=404)
+    try:
+        page = max(int(request.GET.get('page') or 1), 1)
+    except ValueError:
+        page = 1
+
+    choices, more = options.page(request.GET.get('q', '').strip(), page)
+    return JsonResponse({
+        'results': [{'id': value, 'text': label} for value, label in choices],
+        'pagination': {'more': more},
+    })
+
+
 @require_GET
 @login_required
 def certification_cycle_json(request, pk):
@@ -398,17 +428,17 @@ def certification_cycle_json(request, pk):
 
 @require_GET
 @login_required
-def audit_days_by_audit_id(request, audit_id):
+async def audit_days_by_audit_id(request, audit_id):
     """
     API endpoint za dohvatanje podataka o danima audita prema ID-u audita.
-    Vraća podatke o auditu i povezanim danima audita.
+    Vraća podatke o auditu i povezanim danima audita (async ORM, dva upita za dane i rezervacije).
     """
     logger = logging.getLogger('django')
     logger.info(f"Dohvatanje podataka o danima audita za audit ID={audit_id}")
     
     try:
         # Dohvatamo audit
-        audit = get_object_or_404(CycleAudit, pk=audit_id)
+        audit = await aget_object_or_404(CycleAudit.objects.select_related('certification_cycle__company'), pk=audit_id)
         
         # Pripremamo osnovne podatke o auditu
         audit_data = {
@@ -425,12 +455,15 @@ def audit_days_by_audit_id(request, audit_id):
         }
         
         # Dohvatamo dane audita
+        days = audit.audit_days.order_by('date').prefetch_related(
+            Prefetch('reservations', queryset=AuditorReservation.objects.select_related('auditor').order_by('auditor__ime_prezime'))
+        )
         audit_days = []
-        for day in audit.audit_days.all().order_by('date'):
+        async for day in days:
             reservations_data = []
             lead_ids = []
             team_ids = []
-            for res in day.reservations.select_related('auditor').all().order_by('auditor__ime_prezime'):
+            for res in day.reservations.all():
                 reservations_data.append({
                     'id': res.id,
                     'role': res.role,
@@ -475,6 +508,71 @@ def audit_days_by_audit_id(request, audit_id):
         }, status=500)
 
 
+def _conflict_payload(auditors, dates, exclude_audit_id=None):
+    """Konflikti za drag & drop odgovor (409) - lista rečnika po auditoru i datumu"""
+    auditors_by_id = {a.id: a for a in auditors}
+    conflicts_by_auditor = find_conflicts(auditors_by_id.keys(), dates, exclude_audit_id=exclude_audit_id)
+    conflicts = []
+    for auditor_id, bookings in conflicts_by_auditor.items():
+        for booking in bookings:
+            conflicts.append({
+                'auditor': auditors_by_id[auditor_id].ime_prezime,
+                'date': booking.date.isoformat(),
+                'company': booking.company,
+                'type': booking.kind,
+                'conflicting_audit_id': booking.audit_id,
+                'conflicting_visit_id': booking.visit_id,
+            })
+    return conflicts
+
+
+def _stale_response(message, current):
+    """409 za izmenu zasnovanu na zastarelom prikazu; current je sveže stanje događaja (ili None ako je obrisan)"""
+    return JsonResponse({
+        'success': False,
+        'stale': True,
+        'error': message,
+        'current': current,
+    }, status=409)
+
+
+def _audit_day_payload(audit_day):
+    reservations_payload = []
+    for res in audit_day.reservations.select_related('auditor').all().order_by('auditor__ime_prezime'):
+        reservations_payload.append({
+            'id': res.id,
+            'role': res.role,
+            'auditor': {
+                'id': res.auditor.id,
+                'ime_prezime': res.auditor.ime_prezime,
+                'email': res.auditor.email,
+                'telefon': res.auditor.telefon,
+                'kategorija': res.auditor.kategorija,
+                'kategorija_display': res.auditor.get_kategorija_display(),
+            }
+        })
+    return {
+        'id': audit_day.id,
+        'date': audit_day.date.isoformat(),
+        'is_planned': audit_day.is_planned,
+        'is_actual': audit_day.is_actual,
+        'notes': audit_day.notes or '',
+        'version': audit_day.version,
+        'reservations': reservations_payload,
+    }
+
+
+def _cycle_audit_payload(audit):
+    return {
+        'id': audit.id,
+        'planned_date': audit.planned_date.isoformat(),
+        'actual_date': audit.actual_date.isoformat() if audit.actual_date else None,
+        'audit_type': audit.audit_type,
+        'audit_status': audit.audit_status,
+        'version': audit.version,
+    }
+
+
 @require_POST
 @login_required
 def update_event_date(request):
@@ -492,6 +590,8 @@ def update_event_date(request):
         event_id = data.get('eventId')
         event_type = data.get('eventType')
         new_date = data.get('newDate')
+        # Verzija događaja koju je kalendar prikazao (optimistička kontrola konkurentnosti)
+        expected_version = data.get('version')
         
         logger.info(f"Primljeni podaci: event_id={event_id}, event_type={event_type}, new_date={new_date}")
         
@@ -518,160 +618,104 @@ def update_event_date(request):
         
         # Ažuriranje datuma u zavisnosti od tipa događaja
         if event_type == 'audit_day':
-            # Ažuriranje datuma audit dana uz proveru konflikata rezervacija i resync
-            audit_day = get_object_or_404(AuditDay, pk=event_id)
-            old_date = audit_day.date
             new_local_date = local_dt.date()
 
-            # Proveri potencijalne konflikate za sve dodeljene auditore (lead + tim)
-            audit = audit_day.audit
-            assigned_auditors = list(audit.audit_team.all())
-            if audit.lead_auditor_id:
-                assigned_auditors.append(audit.lead_auditor)
-
-            conflicts = []
-            if assigned_auditors:
-                # Proveri potencijalne konflikte i vrati detalje za poruku na frontendu
-                for a in assigned_auditors:
-                    existing = AuditorReservation.objects.select_related(
-                        'audit__certification_cycle__company',
-                        'audit_day__audit__certification_cycle__company'
-                    ).filter(auditor=a, date=new_local_date).exclude(audit=audit).first()
-                    if existing:
-                        company_name = 'druga kompanija'
-                        try:
-                            if getattr(existing, 'audit', None) and existing.audit and existing.audit.certification_cycle:
-                                company_name = existing.audit.certification_cycle.company.name
-                            elif existing.audit_day and existing.audit_day.audit and existing.audit_day.audit.certification_cycle:
-                                company_name = existing.audit_day.audit.certification_cycle.company.name
-                        except Exception:
-                            pass
-                        conflicts.append({
-                            'auditor': a.ime_prezime,
-                            'date': new_local_date.isoformat(),
-                            'company': company_name,
-                            'conflicting_audit_id': getattr(existing, 'audit_id', None),
-                        })
-
-            if conflicts:
-                # Vraćamo 409 sa detaljima konflikata kako bi frontend prikazao preciznu poruku
-                primary = conflicts[0]
-                primary_msg = f"Nije moguće promeniti datum auditu jer je za ovaj {primary['date']} već dodeljen {primary['auditor']} za {primary['company']}."
-                return JsonResponse({
-                    'success': False,
-                    'error': 'Nemoguće pomeriti dan audita zbog konflikta rezervacija.',
-                    'message': primary_msg,
-                    'conflicts': conflicts,
-                }, status=409)
-
-            # Koristi lokalni datum (ne UTC) da se izbegne pomeranje za jedan dan
-            audit_day.date = new_local_date
-            audit_day.save()
-
-            # Resync rezervacija za audit kako bi se azurirala veza na nove dane i datume
-            try:
+            # Provera konflikata i upis u istoj transakciji, uz zaključane redove
+            # dana, audita i dodeljenih auditora (vidi company/concurrency.py)
+            with transaction.atomic():
+                audit_day = AuditDay.objects.select_for_update().filter(pk=event_id).first()
+                if audit_day is None:
+                    return _stale_response('Dan audita više ne postoji - kalendar je zastareo.', None)
+                if is_stale(audit_day, expected_version):
+                    return _stale_response(
+                        'Dan audita je u međuvremenu izmenio drugi korisnik. Prikazano je trenutno stanje.',
+                        {'auditDay': _audit_day_payload(audit_day)},
+                    )
+                old_date = audit_day.date
+
+                audit = CycleAudit.objects.select_for_update().select_related('lead_auditor').get(pk=audit_day.audit_id)
+                assigned_auditors = list(audit.audit_team.all())
+                if audit.lead_auditor_id:
+                    assigned_auditors.append(audit.lead_auditor)
+                lock_auditors(a.id for a in assigned_auditors)
+
+                conflicts = _conflict_payload(assigned_auditors, [new_local_date], exclude_audit_id=audit.pk)
+
+                if conflicts:
+                    # Vraćamo 409 sa detaljima konflikata kako bi frontend prikazao preciznu poruku
+                    primary = conflicts[0]
+                    primary_msg = f"Nije moguće promeniti datum auditu jer je za ovaj {primary['date']} već dodeljen {primary['auditor']} za {primary['company']}."
+                    return JsonResponse({
+                        'success': False,
+                        'error': 'Nemoguće pomeriti dan audita zbog konflikta rezervacija.',
+                        'message': primary_msg,
+                        'conflicts': conflicts,
+                    }, status=409)
+
+                # Koristi lokalni datum (ne UTC) da se izbegne pomeranje za jedan dan
+                audit_day.date = new_local_date
+                audit_day.save()
+
+                # Resync rezervacija za audit kako bi se azurirala veza na nove dane i datume
                 audit.sync_auditor_reservations()
-            except Exception:
-                pass
-
-            # Pripremi rezervacije za vraćanje klijentu
-            reservations_payload = []
-            for res in audit_day.reservations.select_related('auditor').all().order_by('auditor__ime_prezime'):
-                reservations_payload.append({
-                    'id': res.id,
-                    'role': res.role,
-                    'auditor': {
-                        'id': res.auditor.id,
-                        'ime_prezime': res.auditor.ime_prezime,
-                        'email': res.auditor.email,
-                        'telefon': res.auditor.telefon,
-                        'kategorija': res.auditor.kategorija,
-                        'kategorija_display': res.auditor.get_kategorija_display(),
-                    }
-                })
 
             return JsonResponse({
                 'success': True,
                 'message': f'Datum audit dana je uspešno ažuriran sa {old_date} na {audit_day.date}.',
-                'auditDay': {
-                    'id': audit_day.id,
-                    'date': audit_day.date.isoformat(),
-                    'is_planned': audit_day.is_planned,
-                    'is_actual': audit_day.is_actual,
-                    'notes': audit_day.notes or '',
-                    'reservations': reservations_payload,
-                }
+                'auditDay': _audit_day_payload(audit_day),
             })
             
         elif event_type == 'cycle_audit':
             # Ažuriranje planiranog datuma audita uz prethodnu proveru konflikata rezervacija
-            audit = get_object_or_404(CycleAudit, pk=event_id)
-            old_date = audit.planned_date
             new_planned = local_dt.date()  # koristimo lokalni datum (bez UTC pomaka)
 
-            # 1) Izračunaj planirane datume audita posle promene
-            from datetime import timedelta
-            cycle = audit.certification_cycle
-
-            # Broj dana audita prema tipu i podešavanjima ciklusa (isti model kao u CycleAudit.create_audit_days)
-            if audit.audit_type == 'initial' and cycle.inicijalni_broj_dana:
-                broj_dana = zaokruzi_na_veci_broj(cycle.inicijalni_broj_dana)
-            elif (audit.audit_type == 'surveillance_1' or audit.audit_type == 'surveillance_2') and cycle.broj_dana_nadzora:
-                broj_dana = zaokruzi_na_veci_broj(cycle.broj_dana_nadzora)
-            elif audit.audit_type == 'recertification' and cycle.broj_dana_resertifikacije:
-                broj_dana = zaokruzi_na_veci_broj(cycle.broj_dana_resertifikacije)
-            else:
-                broj_dana = 1
-
-            # Ako postoji stvarni datum, datumi se zasnivaju na actual_date; u suprotnom na new_planned
-            anchor_date = audit.actual_date if audit.actual_date else new_planned
-            target_dates = [anchor_date - timedelta(days=i) for i in range(broj_dana)]
-
-            # 2) Prikupi sve dodeljene auditore (lead + tim)
-            assigned_auditors = list(audit.audit_team.all())
-            if audit.lead_auditor_id:
-                assigned_auditors.append(audit.lead_auditor)
-
-            # 3) Provera konflikata sa postojećim rezervacijama drugih audita
-            conflicts = []
-            if assigned_auditors:
-                for a in assigned_auditors:
-                    for d in target_dates:
-                        existing = AuditorReservation.objects.select_related(
-                            'audit__certification_cycle__company'
-                        ).filter(auditor=a, date=d).exclude(audit=audit).first()
-                        if existing:
-                            company_name = existing.audit.certification_cycle.company.name if existing.audit and existing.audit.certification_cycle else 'druga kompanija'
-                            conflicts.append({
-                                'auditor': a.ime_prezime,
-                                'date': d.isoformat(),
-                                'company': company_name,
-                                'conflicting_audit_id': existing.audit_id,
-                            })
-
-            if conflicts:
-                # Vraćamo 409 Conflict sa detaljima kako bi frontend prikazao poruku i vratio prikaz
-                conflict_msgs = [f"{c['auditor']} ({c['date']}) — {c['company']}" for c in conflicts]
-                return JsonResponse({
-                    'success': False,
-                    'error': 'Nemoguće pomeriti audit zbog konflikta rezervacija za sledeće auditore: ' + ', '.join(conflict_msgs),
-                    'conflicts': conflicts,
-                }, status=409)
-
-            # 4) Nema konflikata – ažuriraj datum i pokreni regeneraciju dana/rezevacija kroz save()
-            audit.planned_date = new_planned
-            logger.info("Pozivam audit.save(update_fields=['planned_date']) radi regeneracije audit dana i rezervacija")
-            audit.save(update_fields=['planned_date'])
+            with transaction.atomic():
+                audit = (
+                    CycleAudit.objects.select_for_update()
+                    .select_related('certification_cycle', 'lead_auditor')
+                    .filter(pk=event_id).first()
+                )
+                if audit is None:
+                    return _stale_response('Audit više ne postoji - kalendar je zastareo.', None)
+                if is_stale(audit, expected_version):
+                    return _stale_response(
+                        'Audit je u međuvremenu izmenio drugi korisnik. Prikazano je trenutno stanje.',
+                        {'audit': _cycle_audit_payload(audit)},
+                    )
+                old_date = audit.planned_date
+
+                # 1) Izračunaj planirane datume audita posle promene
+                # Ako postoji stvarni datum, datumi se zasnivaju na actual_date; u suprotnom na new_planned
+                anchor_date = audit.actual_date if audit.actual_date else new_planned
+                target_dates = audit_dates(audit.certification_cycle, audit.audit_type, anchor_date)
+
+                # 2) Prikupi sve dodeljene auditore (lead + tim) i zaključaj ih do kraja transakcije
+                assigned_auditors = list(audit.audit_team.all())
+                if audit.lead_auditor_id:
+                    assigned_auditors.append(audit.lead_auditor)
+                lock_auditors(a.id for a in assigned_auditors)
+
+                # 3) Provera konflikata sa rezervacijama drugih audita i Srbija Tim posetama
+                conflicts = _conflict_payload(assigned_auditors, target_dates, exclude_audit_id=audit.pk)
+
+                if conflicts:
+                    # Vraćamo 409 Conflict sa detaljima kako bi frontend prikazao poruku i vratio prikaz
+                    conflict_msgs = [f"{c['auditor']} ({c['date']}) — {c['company']}" for c in conflicts]
+                    return JsonResponse({
+                        'success': False,
+                        'error': 'Nemoguće pomeriti audit zbog konflikta rezervacija za sledeće auditore: ' + ', '.join(conflict_msgs),
+                        'conflicts': conflicts,
+                    }, status=409)
+
+                # 4) Nema konflikata – ažuriraj datum i pokreni regeneraciju dana/rezevacija kroz save()
+                audit.planned_date = new_planned
+                logger.info("Pozivam audit.save(update_fields=['planned_date']) radi regeneracije audit dana i rezervacija")
+                audit.save(update_fields=['planned_date'])
 
             return JsonResponse({
                 'success': True,
                 'message': f'Planirani datum audita je uspešno ažuriran sa {old_date} na {audit.planned_date}.',
-                'audit': {
-                    'id': audit.id,
-                    'planned_date': audit.planned_date.isoformat(),
-                    'audit_type': audit.audit_type,
-                    'audit_status': audit.audit_status
-                }
+                'audit': _cycle_audit_payload(audit),
             })
             
         elif event_type == 'appointment':
@@ -784,41 +828,24 @@ def validate_auditor_reservation(request):
                 'message': 'Neispravan format datuma.'
             }, status=400)
         
-        # Provera da li auditor već ima rezervaciju na odabrani datum
-        # Isključujemo trenutni termin ako je prosleđen ID
-        existing_reservations = AuditorReservation.objects.select_related(
-            'audit__certification_cycle__company',
-            'audit_day__audit__certification_cycle__company'
-        ).filter(
-            auditor=auditor,
-            date=target_date_obj
-        )
-        
-        # Ako postoje rezervacije, auditor nije dostupan
-        if existing_reservations.exists():
+        # Provera da li auditor već ima rezervaciju ili Srbija Tim posetu na odabrani datum
+        index = BookingIndex.load([auditor.id], target_date_obj, target_date_obj)
+        bookings = index.bookings_on(auditor.id, target_date_obj)
+
+        # Ako postoje zauzetosti, auditor nije dostupan
+        if bookings:
             # Dobavi detaljnije informacije o konfliktima
             conflicts = []
-            
-            for res in existing_reservations:
-                audit_day = res.audit_day
-                # Odredi kompaniju povezanu sa postojećom rezervacijom
-                company_name = None
-                try:
-                    if getattr(res, 'audit', None) and res.audit and res.audit.certification_cycle:
-                        company_name = res.audit.certification_cycle.company.name
-                    elif audit_day and audit_day.audit and audit_day.audit.certification_cycle:
-                        company_name = audit_day.audit.certification_cycle.company.name
-                except Exception:
-                    company_name = None
-
+            for booking in bookings:
                 conflicts.append({
-                    'type': 'reservation',
-                    'id': res.id,
-                    'audit_day_id': audit_day.id if audit_day else None,
-                    'audit_id': (audit_day.audit_id if audit_day else (res.audit_id if getattr(res, 'audit_id', None) else None)),
-                    'date': res.date.isoformat() if res.date else None,
+                    'type': 'reservation' if booking.kind == 'audit' else booking.kind,
+                    'id': booking.reservation_id if booking.kind == 'audit' else booking.visit_id,
+                    'audit_day_id': booking.audit_day_id,
+                    'audit_id': booking.audit_id,
+                    'visit_id': booking.visit_id,
+                    'date': booking.date.isoformat(),
                     'auditor': auditor.ime_prezime,
-                    'company': company_name or 'drugu firmu',
+                    'company': booking.company or 'drugu firmu',
                 })
             
             # Poruka u standardizovanom formatu (prvi konflikt)
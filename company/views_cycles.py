@@ -4,9 +4,11 @@ from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib.auth.decorators import login_required
 from django.urls import reverse_lazy, reverse
 from django.contrib import messages
-from django.db.models import Q
+from django.conf import settings
+from django.db.models import Count, Q
 from django.http import HttpResponseRedirect
 from .cycle_models import CertificationCycle, CycleStandard, CycleAudit
+from .detail_cache import CYCLE_SECTIONS, stamps, with_stamps
 from .models import Company
 from .forms import CertificationCycleForm, CycleAuditForm
 from .standard_models import StandardDefinition
@@ -69,12 +71,19 @@ class CertificationCycleDetailView(LoginRequiredMixin, DetailView):
     template_name = 'certification_cycles/cycle_detail.html'
     context_object_name = 'cycle'
     
+    def get_queryset(self):
+        # Pečati sekcija (ključevi keša fragmenata, company/detail_cache.py) i broj audita u istom upitu
+        return with_stamps(
+            CertificationCycle.objects.select_related('company').annotate(audit_count=Count('audits')),
+            CYCLE_SECTIONS,
+        )
+    
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         cycle = self.object
         
-        # Get standards for this cycle
-        context['standards'] = cycle.cycle_standards.all()
+        # Get standards for this cycle (lenji querysetovi - ne izvršavaju se za sekcije iz keša)
+        context['standards'] = cycle.cycle_standards.select_related('standard_definition')
         
         # Get audits for this cycle
         context['audits'] = (
@@ -83,6 +92,8 @@ class CertificationCycleDetailView(LoginRequiredMixin, DetailView):
             .prefetch_related('audit_team')
             .order_by('planned_date')
         )
+        context['fragment_stamps'] = stamps(cycle, CYCLE_SECTIONS)
+        context['fragment_cache_seconds'] = settings.FRAGMENT_CACHE_SECONDS
         
         # Check if we need to show audit form
         edit_audit = self.request.GET.get('edit_audit')
@@ -37,7 +37,11 @@ fi
 
 # Pokreni migracije
 echo "Primenjujem migracije..."
-python manage.py migrate
+# Migracije na velikim tabelama mogu trajati duže od statement_timeout-a zahteva
+DB_STATEMENT_TIMEOUT_MS=0 python manage.py migrate
+
+# Tabela keša (koristi se kada REDIS_URL nije postavljen; inače ne radi ništa)
+python manage.py createcachetable
 
 # Prikupi statičke fajlove
 echo "Prikupljam statičke fajlove..."
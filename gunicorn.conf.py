@@ -0,0 +1,45 @@
+"""
+Gunicorn podešavanja za produkciju (gunicorn ih automatski učitava iz radnog direktorijuma /app).
+
+Broj workera i niti se izvodi iz broja CPU-a dostupnih kontejneru, a env
+varijable ga menjaju. Svaka nit drži najviše jednu konekciju iz pool-a baze
+(DB_POOL_MAX_SIZE u settings.py podrazumevano prati GUNICORN_THREADS), pa je
+ukupno konekcija ka PostgreSQL-u najviše workers * threads (+ run_worker) -
+to mora stati u max_connections baze (podrazumevano 100), zato se niti
+izvode iz budžeta konekcija (GUNICORN_DB_CONNECTIONS) podeljenog na workere.
+"""
+import os
+
+try:
+    cpu_count = len(os.sched_getaffinity(0))
+except AttributeError:  # macOS / Windows
+    cpu_count = os.cpu_count() or 1
+
+# Klasična preporuka gunicorn-a: (2 x CPU) + 1
+# (prazna env varijabla iz docker-compose.yml znači podrazumevanu vrednost)
+workers = int(os.environ.get('GUNICORN_WORKERS') or cpu_count * 2 + 1)
+
+# Više niti po workeru (gthread): upiti ka bazi čekaju na mrežu pa nit koja
+# čeka ne blokira ostale. Niti ne rastu sa CPU-om - broj workera već raste -
+# nego se budžet konekcija (100 - run_worker - admin/migracije) deli na
+# workere, najviše 4 po workeru (više ne pomaže zbog GIL-a). Na 1-8 CPU to je
+# 4 niti, na 16 CPU 2, pa pool ostaje u max_connections baze.
+db_connections = int(os.environ.get('GUNICORN_DB_CONNECTIONS') or 80)
+threads = int(os.environ.get('GUNICORN_THREADS') or max(1, min(4, db_connections // workers)))
+# settings.py (DB_POOL_MAX_SIZE) se učitava u workerima posle fork-a i čita ovu vrednost
+os.environ['GUNICORN_THREADS'] = str(threads)
+
+# ASGI profil (docker-compose.asgi.yml) postavlja uvicorn workere; niti se tada ne koriste,
+# ali async view-ovi izvršavaju ORM u thread pool-u, pa jedan worker drži više konekcija.
+# Pool se deli iz istog budžeta (najviše 10 po workeru): na 8 CPU 17 x 4, na 2 CPU 5 x 10.
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS') or 'gthread'
+if 'uvicorn' in worker_class.lower():
+    os.environ['DB_POOL_MAX_SIZE'] = os.environ.get('DB_POOL_MAX_SIZE') or str(max(1, min(10, db_connections // workers)))
+
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 60))
+graceful_timeout = 30
+keepalive = 5
+
+# Povremeni restart workera ograničava curenje memorije (PDF/Excel izveštaji)
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 1000))
+max_requests_jitter = 100
@@ -0,0 +1,280 @@
+"""
+Metrike aplikacije u Prometheus tekstualnom formatu, bez spoljnog exportera.
+
+Svaki proces (gunicorn worker, run_worker) drži svoje brojače u memoriji i
+povremeno ih upisuje u svoj fajl u METRICS_DIR (<host>-<pid>.json). Endpoint
+/metrics sabira sve fajlove, tako da se dobija zbir za sve workere. Fajlovi
+ugašenih procesa sa istog hosta se pripajaju u archived.json da se brojači
+ne bi vraćali unazad i da se direktorijum ne bi punio.
+
+Upotreba:
+
+    metrics.inc('isoqar_calendar_feed_events_total', len(events), feed='srbija_tim')
+    metrics.observe('isoqar_request_duration_seconds', 0.123, view='company:list')
+"""
+import atexit
+import fcntl
+import json
+import os
+import socket
+import tempfile
+import threading
+import time
+from collections import defaultdict
+
+from django.conf import settings
+
+COUNTER = 'counter'
+HISTOGRAM = 'histogram'
+
+LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+JOB_BUCKETS = (0.1, 0.5, 1.0, 5.0, 15.0, 60.0, 300.0, 900.0, 3600.0)
+
+# naziv -> (tip, opis, granice za histogram)
+METRICS = {
+    'isoqar_request_duration_seconds': (HISTOGRAM, 'Trajanje HTTP zahteva po nazivu URL-a', LATENCY_BUCKETS),
+    'isoqar_requests_total': (COUNTER, 'Broj HTTP zahteva po nazivu URL-a i statusu', None),
+    'isoqar_db_queries_total': (COUNTER, 'Broj SQL upita po view-u', None),
+    'isoqar_db_query_seconds_total': (COUNTER, 'Ukupno vreme SQL upita po view-u', None),
+    'isoqar_cache_requests_total': (COUNTER, 'Pristupi kešu po nazivu keša i ishodu (hit/miss)', None),
+    'isoqar_jobs_total': (COUNTER, 'Završeni pozadinski poslovi po zadatku i statusu', None),
+    'isoqar_job_duration_seconds': (HISTOGRAM, 'Trajanje pozadinskih poslova po zadatku', JOB_BUCKETS),
+    'isoqar_calendar_feed_requests_total': (COUNTER, 'Broj zahteva za kalendarske feed-ove', None),
+    'isoqar_calendar_feed_events_total': (COUNTER, 'Broj događaja vraćenih u kalendarskim feed-ovima', None),
+    'isoqar_calendar_live_changes_total': (COUNTER, 'Broj promena poslatih otvorenim kalendarima (SSE)', None),
+}
+
+ARCHIVE_FILE = 'archived.json'
+LOCK_FILE = '.lock'
+
+
+def metrics_dir():
+    return getattr(settings, 'METRICS_DIR', None) or os.path.join(settings.BASE_DIR, 'var', 'metrics')
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+class MetricsStore:
+    """Brojači jednog procesa; ključ je (naziv uzorka, sortirane labele)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._values = defaultdict(float)
+        self._pid = os.getpid()
+        self._last_flush = 0.0
+        self._dirty = False
+
+    def _check_fork(self):
+        # Posle fork-a (gunicorn) dete ne sme da nasledi brojače roditelja
+        if os.getpid() != self._pid:
+            self._values = defaultdict(float)
+            self._pid = os.getpid()
+            self._last_flush = 0.0
+            self._dirty = False
+
+    def add(self, sample, labels, amount):
+        key = (sample, tuple(sorted((k, str(v)) for k, v in labels.items())))
+        with self._lock:
+            self._check_fork()
+            self._values[key] += amount
+            self._dirty = True
+        self.maybe_flush()
+
+    def snapshot(self):
+        with self._lock:
+            self._check_fork()
+            return dict(self._values)
+
+    def reset(self):
+        with self._lock:
+            self._values = defaultdict(float)
+            self._dirty = False
+
+    @property
+    def filename(self):
+        return f"{socket.gethostname()}-{os.getpid()}.json"
+
+    def maybe_flush(self):
+        interval = getattr(settings, 'METRICS_FLUSH_INTERVAL', 1.0)
+        if self._dirty and time.monotonic() - self._last_flush >= interval:
+            self.flush()
+
+    def flush(self):
+        """Atomski upis brojača ovog procesa u njegov fajl"""
+        with self._lock:
+            self._check_fork()
+            if not self._dirty:
+                return
+            values = [[sample, list(labels), value] for (sample, labels), value in self._values.items()]
+            self._dirty = False
+            self._last_flush = time.monotonic()
+
+        directory = metrics_dir()
+        try:
+            os.makedirs(directory, exist_ok=True)
+            _write_json(os.path.join(directory, self.filename), values)
+        except OSError:
+            # Metrike nikad ne smeju da obore zahtev
+            with self._lock:
+                self._dirty = True
+
+
+def _write_json(path, values):
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(values, f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def _read_json(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return []
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _merge(totals, values):
+    for sample, labels, value in values:
+        totals[(sample, tuple(tuple(pair) for pair in labels))] += value
+
+
+def _archive_dead_files(directory):
+    """Pripaja fajlove ugašenih procesa sa ovog hosta u archived.json"""
+    prefix = f"{socket.gethostname()}-"
+    dead = []
+    for name in os.listdir(directory):
+        if not name.startswith(prefix) or not name.endswith('.json'):
+            continue
+        try:
+            pid = int(name[len(prefix):-len('.json')])
+        except ValueError:
+            continue
+        if pid != os.getpid() and not _pid_alive(pid):
+            dead.append(name)
+    if not dead:
+        return
+
+    with open(os.path.join(directory, LOCK_FILE), 'a') as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        archive_path = os.path.join(directory, ARCHIVE_FILE)
+        totals = defaultdict(float)
+        _merge(totals, _read_json(archive_path))
+        for name in dead:
+            path = os.path.join(directory, name)
+            if os.path.exists(path):
+                _merge(totals, _read_json(path))
+        _write_json(archive_path, [[sample, list(labels), value] for (sample, labels), value in totals.items()])
+        for name in dead:
+            try:
+                os.remove(os.path.join(directory, name))
+            except FileNotFoundError:
+                pass
+
+
+def collect():
+    """Zbir brojača iz svih fajlova (svi procesi) - {(uzorak, labele): vrednost}"""
+    store.flush()
+    directory = metrics_dir()
+    totals = defaultdict(float)
+    if not os.path.isdir(directory):
+        return totals
+    _archive_dead_files(directory)
+    for name in sorted(os.listdir(directory)):
+        if name.endswith('.json'):
+            _merge(totals, _read_json(os.path.join(directory, name)))
+    return totals
+
+
+def render():
+    """Sve metrike u Prometheus tekstualnom formatu (text/plain; version=0.0.4)"""
+    by_family = defaultdict(list)
+    for (sample, labels), value in collect().items():
+        family = sample
+        for suffix in ('_bucket', '_sum', '_count'):
+            base = sample[:-len(suffix)]
+            if sample.endswith(suffix) and METRICS.get(base, (None,))[0] == HISTOGRAM:
+                family = base
+                break
+        by_family[family].append((sample, labels, value))
+
+    lines = []
+    for family in sorted(by_family):
+        kind, help_text, _ = METRICS.get(family, (COUNTER, '', None))
+        lines.append(f'# HELP {family} {help_text}')
+        lines.append(f'# TYPE {family} {kind}')
+        for sample, labels, value in sorted(by_family[family], key=_sample_sort_key):
+            label_str = ','.join(f'{k}="{_escape(v)}"' for k, v in labels)
+            lines.append(f'{sample}{{{label_str}}} {_format_value(value)}' if label_str else f'{sample} {_format_value(value)}')
+    return '\n'.join(lines) + '\n'
+
+
+def _sample_sort_key(item):
+    sample, labels, _ = item
+    plain = tuple((k, v) for k, v in labels if k != 'le')
+    le = dict(labels).get('le')
+    return (plain, sample, float(le.replace('+Inf', 'inf')) if le else 0.0)
+
+
+store = MetricsStore()
+atexit.register(store.flush)
+
+
+def inc(name, amount=1, **labels):
+    store.add(name, labels, amount)
+
+
+def observe(name, value, **labels):
+    """Upis vrednosti u histogram (kumulativne granice, _sum i _count)"""
+    buckets = METRICS[name][2]
+    for bound in buckets:
+        if value <= bound:
+            store.add(f'{name}_bucket', {**labels, 'le': _format_value(bound)}, 1)
+    store.add(f'{name}_bucket', {**labels, 'le': '+Inf'}, 1)
+    store.add(f'{name}_sum', labels, value)
+    store.add(f'{name}_count', labels, 1)
+
+
+def record_cache(cache, hit):
+    inc('isoqar_cache_requests_total', cache=cache, result='hit' if hit else 'miss')
+
+
+class QueryTimer:
+    """Lagan execute_wrapper: samo broj i vreme upita (za metrike svakog zahteva)"""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.duration += time.perf_counter() - start
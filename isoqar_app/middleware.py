@@ -1,14 +1,35 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
 from django.shortcuts import redirect
 from django.conf import settings
 from django.urls import resolve, reverse
 import re
+import time
 
-class RequireLoginMiddleware:
+
+class AsyncCapableMiddleware:
     """
-    Middleware koji zahteva autentifikaciju za sve stranice osim izuzetih.
+    Osnova za middleware koji radi i pod WSGI i pod ASGI (uvicorn workeri).
+    Pod ASGI se poziva __acall__, pa async view-ovi ne prelaze u sync nit samo zbog middleware-a.
     """
+    sync_capable = True
+    async_capable = True
+
     def __init__(self, get_response):
         self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return self.handle(request)
+
+class RequireLoginMiddleware(AsyncCapableMiddleware):
+    """
+    Middleware koji zahteva autentifikaciju za sve stranice osim izuzetih.
+    """
+    def __init__(self, get_response):
+        super().__init__(get_response)
         # Putanje koje ne zahtevaju autentifikaciju
         self.exempt_urls = [
             re.compile(settings.LOGIN_URL.lstrip('/')),
@@ -18,16 +39,123 @@ class RequireLoginMiddleware:
             re.compile(r'^admin/.*$'),  # Admin stranice imaju svoju autentifikaciju
             re.compile(r'^static/.*$'),
             re.compile(r'^media/.*$'),
+            re.compile(r'^health/'),  # Probe load balancer-a / Docker-a
+            re.compile(r'^metrics/?$'),  # Prometheus scrape, zaštićen METRICS_TOKEN-om
         ]
 
-    def __call__(self, request):
+    def is_exempt(self, request):
+        path = request.path_info.lstrip('/')
+        return any(m.match(path) for m in self.exempt_urls)
+
+    def handle(self, request):
         # Ako korisnik nije autentifikovan i URL nije izuzet, preusmeri na login
-        if not request.user.is_authenticated:
-            path = request.path_info.lstrip('/')
-            
-            # Proveri da li je URL izuzet
-            if not any(m.match(path) for m in self.exempt_urls):
-                return redirect(settings.LOGIN_URL)
-                
-        response = self.get_response(request)
+        if not request.user.is_authenticated and not self.is_exempt(request):
+            return redirect(settings.LOGIN_URL)
+        return self.get_response(request)
+
+    async def __acall__(self, request):
+        user = await request.auser()
+        if not user.is_authenticated and not self.is_exempt(request):
+            return redirect(settings.LOGIN_URL)
+        return await self.get_response(request)
+
+
+class SQLProfilingMiddleware(AsyncCapableMiddleware):
+    """
+    Beleži SQL upite po zahtevu (broj, vreme u bazi, ponovljeni i najsporiji upiti).
+
+    Uključuje se za sve zahteve podešavanjem SQL_PROFILING = True, ili za pojedinačan
+    zahtev zaglavljem "X-SQL-Profile: 1" (samo za staff korisnike ili u DEBUG režimu).
+    Rezultat se vraća u Server-Timing zaglavlju i upisuje u kružni bafer koji se
+    pregleda na /admin/sql-profile/.
+    """
+    header = 'HTTP_X_SQL_PROFILE'
+
+    def is_enabled(self, request):
+        if getattr(settings, 'SQL_PROFILING', False):
+            return True
+        if request.META.get(self.header) not in ('1', 'true', 'yes'):
+            return False
+        user = getattr(request, 'user', None)
+        return settings.DEBUG or bool(user is not None and user.is_staff)
+
+    def handle(self, request):
+        if not self.is_enabled(request):
+            return self.get_response(request)
+
+        from .sql_profiler import QueryProfile
+
+        profile = QueryProfile()
+        start = time.perf_counter()
+        with profile.capture():
+            response = self.get_response(request)
+        return self.record(request, response, profile, start)
+
+    async def __acall__(self, request):
+        # is_enabled može da učita korisnika iz sesije (sync ORM)
+        if not await sync_to_async(self.is_enabled)(request):
+            return await self.get_response(request)
+
+        from .sql_profiler import QueryProfile
+
+        profile = QueryProfile()
+        start = time.perf_counter()
+        async with profile.acapture():
+            response = await self.get_response(request)
+        return self.record(request, response, profile, start)
+
+    def record(self, request, response, profile, start):
+        from .sql_profiler import RECENT_PROFILES
+
+        total_ms = round((time.perf_counter() - start) * 1000, 2)
+        response['Server-Timing'] = f'{profile.server_timing()}, total;dur={total_ms}'
+        response['X-SQL-Query-Count'] = str(profile.count)
+        RECENT_PROFILES.add(profile.as_dict(request, response, total_ms))
+        return response
+
+
+class MetricsMiddleware(AsyncCapableMiddleware):
+    """
+    Metrike po zahtevu za /metrics: trajanje po nazivu URL-a i broj/vreme SQL upita po view-u.
+    Labela je naziv URL-a (npr. "company:list"), ne putanja, da broj serija ostane ograničen.
+    """
+
+    def handle(self, request):
+        if not getattr(settings, 'METRICS_ENABLED', True):
+            return self.get_response(request)
+
+        from .sql_profiler import capture_queries
+        from . import metrics
+
+        timer = metrics.QueryTimer()
+        start = time.perf_counter()
+        with capture_queries(timer):
+            response = self.get_response(request)
+        return self.record(request, response, timer, start)
+
+    async def __acall__(self, request):
+        if not getattr(settings, 'METRICS_ENABLED', True):
+            return await self.get_response(request)
+
+        from .sql_profiler import acapture_queries
+        from . import metrics
+
+        timer = metrics.QueryTimer()
+        start = time.perf_counter()
+        async with acapture_queries(timer):
+            response = await self.get_response(request)
+        return self.record(request, response, timer, start)
+
+    def record(self, request, response, timer, start):
+        from . import metrics
+
+        duration = time.perf_counter() - start
+
+        match = getattr(request, 'resolver_match', None)
+        view = (match.view_name or 'unnamed') if match else 'unresolved'
+        metrics.observe('isoqar_request_duration_seconds', duration, view=view)
+        metrics.inc('isoqar_requests_total', view=view, method=request.method, status=response.status_code)
+        if timer.count:
+            metrics.inc('isoqar_db_queries_total', timer.count, view=view)
+            metrics.inc('isoqar_db_query_seconds_total', timer.duration, view=view)
         return response
@@ -63,6 +63,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'isoqar_app.middleware.MetricsMiddleware',  # Metrike za /metrics (trajanje zahteva, SQL po view-u)
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -71,6 +72,7 @@ MIDDLEWARE = [
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'isoqar_app.middleware.RequireLoginMiddleware',  # Middleware za zahtevanje autentifikacije
+    'isoqar_app.middleware.SQLProfilingMiddleware',  # Profilisanje SQL upita (SQL_PROFILING ili X-SQL-Profile zaglavlje)
 ]
 
 ROOT_URLCONF = 'isoqar_app.urls'
@@ -133,6 +135,69 @@ else:
         }
     }
 
+# Produkcijski profil konekcija ka PostgreSQL-u (vidi gunicorn.conf.py i DEPLOYMENT.md):
+# - pool konekcija po procesu (psycopg 3) umesto nove konekcije po zahtevu;
+#   DB_POOL=False vraća trajne konekcije preko CONN_MAX_AGE
+# - provera konekcije pre ponovne upotrebe (pad baze ili restart ne ruši prvi sledeći zahtev)
+# - statement_timeout ograničava jedan upit (0 = bez ograničenja, npr. za migracije)
+DB_POOL = os.environ.get('DB_POOL', 'True').lower() in ('true', '1', 'yes')
+# Svaka nit gunicorn workera drži najviše jednu konekciju, pa pool ne treba da bude veći od broja niti
+DB_POOL_MIN_SIZE = int(os.environ.get('DB_POOL_MIN_SIZE', 2))
+DB_POOL_MAX_SIZE = int(os.environ.get('DB_POOL_MAX_SIZE') or os.environ.get('GUNICORN_THREADS') or 4)
+DB_POOL_TIMEOUT = float(os.environ.get('DB_POOL_TIMEOUT', 10))
+DB_CONN_MAX_AGE = int(os.environ.get('DB_CONN_MAX_AGE', 60))
+DB_STATEMENT_TIMEOUT_MS = int(os.environ.get('DB_STATEMENT_TIMEOUT_MS', 30000))
+
+if DATABASES['default']['ENGINE'] == 'django.db.backends.postgresql':
+    db_options = {'options': f'-c statement_timeout={DB_STATEMENT_TIMEOUT_MS}'}
+    if DB_POOL:
+        db_options['pool'] = {
+            'min_size': min(DB_POOL_MIN_SIZE, DB_POOL_MAX_SIZE),
+            'max_size': DB_POOL_MAX_SIZE,
+            'timeout': DB_POOL_TIMEOUT,
+        }
+        try:
+            from psycopg_pool import ConnectionPool
+            # Isto što CONN_HEALTH_CHECKS radi za trajne konekcije, ali pri preuzimanju iz pool-a
+            db_options['pool']['check'] = ConnectionPool.check_connection
+        except ImportError:
+            pass
+    DATABASES['default'].update({
+        'OPTIONS': db_options,
+        # Uz pool Django ne sme da drži konekciju sam (CONN_MAX_AGE mora biti 0)
+        'CONN_MAX_AGE': 0 if DB_POOL else DB_CONN_MAX_AGE,
+        'CONN_HEALTH_CHECKS': True,
+    })
+
+# Keš mora biti deljen između gunicorn workera i run_worker-a: generacije analitike i prognoze,
+# verzija referentnih podataka i fragmenti detalja se poništavaju iz signala u jednom procesu.
+# - REDIS_URL (docker-compose) -> Redis
+# - inače uz PostgreSQL -> tabela u bazi (entrypoint.sh pokreće createcachetable)
+# - LocMem samo za lokalni razvoj i testove (jedan proces)
+REDIS_URL = os.environ.get('REDIS_URL', '').strip()
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+            'KEY_PREFIX': 'isoqar',
+        }
+    }
+elif DATABASES['default']['ENGINE'] == 'django.db.backends.postgresql':
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+            'LOCATION': 'isoqar_cache',
+            'OPTIONS': {'MAX_ENTRIES': 20000},
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
@@ -166,13 +231,27 @@ USE_TZ = False  # Isključujemo Django-ovu podršku za vremenske zone
 
 # Static files (CSS, JavaScript, Images)
 STATIC_URL = '/static/'
-STATIC_ROOT = os.path.join(BASE_DIR, 'static')
-# STATICFILES_DIRS = [
-#     os.path.join(BASE_DIR, 'static'),
-# ]  # Zakomentirano jer STATIC_ROOT i STATICFILES_DIRS ne mogu biti isti
-
-# Konfiguracija za pravilne MIME tipove statičkih fajlova
-STATICFILES_STORAGE = 'django.contrib.staticfiles.storage.ManifestStaticFilesStorage'
+# Izvorni fajlovi (i static/dist/ koji gradi `npm run build`) su u static/,
+# a collectstatic ih sa heširanim imenima skuplja u STATIC_ROOT koji servira nginx
+STATICFILES_DIRS = [
+    os.path.join(BASE_DIR, 'static'),
+]
+STATIC_ROOT = os.environ.get('STATIC_ROOT', os.path.join(BASE_DIR, 'staticfiles'))
+
+# Heširana imena + .gz/.br varijante (isoqar_app/storage.py) su podrazumevane kada DEBUG nije uključen;
+# manifest postoji tek posle collectstatic-a, pa se u razvoju i testovima koriste izvorni fajlovi
+STATIC_MANIFEST = os.environ.get('STATIC_MANIFEST', str(not DEBUG)).lower() in ('true', '1', 'yes')
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': (
+            'isoqar_app.storage.CompressedManifestStaticFilesStorage' if STATIC_MANIFEST
+            else 'django.contrib.staticfiles.storage.StaticFilesStorage'
+        ),
+    },
+}
 
 # Definisanje MIME tipova za JavaScript fajlove
 import mimetypes
@@ -183,6 +262,59 @@ mimetypes.add_type("text/css", ".css", True)
 MEDIA_URL = 'media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
+# PDF izveštaji - keš gotovih fajlova (renderuje ih run_worker, vidi company/reports.py)
+REPORTS_ROOT = os.path.join(MEDIA_ROOT, 'reports')
+
+# Fajlovi otpremljeni za uvoz (admin/data-import/) dok ih run_worker ne obradi - van MEDIA_ROOT-a
+# jer nginx javno servira /media/; web i worker dele ovaj direktorijum (docker-compose.yml)
+IMPORT_UPLOAD_ROOT = os.environ.get('IMPORT_UPLOAD_ROOT', os.path.join(BASE_DIR, 'var', 'imports'))
+
+# Profilisanje SQL upita po zahtevu - za sve zahteve (SQL_PROFILING) ili preko X-SQL-Profile zaglavlja
+SQL_PROFILING = os.environ.get('SQL_PROFILING', 'False').lower() in ('true', '1', 'yes')
+SQL_PROFILING_BUFFER_SIZE = int(os.environ.get('SQL_PROFILING_BUFFER_SIZE', 200))
+
+# Prometheus metrike (/metrics) - zajednički direktorijum za sve procese (gunicorn workeri i run_worker)
+METRICS_ENABLED = os.environ.get('METRICS_ENABLED', 'True').lower() in ('true', '1', 'yes')
+METRICS_DIR = os.environ.get('METRICS_DIR', os.path.join(BASE_DIR, 'var', 'metrics'))
+METRICS_FLUSH_INTERVAL = float(os.environ.get('METRICS_FLUSH_INTERVAL', 1.0))
+# Ako je postavljen, /metrics zahteva zaglavlje "Authorization: Bearer <token>" (ili staff korisnika)
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN', '')
+
+# Provere spremnosti (/health/ready/) - vidi company/health_checks.py
+READINESS_CHECKS = ['database', 'migrations', 'cache', 'log_disk', 'job_queue']
+READINESS_CACHE_SECONDS = int(os.environ.get('READINESS_CACHE_SECONDS', 5))
+READINESS_DB_LATENCY_WARNING_MS = 200
+READINESS_MIN_FREE_DISK_MB = int(os.environ.get('READINESS_MIN_FREE_DISK_MB', 100))
+READINESS_MAX_QUEUE_AGE_SECONDS = 600
+
+# Analitika opterećenja auditora - trajanje keša jednog meseca (sekunde)
+ANALYTICS_CACHE_SECONDS = int(os.environ.get('ANALYTICS_CACHE_SECONDS', 3600))
+
+# Keš fragmenata stranica detalja kompanije/ciklusa (company/detail_cache.py); ključ se menja sa podacima,
+# pa vreme samo ograničava koliko dugo stari fragmenti zauzimaju keš
+FRAGMENT_CACHE_SECONDS = int(os.environ.get('FRAGMENT_CACHE_SECONDS', 24 * 3600))
+
+# Registar referentnih podataka (company/reference_data.py) - najduže vreme do osvežavanja u procesu
+# ako verzija ispadne iz deljenog keša ili keš nije deljen (LocMem); izmene se inače vide odmah
+REFERENCE_DATA_MAX_AGE = int(os.environ.get('REFERENCE_DATA_MAX_AGE', 300))
+# Koliko često proces proverava verziju registra u deljenom kešu (uz DatabaseCache svaka provera je upit)
+REFERENCE_DATA_VERSION_CHECK_SECONDS = float(os.environ.get('REFERENCE_DATA_VERSION_CHECK_SECONDS', 5))
+
+# Prognoza potražnje - deo radnih dana auditora koji realno ide na audite
+FORECAST_CAPACITY_SHARE = float(os.environ.get('FORECAST_CAPACITY_SHARE', 0.5))
+
+# Žive izmene kalendara (company/live_updates.py):
+# - LIVE_UPDATES_MODE='stream' - SSE tok, samo u ASGI profilu (docker-compose.asgi.yml)
+# - 'poll' (podrazumevano, WSGI) - kalendar na svakih LIVE_UPDATES_CLIENT_POLL_SECONDS pita ?since= endpoint
+# Za SSE: trajanje jedne veze, interval provere i koliko dugo se pamte promene
+LIVE_UPDATES_MODE = os.environ.get('LIVE_UPDATES_MODE', 'poll')
+LIVE_UPDATES_CLIENT_POLL_SECONDS = float(os.environ.get('LIVE_UPDATES_CLIENT_POLL_SECONDS', 15))
+LIVE_UPDATES_STREAM_SECONDS = int(os.environ.get('LIVE_UPDATES_STREAM_SECONDS', 30))
+LIVE_UPDATES_POLL_SECONDS = float(os.environ.get('LIVE_UPDATES_POLL_SECONDS', 2))
+# Koliko je star red dnevnika pre nego što ga kalendari čitaju (upis sa manjim id-jem može kasnije da se commit-uje)
+LIVE_UPDATES_COMMIT_GRACE_SECONDS = float(os.environ.get('LIVE_UPDATES_COMMIT_GRACE_SECONDS', 2))
+LIVE_UPDATES_RETENTION_SECONDS = int(os.environ.get('LIVE_UPDATES_RETENTION_SECONDS', 3600))
+
 # Documents files (PDF documentation)
 DOCUMENTS_URL = '/documents/'
 DOCUMENTS_ROOT = os.path.join(BASE_DIR, 'documents')
@@ -239,6 +371,8 @@ JAZZMIN_SETTINGS = {
     "topmenu_links": [
         {"name": "Početna", "url": "admin:index", "permissions": ["auth.view_user"]},
         {"model": "auth.User"},
+        {"name": "SQL profil", "url": "sql_profile", "permissions": ["auth.view_user"]},
+        {"name": "Uvoz podataka", "url": "data_import", "permissions": ["auth.view_user"]},
     ],
     "show_sidebar": True,
     "navigation_expanded": True,
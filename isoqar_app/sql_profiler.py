@@ -0,0 +1,185 @@
+"""
+Profilisanje SQL upita po zahtevu.
+
+QueryProfile se kači na sve konekcije preko connection.execute_wrapper i beleži
+broj upita, ukupno vreme u bazi, ponovljene upite (po "otisku" - SQL bez
+konkretnih vrednosti) i najsporije upite. Koristi ga SQLProfilingMiddleware
+(vidi isoqar_app/middleware.py), a rezultati poslednjih zahteva čuvaju se u
+RECENT_PROFILES (kružni bafer u memoriji procesa) i prikazuju na admin stranici
+/admin/sql-profile/.
+
+U testovima:
+
+    class CompanyViewsTests(QueryBudgetMixin, TestCase):
+        def test_list(self):
+            with self.assertQueryBudget(10):
+                self.client.get(reverse('company:list'))
+"""
+import re
+import threading
+import time
+from collections import Counter, deque
+from contextlib import ExitStack, asynccontextmanager, contextmanager
+from datetime import datetime
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import connections
+
+# Koliko ponovljenih i najsporijih upita se čuva po zahtevu
+TOP_STATEMENTS = 5
+
+_WHITESPACE_RE = re.compile(r'\s+')
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r'\b\d+(?:\.\d+)?\b')
+_IN_LIST_RE = re.compile(r"\bIN\s*\(\s*(?:%s|\?|'\?')(?:\s*,\s*(?:%s|\?|'\?'))*\s*\)", re.IGNORECASE)
+
+
+def fingerprint(sql):
+    """SQL bez konkretnih vrednosti - isti otisak imaju upiti koji se razlikuju samo po parametrima"""
+    sql = _WHITESPACE_RE.sub(' ', sql).strip()
+    sql = _STRING_RE.sub("'?'", sql)
+    sql = _NUMBER_RE.sub('?', sql)
+    return _IN_LIST_RE.sub('IN (...)', sql)
+
+
+@contextmanager
+def capture_queries(wrapper):
+    """execute_wrapper na svim konekcijama tekuće niti za vreme bloka"""
+    with ExitStack() as stack:
+        for conn in connections.all():
+            stack.enter_context(conn.execute_wrapper(wrapper))
+        yield
+
+
+@asynccontextmanager
+async def acapture_queries(wrapper):
+    """
+    Isto za async kod (ASGI). Async ORM izvršava upite u sync niti zahteva
+    (sync_to_async, thread_sensitive), pa se wrapper kači na konekcije te niti.
+    """
+    stack = ExitStack()
+
+    def enter():
+        for conn in connections.all():
+            stack.enter_context(conn.execute_wrapper(wrapper))
+
+    await sync_to_async(enter)()
+    try:
+        yield
+    finally:
+        await sync_to_async(stack.close)()
+
+
+class QueryProfile:
+    """Brojač upita za jedan zahtev (ili blok koda)"""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.fingerprints = Counter()
+        self.statements = []
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - start
+            self.count += 1
+            self.duration += elapsed
+            self.fingerprints[fingerprint(sql)] += 1
+            self.statements.append((elapsed, sql))
+
+    @contextmanager
+    def capture(self):
+        """Aktivira profil na svim konekcijama za vreme bloka"""
+        with capture_queries(self):
+            yield self
+
+    @asynccontextmanager
+    async def acapture(self):
+        async with acapture_queries(self):
+            yield self
+
+    @property
+    def duration_ms(self):
+        return round(self.duration * 1000, 2)
+
+    @property
+    def duplicate_count(self):
+        """Broj upita koji su ponavljanje nekog ranijeg otiska"""
+        return sum(count - 1 for count in self.fingerprints.values() if count > 1)
+
+    def duplicates(self, limit=TOP_STATEMENTS):
+        """Otisci koji su izvršeni više puta (tipično N+1), najčešći prvi"""
+        return [(sql, count) for sql, count in self.fingerprints.most_common(limit) if count > 1]
+
+    def slowest(self, limit=TOP_STATEMENTS):
+        return [(round(elapsed * 1000, 2), sql) for elapsed, sql in sorted(self.statements, reverse=True)[:limit]]
+
+    def server_timing(self):
+        """Vrednost Server-Timing zaglavlja (vidljivo u Network tabu browser-a)"""
+        return (
+            f'db;dur={self.duration_ms};desc="{self.count} SQL upita", '
+            f'dbdup;desc="{self.duplicate_count} ponovljenih"'
+        )
+
+    def as_dict(self, request=None, response=None, total_ms=None):
+        return {
+            'timestamp': datetime.now(),
+            'method': request.method if request is not None else '',
+            'path': request.get_full_path()[:300] if request is not None else '',
+            'status': response.status_code if response is not None else None,
+            'total_ms': total_ms,
+            'count': self.count,
+            'duplicate_count': self.duplicate_count,
+            'db_ms': self.duration_ms,
+            'duplicates': self.duplicates(),
+            'slowest': [(ms, sql[:1000]) for ms, sql in self.slowest()],
+        }
+
+
+class ProfileBuffer:
+    """Kružni bafer poslednjih profila (po procesu, bez baze)"""
+
+    def __init__(self, size):
+        self._items = deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def add(self, item):
+        with self._lock:
+            self._items.append(item)
+
+    def items(self):
+        """Najnoviji prvi"""
+        with self._lock:
+            return list(reversed(self._items))
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+
+RECENT_PROFILES = ProfileBuffer(getattr(settings, 'SQL_PROFILING_BUFFER_SIZE', 200))
+
+
+class QueryBudgetMixin:
+    """Mixin za TestCase: provera da endpoint ne prelazi zadati broj upita"""
+
+    @contextmanager
+    def assertQueryBudget(self, max_queries, max_duplicates=None):
+        profile = QueryProfile()
+        with profile.capture():
+            yield profile
+
+        details = '\n'.join(f'  {count}x {sql}' for sql, count in profile.duplicates())
+        self.assertLessEqual(
+            profile.count, max_queries,
+            f'Izvršeno {profile.count} upita, dozvoljeno {max_queries}.\nPonovljeni upiti:\n{details}'
+        )
+        if max_duplicates is not None:
+            self.assertLessEqual(
+                profile.duplicate_count, max_duplicates,
+                f'{profile.duplicate_count} ponovljenih upita, dozvoljeno {max_duplicates}.\n{details}'
+            )
@@ -0,0 +1,73 @@
+"""
+Statički fajlovi za produkciju: heširana imena + unapred kompresovane varijante.
+
+ManifestStaticFilesStorage u collectstatic-u kopira svaki fajl i pod imenom sa
+hešom sadržaja (js/calendar.3f2a9c1b.js), a {% static %} vraća to ime. Pošto se
+ime menja sa svakom izmenom sadržaja, nginx takve fajlove šalje sa
+"Cache-Control: immutable" i godinu dana keša (nginx/default.conf).
+
+Posle heširanja se za tekstualne fajlove upisuju i .gz i (ako je instaliran
+paket brotli) .br varijante, koje nginx šalje direktno preko gzip_static /
+brotli_static, bez kompresije po zahtevu.
+"""
+import gzip
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - opcioni paket
+    brotli = None
+
+COMPRESSIBLE_EXTENSIONS = ('.css', '.js', '.map', '.json', '.svg', '.txt', '.html', '.xml', '.ttf', '.eot')
+# Manji fajlovi ne dobijaju na kompresiji (zaglavlje i round-trip su veći od uštede)
+COMPRESS_MIN_SIZE = 1024
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    # Reference na nepostojeće fajlove (npr. izostavljene .map) ne ruše collectstatic,
+    # a {% static %} za fajl koji nije u manifestu vraća neheširano ime
+    manifest_strict = False
+
+    def stored_name(self, name):
+        try:
+            return super().stored_name(name)
+        except ValueError:
+            # Fajl ne postoji ni u STATIC_ROOT - URL ostaje isti kao bez manifesta (404 umesto 500)
+            return name
+
+    def url_converter(self, name, hashed_files, template=None):
+        convert = super().url_converter(name, hashed_files, template)
+
+        def converter(matchobj):
+            try:
+                return convert(matchobj)
+            except ValueError:
+                # url(...) ka fajlu koji ne postoji u vendor CSS-u ostaje neizmenjen
+                return matchobj.groupdict()['matched']
+
+        return converter
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run, **options)
+        if dry_run:
+            return
+        names = set(paths) | set(self.hashed_files.values())
+        for name in sorted(names):
+            if name.endswith(COMPRESSIBLE_EXTENSIONS) and self.exists(name):
+                self._write_compressed(name)
+
+    def _write_compressed(self, name):
+        path = self.path(name)
+        with open(path, 'rb') as f:
+            content = f.read()
+        if len(content) < COMPRESS_MIN_SIZE:
+            return
+
+        variants = [('.gz', gzip.compress(content, compresslevel=9, mtime=0))]
+        if brotli is not None:
+            variants.append(('.br', brotli.compress(content, quality=11)))
+        for suffix, compressed in variants:
+            if len(compressed) < len(content):
+                with open(path + suffix, 'wb') as f:
+                    f.write(compressed)
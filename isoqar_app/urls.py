@@ -18,9 +18,12 @@ from django.contrib import admin
 from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
+from django.contrib.staticfiles.urls import staticfiles_urlpatterns
 from django.views.generic.base import RedirectView, TemplateView
 from company.views import dashboard
-from company.health_views import health_check, readiness_check, liveness_check
+from company.health_views import health_check, readiness_check, liveness_check, metrics_view
+from company.import_views import data_import
+from company.profiling_views import sql_profile
 from massadmin import urls as massadmin_urls
 import nested_admin.views
 
@@ -34,7 +37,12 @@ urlpatterns = [
     path('health/', health_check, name='health_check'),
     path('health/ready/', readiness_check, name='readiness_check'),
     path('health/live/', liveness_check, name='liveness_check'),
+    path('metrics', metrics_view, name='metrics'),
     
+    # Profili SQL upita po zahtevu (SQLProfilingMiddleware)
+    path('admin/sql-profile/', sql_profile, name='sql_profile'),
+    # Uvoz podataka iz Excel/CSV fajlova kroz red poslova (run_worker)
+    path('admin/data-import/', data_import, name='data_import'),
     path('admin/', admin.site.urls),
     # Preusmeravanje za admin/company URL na admin/company/company/
     path('admin/company', RedirectView.as_view(url='/admin/company/company/'), name='admin-company-redirect'),
@@ -45,5 +53,5 @@ urlpatterns = [
     path('accounts/', include('accounts.urls')),
     # Debug stranica za testiranje JavaScript biblioteka
     path('debug/', TemplateView.as_view(template_name='debugging.html'), name='debug'),
-] + static(settings.STATIC_URL, document_root=settings.STATIC_ROOT) \
+] + staticfiles_urlpatterns() \
   + static(settings.DOCUMENTS_URL, document_root=settings.DOCUMENTS_ROOT)
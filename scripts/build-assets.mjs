@@ -0,0 +1,66 @@
+/**
+ * Gradi JS/CSS bundle-ove definisane u assets.json u static/dist/ (npm run build).
+ *
+ * Fajlovi svakog bundle-a se spajaju redom kojim ih je stranica ranije učitavala
+ * posebnim <script>/<link> tagovima i minifikuju esbuild-om kao obične skripte
+ * (bez `format`), tako da globalne funkcije i promenljive ostaju globalne kao i pre.
+ * Template tag {% bundle %} (company/templatetags/assets.py) koristi dist/<ime>
+ * kada postoji, a collectstatic mu dodaje heš u ime i .gz/.br varijante.
+ *
+ * `npm run build -- --no-minify` samo spaja fajlove (bez esbuild-a), za proveru
+ * bundle-ova na mašini bez instaliranih npm paketa.
+ */
+import { mkdir, readFile, rm, writeFile } from 'node:fs/promises';
+import path from 'node:path';
+import { fileURLToPath } from 'node:url';
+
+const ROOT = path.resolve(path.dirname(fileURLToPath(import.meta.url)), '..');
+const STATIC_DIR = path.join(ROOT, 'static');
+const DIST = 'dist';
+const MINIFY = !process.argv.includes('--no-minify');
+const { transform } = MINIFY ? await import('esbuild') : {};
+
+const SOURCE_MAP_COMMENT = /^[ \t]*\/[/*][#@] sourceMappingURL=.*$/gm;
+const CSS_URL = /url\(\s*(['"]?)([^'")]+)\1\s*\)/g;
+
+// url(...) u CSS-u je relativan na izvorni fajl, a bundle je u static/dist/
+function rebaseCssUrls(css, source) {
+  const sourceDir = path.posix.dirname(source);
+  return css.replace(CSS_URL, (match, quote, url) => {
+    if (/^(data:|[a-z]+:|\/|#)/i.test(url)) {
+      return match;
+    }
+    const rebased = path.posix.relative(DIST, path.posix.join(sourceDir, url));
+    return `url(${quote}${rebased}${quote})`;
+  });
+}
+
+async function buildBundle(name, sources) {
+  const loader = path.extname(name).slice(1);
+  const parts = [];
+  for (const source of sources) {
+    let code = await readFile(path.join(STATIC_DIR, source), 'utf8');
+    code = code.replace(SOURCE_MAP_COMMENT, '');
+    parts.push(loader === 'css' ? rebaseCssUrls(code, source) : code);
+  }
+
+  // Minifikovani izvori često nemaju završni ';' pa se fajlovi razdvajaju eksplicitno
+  const joined = parts.join(loader === 'js' ? '\n;\n' : '\n');
+  const result = MINIFY
+    ? await transform(joined, { loader, minify: true, legalComments: 'none', charset: 'utf8' })
+    : { code: joined, warnings: [] };
+  for (const warning of result.warnings) {
+    console.warn(`${name}: ${warning.text}`);
+  }
+
+  await writeFile(path.join(STATIC_DIR, DIST, name), result.code);
+  const kb = (bytes) => `${(bytes / 1024).toFixed(1)} KB`;
+  console.log(`${DIST}/${name}: ${sources.length} fajl(a), ${kb(Buffer.byteLength(joined))} -> ${kb(Buffer.byteLength(result.code))}`);
+}
+
+const bundles = JSON.parse(await readFile(path.join(ROOT, 'assets.json'), 'utf8'));
+await rm(path.join(STATIC_DIR, DIST), { recursive: true, force: true });
+await mkdir(path.join(STATIC_DIR, DIST), { recursive: true });
+for (const [name, sources] of Object.entries(bundles)) {
+  await buildBundle(name, sources);
+}
@@ -2780,7 +2780,7 @@ function showDateChangeConfirmationModal(event, newDate, callback) {
 }
 
 // Funkcija za ažuriranje datuma događaja na serveru
-// Opcioni 4. parametar: opts = { onSuccess: function(resp){}, onError: function(xhr, message){}}
+// Opcioni 4. parametar: opts = { version: 3, onSuccess: function(resp){}, onError: function(xhr, message){}}
 function updateEventDate(eventType, eventId, newDate, opts) {
   opts = opts || {};
   console.log('Ažuriranje datuma događaja na serveru:', {
@@ -2793,7 +2793,9 @@ function updateEventDate(eventType, eventId, newDate, opts) {
   const payload = {
     eventType: eventType,
     eventId: eventId,
-    newDate: (newDate instanceof Date) ? newDate.toISOString() : new Date(newDate).toISOString()
+    newDate: (newDate instanceof Date) ? newDate.toISOString() : new Date(newDate).toISOString(),
+    // Verzija koju je kalendar prikazao - server odbija izmenu (409) ako je događaj u međuvremenu menjan
+    version: opts.version
   };
   
   $.ajax({
@@ -2840,10 +2842,13 @@ function updateEventDate(eventType, eventId, newDate, opts) {
     // Pokušaj da pročitaš JSON odgovor sa greškama i prikažeš korisniku
     let serverMsg = null;
     let conflictsMsg = null;
+    let isStale = false;
     const isConflict = xhr && xhr.status === 409;
     try {
       const resp = xhr.responseJSON || JSON.parse(xhr.responseText || '{}');
       serverMsg = resp && (resp.error || resp.message);
+      // 409 bez konflikata: događaj je u međuvremenu izmenio drugi korisnik
+      isStale = !!(resp && resp.stale);
       // Ako imamo 409 i listu konflikata, formiraj detaljnu poruku za korisnika
       if (isConflict && resp && Array.isArray(resp.conflicts) && resp.conflicts.length > 0) {
         conflictsMsg = resp.conflicts.map(function(c) {
@@ -2862,7 +2867,7 @@ function updateEventDate(eventType, eventId, newDate, opts) {
       // Ignoriši parse grešku
     }
 
-    const title = isConflict ? 'Konflikt rezervacija' : 'Greška';
+    const title = isStale ? 'Događaj je izmenjen' : (isConflict ? 'Konflikt rezervacija' : 'Greška');
     const fallbackMsg = isConflict
       ? 'Auditor je već dodeljen za taj dan. Izaberite drugi datum.'
       : 'Došlo je do greške prilikom ažuriranja datuma događaja.';
@@ -2986,6 +2991,11 @@ function hideToast(toast) {
 function refreshCalendar() {
   try {
     // 1) Pokušaj preko globalne instance koju kreira calendar.html
+    if (typeof window !== 'undefined' && window.calendar && window.LiveCalendar && window.LiveCalendar.isLive(window.calendar)) {
+      // Promena stiže kao delta preko žive veze (static/js/live_calendar.js)
+      console.log('Kalendar se ažurira preko živih izmena');
+      return;
+    }
     if (typeof window !== 'undefined' && window.calendar && typeof window.calendar.refetchEvents === 'function') {
       console.log('Osvežavanje kalendara preko globalne calendar instance');
       window.calendar.refetchEvents();
@@ -0,0 +1,55 @@
+/**
+ * Lenje učitavanje opcija za velike padajuće liste (vidi company/select_options.py).
+ *
+ * Forma renderuje samo izabrane opcije; select2 ostale dohvata sa servera,
+ * stranu po stranu i uz pretragu, tek kada korisnik otvori listu:
+ *
+ *   <select class="lazy-select" data-options-url="/company/api/select-options/auditors/"
+ *           data-placeholder="Izaberite auditora">
+ *
+ *   LazySelect.initAll();                                  // svi .lazy-select na strani
+ *   LazySelect.init($('#standard_auditors'), {dropdownParent: $('#modal')});
+ */
+(function (window, $) {
+  'use strict';
+
+  var language = {
+    noResults: function () { return 'Nema rezultata'; },
+    searching: function () { return 'Pretraživanje...'; },
+    loadingMore: function () { return 'Učitavanje još rezultata...'; },
+    errorLoading: function () { return 'Greška pri učitavanju opcija.'; }
+  };
+
+  function init($selects, options) {
+    $selects.each(function () {
+      var $select = $(this);
+      if ($select.hasClass('select2-hidden-accessible')) {
+        $select.select2('destroy');
+      }
+      $select.select2($.extend({
+        theme: 'bootstrap4',
+        width: '100%',
+        placeholder: $select.data('placeholder') || '',
+        allowClear: !$select.prop('required'),
+        closeOnSelect: !$select.prop('multiple'),
+        language: language,
+        ajax: {
+          url: $select.data('options-url'),
+          dataType: 'json',
+          delay: 250,
+          cache: true,
+          data: function (params) {
+            return { q: params.term || '', page: params.page || 1 };
+          }
+        }
+      }, options || {}));
+    });
+    return $selects;
+  }
+
+  function initAll(root) {
+    return init($(root || document).find('select.lazy-select'));
+  }
+
+  window.LazySelect = { init: init, initAll: initAll };
+})(window, jQuery);
@@ -0,0 +1,164 @@
+/**
+ * Žive izmene kalendara (vidi company/live_updates.py): Server-Sent Events u ASGI profilu
+ * (mode: 'stream'), inače kratki ?since= upiti na svakih pollMs milisekundi (mode: 'poll').
+ *
+ * Server šalje koje su stavke promenjene ({"audits": [...], "appointments": [...], "visits": [...]}),
+ * a kalendar uklanja njihove događaje i dohvata samo njih iz feed-a, bez punog osvežavanja.
+ *
+ *   LiveCalendar.connect({
+ *     calendar: window.calendar,
+ *     mode: 'poll',                                                   // ili 'stream'
+ *     since: 123,                                                     // poslednja promena pri učitavanju
+ *     streamUrl: '/company/api/calendar/changes/?feed=calendar&since=123',
+ *     pollUrl: '/company/api/calendar/changes/poll/?feed=calendar',
+ *     pollMs: 15000,
+ *     eventsUrl: function () { return window.eventsApiUrl; },  // trenutni feed (sa filterom auditora)
+ *     params: { audits: 'audit', appointments: 'appointment' },   // polje delte -> GET parametar feed-a
+ *     matches: function (event, delta) { ... }                      // da li događaj pripada promenjenoj stavci
+ *   });
+ */
+(function (window) {
+  'use strict';
+
+  var connections = [];
+
+  function withParams(url, params) {
+    var query = Object.keys(params).map(function (key) {
+      return encodeURIComponent(key) + '=' + encodeURIComponent(params[key]);
+    }).join('&');
+    return url + (url.indexOf('?') >= 0 ? '&' : '?') + query;
+  }
+
+  function applyDelta(options, delta) {
+    var query = {};
+    Object.keys(options.params).forEach(function (field) {
+      var ids = delta[field] || [];
+      if (ids.length) {
+        query[options.params[field]] = ids.join(',');
+      }
+    });
+    if (!Object.keys(query).length) {
+      return Promise.resolve();
+    }
+
+    return fetch(withParams(options.eventsUrl(), query), {
+      credentials: 'same-origin',
+      headers: { 'Accept': 'application/json' }
+    })
+      .then(function (response) {
+        if (!response.ok) {
+          throw new Error('HTTP ' + response.status);
+        }
+        return response.json();
+      })
+      .then(function (events) {
+        var calendar = options.calendar;
+        // Dodati događaji pripadaju postojećem izvoru, pa ih sledeći refetchEvents zamenjuje (bez duplikata)
+        var source = calendar.getEventSources()[0];
+        calendar.batchRendering(function () {
+          calendar.getEvents().forEach(function (event) {
+            if (options.matches(event, delta)) {
+              event.remove();
+            }
+          });
+          events.forEach(function (data) {
+            calendar.addEvent(data, source);
+          });
+        });
+      })
+      .catch(function (error) {
+        console.warn('Žive izmene: delta nije primenjena, osvežavam ceo kalendar', error);
+        options.calendar.refetchEvents();
+      });
+  }
+
+  function connect(options) {
+    if (!options.calendar) {
+      return null;
+    }
+    if (options.mode !== 'stream' || !window.EventSource) {
+      return poll(options);
+    }
+
+    var stream = new EventSource(options.streamUrl);
+    // Delte se primenjuju redom, jedna po jedna
+    var queue = Promise.resolve();
+
+    stream.addEventListener('change', function (message) {
+      var delta = JSON.parse(message.data);
+      queue = queue.then(function () { return applyDelta(options, delta); });
+    });
+    stream.addEventListener('reset', function () {
+      queue = queue.then(function () { options.calendar.refetchEvents(); });
+    });
+
+    connections.push({ calendar: options.calendar, stream: stream });
+    return stream;
+  }
+
+  /** Poll režim (WSGI): jedan kratak zahtev na svakih pollMs, dok je stranica vidljiva */
+  function poll(options) {
+    var since = options.since;
+    var queue = Promise.resolve();
+    var timer = null;
+    var closed = false;
+
+    function schedule() {
+      if (!closed) {
+        timer = window.setTimeout(tick, options.pollMs || 15000);
+      }
+    }
+
+    function tick() {
+      if (document.hidden) {
+        schedule();
+        return;
+      }
+      fetch(withParams(options.pollUrl, { since: since }), {
+        credentials: 'same-origin',
+        headers: { 'Accept': 'application/json' }
+      })
+        .then(function (response) {
+          if (!response.ok) {
+            throw new Error('HTTP ' + response.status);
+          }
+          return response.json();
+        })
+        .then(function (result) {
+          since = result.last_id;
+          if (result.event === 'change') {
+            queue = queue.then(function () { return applyDelta(options, result.data); });
+          } else if (result.event === 'reset') {
+            queue = queue.then(function () { options.calendar.refetchEvents(); });
+          }
+        })
+        .catch(function (error) {
+          console.warn('Žive izmene: provera nije uspela', error);
+        })
+        .then(schedule);
+    }
+
+    schedule();
+    return {
+      close: function () {
+        closed = true;
+        window.clearTimeout(timer);
+      }
+    };
+  }
+
+  /**
+   * Da li kalendar dobija žive izmene odmah (otvorena SSE veza); tada posle sopstvene izmene nije
+   * potrebno puno osvežavanje. U poll režimu delta stiže tek posle pollMs, pa se kalendar osvežava.
+   */
+  function isLive(calendar) {
+    return connections.some(function (connection) {
+      return connection.calendar === calendar && connection.stream.readyState === EventSource.OPEN;
+    });
+  }
+
+  window.LiveCalendar = {
+    connect: connect,
+    isLive: isLive
+  };
+})(window);
@@ -0,0 +1,124 @@
+/**
+ * Pomoćne funkcije za modale na stranici kalendara (templates/calendar/calendar.html).
+ *
+ * Izdvojeno iz inline skripti template-a da bi se keširalo zajedno sa ostatkom
+ * bundle-a 'calendar.js' (assets.json). Redosled definicija je isti kao ranije:
+ * safeShowModal iz calendar.js i calendar_page.js ga nadjačavaju, a posle
+ * DOMContentLoaded sve varijante pokazuju na window.showModal.
+ */
+// Wait for DOM to be fully loaded before defining any functions or accessing DOM elements
+document.addEventListener('DOMContentLoaded', function () {
+  console.log('DOM fully loaded, initializing modal functions');
+  console.log('Bootstrap version check:', typeof bootstrap !== 'undefined' ? 'Available' : 'Not available');
+  if (typeof bootstrap !== 'undefined') {
+    console.log('Bootstrap Modal available:', typeof bootstrap.Modal !== 'undefined');
+  }
+
+  // Simple modal show function for Bootstrap 5
+  window.showModal = function (modalSelector) {
+    console.log('Showing modal using showModal function:', modalSelector);
+
+    try {
+      // Get the modal element
+      const modalElement = document.querySelector(modalSelector);
+      if (!modalElement) {
+        console.error('Modal element not found:', modalSelector);
+        return false;
+      }
+
+      // Bootstrap 5 - direct instantiation
+      if (typeof bootstrap !== 'undefined' && typeof bootstrap.Modal !== 'undefined') {
+        console.log('Using Bootstrap 5 Modal API');
+        const modal = new bootstrap.Modal(modalElement);
+        modal.show();
+        return true;
+      }
+
+      // jQuery fallback (for Bootstrap 4 or jQuery UI modals)
+      if (typeof $ !== 'undefined' && typeof $.fn.modal !== 'undefined') {
+        console.log('Using jQuery modal API');
+        $(modalSelector).modal('show');
+        return true;
+      }
+
+      // Manual fallback - last resort
+      console.log('Using manual DOM manipulation');
+      modalElement.classList.add('show');
+      modalElement.style.display = 'block';
+      document.body.classList.add('modal-open');
+      return true;
+    } catch (error) {
+      console.error('Error showing modal:', error);
+      // Ultra fallback
+      try {
+        const modalElement = document.querySelector(modalSelector);
+        modalElement.style.display = 'block';
+        return false;
+      } catch (e) {
+        console.error('Even ultra fallback failed:', e);
+        return false;
+      }
+    }
+  };
+
+  // Ensure all modal functions use the same implementation
+  window.forceShowModal = window.showModal;
+  window.safeShowModal = window.showModal;
+  console.log('Modal helper functions initialized');
+});
+
+// Pomoćna funkcija za sigurno otvaranje modala
+function safeShowModal(modalSelector) {
+  console.log('Showing modal:', modalSelector);
+
+  // Get backdrop and ensure it exists
+  const customBackdrop = document.getElementById('custom-modal-backdrop');
+  if (customBackdrop) {
+    customBackdrop.style.display = 'block';
+  }
+
+  // Remove any existing backdrops from Bootstrap
+  document.querySelectorAll('.modal-backdrop').forEach(b => b.remove());
+
+  // Get modal element
+  const modalElement = document.querySelector(modalSelector);
+  if (!modalElement) {
+    console.error('Modal element not found:', modalSelector);
+    return;
+  }
+
+  try {
+    // Try jQuery first (most compatible)
+    if (typeof $ !== 'undefined' && typeof $.fn.modal !== 'undefined') {
+      $(modalSelector).modal('show');
+      return;
+    }
+
+    // Try Bootstrap 5
+    if (typeof bootstrap !== 'undefined' && typeof bootstrap.Modal !== 'undefined') {
+      const modal = new bootstrap.Modal(modalElement);
+      modal.show();
+      return;
+    }
+
+    // Last resort manual approach
+    modalElement.classList.add('show');
+    modalElement.style.display = 'block';
+    document.body.classList.add('modal-open');
+  } catch (error) {
+    console.error('Error showing modal:', error);
+    // Ultra fallback
+    modalElement.classList.add('show');
+    modalElement.style.display = 'block';
+    if (customBackdrop) customBackdrop.style.display = 'block';
+  }
+}
+
+// Provera da li su sve komponente uspešno učitane
+document.addEventListener('DOMContentLoaded', function () {
+  if (typeof FullCalendar !== 'undefined') {
+    console.log('FullCalendar uspešno učitan:', FullCalendar.version);
+  } else {
+    console.error('FullCalendar nije uspešno učitan!');
+  }
+});
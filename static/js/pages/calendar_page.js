@@ -0,0 +1,1999 @@
+/**
+ * Inicijalizacija i rukovanje kalendarom (templates/calendar/calendar.html).
+ *
+ * Izdvojeno iz inline skripte template-a; vrednosti koje zavise od zahteva
+ * (URL-ovi, selectedAuditor, initialCalendarDate, window.calendarPageConfig)
+ * template i dalje postavlja pre učitavanja bundle-a 'calendar.js'.
+ */
+// Funkcija za formatiranje datuma
+function formatDate(dateString) {
+  if (!dateString) return 'Nije postavljen';
+  const date = new Date(dateString);
+  if (isNaN(date.getTime())) return 'Neispravan datum';
+
+  return date.toLocaleDateString('sr-RS', {
+    year: 'numeric',
+    month: '2-digit',
+    day: '2-digit'
+  });
+}
+
+// Funkcija za proveru dostupnosti Bootstrap JS biblioteke
+function isBootstrapAvailable() {
+  return (typeof $.fn.modal === 'function');
+}
+
+// Unapređena funkcija za sigurno otvaranje modala koja podržava i Bootstrap 4 i 5
+function safeShowModal(modalId) {
+  console.log('safeShowModal pozvan za:', modalId);
+
+  // Ukloni početni # ako postoji (za konzistentnost)
+  const modalIdClean = modalId.startsWith('#') ? modalId : '#' + modalId;
+
+  // Dohvati element modala
+  const modalElement = document.querySelector(modalIdClean);
+
+  if (!modalElement) {
+    console.error('Modal element nije pronađen:', modalIdClean);
+    return;
+  }
+
+  try {
+    // Pokušaj otvoriti modal koristeći Bootstrap 5 API
+    if (typeof bootstrap !== 'undefined' && typeof bootstrap.Modal === 'function') {
+      console.log('Korišćenje Bootstrap 5 API za prikazivanje modala');
+      const modal = bootstrap.Modal.getInstance(modalElement) || new bootstrap.Modal(modalElement);
+      modal.show();
+    }
+    // Pokušaj otvoriti modal koristeći jQuery API (Bootstrap 4 ili ranije)
+    else if (typeof $ === 'function' && typeof $.fn.modal === 'function') {
+      console.log('Korišćenje jQuery Bootstrap API za prikazivanje modala');
+      $(modalIdClean).modal('show');
+    }
+    // Ako ništa od toga ne radi, probaj osnovni pristup
+    else {
+      console.log('Korišćenje osnovnog pristupa za prikazivanje modala');
+      // Popravi potencijalne probleme sa stilovima
+      fixModalStyles(modalElement);
+
+      modalElement.style.display = 'block';
+      modalElement.classList.add('show');
+      document.body.classList.add('modal-open');
+
+      // Kreiraj backdrop ako ne postoji
+      let backdrop = document.querySelector('.modal-backdrop');
+      if (!backdrop) {
+        backdrop = document.createElement('div');
+        backdrop.className = 'modal-backdrop fade show';
+        document.body.appendChild(backdrop);
+      }
+    }
+  } catch (error) {
+    console.error('Greška pri otvaranju modala:', error);
+  }
+}
+
+// Funkcija za popravljanje stilova modala
+function fixModalStyles(modalElement) {
+  if (!modalElement) return;
+
+  // Osiguraj da modal ima ispravne klase
+  if (!modalElement.classList.contains('fade')) {
+    modalElement.classList.add('fade');
+  }
+
+  // Resetuj inline stilove koji bi mogli uzrokovati probleme
+  modalElement.style.paddingRight = '';
+  modalElement.style.overflow = '';
+
+  // Postavi z-index da bude ispred drugih elemenata
+  modalElement.style.zIndex = '1050';
+
+  // Ukloni aria-hidden="true" ako postoji
+  if (modalElement.getAttribute('aria-hidden') === 'true') {
+    modalElement.setAttribute('aria-hidden', 'false');
+  }
+}
+
+// Funkcija za otvaranje modala za detalje audit dana
+function openAuditDayModal(event) {
+  console.log('Opening audit day modal for event:', event);
+
+  // Detaljno logovanje event objekta za dijagnostiku
+  console.log('Event object details:');
+  console.log('- title:', event.title);
+  console.log('- id:', event.id);
+  console.log('- start:', event.start);
+  console.log('- end:', event.end);
+  console.log('- extendedProps:', event.extendedProps);
+
+  try {
+    // Prikaži modal sigurno
+    safeShowModal('#auditDayModal');
+
+    // Postavi učitavanje za sva polja
+    $('#audit-day-date').text('Učitavanje...');
+    $('#audit-day-is-planned').text('Učitavanje...');
+    $('#audit-day-is-actual').text('Učitavanje...');
+    $('#audit-day-notes').text('Učitavanje...');
+    $('#audit-day-audit-id').text('Učitavanje...');
+
+    // Dobavi podatke iz event objekta s više mogućih izvora
+    const eventProps = event.extendedProps || {};
+    // Pokušaj odmah izvući ID audit dana iz eventa
+    const auditDayIdFromEvent = eventProps.audit_day_id || null;
+
+    // Pokušaj izvući ID audita iz više mogućih izvora
+    const auditId = eventProps.audit_id ||
+      eventProps.id ||
+      (event.id ? event.id.toString().split('_').pop() : null) ||
+      (eventProps.url ? eventProps.url.split('/').filter(Boolean).pop() : null);
+
+    console.log('Extracted Audit ID:', auditId);
+
+    if (!auditId) {
+      console.error('Nije pronađen ID audita u event objektu');
+      $('#audit-day-date').text('Greška: Nije pronađen ID audita');
+      return;
+    }
+
+    // Koristimo audit_id za dobavljanje audit_day_id preko AJAX-a
+    const ajaxUrl = `/company/api/audit-days/by-audit/${auditId}/`;
+    console.log('AJAX URL for audit day data:', ajaxUrl);
+
+    $.ajax({
+      url: ajaxUrl,
+      dataType: 'json',
+      timeout: 10000, // 10 sekundi timeout
+      beforeSend: function () {
+        console.log('Sending AJAX request for audit day data...');
+      },
+      success: function (data) {
+        console.log('Audit day data received:', data);
+        let selectedAuditDayId = auditDayIdFromEvent;
+        let selectedAuditDay = null;
+
+        try {
+          const auditData = (data && data.audit) ? data.audit : null;
+          const days = (auditData && Array.isArray(auditData.audit_days)) ? auditData.audit_days : [];
+
+          // Popuni opšte podatke o auditu
+          if (auditData) {
+            $('#audit-company').text(auditData.company_name || 'N/A');
+            $('#audit-type').text(auditData.audit_type_display || auditData.audit_type || 'N/A');
+            $('#audit-status').text(auditData.audit_status_display || auditData.audit_status || 'N/A');
+            $('#audit-planned-date').text(auditData.planned_date ? formatDate(auditData.planned_date) : 'N/A');
+            $('#audit-actual-date').text(auditData.actual_date ? formatDate(auditData.actual_date) : 'N/A');
+          }
+
+          if (!selectedAuditDayId) {
+            const eventDateStr = event.start ? event.start.toISOString().slice(0, 10) : null;
+            if (eventDateStr) {
+              // Pokušaj prvo da pronađeš po datumu i statusu (planirano/održano)
+              selectedAuditDay = days.find(d => (d.date || '').startsWith(eventDateStr) && ((eventProps.auditStatus === 'planned' && d.is_planned) || (eventProps.auditStatus === 'completed' && d.is_actual)))
+                || days.find(d => (d.date || '').startsWith(eventDateStr))
+                || null;
+              if (selectedAuditDay) {
+                selectedAuditDayId = selectedAuditDay.id;
+              }
+            }
+          } else {
+            selectedAuditDay = days.find(d => d.id === selectedAuditDayId) || null;
+          }
+
+          // Ako smo pronašli konkretan dan, osveži napomene i status
+          if (selectedAuditDay) {
+            if (selectedAuditDay.notes) {
+              eventProps.notes = selectedAuditDay.notes;
+            }
+            if (selectedAuditDay.is_actual) {
+              eventProps.auditStatus = 'completed';
+            } else if (selectedAuditDay.is_planned) {
+              eventProps.auditStatus = 'planned';
+            }
+          }
+        } catch (parseErr) {
+          console.error('Greška prilikom obrade podataka audit dana:', parseErr);
+        }
+
+        // Ažuriraj modal čak i ako nije pronađen precizan ID (link za izmenu će izostati)
+        updateAuditDayModal(selectedAuditDayId, auditId, event, eventProps);
+
+        if (!selectedAuditDayId) {
+          console.warn('Nije moguće utvrditi ID audit dana iz odgovora');
+          $('#audit-day-date').text(formatDate(event.start) || 'N/A');
+          $('#audit-day-notes').text(eventProps.notes || 'Nema napomena');
+        }
+      },
+      error: function (xhr, status, error) {
+        console.error('Greška prilikom dohvatanja podataka o audit danu:', error);
+        // Fallback: prikaži podatke iz eventa
+        $('#audit-day-date').text(formatDate(event.start) || 'N/A');
+        $('#audit-day-is-planned').text(eventProps.auditStatus === 'planned' ? 'Da' : 'Ne');
+        $('#audit-day-is-actual').text(eventProps.auditStatus === 'completed' ? 'Da' : 'Ne');
+        $('#audit-day-notes').text(eventProps.notes || 'Nema napomena');
+        // Fallback za opšte podatke
+        $('#audit-company').text('N/A');
+        $('#audit-type').text('N/A');
+        $('#audit-status').text(eventProps.auditStatus || 'N/A');
+        $('#audit-planned-date').text('N/A');
+        $('#audit-actual-date').text('N/A');
+      }
+    });
+
+    // Funkcija za ažuriranje audit day modala nakon dobijanja ID-a
+    function updateAuditDayModal(auditDayId, auditId, event, eventProps) {
+      // Popuni osnovne podatke iz event objekta
+      $('#audit-day-date').text(formatDate(event.start) || 'N/A');
+      $('#audit-day-is-planned').text(eventProps.auditStatus === 'planned' ? 'Da' : 'Ne');
+      $('#audit-day-is-actual').text(eventProps.auditStatus === 'completed' ? 'Da' : 'Ne');
+      $('#audit-day-notes').text(eventProps.notes || 'Nema napomena');
+
+      // Postavi URL za dugme za izmenu audit dana
+      $('#editAuditDayBtn').off('click').on('click', function () {
+        if (auditDayId) {
+          const auditDayUrl = `/company/audit-days/${auditDayId}/update/`;
+          console.log('Navigating to audit day update URL:', auditDayUrl);
+          window.location.href = auditDayUrl;
+        } else {
+          alert('ID audit dana nije dostupan.');
+        }
+      });
+
+      // Omogući/onesposobi dugme za izmenu na osnovu dostupnosti ID-a
+      if (auditDayId) {
+        $('#editAuditDayBtn').prop('disabled', false);
+      } else {
+        $('#editAuditDayBtn').prop('disabled', true);
+      }
+    }
+  } catch (e) {
+    console.error('Greška pri otvaranju AuditDay modala:', e);
+  }
+}
+
+// Helper: centralizovani prikaz grešaka u kalendaru preko Bootstrap modala
+function showErrorModal(title, message, details) {
+  try {
+    if (title) {
+      $('#calendarErrorModalLabel').text(title);
+    }
+    $('#calendarErrorModalMessage').text(message || 'Došlo je do greške.');
+
+    if (details) {
+      $('#calendarErrorDetailsWrapper').show();
+      // Ograniči veoma dugačke detalje
+      var content = String(details);
+      if (content.length > 2000) {
+        content = content.substring(0, 2000) + '\n… (skraćeno)';
+      }
+      $('#calendarErrorModalDetailsContent').text(content);
+    } else {
+      $('#calendarErrorDetailsWrapper').hide();
+      $('#calendarErrorModalDetailsContent').text('');
+    }
+
+    // Prikaži modal sigurno (podržani BS5/BS4 fallbackovi su u safeShowModal)
+    if (typeof safeShowModal === 'function') {
+      safeShowModal('#calendarErrorModal');
+    } else if (window.bootstrap && window.bootstrap.Modal) {
+      var modalEl = document.getElementById('calendarErrorModal');
+      var bsModal = new bootstrap.Modal(modalEl);
+      bsModal.show();
+    } else {
+      // Fallback u krajnjoj nuždi
+      alert((title ? (title + ': ') : '') + (message || '') + (details ? ('\n\nDetalji: ' + details) : ''));
+    }
+  } catch (err) {
+    console.error('Greška pri prikazu error modala:', err);
+    alert((title ? (title + ': ') : '') + (message || '') + (details ? ('\n\nDetalji: ' + details) : ''));
+  }
+}
+
+// Funkcija za otvaranje modala za detalje certifikacionog ciklusa
+function openCycleAuditModal(event) {
+  console.log('Opening cycle audit modal for event:', event);
+
+  // Detaljno logovanje event objekta za dijagnostiku
+  console.log('Event object details:');
+  console.log('- title:', event.title);
+  console.log('- id:', event.id);
+  console.log('- start:', event.start);
+  console.log('- end:', event.end);
+  console.log('- extendedProps:', event.extendedProps);
+
+  try {
+    // Prikaži modal sigurno
+    safeShowModal('#cycleAuditModal');
+
+    // Postavi učitavanje za sva polja
+    $('#cycle-company').text('Učitavanje...');
+    $('#cycle-audit-type').text('Učitavanje...');
+    $('#cycle-status').text('Učitavanje...');
+    $('#cycle-planned-date').text('Učitavanje...');
+    $('#cycle-actual-date').text('Učitavanje...');
+    $('#cycle-id').text('Učitavanje...');
+    $('#cycle-start-date').text('Učitavanje...');
+    $('#cycle-cycle-status').text('Učitavanje...');
+    $('#cycle-notes').text('Učitavanje...');
+    // Lead auditor placeholder
+    $('#lead-auditor-name').text('Učitavanje...');
+    // Audit team placeholder
+    $('#audit-team-list').html('<li><em>Učitavanje...</em></li>');
+
+    // Dobavi podatke iz event objekta s više mogućih izvora
+    const eventProps = event.extendedProps || {};
+
+    // Stabilan ID ciklusa – dolazi iz extendedProps
+    const cycleId = eventProps.cycle_id || eventProps.certification_cycle_id || null;
+    // Stabilan ID audita – koristi se za edit dugme
+    // Pokušaji redom: extendedProps.audit_id, extendedProps.auditId, extendedProps.id (ako izgleda kao broj),
+    // pa ekstrakcija prve numeričke sekvence iz event.id
+    let auditId = null;
+    if (eventProps.audit_id) {
+      auditId = eventProps.audit_id;
+    } else if (eventProps.auditId) {
+      auditId = eventProps.auditId;
+    } else if (eventProps.id && /^\d+$/.test(String(eventProps.id))) {
+      auditId = String(eventProps.id);
+    } else if (event && event.id) {
+      const match = String(event.id).match(/\d+/);
+      if (match) auditId = match[0];
+    }
+
+    console.log('Extracted Cycle ID:', cycleId);
+    console.log('Extracted Audit ID:', auditId);
+    console.log('Original Event ID:', event.id);
+
+    if (!cycleId) {
+      console.error('Nije pronađen ID ciklusa u event objektu');
+      $('#cycle-company').text('Greška: Nije pronađen ID ciklusa');
+      try {
+        var d = {
+          event_id: String(event && event.id || ''),
+          extended_props: JSON.stringify(event && event.extendedProps || {})
+        };
+        showErrorModal('Nedostaje ID ciklusa', 'Nije moguće otvoriti detalje ciklusa jer nedostaje ID ciklusa.', 'Event ID: ' + d.event_id + '\nExtended props: ' + d.extended_props);
+      } catch (ee) { /* noop */ }
+      return;
+    }
+
+    // Popuni osnovne podatke iz event objekta
+    $('#cycle-company').text(eventProps.company || 'N/A');
+    $('#cycle-audit-type').text(eventProps.type || 'N/A');
+    $('#cycle-status').text(eventProps.status || 'N/A');
+    $('#cycle-id').text(cycleId || 'N/A');
+    $('#cycle-notes').text(eventProps.notes || 'Nema napomena');
+
+    // Dugme: pregled ciklusa
+    $('#viewCycleBtn').off('click').on('click', function () {
+      const cycleUrl = `/company/cycles/${cycleId}/`;
+      // Potpuno zatvori modal pre navigacije
+      $('#cycleAuditModal').modal('hide');
+      // Ukloni backdrop i modal-open klasu
+      $('.modal-backdrop').remove();
+      $('body').removeClass('modal-open');
+      $('body').css('padding-right', '');
+      // Navigacija na stranicu sa detaljima ciklusa
+      window.location.href = cycleUrl;
+    });
+
+    // Dugme: izmena audita u okviru ciklusa
+    $('#editCycleAuditBtn').off('click').on('click', function () {
+      if (auditId) {
+        // Dobijamo trenutni prikaz kalendara
+        const currentDate = calendar.getDate();
+        const currentMonth = currentDate.getMonth() + 1; // getMonth() vraća 0-11
+        const currentYear = currentDate.getFullYear();
+
+        const auditUrl = `/company/audits/${auditId}/update/?calendar_month=${currentMonth}&calendar_year=${currentYear}`;
+        console.log('Navigating to audit update URL with calendar params:', auditUrl);
+
+        // Potpuno zatvori modal pre navigacije
+        $('#cycleAuditModal').modal('hide');
+        // Ukloni backdrop i modal-open klasu
+        $('.modal-backdrop').remove();
+        $('body').removeClass('modal-open');
+        $('body').css('padding-right', '');
+
+        window.location.href = auditUrl;
+      } else {
+        showErrorModal('Nedostaje ID audita', 'ID audita nije dostupan za ovaj događaj.');
+      }
+    });
+
+    // Proveri da li je URL za dohvatanje podataka o ciklusu dostupan
+    if (!certificationCycleJsonUrl) {
+      console.error('certificationCycleJsonUrl nije definisan');
+      $('#cycle-start-date').text('Greška: URL nije dostupan');
+      $('#cycle-cycle-status').text('Greška: URL nije dostupan');
+      showErrorModal('Interna greška konfiguracije', 'URL za čitanje podataka o ciklusu nije definisan. Kontaktirajte administratora.');
+      return;
+    }
+
+    const ajaxBase = certificationCycleJsonUrl.replace('0', cycleId);
+    const ajaxUrl = auditId ? `${ajaxBase}?audit_id=${encodeURIComponent(auditId)}` : ajaxBase;
+    console.log('AJAX URL for cycle data:', ajaxUrl);
+
+    // Dohvati dodatne podatke o ciklusu preko AJAX-a
+    $.ajax({
+      url: ajaxUrl,
+      dataType: 'json',
+      timeout: 10000, // 10 sekundi timeout
+      beforeSend: function () {
+        console.log('Sending AJAX request for cycle data...');
+      },
+      success: function (data) {
+        console.log('Cycle data received:', data);
+
+        if (data && data.cycle) {
+          try {
+            // Ažuriraj osnovne podatke iz backend-a
+            if (data.cycle.company_name) {
+              $('#cycle-company').text(data.cycle.company_name);
+            }
+            if (typeof data.cycle.notes !== 'undefined') {
+              $('#cycle-notes').text(data.cycle.notes || 'Nema napomena');
+            }
+
+            // Popuni podatke o ciklusu
+            $('#cycle-start-date').text(formatDate(data.cycle.planirani_datum));
+
+            // Proveri da li postoji status_display, ako ne, koristi status direktno
+            if (data.cycle.status_display) {
+              $('#cycle-cycle-status').text(data.cycle.status_display);
+            } else if (data.cycle.status) {
+              // Mapiraj status na čitljiv tekst
+              const statusMap = {
+                'active': 'Aktivan',
+                'completed': 'Završen',
+                'cancelled': 'Otkazan'
+              };
+              $('#cycle-cycle-status').text(statusMap[data.cycle.status] || data.cycle.status);
+            } else {
+              $('#cycle-cycle-status').text('N/A');
+            }
+
+            // Popuni podatke o auditu
+            if (data.audit) {
+              console.log('Audit iz API-ja:', data.audit);
+              console.log('Lead auditor iz API-ja:', data.audit.lead_auditor);
+              console.log('Audit team iz API-ja:', data.audit.audit_team);
+              // Ažuriraj tip i status audita iz backend-a
+              if (data.audit.audit_type_display || data.audit.audit_type) {
+                $('#cycle-audit-type').text(data.audit.audit_type_display || data.audit.audit_type);
+              }
+              if (data.audit.audit_status_display || data.audit.audit_status) {
+                $('#cycle-status').text(data.audit.audit_status_display || data.audit.audit_status);
+              }
+              $('#cycle-planned-date').text(formatDate(data.audit.planned_date) || 'Nije postavljen');
+              $('#cycle-actual-date').text(formatDate(data.audit.actual_date) || 'Nije postavljen');
+              // Vodeći auditor
+              if (data.audit.lead_auditor && data.audit.lead_auditor.ime_prezime) {
+                $('#lead-auditor-name').text(data.audit.lead_auditor.ime_prezime);
+              } else {
+                $('#lead-auditor-name').text('Nije dodeljen');
+              }
+              // Tim auditora
+              if (Array.isArray(data.audit.audit_team) && data.audit.audit_team.length) {
+                const items = data.audit.audit_team.map(function (m) {
+                  return '<li>' + (m.ime_prezime || 'Nepoznato') + '</li>';
+                }).join('');
+                $('#audit-team-list').html(items);
+              } else {
+                $('#audit-team-list').html('<li><em>Nema dodeljenih članova</em></li>');
+              }
+            } else {
+              console.warn('Nema podataka o auditu u odgovoru');
+              $('#cycle-planned-date').text('Nije dostupno');
+              $('#cycle-actual-date').text('Nije dostupno');
+              $('#cycle-audit-type').text('Nije dostupno');
+              $('#cycle-status').text('Nije dostupno');
+              $('#lead-auditor-name').text('Nije dostupno');
+              $('#audit-team-list').html('<li><em>Nije dostupno</em></li>');
+            }
+          } catch (e) {
+            console.error('Greška pri popunjavanju podataka o ciklusu:', e);
+            $('#cycle-start-date').text('Greška pri obradi podataka');
+            $('#cycle-cycle-status').text('Greška pri obradi podataka');
+          }
+        } else {
+          console.error('Nema podataka o ciklusu u odgovoru');
+          $('#cycle-start-date').text('Nije dostupno');
+          $('#cycle-cycle-status').text('Nije dostupno');
+          $('#lead-auditor-name').text('Nije dostupno');
+          $('#audit-team-list').html('<li><em>Nije dostupno</em></li>');
+        }
+      },
+      error: function (xhr, status, error) {
+        console.error('Greška prilikom dohvatanja podataka o ciklusu:', error);
+        console.error('Status:', status);
+        console.error('Response text:', xhr.responseText);
+
+        let errorMsg = 'Greška prilikom dohvatanja podataka';
+
+        try {
+          const response = JSON.parse(xhr.responseText);
+          if (response && response.error) {
+            errorMsg = response.error;
+          }
+        } catch (e) {
+          console.error('Greška prilikom parsiranja odgovora:', e);
+        }
+
+        $('#cycle-start-date').text('Greška');
+        $('#cycle-cycle-status').text('Greška');
+        $('#lead-auditor-name').text('Greška');
+        $('#audit-team-list').html('<li><em>Greška</em></li>');
+        var details = 'Status: ' + (status || 'N/A') + '\n' +
+          'HTTP: ' + (xhr.status || 'N/A') + ' ' + (xhr.statusText || '') + '\n' +
+          'Detalji: ' + (errorMsg || '') + (xhr.responseText ? ('\nOdgovor servera: ' + String(xhr.responseText).substring(0, 800)) : '');
+        showErrorModal('Greška prilikom dohvatanja podataka o ciklusu', 'Nismo uspeli da učitamo podatke o ciklusu. Pokušajte ponovo.', details);
+      }
+    });
+  } catch (e) {
+    console.error('Greška pri otvaranju CycleAudit modala:', e);
+  }
+}
+
+// Funkcija za dobijanje CSRF tokena
+function getCookie(name) {
+  let cookieValue = null;
+  if (document.cookie && document.cookie !== '') {
+    const cookies = document.cookie.split(';');
+    for (let i = 0; i < cookies.length; i++) {
+      const cookie = cookies[i].trim();
+      if (cookie.substring(0, name.length + 1) === (name + '=')) {
+        cookieValue = decodeURIComponent(cookie.substring(name.length + 1));
+        break;
+      }
+    }
+  }
+  return cookieValue;
+}
+
+// Funkcija za otvaranje modala za detalje termina
+function openAppointmentModal(event) {
+  try {
+    console.log('Opening appointment modal for event:', event);
+
+    // Detaljno logovanje event objekta za dijagnostiku
+    console.log('Event object details:');
+    console.log('- title:', event.title);
+    console.log('- id:', event.id);
+    console.log('- start:', event.start);
+    console.log('- end:', event.end);
+    console.log('- extendedProps:', event.extendedProps);
+
+    // Attempt to extract appointment ID from event with more fallbacks
+    const appointmentId = event.extendedProps?.appointment_id ||
+      event.extendedProps?.id ||
+      event.id ||
+      (event.extendedProps?.url ? event.extendedProps.url.split('/').filter(Boolean).pop() : null);
+
+    console.log('Extracted Appointment ID:', appointmentId);
+
+    // Set loading placeholders
+    document.getElementById('appointment-title').textContent = 'Učitavanje...';
+    document.getElementById('appointment-company').textContent = 'Učitavanje...';
+    document.getElementById('appointment-type').textContent = 'Učitavanje...';
+    document.getElementById('appointment-start').textContent = 'Učitavanje...';
+    document.getElementById('appointment-end').textContent = 'Učitavanje...';
+    document.getElementById('appointment-location').textContent = 'Učitavanje...';
+    document.getElementById('appointment-status').textContent = 'Učitavanje...';
+    document.getElementById('appointment-contacts').textContent = 'Učitavanje...';
+    document.getElementById('appointment-description').textContent = 'Učitavanje...';
+
+    if (!appointmentId) {
+      document.getElementById('appointment-title').textContent = 'Greška: Nije pronađen ID termina';
+      document.getElementById('appointment-company').textContent = 'Učitavanje...';
+      document.getElementById('appointment-type').textContent = 'Učitavanje...';
+      document.getElementById('appointment-start').textContent = 'Učitavanje...';
+      document.getElementById('appointment-end').textContent = 'Učitavanje...';
+      document.getElementById('appointment-location').textContent = 'Učitavanje...';
+      document.getElementById('appointment-status').textContent = 'Učitavanje...';
+      document.getElementById('appointment-contacts').textContent = 'Učitavanje...';
+      document.getElementById('appointment-description').textContent = 'Učitavanje...';
+      return;
+    }
+
+    // Fetch appointment data (implement this according to your backend API)
+    // For now, let's just populate with data from the event
+    document.getElementById('appointment-title').textContent = event.title || 'Nema naslova';
+    document.getElementById('appointment-company').textContent = event.extendedProps?.company || 'Nepoznata kompanija';
+    document.getElementById('appointment-type').textContent = event.extendedProps?.type || event.extendedProps?.appointmentType || 'Sastanak';
+    document.getElementById('appointment-start').textContent = formatDate(event.start) || 'Nepoznato';
+    document.getElementById('appointment-end').textContent = formatDate(event.end) || 'Nepoznato';
+    document.getElementById('appointment-location').textContent = event.extendedProps?.location || 'Nije navedeno';
+    document.getElementById('appointment-status').textContent = event.extendedProps?.status || 'Zakazano';
+    document.getElementById('appointment-contacts').textContent = event.extendedProps?.contacts || 'Nema kontakata';
+    document.getElementById('appointment-description').textContent = event.extendedProps?.description || 'Nema opisa';
+
+    // Set up the edit button directly with a href attribute
+    const editButton = document.getElementById('editAppointmentBtn');
+
+    // Set up data and href attributes for the edit button
+    const editUrl = `/company/appointments/${appointmentId}/update/`;
+
+    // Convert the button to a proper link that looks like a button
+    const editLink = document.createElement('a');
+    editLink.setAttribute('id', 'editAppointmentBtn');
+    editLink.setAttribute('href', editUrl);
+    editLink.setAttribute('class', editButton.getAttribute('class'));
+    editLink.setAttribute('data-bs-dismiss', 'modal'); // Add this to close the modal
+    editLink.textContent = 'Izmeni';
+    editLink.style.textDecoration = 'none';
+
+    // Replace the button with the link
+    editButton.parentNode.replaceChild(editLink, editButton);
+
+    // Log the change
+    console.log('Set up edit link to URL:', editUrl);
+  } catch (e) {
+    console.error('Greška pri otvaranju Appointment modala:', e);
+  }
+}
+// Duplikat openAuditDayModal funkcije je uklonjen
+
+// Funkcija za osvežavanje kalendara
+function refreshCalendar() {
+  if (window.calendar && LiveCalendar.isLive(window.calendar)) {
+    // Promena stiže kao delta preko žive veze
+    console.log('Kalendar se ažurira preko živih izmena');
+  } else if (window.calendar) {
+    console.log('Osvežavanje kalendara...');
+    window.calendar.refetchEvents();
+  } else {
+    console.warn('Kalendar nije dostupan za osvežavanje');
+  }
+}
+
+// Funkcija za prikazivanje modala za potvrdu promene datuma
+function showDateChangeConfirmationModal(event, newDate, callback) {
+  // Formatiranje datuma za prikaz
+  const formattedDate = newDate.toLocaleDateString('sr-RS', {
+    year: 'numeric',
+    month: '2-digit',
+    day: '2-digit',
+    hour: '2-digit',
+    minute: '2-digit'
+  });
+
+  // Priprema teksta za modal u zavisnosti od tipa događaja
+  const eventType = (event.extendedProps && (event.extendedProps.eventType || event.extendedProps.type)) || null;
+  let title, message, eventTitle;
+
+  // Dobijanje naslova događaja za prikaz u modalu
+  eventTitle = event.title || 'Događaj';
+
+  if (eventType === 'audit_day') {
+    title = 'Promena datuma audit dana';
+    message = `Da li ste sigurni da želite da promenite datum audit dana na ${formattedDate}?`;
+  } else if (eventType === 'cycle_audit') {
+    title = 'Promena planiranog datuma audita';
+    message = `Da li ste sigurni da želite da promenite datum audita na ${formattedDate}?`;
+  } else if (eventType === 'appointment') {
+    title = 'Promena datuma sastanka';
+    message = `Da li ste sigurni da želite da promenite datum sastanka "${eventTitle}" na ${formattedDate}?`;
+  } else {
+    title = 'Promena datuma događaja';
+    message = `Da li ste sigurni da želite da promenite datum događaja na ${formattedDate}?`;
+  }
+
+  // Koristi SweetAlert2 za lepši i moderniji prikaz modala
+  if (typeof Swal !== 'undefined') {
+    // Koristi SweetAlert2 ako je dostupan
+    Swal.fire({
+      title: title,
+      html: message,
+      icon: 'question',
+      showCancelButton: true,
+      confirmButtonText: 'Potvrdi',
+      cancelButtonText: 'Otkaži',
+      confirmButtonColor: '#3085d6',
+      cancelButtonColor: '#d33',
+      focusCancel: true,
+      allowOutsideClick: false,
+      allowEscapeKey: false
+    }).then((result) => {
+      if (result.isConfirmed) {
+        if (typeof callback === 'function') {
+          callback(true);
+        }
+      } else {
+        if (typeof callback === 'function') {
+          callback(false);
+        }
+      }
+    });
+  } else {
+    // Fallback na standardni confirm dijalog ako SweetAlert2 nije dostupan
+    const confirmed = confirm(title + '\n\n' + message);
+    if (typeof callback === 'function') {
+      callback(confirmed);
+    }
+  }
+}
+
+function initializeCalendar() {
+  console.log('Pokretanje inicijalizacije kalendara (v6.1.18)...');
+
+  // Provera da li je jQuery dostupan
+  if (typeof jQuery === 'undefined') {
+    console.error('jQuery nije dostupan!');
+    return;
+  }
+
+  // Provera da li je FullCalendar dostupan
+  if (typeof FullCalendar === 'undefined') {
+    console.error('FullCalendar nije dostupan!');
+    return;
+  }
+
+  // Provera da li postoji element kalendara
+  var calendarEl = document.getElementById('calendar');
+  if (!calendarEl) {
+    console.error('Element kalendara ne postoji!');
+    return;
+  }
+
+  console.log('Inicijalizacija kalendara...');
+
+  // Inicijalizacija kalendara - za verziju 6.1.18
+  try {
+    // Pripremi kalendar konfiguraciju
+    var calendarConfig = {
+      locale: 'sr',
+      initialView: window.calendarPageConfig.initialView,
+      height: 'auto',
+      dayMaxEvents: 4,  // Prikaži max 4 događaja po danu, ostali idu u "+more" link
+      moreLinkClick: 'popover',  // Klik na "+more" otvara popover sa svim događajima
+      headerToolbar: {
+        left: 'prev,next today',
+        center: 'title',
+        right: 'multiMonthYear,dayGridMonth,timeGridWeek,timeGridDay'
+      },
+      buttonText: {
+        today: 'Danas',
+        year: 'Godina',
+        month: 'Mesec',
+        week: 'Nedelja',
+        day: 'Dan',
+        list: 'Lista'
+      },
+      // U bundlovanoj verziji FullCalendar-a, pluginovi su već uključeni
+      // Nije potrebno eksplicitno navođenje pluginova
+      themeSystem: 'bootstrap5',
+      events: function (info, successCallback, failureCallback) {
+        var url = window.eventsApiUrl;
+        console.log('Using window.eventsApiUrl:', window.eventsApiUrl);
+        console.log('Fetching events from:', url);
+        console.log('Date range:', info.start, 'to', info.end);
+
+        $.ajax({
+          url: url,
+          dataType: 'json',
+          success: function (data) {
+            console.log('Events loaded successfully:', data);
+            console.log('Number of events:', data.length);
+            successCallback(data);
+          },
+          error: function (xhr, status, error) {
+            console.error('AJAX Error details:');
+            console.error('- Status:', status);
+            console.error('- Error:', error);
+            console.error('- XHR status:', xhr.status);
+            console.error('- XHR statusText:', xhr.statusText);
+            console.error('- Response:', xhr.responseText);
+            console.error('- Response type:', xhr.getResponseHeader('Content-Type'));
+
+            alert('Greška pri učitavanju događaja:\nStatus: ' + xhr.status + '\nPoruka: ' + error + '\n\nPogledajte konzolu za više detalja.');
+            failureCallback(error);
+          }
+        });
+      },
+      eventClick: function (info) {
+        console.log('=== EVENT CLICK HANDLER POKRENUT (v6.1.18) ===');
+        console.log('Event clicked:', info.event);
+
+        // Prevent default action and stop propagation
+        if (info.jsEvent) {
+          info.jsEvent.preventDefault();
+          info.jsEvent.stopPropagation();
+        }
+
+        // Provera tipa događaja - detaljna dijagnostika
+        console.log('=== DETALJNA DIJAGNOSTIKA DOGAĐAJA ===');
+        console.log('Info objekat:', info);
+        console.log('Info.event:', info.event);
+        console.log('Event extended props:', info.event.extendedProps);
+
+        // Provera da li extendedProps postoje
+        if (!info.event.extendedProps) {
+          console.error('GREŠKA: extendedProps ne postoje na event objektu');
+        }
+
+        // Dobavljanje tipa događaja iz dostupnih informacija
+        var eventType = info.event.extendedProps?.eventType || info.event.extendedProps?.type;
+
+        // Ako tip nije pronađen, pokušajmo prepoznati tip iz naslova i drugih atributa
+        if (!eventType) {
+          const title = info.event.title || '';
+          const id = info.event.id || '';
+
+          console.log('ANALIZA TIPA DOGAĐAJA ZA:', title);
+          console.log('ID događaja za analizu:', id);
+
+          // POSEBAN SLUČAJ: Prva nadzorna provera - Dan audita
+          if (title === 'Prva nadzorna provera - Dan audita') {
+            eventType = 'audit_day';
+            console.log('POGODAK: Pronađen specifičan slučaj "Prva nadzorna provera - Dan audita"');
+          }
+          // Provera za audit_day događaje
+          else if (title.toLowerCase().includes('dan audita') ||
+            title.toLowerCase().includes('provera') ||
+            title.toLowerCase().includes('nadzorna') ||
+            id.includes('audit_day') ||
+            id.includes('audit-day') ||
+            id.includes('audit')) {
+            eventType = 'audit_day';
+            console.log('Tip događaja određen iz naslova/ID-ja kao audit_day');
+          }
+          // Provera za cycle_audit događaje
+          else if (title.toLowerCase().includes('ciklus') ||
+            title.toLowerCase().includes('certifikacijski') ||
+            id.includes('cycle') ||
+            id.includes('cert_cycle')) {
+            eventType = 'cycle_audit';
+            console.log('Tip događaja određen iz naslova/ID-ja kao cycle_audit');
+          }
+          // Provera za appointment događaje
+          else if (title.toLowerCase().includes('sastanak') ||
+            title.toLowerCase().includes('termin') ||
+            id.includes('appointment') ||
+            id.includes('meeting')) {
+            eventType = 'appointment';
+            console.log('Tip događaja određen iz naslova/ID-ja kao appointment');
+          }
+        }
+
+        console.log('Detektovan tip događaja:', eventType);
+
+        // Ispitaj dodatne properties da vidimo šta je dostupno
+        console.log('Svi dostupni propertiji na event objektu:', Object.keys(info.event));
+        console.log('Naslov događaja:', info.event.title);
+        console.log('ID događaja:', info.event.id);
+
+        // Otvaranje modala na osnovu tipa događaja - sa dodatnim proverama i rukovanjem greškama
+        try {
+          console.log('Pokušavam otvoriti modal za tip:', eventType);
+
+          // Ako nemamo tip događaja, pokušajmo zaključiti iz naslova
+          if (!eventType && info.event.title === 'Sastanak') {
+            console.log('Naslov je "Sastanak", pretpostavljam da je tip appointment');
+            eventType = 'appointment';
+          }
+
+          if (eventType === 'audit_day' || eventType === 'audit-day') {
+            console.log('Otvaranje audit_day modala...');
+            // Provera da li element postoji
+            const modalElement = document.getElementById('auditDayModal'); // Changed from auditDetailModal to auditDayModal
+            if (!modalElement) {
+              console.error('Modal auditDayModal nije pronađen');
+              alert('Greška: Modal za audit nije pronađen. Kontaktirajte administratora.');
+              return;
+            }
+
+            // Otvaranje modala
+            try {
+              const auditModal = new bootstrap.Modal(modalElement);
+              auditModal.show();
+              console.log('Modal auditDayModal je uspešno otvoren');
+
+              // Popunjavanje podataka sa odlaganjem
+              setTimeout(() => {
+                try {
+                  openAuditDayModal(info.event);
+                } catch (err) {
+                  console.error('Greška prilikom popunjavanja audit modala:', err);
+                }
+              }, 100);
+            } catch (modalError) {
+              console.error('Greška prilikom otvaranja audit modala:', modalError);
+              // Pokušaj alternativni način
+              modalElement.classList.add('show');
+              modalElement.style.display = 'block';
+              document.body.classList.add('modal-open');
+            }
+          } else if (eventType === 'cycle_audit' || eventType === 'cycle-audit') {
+            console.log('Otvaranje cycle_audit modala...');
+            // Provera da li element postoji
+            const modalElement = document.getElementById('cycleAuditModal');
+            if (!modalElement) {
+              console.error('Element modala #cycleAuditModal nije pronađen!');
+              alert('Greška: Modal za ciklus audita nije pronađen. Kontaktirajte administratora.');
+              return;
+            }
+
+            // Otvaranje modala
+            try {
+              const cycleModal = new bootstrap.Modal(modalElement);
+              cycleModal.show();
+              console.log('Modal cycleAuditModal je uspešno otvoren');
+
+              // Popunjavanje podataka sa odlaganjem
+              setTimeout(() => {
+                try {
+                  openCycleAuditModal(info.event);
+                } catch (err) {
+                  console.error('Greška prilikom popunjavanja cycle modala:', err);
+                }
+              }, 100);
+            } catch (modalError) {
+              console.error('Greška prilikom otvaranja cycle modala:', modalError);
+              // Pokušaj alternativni način
+              modalElement.classList.add('show');
+              modalElement.style.display = 'block';
+              document.body.classList.add('modal-open');
+            }
+          } else if (eventType === 'appointment' || info.event.title === 'Sastanak') {
+            // Ako je termin povezan sa Danom audita, otvaramo audit modal umesto appointment modala
+            const props = info.event.extendedProps || {};
+            if (props.related_audit_day_id && props.related_audit_id) {
+              console.log('Termin je povezan sa Danom audita - otvaram auditDayModal...');
+              const modalElement = document.getElementById('auditDayModal');
+              if (!modalElement) {
+                console.error('Modal auditDayModal nije pronađen');
+                alert('Greška: Modal za audit nije pronađen. Kontaktirajte administratora.');
+                return;
+              }
+              try {
+                const auditModal = new bootstrap.Modal(modalElement);
+                auditModal.show();
+                console.log('Modal auditDayModal je uspešno otvoren (iz termina)');
+                // Kreiramo "audit_day" event objekat za postojeću funkciju openAuditDayModal
+                const auditEvent = {
+                  id: props.related_audit_day_id,
+                  start: info.event.start,
+                  extendedProps: {
+                    eventType: 'audit_day',
+                    audit_id: props.related_audit_id,
+                    audit_day_id: props.related_audit_day_id,
+                    // zadržimo i originalne propratne podatke ako zatrebaju
+                    ...props
+                  }
+                };
+                setTimeout(() => {
+                  try {
+                    openAuditDayModal(auditEvent);
+                  } catch (err) {
+                    console.error('Greška prilikom popunjavanja audit modala iz termina:', err);
+                  }
+                }, 100);
+              } catch (modalError) {
+                console.error('Greška prilikom otvaranja audit modala iz termina:', modalError);
+                modalElement.classList.add('show');
+                modalElement.style.display = 'block';
+                document.body.classList.add('modal-open');
+              }
+            } else {
+              console.log('Otvaranje appointment modala...');
+              // Provera da li element postoji
+              const modalElement = document.getElementById('appointmentDetailModal');
+              if (!modalElement) {
+                console.error('Element modala #appointmentDetailModal nije pronađen!');
+                alert('Greška: Modal za sastanak nije pronađen. Kontaktirajte administratora.');
+                return;
+              }
+
+              // Otvaranje modala
+              try {
+                const appointmentModal = new bootstrap.Modal(modalElement);
+                appointmentModal.show();
+                console.log('Modal appointmentDetailModal je uspešno otvoren');
+
+                // Popunjavanje podataka sa odlaganjem
+                setTimeout(() => {
+                  try {
+                    openAppointmentModal(info.event);
+                  } catch (err) {
+                    console.error('Greška prilikom popunjavanja appointment modala:', err);
+                  }
+                }, 100);
+              } catch (modalError) {
+                console.error('Greška prilikom otvaranja appointment modala:', modalError);
+                // Pokušaj alternativni način
+                modalElement.classList.add('show');
+                modalElement.style.display = 'block';
+                document.body.classList.add('modal-open');
+              }
+            }
+          } else {
+            console.warn('Nepoznat tip događaja:', eventType);
+            alert(`Nepoznat tip događaja: ${eventType || 'nije definisan'}`);
+          }
+        } catch (error) {
+          console.error('Opšta greška pri otvaranju modala:', error);
+          alert('Došlo je do greške prilikom otvaranja modala. Molimo pokušajte ponovo.');
+        }
+
+        // Multiple ways to prevent default navigation
+        if (info.jsEvent && typeof info.jsEvent.preventDefault === 'function') {
+          info.jsEvent.preventDefault();
+        }
+        if (info.el && info.el.tagName === 'A') {
+          info.el.setAttribute('href', 'javascript:void(0);');
+        }
+        return false; // Prevent default
+      },
+      eventTimeFormat: { // Formatiranje vremena događaja
+        hour: '2-digit',
+        minute: '2-digit',
+        hour12: false
+      },
+      editable: true,
+      eventStartEditable: true,
+      eventDurationEditable: false, // Onemogućavamo promenu trajanja događaja
+
+      // Handler za drag-and-drop događaja
+      eventDrop: function (info) {
+        const event = info.event;
+        const eventType = event.extendedProps.eventType || event.extendedProps.type;
+
+        console.log('Događaj premešten:', event);
+        console.log('Event extended props:', event.extendedProps);
+
+        // Određivanje ID-a događaja u zavisnosti od tipa
+        let eventId;
+        if (eventType === 'audit_day') {
+          eventId = event.extendedProps.audit_day_id || event.id;
+        } else if (eventType === 'cycle_audit') {
+          eventId = event.extendedProps.audit_id || event.id;
+        } else if (eventType === 'appointment') {
+          eventId = event.extendedProps.appointment_id || event.id;
+        } else {
+          eventId = event.id;
+        }
+
+        const newDate = event.start;
+
+        console.log('Događaj premešten - detalji:', {
+          eventType: eventType,
+          eventId: eventId,
+          newDate: newDate
+        });
+
+        // Provera da li je dozvoljeno pomeranje ovog tipa događaja
+        if (!eventType) {
+          console.warn('Nepoznat tip događaja:', eventType);
+          info.revert(); // Vrati događaj na originalnu poziciju
+          return;
+        }
+
+        // Podržani tipovi događaja za drag-and-drop
+        const supportedTypes = ['audit_day', 'cycle_audit', 'appointment'];
+        if (!supportedTypes.includes(eventType)) {
+          console.warn('Pomeranje ovog tipa događaja nije podržano:', eventType);
+          info.revert(); // Vrati događaj na originalnu poziciju
+          return;
+        }
+
+        // Za appointment tip događaja, direktno pozovi updateEventDate koji će prikazati dijalog ako dođe do konflikta
+        if (eventType === 'appointment') {
+          console.log('Processing appointment drag-and-drop for event:', eventId);
+
+          // Prikaži modal za potvrdu promene datuma
+          showDateChangeConfirmationModal(event, newDate, function (confirmed) {
+            if (confirmed) {
+              console.log('User confirmed date change, calling updateEventDate...');
+
+              // Korisnik je potvrdio promenu, ažuriraj datum na serveru
+              // Direktno pozovi AJAX da vidimo šta se dešava
+              const csrftoken = getCookie('csrftoken');
+              const payload = {
+                eventType: eventType,
+                eventId: eventId,
+                newDate: newDate.toISOString()
+              };
+
+              console.log('Sending update request with payload:', payload);
+
+              $.ajax({
+                url: '/company/api/events/update-date/',
+                type: 'POST',
+                data: JSON.stringify(payload),
+                contentType: 'application/json',
+                headers: { 'X-CSRFToken': csrftoken },
+                success: function (response) {
+                  console.log('Update successful:', response);
+                  if (response.success) {
+                    refreshCalendar();
+                  } else {
+                    // Server vratio success: false
+                    console.log('Server returned success: false');
+                    Swal.fire({
+                      title: 'Konflikt rezervacija',
+                      text: 'Nije moguće sačuvati trenutni datum jer za navedeni datum već postoji dodeljen auditor nekoj drugoj firmi.',
+                      icon: 'error',
+                      confirmButtonText: 'U redu',
+                      allowOutsideClick: false,
+                      allowEscapeKey: false
+                    }).then(() => {
+                      info.revert();
+                      refreshCalendar();
+                    });
+                  }
+                },
+                error: function (xhr, status, error) {
+                  console.log('Update failed - xhr:', xhr, 'status:', status, 'error:', error);
+                  console.log('Response text:', xhr.responseText);
+
+                  // Prikaži poruku o konfliktu bez obzira na tip greške
+                  Swal.fire({
+                    title: 'Konflikt rezervacija',
+                    text: 'Nije moguće sačuvati trenutni datum jer za navedeni datum već postoji dodeljen auditor nekoj drugoj firmi.',
+                    icon: 'error',
+                    confirmButtonText: 'U redu',
+                    allowOutsideClick: false,
+                    allowEscapeKey: false
+                  }).then(() => {
+                    info.revert();
+                    refreshCalendar();
+                  });
+                }
+              });
+            } else {
+              console.log('User cancelled date change, reverting...');
+              // Korisnik je otkazao promenu, vrati događaj na originalnu poziciju
+              info.revert();
+            }
+          });
+          return;
+        } else if (eventType === 'cycle_audit') {
+          // Posebno rukovanje za cycle_audit događaje
+          // Prikaži modal za potvrdu promene datuma
+          showDateChangeConfirmationModal(event, newDate, function (confirmed) {
+            console.log('cycle_audit: showDateChangeConfirmationModal callback pozvan, confirmed:', confirmed);
+            if (confirmed) {
+              console.log('cycle_audit: Korisnik je potvrdio. Pozivam updateEventDate sa:', {
+                eventType: eventType,
+                eventId: eventId,
+                newDate: newDate
+              });
+              // Korisnik je potvrdio promenu, ažuriraj datum na serveru
+              // Proveri da li updateEventDate funkcija postoji
+              if (typeof updateEventDate !== 'function') {
+                console.error('updateEventDate funkcija nije definisana! Direktno pozivam AJAX...');
+                // Direktno pozovi AJAX ako funkcija nije dostupna
+                const csrftoken = getCookie('csrftoken');
+                const payload = {
+                  eventType: eventType,
+                  eventId: eventId,
+                  newDate: newDate.toISOString(),
+                  version: event.extendedProps.version
+                };
+                console.log('Šaljem AJAX zahtev sa payload:', payload);
+                $.ajax({
+                  url: '/company/api/events/update-date/',
+                  type: 'POST',
+                  data: JSON.stringify(payload),
+                  contentType: 'application/json',
+                  headers: { 'X-CSRFToken': csrftoken },
+                  success: function(response) {
+                    console.log('AJAX uspešan:', response);
+                    if (response.success) {
+                      // Prvo osveži kalendar
+                      refreshCalendar();
+                      // Zatim prikaži poruku o uspehu
+                      Swal.fire({
+                        title: 'Uspešno!',
+                        text: response.message || 'Datum audita je uspešno promenjen.',
+                        icon: 'success',
+                        confirmButtonText: 'U redu',
+                        timer: 2000,
+                        timerProgressBar: true
+                      });
+                    } else {
+                      console.error('Server vratio success: false:', response.error);
+                      Swal.fire({
+                        title: 'Greška',
+                        text: response.error || 'Došlo je do greške prilikom čuvanja.',
+                        icon: 'error',
+                        confirmButtonText: 'U redu'
+                      });
+                      info.revert();
+                    }
+                  },
+                  error: function(xhr, status, error) {
+                    console.error('AJAX greška:', { xhr: xhr, status: status, error: error });
+                    info.revert();
+                    refreshCalendar();
+                  }
+                });
+                return;
+              }
+              updateEventDate(eventType, eventId, newDate, {
+                version: event.extendedProps.version,
+                onSuccess: function (response) { 
+                  console.log('cycle_audit: updateEventDate uspešno završen');
+                  // Prvo osveži kalendar
+                  try { refreshCalendar(); } catch (e) { console.error('refreshCalendar greška:', e); }
+                  // Zatim prikaži poruku o uspehu
+                  Swal.fire({
+                    title: 'Uspešno!',
+                    text: (response && response.message) || 'Datum audita je uspešno promenjen.',
+                    icon: 'success',
+                    confirmButtonText: 'U redu',
+                    timer: 2000,
+                    timerProgressBar: true
+                  });
+                },
+                onError: function (xhr, message) {
+                  try {
+                    // Prikaži detaljan error modal za konflikt auditora
+                    if (xhr && xhr.status === 409) {
+                      const isConflict = true;
+                      const title = 'Konflikt rezervacija';
+                      let messageToShow = message || 'Auditor je već dodeljen za taj dan.';
+
+                      console.log('Prikazujem SweetAlert za konflikt cycle_audit:', message);
+
+                      if (typeof Swal !== 'undefined') {
+                        Swal.fire({
+                          title: title,
+                          text: messageToShow,
+                          icon: 'error',
+                          confirmButtonText: 'U redu',
+                          allowOutsideClick: false,
+                          allowEscapeKey: false
+                        }).then(() => {
+                          // Osvežavanje kalendara nakon zatvaranja dijaloga
+                          refreshCalendar();
+                        });
+                      } else {
+                        alert(title + ': ' + messageToShow);
+                        refreshCalendar();
+                      }
+                    }
+                    info.revert();
+                  } catch (e) {
+                    console.error('Error handling conflict:', e);
+                    info.revert();
+                  }
+                }
+              });
+            } else {
+              // Korisnik je otkazao promenu, vrati događaj na originalnu poziciju
+              info.revert();
+            }
+          });
+        } else {
+          // Za ostale tipove događaja, prikaži standardni modal za potvrdu
+          showDateChangeConfirmationModal(event, newDate, function (confirmed) {
+            if (confirmed) {
+              // Korisnik je potvrdio promenu, ažuriraj datum na serveru
+              updateEventDate(eventType, eventId, newDate, {
+                version: event.extendedProps.version,
+                onSuccess: function () { try { refreshCalendar(); } catch (e) { /* ignore */ } },
+                onError: function (xhr, message) {
+                  try {
+                    // Prikaži detaljan error modal za konflikt auditora
+                    if (xhr && xhr.status === 409) {
+                      const isConflict = true;
+                      const title = 'Konflikt rezervacija';
+                      let messageToShow = message || 'Auditor je već dodeljen za taj dan.';
+
+                      if (typeof Swal !== 'undefined') {
+                        Swal.fire({
+                          title: title,
+                          text: messageToShow,
+                          icon: 'error',
+                          confirmButtonText: 'U redu',
+                          allowOutsideClick: false,
+                          allowEscapeKey: false
+                        }).then(() => {
+                          // Osvežavanje kalendara nakon zatvaranja dijaloga
+                          refreshCalendar();
+                        });
+                      } else {
+                        alert(title + ': ' + messageToShow);
+                        refreshCalendar();
+                      }
+                    }
+                    info.revert();
+                  } catch (e) {
+                    console.error('Error handling conflict:', e);
+                    info.revert();
+                  }
+                }
+              });
+            } else {
+              // Korisnik je otkazao promenu, vrati događaj na originalnu poziciju
+              info.revert();
+            }
+          });
+        }
+      }
+    };
+
+    // Dodaj initialDate ako je dostupan
+    if (window.initialCalendarDate) {
+      console.log('Dodajem initialDate u kalendar konfiguraciju:', window.initialCalendarDate);
+      calendarConfig.initialDate = window.initialCalendarDate;
+    }
+
+    // Kreiraj kalendar sa konfigurацијом
+    console.log('Kreiranje FullCalendar instance...');
+    var calendar = new FullCalendar.Calendar(calendarEl, calendarConfig);
+    console.log('FullCalendar instance kreirana:', calendar);
+
+    // Učini FullCalendar instancu dostupnom globalno da refreshCalendar() ne radi full reload
+    window.calendar = calendar;
+
+    // Žive izmene: drugi planeri vide promene odmah, bez punog osvežavanja (static/js/live_calendar.js)
+    if (window.calendarLiveStream) {
+      window.calendarLiveStream.close();
+    }
+    var live = window.calendarPageConfig.live;
+    window.calendarLiveStream = LiveCalendar.connect({
+      calendar: calendar,
+      mode: live.mode,
+      since: live.since,
+      streamUrl: live.streamUrl,
+      pollUrl: live.pollUrl,
+      pollMs: live.pollMs,
+      eventsUrl: function () { return window.eventsApiUrl; },
+      params: { audits: 'audit', appointments: 'appointment' },
+      matches: function (event, delta) {
+        var props = event.extendedProps || {};
+        if (props.eventType === 'appointment') {
+          return delta.appointments.indexOf(props.appointment_id) >= 0;
+        }
+        return delta.audits.indexOf(props.audit_id) >= 0;
+      }
+    });
+
+    // Renderuj kalendar
+    console.log('Pozivanje calendar.render()...');
+    try {
+      calendar.render();
+      console.log('Kalendar je uspešno renderovan!');
+
+      // Proveri dimenzije nakon renderovanja
+      setTimeout(function () {
+        var calendarHeight = calendarEl.offsetHeight;
+        var calendarWidth = calendarEl.offsetWidth;
+        console.log('Calendar dimensions:', {
+          height: calendarHeight,
+          width: calendarWidth,
+          visible: calendarHeight > 0 && calendarWidth > 0
+        });
+
+        if (calendarHeight === 0 || calendarWidth === 0) {
+          console.error('KALENDAR NIJE VIDLJIV! Proverite CSS stilove.');
+        }
+      }, 500);
+    } catch (renderError) {
+      console.error('GREŠKA PRI RENDEROVANJU KALENDARA:', renderError);
+      alert('Greška pri renderovanju kalendara: ' + renderError.message);
+    }
+
+    // Proveri da li postoji success poruka (korisnik se vratio sa stranice za izmenu)
+    const hasSuccessMessage = document.querySelector('.alert-success');
+
+    // Nakon renderovanja, navigiraj na početni datum ako je postavljen
+    if (window.initialCalendarDate) {
+      setTimeout(function () {
+        try {
+          console.log('Navigacija na početni datum nakon renderovanja:', window.initialCalendarDate);
+          calendar.gotoDate(window.initialCalendarDate);
+          console.log('Uspešno navigiran kalendar na datum:', window.initialCalendarDate);
+
+          // UVEK osveži događaje nakon navigacije (posebno ako postoji success poruka)
+          setTimeout(function () {
+            console.log('Osvežavanje događaja kalendara nakon navigacije...');
+
+            // Ako postoji success poruka, dodaj cache busting parametar
+            if (hasSuccessMessage) {
+              console.log('Detektovana success poruka - forsiram osvežavanje sa cache buster-om');
+              const originalEventsUrl = eventsApiUrl; // Koristi originalnu URL varijablu
+              const cacheBuster = '?_=' + new Date().getTime();
+              const newEventsUrl = originalEventsUrl + cacheBuster;
+
+              console.log('Postavljanje novog events URL-a:', newEventsUrl);
+              calendar.setOption('events', newEventsUrl);
+            }
+
+            calendar.refetchEvents();
+            console.log('Događaji osveženi');
+          }, 400);
+        } catch (e) {
+          console.warn('Greška pri navigaciji na početni datum:', e);
+        }
+      }, 100);
+    } else if (hasSuccessMessage) {
+      // Ako nema URL parametara, ali postoji success poruka
+      setTimeout(function () {
+        try {
+          console.log('Detektovana success poruka bez URL parametara, osvežavam kalendar...');
+          // Dodaj cache busting parametar
+          const originalEventsUrl = eventsApiUrl;
+          const cacheBuster = '?_=' + new Date().getTime();
+          const newEventsUrl = originalEventsUrl + cacheBuster;
+
+          console.log('Postavljanje novog events URL-a sa cache buster-om:', newEventsUrl);
+          calendar.setOption('events', newEventsUrl);
+
+          // Osveži događaje
+          setTimeout(function () {
+            calendar.refetchEvents();
+            console.log('Događaji osveženi sa novim URL-om');
+          }, 200);
+        } catch (e) {
+          console.warn('Greška pri osvežavanju kalendara:', e);
+        }
+      }, 300);
+    }
+
+    // Delegirani klik handler: radi i posle rerendera, bez potrebe za re-bind
+    try {
+      // Vizuelno: naslov meseca izgleda kao link
+      const styleEl = document.createElement('style');
+      styleEl.textContent = '.fc .fc-multimonth-title{cursor:pointer;}';
+      document.head.appendChild(styleEl);
+
+      document.addEventListener('click', function (ev) {
+        try {
+          if (!window.calendar) return;
+          const view = window.calendar.view;
+          if (!view || !(view.type === 'multiMonthYear' || (view.type && view.type.includes('multiMonth')))) return;
+
+          const titleEl = ev.target && ev.target.closest(
+            '.fc-multimonth-title, .fc-multiMonthYear-header h2, .fc-multimonth-header h2, .fc-multimonth-header'
+          );
+          if (!titleEl) return;
+
+          // Pokušaj 1: parsiraj mesec iz naslova i koristi godinu iz currentStart
+          const rawText = (titleEl.innerText || titleEl.textContent || '').replace(/\u00A0/g, ' ').trim();
+          // Očisti eventualne ikonice i ne-alfabetske znakove oko naziva
+          const textParts = rawText.split(' ');
+          const monthNameCandidate = (textParts[0] || '').trim();
+          const monthsMap = {
+            // Latinica
+            'januar': 0, 'februar': 1, 'mart': 2, 'april': 3, 'maj': 4, 'jun': 5, 'jul': 6, 'avgust': 7, 'septembar': 8, 'oktobar': 9, 'novembar': 10, 'decembar': 11,
+            'Januar': 0, 'Februar': 1, 'Mart': 2, 'April': 3, 'Maj': 4, 'Jun': 5, 'Jul': 6, 'Avgust': 7, 'Septembar': 8, 'Oktobar': 9, 'Novembar': 10, 'Decembar': 11,
+            // Ćirilica
+            'јануар': 0, 'фебруар': 1, 'март': 2, 'април': 3, 'мај': 4, 'јун': 5, 'јул': 6, 'август': 7, 'септембар': 8, 'октобар': 9, 'новембар': 10, 'децембар': 11,
+            'Јануар': 0, 'Фебруар': 1, 'Март': 2, 'Април': 3, 'Мај': 4, 'Јун': 5, 'Јул': 6, 'Август': 7, 'Септембар': 8, 'Октобар': 9, 'Новембар': 10, 'Децембар': 11,
+            // Engleski
+            'january': 0, 'february': 1, 'march': 2, 'april': 3, 'may': 4, 'june': 5, 'july': 6, 'august': 7, 'september': 8, 'october': 9, 'november': 10, 'december': 11,
+            'January': 0, 'February': 1, 'March': 2, 'April': 3, 'May': 4, 'June': 5, 'July': 6, 'August': 7, 'September': 8, 'October': 9, 'November': 10, 'December': 11
+          };
+          let monthIndex = monthsMap[monthNameCandidate];
+          if (monthIndex === undefined) {
+            monthIndex = monthsMap[monthNameCandidate.toLowerCase ? monthNameCandidate.toLowerCase() : monthNameCandidate];
+          }
+          if (monthIndex !== undefined) {
+            const year = (view.currentStart || new Date()).getFullYear();
+            const date = new Date(year, monthIndex, 1);
+            ev.preventDefault();
+            ev.stopPropagation();
+            window.calendar.changeView('dayGridMonth', date);
+            return;
+          }
+
+          // Pokušaj 2: fallback na prvi [data-date] iz tela meseca
+          let container = titleEl.closest('.fc-multimonth-month, .fc-multiMonthYear-month, .fc-multimonth');
+          let dateCell = container ? container.querySelector('.fc-daygrid-day[data-date], [data-date]') : null;
+          const dateStr = dateCell ? dateCell.getAttribute('data-date') : null;
+          if (dateStr) {
+            ev.preventDefault();
+            ev.stopPropagation();
+            window.calendar.changeView('dayGridMonth', dateStr);
+          }
+        } catch (e) { console.error('Delegated month-title click failed:', e); }
+      }, true);
+    } catch (e) {
+      console.warn('Delegated handler init failed:', e);
+    }
+
+    // Dodavanje event listenera za klikove na naslove meseci u godišnjem prikazu
+    setTimeout(function () {
+      // Funkcija za dodavanje event listenera na naslove meseci (izložena globalno)
+      window.addMonthTitleClickListeners = function () {
+        // Direktno targetiranje naslova meseci na osnovu HTML strukture
+        // Selektori su sortirani od najspecifičnijih do najopštijih
+        const selectors = [
+          // Na osnovu prikazane slike, fokusiramo se na naslove meseci u FC6
+          '.fc-multiMonthYear-header h2', // Glavni cilj - h2 elementi u zaglavlju meseca
+          '.fc-multimonth-title',         // Direktno po klasi naziva
+          '.fc-month-title',              // Alternativna klasa u novijim verzijama
+          '.fc-header-toolbar th.fc-multimonth-header', // Alternativna struktura
+          '.fc-header-toolbar h2',        // Opštiji pristup
+          'h2.fc-toolbar-title',         // Naslov u toolbaru
+          // Selektori koji ciljaju dodatne strukture koje mogu biti prisutne
+          '.fc-toolbar h2',               // Opštiji pristup za toolbar
+          '.fc div[class*="month-title"]',// Bilo koji element sa klasom koja sadrži month-title
+          '.fc div[class*="title"]:not(.fc-toolbar-title)', // Bilo koji title osim glavnog
+          // Krajnji selektori kao fallback
+          'th.fc-multimonth-header',      // Header ćelije 
+          '.fc th button',                // Dugmad u header ćelijama (v6 može koristiti buttons)
+          '.fc h2',                       // Svi h2 elementi unutar kalendara
+          'h2'                            // Apsolutni fallback - svi h2 elementi
+        ];
+
+        // Probaj svaki selektor dok ne nađeš naslove meseci
+        let monthTitles = [];
+        for (const selector of selectors) {
+          monthTitles = document.querySelectorAll(selector);
+          if (monthTitles.length > 0) {
+            console.log('Pronađeni naslovi meseci koristeći selektor:', selector);
+            break;
+          }
+        }
+
+        // Ako nema naslova meseci, znači da nismo u godišnjem prikazu
+        if (monthTitles.length === 0) {
+          console.log('Nismo pronašli naslove meseci, možda nismo u godišnjem prikazu');
+          return;
+        }
+
+        console.log('Dodavanje event listenera za', monthTitles.length, 'naslova meseci');
+
+        // Dodavanje event listenera za svaki naslov meseca
+        monthTitles.forEach(function (titleElement) {
+          // Proveri da li već ima event listener
+          if (!titleElement.hasAttribute('data-listener-added')) {
+            // Oznaka da je dodat listener
+            titleElement.setAttribute('data-listener-added', 'true');
+
+            // Čuvamo originalni tekst za kasnije (pre dodavanja ikonica)
+            const originalText = titleElement.innerText || titleElement.textContent;
+
+            // Dodavanje stilova da naslov izgleda kao link
+            titleElement.style.position = 'relative'; // Za pozicioniranje dekoracije
+            titleElement.style.cursor = 'pointer';
+            titleElement.style.color = '#0275d8'; // Bootstrap plava boja
+            titleElement.style.textDecoration = 'none';
+            titleElement.style.border = '1px solid transparent'; // Da ne pomera layout pri hoveru
+            titleElement.style.padding = '2px 8px';
+            titleElement.style.borderRadius = '4px';
+            titleElement.style.transition = 'all 0.2s';
+
+            // Dodajemo hover efekat
+            titleElement.addEventListener('mouseover', function () {
+              this.style.textDecoration = 'underline';
+              this.style.backgroundColor = 'rgba(2, 117, 216, 0.1)'; // Blaga plava pozadina
+              this.style.boxShadow = '0 1px 2px rgba(0,0,0,0.15)';
+              this.style.border = '1px solid rgba(2, 117, 216, 0.3)'; // Blagi okvir
+              // Prikaži poruku
+              if (this._tooltip) {
+                this._tooltip.style.visibility = 'visible';
+                this._tooltip.style.opacity = '1';
+              }
+            });
+
+            titleElement.addEventListener('mouseout', function () {
+              this.style.textDecoration = 'none';
+              this.style.backgroundColor = 'transparent';
+              this.style.boxShadow = 'none';
+              this.style.border = '1px solid transparent';
+              // Sakrij poruku
+              if (this._tooltip) {
+                this._tooltip.style.visibility = 'hidden';
+                this._tooltip.style.opacity = '0';
+              }
+            });
+
+            // Dodaj jasnu oznaku da je klikabilno
+            const span = document.createElement('span');
+            span.innerHTML = ' &#128279;'; // Link simbol - mala ikona lanca
+            span.style.fontSize = '0.7em';
+            span.style.opacity = '0.7';
+            span.style.verticalAlign = 'super';
+            span.style.marginLeft = '3px';
+            span.style.display = 'inline-block';
+            titleElement.appendChild(span);
+
+            // Dodaj tooltip
+            const tooltip = document.createElement('div');
+            tooltip.textContent = 'Kliknite za prikaz meseca ' + originalText;
+            tooltip.style.position = 'absolute';
+            tooltip.style.bottom = '-25px';
+            tooltip.style.left = '50%';
+            tooltip.style.transform = 'translateX(-50%)';
+            tooltip.style.backgroundColor = '#333';
+            tooltip.style.color = '#fff';
+            tooltip.style.padding = '3px 8px';
+            tooltip.style.borderRadius = '4px';
+            tooltip.style.fontSize = '12px';
+            tooltip.style.zIndex = '1000';
+            tooltip.style.whiteSpace = 'nowrap';
+            tooltip.style.transition = 'opacity 0.3s, visibility 0.3s';
+            tooltip.style.visibility = 'hidden';
+            tooltip.style.opacity = '0';
+            tooltip.style.pointerEvents = 'none'; // Da ne smeta klikovima
+            titleElement.appendChild(tooltip);
+
+            // Sačuvaj referencu na tooltip
+            titleElement._tooltip = tooltip;
+
+            // Dodavanje event listenera za klik
+            titleElement.addEventListener('click', function (e) {
+              e.preventDefault();
+              e.stopPropagation();
+
+              // Moramo koristiti sačuvani originalni tekst umesto trenutnog innerText
+              // jer smo naslovu dodali HTML elemente (ikonica linka i tooltip)
+              // koji će smetati parsiranju
+              const monthText = originalText;
+              console.log('Kliknuto na mesec (originalni tekst):', monthText);
+
+              try {
+                // 1) Najpouzdanije: pokušaj da dobiješ datum iz DOM-a (data-date u telu tog meseca)
+                let container = titleElement.closest('.fc-multimonth-month, .fc-multiMonthYear-month, .fc-multimonth');
+                let dateStr = null;
+                if (container) {
+                  const firstDateEl = container.querySelector('[data-date]');
+                  if (firstDateEl) {
+                    dateStr = firstDateEl.getAttribute('data-date');
+                  }
+                }
+
+                if (dateStr) {
+                  console.log('Detektovan data-date iz DOM-a:', dateStr);
+                  window.calendar.changeView('dayGridMonth', dateStr);
+                  return;
+                }
+
+                // Parsiranje meseca i godine iz teksta
+                const parts = monthText.replace(/\u00A0/g, ' ').split(' ');
+                console.log('Delovi naslova meseca:', parts);
+
+                if (parts.length >= 2) {
+                  // Meseci u srpskom (latinica i ćirilica)
+                  const monthsMap = {
+                    // Latinica
+                    'januar': 0, 'februar': 1, 'mart': 2, 'april': 3, 'maj': 4, 'jun': 5,
+                    'jul': 6, 'avgust': 7, 'septembar': 8, 'oktobar': 9, 'novembar': 10, 'decembar': 11,
+                    'Januar': 0, 'Februar': 1, 'Mart': 2, 'April': 3, 'Maj': 4, 'Jun': 5,
+                    'Jul': 6, 'Avgust': 7, 'Septembar': 8, 'Oktobar': 9, 'Novembar': 10, 'Decembar': 11,
+
+                    // Ćirilica
+                    'јануар': 0, 'фебруар': 1, 'март': 2,
+                    'април': 3, 'мај': 4, 'јун': 5,
+                    'јул': 6, 'август': 7, 'септембар': 8,
+                    'октобар': 9, 'новембар': 10, 'децембар': 11,
+                    'Јануар': 0, 'Фебруар': 1, 'Март': 2,
+                    'Април': 3, 'Мај': 4, 'Јун': 5,
+                    'Јул': 6, 'Август': 7, 'Септембар': 8,
+                    'Октобар': 9, 'Новембар': 10, 'Децембар': 11,
+
+                    // Engleska imena meseci (fallback)
+                    'january': 0, 'february': 1, 'march': 2, 'april': 3, 'may': 4, 'june': 5,
+                    'july': 6, 'august': 7, 'september': 8, 'october': 9, 'november': 10, 'december': 11,
+                    'January': 0, 'February': 1, 'March': 2, 'April': 3, 'May': 4, 'June': 5,
+                    'July': 6, 'August': 7, 'September': 8, 'October': 9, 'November': 10, 'December': 11
+                  };
+
+                  // Za slučaj kada se prikazuje samo ime meseca bez godine
+                  // Očistimo moguće znakove koji nisu slova
+                  const cleanMonthText = monthText.replace(/[^a-zA-ZЀ-ӿ]/g, '').trim();
+
+                  // Pokušavamo da dobijemo ime meseca i godinu iz teksta
+                  let monthIndex = null;
+                  let yearValue = null;
+
+                  // Prvo pokušavamo direktno parsiranje prvog dela kao meseca
+                  const firstPart = parts[0];
+                  monthIndex = monthsMap[firstPart];
+
+                  // Ako to ne uspe, pokušavamo sa lowercase verzijom
+                  if (monthIndex === undefined) {
+                    monthIndex = monthsMap[firstPart.toLowerCase()];
+                  }
+
+                  // Tražimo godinu u poslednjoj reči (najčešći slučaj)
+                  const lastPart = parts[parts.length - 1];
+                  yearValue = parseInt(lastPart);
+
+                  // Ako nije uspelo, prolazimo kroz sve delove i tražimo mesec i godinu
+                  if (monthIndex === undefined || isNaN(yearValue)) {
+                    console.log('Potrebna detaljnija analiza naziva meseca');
+
+                    // Tražimo bilo koji deo koji izgleda kao godina (4 cifre)
+                    for (let i = 0; i < parts.length; i++) {
+                      const yearCandidate = parseInt(parts[i].replace(/\D/g, ''));
+                      if (!isNaN(yearCandidate) && yearCandidate > 1000 && yearCandidate < 3000) {
+                        yearValue = yearCandidate;
+                        console.log('Pronađena godina:', yearValue);
+                        break;
+                      }
+                    }
+
+                    // Tražimo bilo koji deo koji odgovara imenu meseca
+                    for (let i = 0; i < parts.length; i++) {
+                      const cleanPart = parts[i].toLowerCase().trim();
+                      if (monthsMap[cleanPart] !== undefined) {
+                        monthIndex = monthsMap[cleanPart];
+                        console.log('Pronađen mesec (lowercase):', cleanPart, monthIndex);
+                        break;
+                      } else if (monthsMap[parts[i]] !== undefined) {
+                        monthIndex = monthsMap[parts[i]];
+                        console.log('Pronađen mesec (original):', parts[i], monthIndex);
+                        break;
+                      }
+                    }
+                  }
+
+                  // Prvo pokusamo direktno sa cistim tekstom za slucaj da je samo ime meseca
+                  if (monthIndex === null || monthIndex === undefined) {
+                    monthIndex = monthsMap[cleanMonthText];
+                    if (monthIndex === undefined) {
+                      monthIndex = monthsMap[cleanMonthText.toLowerCase()];
+                    }
+                  }
+
+                  // Ako imamo samo mesec bez godine, koristimo trenutnu godinu
+                  if (monthIndex !== null && monthIndex !== undefined && (yearValue === null || isNaN(yearValue))) {
+                    // Uzmi trenutnu godinu
+                    const currentDate = new Date();
+                    yearValue = currentDate.getFullYear();
+                    console.log('Koristimo trenutnu godinu:', yearValue, 'za mesec:', monthIndex);
+                  }
+
+                  // Provera da li smo uspešno dobili mesec (godina je opciona, koristimo trenutnu)
+                  if (monthIndex !== null && monthIndex !== undefined) {
+                    console.log('Uspešno parsiranje: mesec =', monthIndex, 'godina =', yearValue);
+
+                    // Kreiranje datuma za prvi dan tog meseca
+                    const date = new Date(yearValue, monthIndex, 1);
+
+                    // Prebacivanje na mesečni prikaz sa odabranim mesecom
+                    window.calendar.changeView('dayGridMonth', date);
+                    console.log('Prebacivanje na mesečni prikaz:', date);
+                  } else {
+                    console.error('Nije moguće parsirati mesec iz:', monthText);
+                    console.error('Pokušano sa delovima:', parts);
+                    console.error('I sa čistim tekstom:', cleanMonthText);
+
+                    // Pokusaj jos jednom sa fiksnim mapiranjem za mesec maj
+                    if (monthText.includes('мај') || monthText.toLowerCase().includes('maj')) {
+                      console.log('Detektovan mesec maj, koristimo hardkodirano');
+                      const currentDate = new Date();
+                      const date = new Date(currentDate.getFullYear(), 4, 1); // Maj je indeks 4
+                      window.calendar.changeView('dayGridMonth', date);
+                      console.log('Prebacivanje na maj:', date);
+                    }
+                  }
+                }
+              } catch (err) {
+                console.error('Greška pri parsiranju naslova meseca:', err);
+              }
+            });
+          }
+        });
+      }
+
+      // Dodavanje event listenera za promenu prikaza kalendara
+      calendar.on('viewDidMount', function (info) {
+        console.log('Promena pogleda kalendara na:', info.view.type);
+        // Provera da li je godišnji pogled
+        if (info.view.type === 'multiMonthYear' || info.view.type.includes('multiMonth')) {
+          console.log('Ušli smo u godišnji prikaz, dodajem listenere na naslove meseci');
+          // Sačekaj da se DOM ažurira
+          setTimeout(addMonthTitleClickListeners, 100);
+          // Dodaj još jedan pokušaj nakon dužeg vremena (za sporije učitavanje)
+          setTimeout(addMonthTitleClickListeners, 500);
+        }
+      });
+
+      // Dodatni event listeneri za hvatanje različitih događaja koji mogu uticati na prikaz
+      calendar.on('datesSet', function () {
+        // Kada se promeni set datuma (npr. mesec/godina), sačekaj da se DOM ažurira
+        setTimeout(addMonthTitleClickListeners, 100);
+      });
+
+      // Obavezno dodaj za prepravku nakon odredjenog vremena
+      setInterval(function () {
+        const view = calendar.view;
+        if (view && (view.type === 'multiMonthYear' || view.type.includes('multiMonth'))) {
+          addMonthTitleClickListeners();
+        }
+      }, 1000); // Svake sekunde
+
+      // Inicijalno dodavanje event listenera (u slučaju da je godišnji prikaz default)
+      addMonthTitleClickListeners();
+      // Dodatni pokušaj nakon nekog vremena (za pouzdanije učitavanje)
+      setTimeout(addMonthTitleClickListeners, 500);
+      setTimeout(addMonthTitleClickListeners, 1000);
+
+      // Dodavanje globalnog event listenera za klik na Year dugme - unutar istog scope-a
+      setTimeout(function () {
+        // Koristimo samo validne CSS selektore
+        let yearButtons = document.querySelectorAll('button.fc-multiMonthYear-button, button[title="year"], button.fc-yearView-button');
+
+        // Ako nisu pronađeni, fallback: pretraži sva dugmad i filtriraj po tekstu
+        if (!yearButtons || yearButtons.length === 0) {
+          const allButtons = document.querySelectorAll('.fc button, .fc-header-toolbar button, button');
+          yearButtons = Array.from(allButtons).filter(function (btn) {
+            const t = (btn.innerText || btn.textContent || '').trim().toLowerCase();
+            return t === 'year' || t === 'година' || t === 'godina';
+          });
+        }
+
+        (yearButtons ? Array.from(yearButtons) : []).forEach(function (btn) {
+          if (!btn.hasAttribute('data-year-listener')) {
+            btn.setAttribute('data-year-listener', 'true');
+            btn.addEventListener('click', function () {
+              console.log('Kliknuto Year dugme, dodajem listenere nakon promene prikaza');
+              // Sačekaj da se promeni prikaz
+              setTimeout(addMonthTitleClickListeners, 200);
+              setTimeout(addMonthTitleClickListeners, 500);
+              setTimeout(addMonthTitleClickListeners, 1000);
+            });
+          }
+        });
+      }, 1000);
+    }, 500); // Sačekaj da se kalendar u potpunosti renderuje
+  } catch (error) {
+    console.error('Greška prilikom inicijalizacije kalendara:', error);
+  }
+}
+
+// POZIV INICIJALIZACIJE KALENDARA - mora biti nakon definicije funkcije
+console.log('Pozivanje initializeCalendar() funkcije...');
+if (typeof initializeCalendar === 'function') {
+  initializeCalendar();
+} else {
+  console.error('initializeCalendar funkcija nije definisana!');
+}
+
+// FIX: Osiguraj da se kalendar pravilno renderuje nakon povratka sa back-forward cache (bfcache)
+// Ovo rešava problem kada korisnik edituje termin, vrati se na kalendar, i kalendar je prazan
+window.addEventListener('pageshow', function(event) {
+  console.log('pageshow event triggered, persisted:', event.persisted);
+  // event.persisted je true ako je stranica učitana iz bfcache
+  if (event.persisted) {
+    console.log('Stranica učitana iz bfcache - osvežavam kalendar...');
+    // Proveri da li kalendar postoji i ponovo ga renderuj
+    if (window.calendar) {
+      try {
+        // Ponovo renderuj kalendar
+        window.calendar.render();
+        // Osveži događaje
+        setTimeout(function() {
+          window.calendar.refetchEvents();
+          console.log('Kalendar osvežen nakon povratka iz bfcache');
+        }, 100);
+      } catch (e) {
+        console.error('Greška pri osvežavanju kalendara iz bfcache:', e);
+        // Ako ne uspe, ponovo inicijalizuj kalendar
+        if (typeof initializeCalendar === 'function') {
+          initializeCalendar();
+        }
+      }
+    } else {
+      // Kalendar nije inicijalizovan, pokreni inicijalizaciju
+      console.log('Kalendar nije pronađen, pokrećem inicijalizaciju...');
+      if (typeof initializeCalendar === 'function') {
+        initializeCalendar();
+      }
+    }
+  }
+});
+
+// Dodatni fix: Osiguraj renderovanje kalendara kada se prozor ponovo fokusira
+// (pomaže u nekim edge case scenarijima sa tabovima)
+document.addEventListener('visibilitychange', function() {
+  if (document.visibilityState === 'visible' && window.calendar) {
+    console.log('Tab je ponovo vidljiv - proveravam kalendar...');
+    var calendarEl = document.getElementById('calendar');
+    if (calendarEl && calendarEl.offsetHeight === 0) {
+      console.log('Kalendar ima nultu visinu - ponovo renderujem...');
+      window.calendar.render();
+      setTimeout(function() {
+        window.calendar.refetchEvents();
+      }, 100);
+    }
+  }
+});
+
+// Druga verzija openAppointmentModal funkcije je uklonjena jer je duplirana
+
+// Funkcija za ažuriranje svih Bootstrap 4 modalnih kontrola na Bootstrap 5
+function modernizeBootstrapModals() {
+  console.log('Modernizacija Bootstrap modalnih kontrola...');
+
+  // Ažuriranje close dugmadi u header sekcijama
+  document.querySelectorAll('.modal .modal-header button.close[data-dismiss="modal"]').forEach(button => {
+    console.log('Ažuriranje close dugmeta u headeru:', button);
+    button.className = 'btn-close';
+    button.removeAttribute('data-dismiss');
+    button.setAttribute('data-bs-dismiss', 'modal');
+    button.innerHTML = '';
+  });
+
+  // Ažuriranje dugmadi za zatvaranje u footer sekcijama
+  document.querySelectorAll('.modal .modal-footer button[data-dismiss="modal"]').forEach(button => {
+    console.log('Ažuriranje dugmeta u footeru:', button);
+    button.removeAttribute('data-dismiss');
+    button.setAttribute('data-bs-dismiss', 'modal');
+  });
+}
+
+// Automatsko ažuriranje kada se stranica učita
+document.addEventListener('DOMContentLoaded', function () {
+  setTimeout(modernizeBootstrapModals, 500);
+
+  // Add event listener for the viewCycleBtn
+  const viewCycleBtn = document.getElementById('viewCycleBtn');
+  if (viewCycleBtn) {
+    viewCycleBtn.addEventListener('click', function () {
+      // Get the cycle ID and navigate to the cycle details page
+      const cycleId = document.getElementById('cycle-id').textContent;
+      if (cycleId) {
+        console.log('Navigating to cycle details:', cycleId);
+        // Use history.pushState to avoid full page reload if possible
+        const url = `/company/cycles/${cycleId}/`;
+        // Close modal before navigation
+        if (typeof bootstrap !== 'undefined') {
+          const modalElement = document.querySelector('#cycleAuditModal');
+          const modal = bootstrap.Modal.getInstance(modalElement);
+          if (modal) {
+            modal.hide();
+            // Wait for modal to close before navigating
+            setTimeout(() => {
+              window.location.href = url;
+            }, 300);
+          } else {
+            window.location.href = url;
+          }
+        } else {
+          window.location.href = url;
+        }
+      }
+    });
+  }
+});
+
+// Dodaj handler za filter formu da sačuva trenutni prikaz kalendara
+document.addEventListener('DOMContentLoaded', function () {
+  const filterForm = document.querySelector('form.form-inline');
+
+  if (filterForm) {
+    filterForm.addEventListener('submit', function (e) {
+    // Dobij trenutni view i datum iz kalendara
+      if (window.calendar && window.calendar.view) {
+        // Prvo ukloni stara hidden polja ako postoje (da ne dupliramo)
+        const oldInputs = filterForm.querySelectorAll('input[name="view"], input[name="year"], input[name="month"]');
+        oldInputs.forEach(input => input.remove());
+
+        const currentView = window.calendar.view;
+        const currentDate = currentView.currentStart || new Date();
+
+        // Dodaj hidden polja za view type
+        const viewInput = document.createElement('input');
+        viewInput.type = 'hidden';
+        viewInput.name = 'view';
+        viewInput.value = currentView.type;
+        filterForm.appendChild(viewInput);
+
+        const monthInput = document.createElement('input');
+        monthInput.type = 'hidden';
+        monthInput.name = 'month';
+        monthInput.value = currentDate.getMonth() + 1;
+        filterForm.appendChild(monthInput);
+
+        console.log('Filter forma - sačuvani parametri:', {
+          view: currentView.type,
+          year: currentDate.getFullYear(),
+          month: currentDate.getMonth() + 1,
+          currentDate: currentDate
+        });
+      } else {
+        console.warn('Kalendar nije dostupan pri submit-u forme');
+      }
+    });
+  }
+});